@@ -30,7 +30,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 
-from .routers import crawler_router, data_router, websocket_router
+from .routers import crawler_router, data_router, metrics_router, websocket_router
 
 app = FastAPI(
     title="MediaCrawler WebUI API",
@@ -62,6 +62,8 @@ app.add_middleware(
 app.include_router(crawler_router, prefix="/api")
 app.include_router(data_router, prefix="/api")
 app.include_router(websocket_router, prefix="/api")
+# Serves /metrics for Prometheus and /api/metrics/summary
+app.include_router(metrics_router)
 
 
 @app.get("/")
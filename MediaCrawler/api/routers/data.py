@@ -16,6 +16,7 @@
 # 详细许可条款请参阅项目根目录下的LICENSE文件。
 # 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
 
+import asyncio
 import os
 import json
 from pathlib import Path
@@ -24,6 +25,8 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import FileResponse
 
+from store.word_frequency import WORD_FREQ_PLATFORMS, WordFrequencyStore
+
 router = APIRouter(prefix="/data", tags=["data"])
 
 # Data directory
@@ -241,3 +244,39 @@ async def get_data_stats():
                 continue
 
     return stats
+
+
+def _word_frequency_store(platform: str) -> WordFrequencyStore:
+    if platform not in WORD_FREQ_PLATFORMS:
+        raise HTTPException(status_code=404, detail=f"Unknown platform, expected one of {', '.join(WORD_FREQ_PLATFORMS)}")
+    return WordFrequencyStore(platform, base_dir=str(DATA_DIR))
+
+
+@router.get("/words/{platform}/keywords")
+async def get_word_keywords(platform: str):
+    """Source keywords of the aggregated comment word frequency"""
+    store = _word_frequency_store(platform)
+    return {"keywords": await asyncio.to_thread(store.get_keywords)}
+
+
+@router.get("/words/{platform}/top")
+async def get_top_words(platform: str, top_n: int = 20, keyword: Optional[str] = None,
+                        since_day: Optional[str] = None, until_day: Optional[str] = None):
+    """Most frequent comment words across all jobs, optionally of one keyword and day range (YYYY-MM-DD)"""
+    store = _word_frequency_store(platform)
+    words = await asyncio.to_thread(store.get_top_words, top_n, keyword, since_day, until_day)
+    return {"words": [{"word": word, "count": count} for word, count in words]}
+
+
+@router.get("/words/{platform}/trending")
+async def get_trending_words(platform: str, days: int = 7, until_day: Optional[str] = None,
+                             keyword: Optional[str] = None, top_n: int = 20):
+    """Comment words that grew the most in the last `days` days compared to the days before"""
+    if days < 1:
+        raise HTTPException(status_code=400, detail="days must be at least 1")
+    store = _word_frequency_store(platform)
+    try:
+        words = await asyncio.to_thread(store.get_trending_words, days, until_day, keyword, top_n)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="until_day must be YYYY-MM-DD")
+    return {"words": words}
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/api/routers/metrics.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+import config
+from tools.perf_metrics import read_snapshot, render_prometheus, summarize
+
+router = APIRouter(tags=["metrics"])
+
+# The crawler subprocess runs from the project root and writes its snapshot there
+METRICS_FILE = Path(__file__).parent.parent.parent / config.PERF_METRICS_FILE
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_prometheus_metrics():
+    """Perf metrics of the current (or last) crawler run in the Prometheus text format"""
+    snapshot = read_snapshot(str(METRICS_FILE))
+    if snapshot is None:
+        return PlainTextResponse("", media_type="text/plain; version=0.0.4")
+    return PlainTextResponse(render_prometheus(snapshot), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/api/metrics/summary")
+async def get_metrics_summary():
+    """count/avg/p50/p95 per request endpoint, sign method and store, items stored per second"""
+    snapshot = read_snapshot(str(METRICS_FILE))
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="No metrics recorded yet")
+    return summarize(snapshot)
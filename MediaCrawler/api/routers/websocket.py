@@ -136,7 +136,7 @@ async def websocket_logs(websocket: WebSocket):
 
 @router.websocket("/ws/status")
 async def websocket_status(websocket: WebSocket):
-    """WebSocket status stream"""
+    """WebSocket status stream, including the crawl progress aggregated from the crawler progress events"""
     await websocket.accept()
 
     try:
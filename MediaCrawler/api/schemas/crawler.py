@@ -72,6 +72,21 @@ class CrawlerStartRequest(BaseModel):
     cookies: str = ""
     headless: bool = False
     crawl_count: int = 20
+    resume_job_id: str = ""  # Job ID of an interrupted crawl, continued from its checkpoint with the saved settings
+
+
+class CrawlerProgress(BaseModel):
+    """Crawl progress aggregated from the structured events of the crawler process"""
+    stage: Literal["starting", "crawling", "finished"] = "starting"
+    pages: int = 0
+    contents: int = 0
+    comments: int = 0
+    creators: int = 0
+    errors: int = 0
+    target_contents: Optional[int] = None  # None when unknown upfront (creator mode)
+    elapsed_seconds: float = 0
+    eta_seconds: Optional[float] = None
+    last_error: Optional[str] = None
 
 
 class CrawlerStatusResponse(BaseModel):
@@ -82,6 +97,7 @@ class CrawlerStatusResponse(BaseModel):
     started_at: Optional[str] = None
     error_message: Optional[str] = None
     client_job_id: Optional[str] = None
+    progress: Optional[CrawlerProgress] = None
 
 
 class LogEntry(BaseModel):
@@ -17,14 +17,23 @@
 # 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
 
 import asyncio
+import json
 import subprocess
 import signal
 import os
+import tempfile
 from typing import Optional, List
 from datetime import datetime
 from pathlib import Path
 
-from ..schemas import CrawlerStartRequest, LogEntry
+from tools.progress import PROGRESS_FILE_ENV
+
+from ..schemas import CrawlerProgress, CrawlerStartRequest, LogEntry
+
+# Seconds between two reads of the progress events file
+PROGRESS_POLL_INTERVAL = 0.5
+# Progress stage after each structured event type of tools.progress
+PROGRESS_EVENT_STAGES = {"run_started": "crawling", "progress": "crawling", "run_finished": "finished"}
 
 
 class CrawlerManager:
@@ -44,6 +53,10 @@ class CrawlerManager:
         self._project_root = Path(__file__).parent.parent.parent
         # Log queue - for pushing to WebSocket
         self._log_queue: Optional[asyncio.Queue] = None
+        # Structured progress events written by the crawler process, see tools/progress.py
+        self.progress: Optional[CrawlerProgress] = None
+        self._progress_file: Optional[Path] = None
+        self._progress_offset = 0
 
     @property
     def logs(self) -> List[LogEntry]:
@@ -116,6 +129,12 @@ class CrawlerManager:
             # Build command line arguments
             cmd = self._build_command(config)
 
+            fd, progress_file = tempfile.mkstemp(prefix="mediacrawler_progress_", suffix=".jsonl")
+            os.close(fd)
+            self._progress_file = Path(progress_file)
+            self._progress_offset = 0
+            self.progress = CrawlerProgress()
+
             # Log start information
             entry = self._create_log_entry(f"Starting crawler: {' '.join(cmd)}", "info")
             await self._push_log(entry)
@@ -129,7 +148,12 @@ class CrawlerManager:
                     text=True,
                     bufsize=1,
                     cwd=str(self._project_root),
-                    env={**os.environ, "PYTHONUNBUFFERED": "1", "PYTHONIOENCODING": "utf-8"},
+                    env={
+                        **os.environ,
+                        "PYTHONUNBUFFERED": "1",
+                        "PYTHONIOENCODING": "utf-8",
+                        PROGRESS_FILE_ENV: str(self._progress_file),
+                    },
                     encoding="utf-8",
                     errors="replace"  # Replace undecodable characters instead of raising error
                 )
@@ -146,10 +170,12 @@ class CrawlerManager:
 
                 # Start log reading task
                 self._read_task = asyncio.create_task(self._read_output())
+                asyncio.create_task(self._watch_progress(self.process, self._progress_file))
 
                 return True
             except Exception as e:
                 self.status = "error"
+                self._progress_file.unlink(missing_ok=True)
                 entry = self._create_log_entry(f"Failed to start crawler: {str(e)}", "error")
                 await self._push_log(entry)
                 self.current_config = None
@@ -209,8 +235,52 @@ class CrawlerManager:
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "error_message": None,
             "client_job_id": active_job_id,
+            "progress": self.progress.model_dump() if self.progress else None,
         }
 
+    def _apply_progress_event(self, event: dict):
+        """Fold one structured progress event into the aggregated progress"""
+        if event.get("event") == "error":
+            self.progress.errors += 1
+            self.progress.last_error = event.get("message")
+            return
+        stage = PROGRESS_EVENT_STAGES.get(event.get("event"))
+        if stage is None:
+            return
+        # progress / run_finished events carry cumulative counts
+        fields = {key: value for key, value in event.items() if key in CrawlerProgress.model_fields}
+        self.progress = self.progress.model_copy(update={**fields, "stage": stage})
+
+    def _read_progress_events(self, progress_file: Path):
+        """Apply the complete lines appended to the progress file since the last read"""
+        try:
+            with open(progress_file, "rb") as f:
+                f.seek(self._progress_offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Partially written, read it again next time
+                        break
+                    self._progress_offset += len(line)
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._apply_progress_event(event)
+        except OSError:
+            pass
+
+    async def _watch_progress(self, process: subprocess.Popen, progress_file: Path):
+        """Tail the progress file of a crawler process until it exits"""
+        try:
+            while process.poll() is None:
+                if self._progress_file == progress_file:
+                    self._read_progress_events(progress_file)
+                await asyncio.sleep(PROGRESS_POLL_INTERVAL)
+            if self._progress_file == progress_file:
+                self._read_progress_events(progress_file)
+        finally:
+            progress_file.unlink(missing_ok=True)
+
     def _build_command(self, config: CrawlerStartRequest) -> list:
         """Build main.py command line arguments"""
         cmd = ["uv", "run", "python", "main.py"]
@@ -243,6 +313,9 @@ class CrawlerManager:
         cmd.extend(["--headless", "true" if config.headless else "false"])
         cmd.extend(["--crawl_count", str(config.crawl_count)])
 
+        if config.resume_job_id:
+            cmd.extend(["--resume", config.resume_job_id])
+
         return cmd
 
     async def _read_output(self):
@@ -18,7 +18,7 @@
 # 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
 
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 from playwright.async_api import BrowserContext, BrowserType, Playwright
 
@@ -85,6 +85,17 @@ class AbstractLogin(ABC):
 
 class AbstractStore(ABC):
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Record write latency and stored item counts (tools.perf_metrics) and crawl progress (tools.progress)
+        from tools.perf_metrics import measure_store
+        from tools.progress import track_store_progress
+        for item in ("content", "comment", "creator"):
+            store_func = cls.__dict__.get(f"store_{item}")
+            if store_func is not None and not getattr(store_func, "__isabstractmethod__", False):
+                store_func = track_store_progress(store_func, item)
+                setattr(cls, f"store_{item}", measure_store(store_func, cls.__name__, item))
+
     @abstractmethod
     async def store_content(self, content_item: Dict):
         pass
@@ -118,6 +129,14 @@ class AbstractStoreVideo(ABC):
 
 class AbstractApiClient(ABC):
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Serve idempotent endpoints from the api response cache, see config.API_RESPONSE_CACHE_TTL
+        request_func = cls.__dict__.get("request")
+        if request_func is not None and not getattr(request_func, "__isabstractmethod__", False):
+            from cache.api_response_cache import cache_api_response
+            cls.request = cache_api_response(request_func)
+
     @abstractmethod
     async def request(self, method, url, **kwargs):
         pass
@@ -125,3 +144,10 @@ class AbstractApiClient(ABC):
     @abstractmethod
     async def update_cookies(self, browser_context: BrowserContext):
         pass
+
+    def is_cacheable_response(self, method: str, url: str, response: Any) -> bool:
+        """
+        Whether a response returned by request() may be stored in the api response cache.
+        Override when the platform returns risk control or login pages without raising
+        """
+        return True
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/benchmarks/crawl_benchmark.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+End-to-end crawl benchmark, runs fully offline against the mock platform server (benchmarks/mock_platform_server.py).
+
+Runs the real search flow of a platform crawler (search -> detail -> comments -> store) with its client pointed at
+the mock server, once per SAVE_DATA_OPTION, in a temporary working directory. Platforms whose requests need a
+browser or node signature (xhs, dy, ks, wb, zhihu) are covered by hot_path_benchmark instead.
+
+Measures per platform and save option:
+  - items_per_sec: contents, comments and creators stored per second
+  - the stored item counts, requests served by the mock server and the elapsed time
+
+Usage:
+    python -m benchmarks.crawl_benchmark --platforms bili,tieba --save-options json,csv,sqlite --pages 5
+    python -m benchmarks.crawl_benchmark --save-report crawl_baseline.json
+    python -m benchmarks.crawl_benchmark --baseline crawl_baseline.json --tolerance 0.2
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Tuple
+
+import config
+from benchmarks.mock_platform_server import PLATFORM_ROUTES, MockPage, MockPlatformServer
+from benchmarks.report import check_baseline, print_report, save_report
+from config.db_config import sqlite_db_config
+from database import db_session
+from tools import perf_metrics
+
+# wbi key pair served from localStorage, the same pair as in the bilibili client docstring
+BILI_LOCAL_STORAGE = {
+    "wbi_img_urls": "https://i0.hdslb.com/bfs/wbi/7cd084941338484aae1ad9425b84077c.png-"
+                    "https://i0.hdslb.com/bfs/wbi/4932caff0ff746eab6f01bf08b70ac45.png",
+}
+
+
+def _create_bili_crawler(base_url: str, page: MockPage):
+    from media_platform.bilibili import BilibiliCrawler
+    from media_platform.bilibili.client import BilibiliClient
+
+    crawler = BilibiliCrawler()
+    crawler.bili_client = BilibiliClient(
+        headers={"User-Agent": crawler.user_agent, "Cookie": ""}, playwright_page=page, cookie_dict={}
+    )
+    crawler.bili_client._host = base_url
+    return crawler, crawler.bili_client
+
+
+def _create_tieba_crawler(base_url: str, page: MockPage):
+    from media_platform.tieba import TieBaCrawler
+    from media_platform.tieba.client import BaiduTieBaClient
+
+    crawler = TieBaCrawler()
+    crawler.tieba_client = BaiduTieBaClient(headers={"User-Agent": crawler.user_agent, "Cookie": ""}, playwright_page=page)
+    crawler.tieba_client._host = base_url
+    return crawler, crawler.tieba_client
+
+
+# platform -> (search page size, crawler factory, localStorage of the page)
+PLATFORMS: Dict[str, Tuple[int, Callable, Dict[str, str]]] = {
+    "bili": (20, _create_bili_crawler, BILI_LOCAL_STORAGE),
+    "tieba": (10, _create_tieba_crawler, {}),
+}
+
+
+@contextmanager
+def override_config(**values) -> Iterator[None]:
+    """Set config attributes for the duration of the block"""
+    saved = {name: getattr(config, name) for name in values}
+    for name, value in values.items():
+        setattr(config, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(config, name, value)
+
+
+@contextmanager
+def working_directory(path: str) -> Iterator[None]:
+    """Stores write to data/ relative to the working directory"""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+async def _prepare_store(save_option: str, work_dir: str):
+    if save_option == "sqlite":
+        sqlite_db_config["db_path"] = os.path.join(work_dir, "benchmark.db")
+        await db_session.dispose_engines()
+        await db_session.create_tables("sqlite")
+    elif save_option in ("db", "mysql"):
+        await db_session.create_tables(save_option)
+
+
+async def _close_store(save_option: str):
+    if save_option == "excel":
+        from store.excel_store_base import ExcelStoreBase
+        ExcelStoreBase.flush_all()
+    elif save_option == "mongodb":
+        from database.mongodb_store_base import MongoDBConnection
+        await MongoDBConnection().close()
+    await db_session.dispose_engines()
+
+
+async def bench_crawl(platform: str, save_option: str, args) -> Dict:
+    page_size, create_crawler, local_storage = PLATFORMS[platform]
+    server = MockPlatformServer(PLATFORM_ROUTES[platform], latency=args.latency_ms / 1000)
+    base_url = await server.start()
+    page = MockPage(local_storage)
+    sqlite_db_path = sqlite_db_config["db_path"]
+    overrides = dict(
+        PLATFORM=platform,
+        SAVE_DATA_OPTION=save_option,
+        CRAWLER_TYPE="search",
+        KEYWORDS=",".join(f"benchmark{i}" for i in range(args.keywords)),
+        START_PAGE=1,
+        CRAWLER_MAX_NOTES_COUNT=args.pages * page_size,
+        CRAWLER_MAX_SLEEP_SEC=0,
+        MAX_CONCURRENCY_NUM=args.concurrency,
+        ENABLE_GET_MEIDAS=False,
+        ENABLE_GET_COMMENTS=True,
+        ENABLE_GET_SUB_COMMENTS=args.sub_comments,
+        CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES=args.comments,
+        ENABLE_GET_WORDCLOUD=False,
+        # The fixtures replay the same items, the response cache would answer every detail request after the first
+        ENABLE_API_RESPONSE_CACHE=False,
+        BILI_SEARCH_MODE="normal",
+    )
+    try:
+        with tempfile.TemporaryDirectory() as work_dir, override_config(**overrides), working_directory(work_dir):
+            await _prepare_store(save_option, work_dir)
+            crawler, client = create_crawler(base_url, page)
+            perf_metrics.registry.reset()
+            start = time.perf_counter()
+            await crawler.search()
+            await _close_store(save_option)
+            elapsed = time.perf_counter() - start
+            await client.close_http_clients()
+    finally:
+        sqlite_db_config["db_path"] = sqlite_db_path
+        await page.close()
+        await server.close()
+
+    items = {
+        sample["labels"]["item"]: sample["value"]
+        for sample in perf_metrics.ITEMS_STORED.snapshot()["samples"]
+    }
+    return {
+        "items_per_sec": sum(items.values()) / elapsed,
+        "items": items,
+        "requests": server.request_count,
+        "elapsed_seconds": elapsed,
+    }
+
+
+async def run_benchmark(args) -> Dict:
+    report: Dict = {}
+    for platform in args.platforms.split(","):
+        report[platform] = {}
+        for save_option in args.save_options.split(","):
+            report[platform][save_option] = await bench_crawl(platform, save_option, args)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end crawl benchmark")
+    parser.add_argument("--platforms", default=",".join(PLATFORMS), help=f"comma separated, of {', '.join(PLATFORMS)}")
+    parser.add_argument("--save-options", default="json,csv,sqlite",
+                        help="comma separated SAVE_DATA_OPTION values, db/mongodb/excel need their server or package")
+    parser.add_argument("--keywords", type=int, default=1, help="number of search keywords")
+    parser.add_argument("--pages", type=int, default=3, help="search result pages per keyword")
+    parser.add_argument("--comments", type=int, default=10, help="CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES")
+    parser.add_argument("--sub-comments", action="store_true", help="ENABLE_GET_SUB_COMMENTS")
+    parser.add_argument("--concurrency", type=int, default=config.MAX_CONCURRENCY_NUM, help="MAX_CONCURRENCY_NUM")
+    parser.add_argument("--latency-ms", type=float, default=0, help="mock server response latency")
+    parser.add_argument("--log-level", default="WARNING", help="level of the MediaCrawler logger during the runs")
+    parser.add_argument("--save-report", default="", help="write the report as JSON, to use as a baseline")
+    parser.add_argument("--baseline", default="", help="baseline report, exit with 1 when throughput dropped")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative throughput drop")
+    args = parser.parse_args()
+
+    logging.getLogger("MediaCrawler").setLevel(args.log_level)
+    report = asyncio.run(run_benchmark(args))
+    print_report(report)
+    if args.save_report:
+        save_report(report, args.save_report)
+    if args.baseline and not check_baseline(report, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
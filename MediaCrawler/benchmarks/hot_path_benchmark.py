@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/benchmarks/hot_path_benchmark.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Micro benchmark of the CPU bound hot paths of the crawlers, runs fully offline on the recorded fixtures.
+
+Measures ops_per_sec of:
+  - extractors: the tieba page parsers, the xhs note detail page and the zhihu search result extractor
+  - signing: bili wbi, xhs x-s headers (window.mnsv2 answered by a mock page), douyin a_bogus and zhihu x-zse-96
+    (both through execjs, skipped when no javascript runtime is available)
+
+Usage:
+    python -m benchmarks.hot_path_benchmark
+    python -m benchmarks.hot_path_benchmark --only extract --min-time 2
+    python -m benchmarks.hot_path_benchmark --save-report hot_path_baseline.json
+    python -m benchmarks.hot_path_benchmark --baseline hot_path_baseline.json --tolerance 0.2
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import sys
+import time
+from typing import Awaitable, Callable, Dict, Union
+
+from benchmarks.mock_platform_server import BENCHMARK_DIR, FIXTURES_DIR, TIEBA_FIXTURES_DIR, MockPage
+from benchmarks.report import check_baseline, print_report, save_report
+
+# Signers load libs/*.js relative to the project root
+PROJECT_ROOT = BENCHMARK_DIR.parent
+
+XHS_NOTE_ID = "65a1b2c3000000001e00d4f5"
+DOUYIN_USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+
+
+async def measure(func: Callable[[], Union[None, Awaitable]], min_time: float) -> Dict:
+    """Call func repeatedly for at least min_time seconds, awaiting its result when it is a coroutine"""
+    ops = 0
+    start = time.perf_counter()
+    while True:
+        result = func()
+        if inspect.isawaitable(result):
+            await result
+        ops += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+    return {"ops_per_sec": ops / elapsed, "mean_ms": elapsed / ops * 1000}
+
+
+def _read_text(path) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def extract_cases() -> Dict[str, Callable]:
+    from media_platform.tieba.help import TieBaExtractor
+    from media_platform.xhs.extractor import XiaoHongShuExtractor
+    from media_platform.zhihu.help import ZhihuExtractor
+
+    tieba = TieBaExtractor()
+    search_page = _read_text(TIEBA_FIXTURES_DIR / "search_keyword_notes.html")
+    detail_page = _read_text(TIEBA_FIXTURES_DIR / "note_detail.html")
+    comments_page = _read_text(TIEBA_FIXTURES_DIR / "note_comments.html")
+    sub_comments_page = _read_text(TIEBA_FIXTURES_DIR / "note_sub_comments.html")
+    parent_comment = tieba.extract_tieba_note_parment_comments(comments_page, note_id="9117888152")[0]
+    xhs_page = _read_text(FIXTURES_DIR / "xhs" / "note_detail.html")
+    zhihu_search = json.loads(_read_text(FIXTURES_DIR / "zhihu" / "search.json"))
+    zhihu = ZhihuExtractor()
+    xhs = XiaoHongShuExtractor()
+    return {
+        "tieba_search": lambda: tieba.extract_search_note_list(search_page),
+        "tieba_note_detail": lambda: tieba.extract_note_detail(detail_page),
+        "tieba_comments": lambda: tieba.extract_tieba_note_parment_comments(comments_page, note_id="9117888152"),
+        "tieba_sub_comments": lambda: tieba.extract_tieba_note_sub_comments(sub_comments_page, parent_comment),
+        "xhs_note_detail": lambda: xhs.extract_note_detail_from_html(XHS_NOTE_ID, xhs_page),
+        "zhihu_search": lambda: zhihu.extract_contents_from_search(zhihu_search),
+    }
+
+
+def _javascript_available() -> bool:
+    try:
+        import execjs
+        execjs.get()
+        return True
+    except Exception:
+        return False
+
+
+def sign_cases() -> Dict[str, Callable]:
+    from media_platform.bilibili.help import BilibiliSign
+    from media_platform.xhs.playwright_sign import sign_with_playwright
+
+    bili = BilibiliSign("7cd084941338484aae1ad9425b84077c", "4932caff0ff746eab6f01bf08b70ac45")
+    xhs_page = MockPage(local_storage={"b1": "I38rHdgsjopgIvesdVwgIC+oIELmBZ5e3VwXLgFTIxS3bqwErFeexd0ekncAzMFYnqthIhJeSnMDKutRI3KsYorWHPtGrbV0"},
+                        evaluate_results={"window.mnsv2": "mns0101_" + "0" * 120})
+    xhs_search = {"keyword": "benchmark", "page": 1, "page_size": 20, "search_id": "2c7hu5b3kzoivkh848hp0", "sort": "general"}
+    cases = {
+        "bili_wbi": lambda: bili.sign({"keyword": "benchmark", "page": 1, "page_size": 20, "search_type": "video"}),
+        "xhs_headers": lambda: sign_with_playwright(xhs_page, "/api/sns/web/v1/search/notes", xhs_search, a1="18c2a6f1c4f"),
+    }
+    if _javascript_available():
+        from media_platform.douyin.help import get_a_bogus_from_js
+        from media_platform.zhihu.help import sign as zhihu_sign
+
+        douyin_params = "device_platform=webapp&aid=6383&channel=channel_pc_web&aweme_id=7343513427213192489"
+        zhihu_url = "/api/v4/search_v3?gk_version=gz-gaokao&t=general&q=benchmark&correction=1&offset=0&limit=20"
+        cases["dy_a_bogus"] = lambda: get_a_bogus_from_js("/aweme/v1/web/aweme/detail/", douyin_params, DOUYIN_USER_AGENT)
+        cases["zhihu_x_zse_96"] = lambda: zhihu_sign(zhihu_url, "d_c0=AEBQbenchmark|1700000000")
+    return cases
+
+
+SUITES = {"extract": extract_cases, "sign": sign_cases}
+
+
+async def run_benchmark(args) -> Dict:
+    report: Dict = {}
+    previous = os.getcwd()
+    os.chdir(PROJECT_ROOT)
+    try:
+        for suite in args.only.split(","):
+            report[suite] = {}
+            for name, func in SUITES[suite]().items():
+                report[suite][name] = await measure(func, args.min_time)
+    finally:
+        os.chdir(previous)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline micro benchmark of extractors and signers")
+    parser.add_argument("--only", default=",".join(SUITES), help=f"comma separated suites, of {', '.join(SUITES)}")
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds each case runs")
+    parser.add_argument("--save-report", default="", help="write the report as JSON, to use as a baseline")
+    parser.add_argument("--baseline", default="", help="baseline report, exit with 1 when throughput dropped")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative throughput drop")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args))
+    print_report(report)
+    if args.save_report:
+        save_report(report, args.save_report)
+    if args.baseline and not check_baseline(report, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
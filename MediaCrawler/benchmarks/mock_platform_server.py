@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/benchmarks/mock_platform_server.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : In-process mock platform HTTP server replaying recorded response fixtures, and a stand-in for the
+#            playwright page of the clients that load pages through the browser (tieba) or read localStorage (bilibili).
+#            The platform clients are pointed at it by replacing their _host, nothing else in the crawl path changes.
+import asyncio
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+BENCHMARK_DIR = Path(__file__).parent
+FIXTURES_DIR = BENCHMARK_DIR / "fixtures"
+# Pages recorded for the tieba extractor tests, shared with the benchmarks
+TIEBA_FIXTURES_DIR = BENCHMARK_DIR.parent / "media_platform" / "tieba" / "test_data"
+
+CONTENT_TYPES = {".json": b"application/json; charset=utf-8", ".html": b"text/html; charset=utf-8"}
+
+# platform -> [(regex matched against "path?query", fixture file)], the first match answers the request
+PLATFORM_ROUTES: Dict[str, List[Tuple[str, Path]]] = {
+    "bili": [
+        (r"^/x/web-interface/wbi/search/type\?", FIXTURES_DIR / "bilibili" / "search.json"),
+        (r"^/x/web-interface/view/detail\?", FIXTURES_DIR / "bilibili" / "video_detail.json"),
+        (r"^/x/v2/reply/wbi/main\?", FIXTURES_DIR / "bilibili" / "comments.json"),
+    ],
+    "tieba": [
+        (r"^/f/search/res\?", TIEBA_FIXTURES_DIR / "search_keyword_notes.html"),
+        (r"^/p/comment\?", TIEBA_FIXTURES_DIR / "note_sub_comments.html"),
+        (r"^/p/\d+\?pn=", TIEBA_FIXTURES_DIR / "note_comments.html"),
+        (r"^/p/\d+$", TIEBA_FIXTURES_DIR / "note_detail.html"),
+    ],
+}
+
+
+class MockPlatformServer:
+
+    def __init__(self, routes: List[Tuple[str, Path]], latency: float = 0.0):
+        """
+        :param routes: [(regex matched against "path?query", fixture file)], the first match answers the request
+        :param latency: Seconds every response is delayed
+        """
+        self.latency = latency
+        self.request_count = 0
+        self._routes = [(re.compile(pattern), path.read_bytes(), CONTENT_TYPES.get(path.suffix, b"text/plain"))
+                        for pattern, path in routes]
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> str:
+        """
+        Listen on an ephemeral localhost port
+        :return: base url of the server, to use as the client _host
+        """
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    def _route(self, target: str) -> Tuple[bytes, bytes, bytes]:
+        for pattern, body, content_type in self._routes:
+            if pattern.search(target):
+                return b"200 OK", body, content_type
+        return b"404 Not Found", b"", b"text/plain"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                target = request_line.decode("latin-1").split(" ")[1]
+                content_length = 0
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        content_length = int(value.strip())
+                if content_length:
+                    await reader.readexactly(content_length)
+
+                self.request_count += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                status, body, content_type = self._route(target)
+                writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: " + str(len(body)).encode()
+                             + b"\r\nContent-Type: " + content_type + b"\r\n\r\n" + body)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+class MockPage:
+    """
+    Stand-in for the playwright page of a platform client: goto loads the url from the mock server over HTTP,
+    content returns the loaded document, evaluate answers the localStorage read and the expressions of evaluate_results
+    """
+
+    def __init__(self, local_storage: Optional[Dict[str, str]] = None, evaluate_results: Optional[Dict[str, Any]] = None):
+        """
+        :param local_storage: window.localStorage of the page
+        :param evaluate_results: expression prefix (e.g. "window.mnsv2") -> value returned by evaluate
+        """
+        self.local_storage = local_storage or {}
+        self.evaluate_results = evaluate_results or {}
+        self._client = httpx.AsyncClient()
+        self._content = ""
+
+    async def goto(self, url: str, **kwargs):
+        response = await self._client.get(url)
+        self._content = response.text
+        return response
+
+    async def content(self) -> str:
+        return self._content
+
+    async def evaluate(self, expression: str, *args):
+        if "localStorage" in expression:
+            return dict(self.local_storage)
+        for prefix, value in self.evaluate_results.items():
+            if expression.startswith(prefix):
+                return value
+        raise NotImplementedError(f"MockPage can not evaluate {expression!r}")
+
+    async def close(self):
+        await self._client.aclose()
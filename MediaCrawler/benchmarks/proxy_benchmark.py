@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/benchmarks/proxy_benchmark.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Proxy pool benchmark, runs fully offline against in-process mock proxies (proxy/mock_proxy_server.py).
+
+Measures:
+  - acquisition: get_proxy latency with inline validation (cold) vs. proxies validated ahead of time (warm)
+  - validation: check_proxies throughput, proxies validated per second
+  - rotation: request throughput through the pool while proxies expire (--ttl) and fail (--failure-rate),
+    with the background health checker running
+
+Usage:
+    python -m benchmarks.proxy_benchmark --proxies 20 --pool-count 5 --latency-ms 20 --failure-rate 0.1 --ttl 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import config
+from benchmarks.report import print_report
+from proxy.mock_proxy_server import MOCK_VALIDATE_URL, MockHttpProxyServer
+from proxy.providers.local_proxy import LocalProxyProvider
+from proxy.proxy_ip_pool import ProxyIpPool
+from proxy.proxy_mixin import ProxyRefreshMixin
+from proxy.types import IpInfoModel
+
+
+class CountingProvider(LocalProxyProvider):
+    """Local provider counting vendor fetches"""
+
+    fetches = 0
+
+    async def get_proxy(self, num: int) -> List[IpInfoModel]:
+        self.fetches += 1
+        return await super().get_proxy(num)
+
+
+class BenchClient(ProxyRefreshMixin):
+    def __init__(self, pool: ProxyIpPool):
+        self.proxy = None
+        self.init_proxy_pool(pool)
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "p50_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[int(len(samples) * 0.95) - 1] * 1000 if len(samples) >= 20 else samples[-1] * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+
+def _new_pool(proxies: List[IpInfoModel], pool_count: int, ttl: int = 0) -> ProxyIpPool:
+    pool = ProxyIpPool(ip_pool_count=pool_count, enable_validate_ip=True,
+                       ip_provider=CountingProvider(proxies=proxies, ttl=ttl))
+    pool.valid_ip_url = MOCK_VALIDATE_URL
+    return pool
+
+
+async def bench_acquisition(proxies: List[IpInfoModel], pool_count: int, iterations: int) -> Dict:
+    cold, warm = [], []
+    for _ in range(iterations):
+        pool = _new_pool(proxies, pool_count)
+        await pool.load_proxies()
+        start = time.perf_counter()
+        await pool.get_proxy()
+        cold.append(time.perf_counter() - start)
+
+        await pool.check_proxies()
+        start = time.perf_counter()
+        await pool.get_proxy()
+        warm.append(time.perf_counter() - start)
+    return {"cold (inline validation)": _percentiles(cold), "warm (validated ahead)": _percentiles(warm)}
+
+
+async def bench_validation(proxies: List[IpInfoModel], rounds: int) -> Dict:
+    pool = _new_pool(proxies, len(proxies))
+    await pool.load_proxies()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await pool.check_proxies()
+    elapsed = time.perf_counter() - start
+    return {"proxies_per_sec": len(proxies) * rounds / elapsed, "healthy": len(pool.proxy_list)}
+
+
+async def bench_rotation(proxies: List[IpInfoModel], pool_count: int, ttl: int, requests: int,
+                         concurrency: int, check_interval: float) -> Dict:
+    pool = _new_pool(proxies, pool_count, ttl=ttl)
+    await pool.load_proxies()
+    await pool.check_proxies()
+    pool.start_health_check(interval=check_interval)
+    client = BenchClient(pool)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one_request():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client._send_request("GET", MOCK_VALIDATE_URL, timeout=config.IP_PROXY_VALIDATE_TIMEOUT)
+                if response.status_code != 200:
+                    client._report_proxy_result(False)
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one_request() for _ in range(requests)])
+    elapsed = time.perf_counter() - start
+    await pool.close()
+    await client.close_http_clients()
+    return {
+        "requests_per_sec": requests / elapsed,
+        "error_rate": errors / requests,
+        "provider_fetches": pool.ip_provider.fetches,
+        "distinct_proxies_used": len(pool.proxy_stats),
+        **_percentiles(latencies),
+    }
+
+
+async def run_benchmark(args) -> Dict:
+    server = MockHttpProxyServer(latency=args.latency_ms / 1000, failure_rate=args.failure_rate, seed=args.seed)
+    proxies = await server.start(args.proxies)
+    try:
+        return {
+            "acquisition": await bench_acquisition(proxies, args.pool_count, args.iterations),
+            "validation": await bench_validation(proxies, args.iterations),
+            "rotation": await bench_rotation(proxies, args.pool_count, args.ttl, args.requests, args.concurrency,
+                                             args.check_interval),
+        }
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline proxy pool benchmark")
+    parser.add_argument("--proxies", type=int, default=20, help="number of mock proxies")
+    parser.add_argument("--pool-count", type=int, default=config.IP_PROXY_POOL_COUNT, help="IP_PROXY_POOL_COUNT")
+    parser.add_argument("--latency-ms", type=float, default=20, help="mock proxy response latency")
+    parser.add_argument("--failure-rate", type=float, default=0.05, help="probability of a 502 from a proxy")
+    parser.add_argument("--ttl", type=int, default=35, help="proxy lifetime in seconds, proxies count as expired 30s early")
+    parser.add_argument("--requests", type=int, default=500, help="requests of the rotation scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent requests of the rotation scenario")
+    parser.add_argument("--check-interval", type=float, default=1.0, help="health check interval in seconds")
+    parser.add_argument("--iterations", type=int, default=20, help="iterations of acquisition/validation scenarios")
+    parser.add_argument("--seed", type=int, default=None, help="random seed of simulated failures")
+    args = parser.parse_args()
+    print_report(asyncio.run(run_benchmark(args)))
+
+
+if __name__ == "__main__":
+    main()
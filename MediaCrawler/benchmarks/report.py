@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/benchmarks/report.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : Benchmark report helpers: printing nested reports, saving them as JSON and comparing a run
+#            against a saved baseline, so a hot path change that lowers throughput fails loudly.
+import json
+from typing import Dict, List
+
+# Report keys compared against the baseline, higher is better
+THROUGHPUT_SUFFIX = "_per_sec"
+
+
+def print_report(report: Dict, indent: int = 0):
+    for name, value in report.items():
+        if isinstance(value, dict):
+            print(" " * indent + f"{name}:")
+            print_report(value, indent + 2)
+        else:
+            print(" " * indent + f"{name}: {value:.3f}" if isinstance(value, float) else " " * indent + f"{name}: {value}")
+
+
+def save_report(report: Dict, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def load_report(path: str) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_reports(current: Dict, baseline: Dict, tolerance: float, prefix: str = "") -> List[str]:
+    """
+    Throughput values (keys ending with _per_sec) that dropped more than tolerance below the baseline
+    :param current: report of this run
+    :param baseline: saved report
+    :param tolerance: allowed relative drop, 0.2 means 20% slower still passes
+    :return: human readable regressions, empty when the run is within tolerance
+    """
+    regressions = []
+    for name, base_value in baseline.items():
+        value = current.get(name)
+        path = f"{prefix}{name}"
+        if isinstance(base_value, dict) and isinstance(value, dict):
+            regressions.extend(compare_reports(value, base_value, tolerance, f"{path}."))
+        elif name.endswith(THROUGHPUT_SUFFIX) and isinstance(base_value, (int, float)) and isinstance(value, (int, float)):
+            if base_value > 0 and value < base_value * (1 - tolerance):
+                regressions.append(f"{path}: {value:.3f} < baseline {base_value:.3f} (-{(1 - value / base_value):.0%})")
+    return regressions
+
+
+def check_baseline(report: Dict, baseline_path: str, tolerance: float) -> bool:
+    """Print the regressions against the baseline report, returns False when there are any"""
+    regressions = compare_reports(report, load_report(baseline_path), tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"No throughput regression against {baseline_path} (tolerance {tolerance:.0%})")
+    return not regressions
@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/benchmarks/store_benchmark.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Store layer throughput benchmark and soak test, pushes synthetic contents and comments through every
+AbstractStore implementation of a platform store factory (csv, json, sqlite, db, mongodb, excel).
+
+Each store and writer count runs in a fresh process inside a temporary working directory, so peak RSS and file
+sizes belong to that run only. Items are written like the crawlers do: one store instance per item, the comments of
+a content in one batch_session() (SQL stores also run with a session per item, see --sql-sessions), and
+--writers concurrent tasks each taking the next content.
+
+Reports at every --rows checkpoint:
+  - rows_per_sec: rows written per second since the start
+  - interval_rows_per_sec: rows per second since the previous checkpoint, drops when writes slow down with size
+  - peak_rss_mb and file_size_mb
+and once the store is closed (excel and mongodb flush their buffers then) the totals and rows found on disk.
+When rows_on_disk differs from the rows written, the final entry gets a known_failure note (see KNOWN_FAILURES).
+A run stops early once it exceeds --max-seconds, the report then states where it stopped.
+
+Usage:
+    python -m benchmarks.store_benchmark --stores csv,json,sqlite --rows 10000,100000 --writers 1,8
+    python -m benchmarks.store_benchmark --rows 10000,100000,1000000 --max-seconds 600
+    python -m benchmarks.store_benchmark --save-report store_baseline.json
+    python -m benchmarks.store_benchmark --baseline store_baseline.json --tolerance 0.2
+"""
+
+import argparse
+import asyncio
+import csv
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sqlalchemy import BigInteger, Integer, func, select
+
+import config
+from benchmarks.report import check_baseline, print_report, save_report
+
+SQL_STORES = ("sqlite", "db")
+
+# Data loss of the file stores with concurrent writers: AsyncFileWriter locks per store instance and the crawlers
+# create one store per item, so writers with --writers > 1 do not exclude each other
+KNOWN_FAILURES = {
+    "json": "concurrent read-modify-write of the json file, rows of other writers get overwritten",
+    "csv": "concurrent writers of a new csv file each write a header row",
+}
+
+
+@dataclass
+class PlatformStores:
+    factory: str  # "module:StoreFactory"
+    content_model: str
+    comment_model: str
+    content_key: str  # natural key of the content, also the parent key of its comments
+    comment_key: str
+    file_platform: str  # directory name of the csv/json files under data/
+
+
+PLATFORMS: Dict[str, PlatformStores] = {
+    "bili": PlatformStores("store.bilibili:BiliStoreFactory", "BilibiliVideo", "BilibiliVideoComment",
+                           "video_id", "comment_id", "bili"),
+    "xhs": PlatformStores("store.xhs:XhsStoreFactory", "XhsNote", "XhsNoteComment",
+                          "note_id", "comment_id", "xhs"),
+}
+
+
+def _load_factory(platform: PlatformStores):
+    module_name, class_name = platform.factory.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _item_template(model, text_length: int) -> Dict:
+    """One synthetic row covering every column of the table model"""
+    from database.models import Count
+
+    item = {}
+    for column in model.__table__.columns:
+        if column.primary_key or column.name == "add_ts":
+            continue
+        if isinstance(column.type, Count):
+            item[column.name] = "1024"
+        elif isinstance(column.type, (BigInteger, Integer)):
+            item[column.name] = 1700000000
+        else:
+            length = min(text_length, getattr(column.type, "length", None) or text_length)
+            item[column.name] = ("基准测试数据" * length)[:length]
+    return item
+
+
+def _key_factory(model, column_name: str):
+    """Natural keys are BIGINT on some platforms and VARCHAR on others"""
+    if isinstance(model.__table__.columns[column_name].type, (BigInteger, Integer)):
+        return int
+    return str
+
+
+class SyntheticItems:
+    """Contents and their comments with unique natural keys"""
+
+    def __init__(self, platform: PlatformStores, text_length: int, comments_per_content: int):
+        from database import models
+
+        content_model = getattr(models, platform.content_model)
+        comment_model = getattr(models, platform.comment_model)
+        self.platform = platform
+        self.comments_per_content = comments_per_content
+        self._content = _item_template(content_model, text_length)
+        self._comment = _item_template(comment_model, text_length)
+        self._content_key = _key_factory(content_model, platform.content_key)
+        self._comment_key = _key_factory(comment_model, platform.comment_key)
+
+    def content(self, index: int) -> Dict:
+        return {
+            **self._content,
+            self.platform.content_key: self._content_key(10 ** 9 + index),
+            "last_modify_ts": int(time.time() * 1000),
+        }
+
+    def comments(self, index: int) -> List[Dict]:
+        first = index * self.comments_per_content
+        return [
+            {
+                **self._comment,
+                self.platform.comment_key: self._comment_key(10 ** 10 + first + i),
+                self.platform.content_key: self._content_key(10 ** 9 + index),
+                "last_modify_ts": int(time.time() * 1000),
+            }
+            for i in range(self.comments_per_content)
+        ]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak RSS of this process, None where neither resource (POSIX only) nor psutil is available"""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        memory = psutil.Process().memory_info()
+        # peak_wset on Windows, the current rss elsewhere
+        return getattr(memory, "peak_wset", memory.rss) / (1024 * 1024)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def directory_size_mb(path: str) -> float:
+    size = 0
+    for root, _, files in os.walk(path):
+        size += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return size / (1024 * 1024)
+
+
+class RunState:
+    """Rows written so far and the checkpoints reached, shared by the writer tasks of one run"""
+
+    def __init__(self, checkpoints: List[int], max_rows: int, deadline: float, work_dir: str):
+        self.checkpoints = sorted(checkpoints)
+        self.max_rows = max_rows
+        self.deadline = deadline
+        self.work_dir = work_dir
+        self.rows = 0
+        self.next_content = 0
+        self.start = time.perf_counter()
+        self.results: Dict[str, Dict] = {}
+        self._last_rows = 0
+        self._last_time = self.start
+
+    def take_content(self) -> Optional[int]:
+        if self.rows >= self.max_rows or time.perf_counter() > self.deadline:
+            return None
+        self.next_content += 1
+        return self.next_content - 1
+
+    def add_rows(self, rows: int):
+        self.rows += rows
+        while self.checkpoints and self.rows >= self.checkpoints[0]:
+            self._record(self.checkpoints.pop(0))
+
+    def _record(self, checkpoint: int):
+        now = time.perf_counter()
+        self.results[f"{checkpoint}_rows"] = {
+            "rows_per_sec": self.rows / (now - self.start),
+            "interval_rows_per_sec": (self.rows - self._last_rows) / (now - self._last_time),
+            "peak_rss_mb": peak_rss_mb(),
+            "file_size_mb": directory_size_mb(self.work_dir),
+        }
+        self._last_rows, self._last_time = self.rows, now
+
+
+async def _write_contents(state: RunState, items: SyntheticItems, factory, sql_session: str):
+    from database.db_session import batch_session
+
+    while (index := state.take_content()) is not None:
+        await factory.create_store().store_content(items.content(index))
+        if sql_session == "batch":
+            async with batch_session():
+                for comment in items.comments(index):
+                    await factory.create_store().store_comment(comment)
+        else:
+            for comment in items.comments(index):
+                await factory.create_store().store_comment(comment)
+        state.add_rows(1 + items.comments_per_content)
+
+
+async def _rows_on_disk(save_option: str, platform: PlatformStores) -> Optional[int]:
+    """Rows the store actually persisted, concurrent writers must not lose any"""
+    if save_option in SQL_STORES:
+        from database import models
+        from database.db_session import get_session
+        rows = 0
+        for model_name in (platform.content_model, platform.comment_model):
+            async with get_session() as session:
+                rows += await session.scalar(select(func.count()).select_from(getattr(models, model_name)))
+        return rows
+    data_dir = os.path.join("data", platform.file_platform, save_option)
+    if save_option not in ("csv", "json") or not os.path.isdir(data_dir):
+        return None
+    rows = 0
+    for name in os.listdir(data_dir):
+        with open(os.path.join(data_dir, name), encoding="utf-8-sig", newline="") as f:
+            rows += len(json.load(f)) if save_option == "json" else sum(1 for _ in csv.reader(f)) - 1
+    return rows
+
+
+async def _open_store(save_option: str, work_dir: str):
+    from database import db_session
+    if save_option == "sqlite":
+        from config.db_config import sqlite_db_config
+        sqlite_db_config["db_path"] = os.path.join(work_dir, "benchmark.db")
+    if save_option in SQL_STORES:
+        await db_session.create_tables(save_option)
+    elif save_option == "mongodb":
+        from database.mongodb_store_base import MongoDBConnection
+        await MongoDBConnection().ensure_indexes()
+
+
+async def _close_store(save_option: str):
+    if save_option == "excel":
+        from store.excel_store_base import ExcelStoreBase
+        ExcelStoreBase.flush_all()
+    elif save_option == "mongodb":
+        from database.mongodb_store_base import MongoDBConnection
+        await MongoDBConnection().close()
+
+
+async def bench_store(platform_name: str, save_option: str, writers: int, sql_session: str, args: Dict) -> Dict:
+    """Write the rows of one run, sets the global config and is meant to run in its own process"""
+    from database import db_session
+    from var import crawler_type_var
+
+    platform = PLATFORMS[platform_name]
+    config.PLATFORM = platform_name
+    config.SAVE_DATA_OPTION = save_option
+    config.CRAWLER_TYPE = "search"
+    config.ENABLE_GET_WORDCLOUD = False
+    crawler_type_var.set("search")
+    factory = _load_factory(platform)
+    items = SyntheticItems(platform, args["text_length"], args["comments_per_content"])
+    rows = sorted(args["rows"])
+
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        try:
+            await _open_store(save_option, work_dir)
+            state = RunState(rows, rows[-1], time.perf_counter() + args["max_seconds"], work_dir)
+            await asyncio.gather(*(_write_contents(state, items, factory, sql_session) for _ in range(writers)))
+            await _close_store(save_option)
+            elapsed = time.perf_counter() - state.start
+            result = dict(state.results)
+            result["final"] = {
+                "rows": state.rows,
+                "rows_per_sec": state.rows / elapsed,
+                "elapsed_seconds": elapsed,
+                "peak_rss_mb": peak_rss_mb(),
+                "file_size_mb": directory_size_mb(work_dir),
+                "rows_on_disk": await _rows_on_disk(save_option, platform),
+            }
+            rows_on_disk = result["final"]["rows_on_disk"]
+            if rows_on_disk is not None and rows_on_disk != state.rows:
+                result["final"]["known_failure"] = KNOWN_FAILURES.get(
+                    save_option, f"unexpected, {state.rows} rows written but {rows_on_disk} on disk"
+                )
+            if state.rows < rows[-1]:
+                result["final"]["stopped"] = f"--max-seconds {args['max_seconds']} reached"
+        finally:
+            await db_session.dispose_engines()
+            os.chdir(previous_dir)
+    return result
+
+
+def run_in_process(platform_name: str, save_option: str, writers: int, sql_session: str, args: Dict) -> Dict:
+    """Entry point of the benchmark process of one run"""
+    logging.getLogger("MediaCrawler").setLevel(args["log_level"])
+    try:
+        return asyncio.run(bench_store(platform_name, save_option, writers, sql_session, args))
+    except Exception as e:
+        # db / mongodb without a reachable server, excel without openpyxl
+        return {"skipped": f"{type(e).__name__}: {str(e).splitlines()[0][:200]}"}
+
+
+def run_benchmark(args) -> Dict:
+    run_args = {
+        "rows": [int(rows) for rows in args.rows.split(",")],
+        "max_seconds": args.max_seconds,
+        "text_length": args.text_length,
+        "comments_per_content": args.comments_per_content,
+        "log_level": args.log_level,
+    }
+    report: Dict = {}
+    context = multiprocessing.get_context("spawn")
+    for save_option in args.stores.split(","):
+        sessions = args.sql_sessions.split(",") if save_option in SQL_STORES else ["batch"]
+        for sql_session in sessions:
+            name = f"{save_option}_{sql_session}_session" if save_option in SQL_STORES else save_option
+            report[name] = {}
+            for writers in (int(w) for w in args.writers.split(",")):
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    report[name][f"writers_{writers}"] = executor.submit(
+                        run_in_process, args.platform, save_option, writers, sql_session, run_args
+                    ).result()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Store layer throughput benchmark and soak test")
+    parser.add_argument("--platform", default="bili", choices=sorted(PLATFORMS), help="store factory to benchmark")
+    parser.add_argument("--stores", default="csv,json,sqlite,db,mongodb,excel",
+                        help="comma separated SAVE_DATA_OPTION values")
+    parser.add_argument("--rows", default="10000,100000,1000000", help="comma separated row count checkpoints")
+    parser.add_argument("--writers", default="1,8", help="comma separated numbers of concurrent writers")
+    parser.add_argument("--sql-sessions", default="batch,per_item",
+                        help="comment writes of SQL stores: batch (one session per content) and/or per_item")
+    parser.add_argument("--comments-per-content", type=int, default=9, help="comments written after each content")
+    parser.add_argument("--text-length", type=int, default=200, help="characters of each text column")
+    parser.add_argument("--max-seconds", type=float, default=300, help="stop a run after this many seconds")
+    parser.add_argument("--log-level", default="WARNING", help="level of the MediaCrawler logger during the runs")
+    parser.add_argument("--save-report", default="", help="write the report as JSON, to use as a baseline")
+    parser.add_argument("--baseline", default="", help="baseline report, exit with 1 when throughput dropped")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative throughput drop")
+    args = parser.parse_args()
+
+    report = run_benchmark(args)
+    print_report(report)
+    if args.save_report:
+        save_report(report, args.save_report)
+    if args.baseline and not check_baseline(report, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -25,7 +25,7 @@
 # @Desc    : Abstract class
 
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 
 class AbstractCache(ABC):
@@ -60,3 +60,40 @@ class AbstractCache(ABC):
         :return:
         """
         raise NotImplementedError
+
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get the values of multiple keys, None for missing keys.
+        The default implementation calls get for each key, caches doing network I/O should override it.
+        :param keys: The keys
+        :return:
+        """
+        return [self.get(key) for key in keys]
+
+    def mset(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        """
+        Set multiple key-value pairs with the same expiration time
+        :param mapping: key -> value
+        :param expire_time: Expiration time
+        :return:
+        """
+        for key, value in mapping.items():
+            self.set(key, value, expire_time)
+
+    # Async API, the default implementations call the sync methods, which is fine for in-process caches.
+    # Caches doing network I/O override them so crawler tasks do not block the event loop.
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return self.get(key)
+
+    async def aset(self, key: str, value: Any, expire_time: int) -> None:
+        self.set(key, value, expire_time)
+
+    async def akeys(self, pattern: str) -> List[str]:
+        return self.keys(pattern)
+
+    async def amget(self, keys: List[str]) -> List[Optional[Any]]:
+        return self.mget(keys)
+
+    async def amset(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        self.mset(mapping, expire_time)
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/cache/api_response_cache.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : Response cache for idempotent platform API calls, wraps every AbstractApiClient.request
+
+import asyncio
+import copy
+import fnmatch
+import functools
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import config
+from cache.abs_cache import AbstractCache
+from cache.cache_factory import CacheFactory
+from tools import utils
+
+CACHE_KEY_PREFIX = "api_response:"
+
+# Signature/session params that change between identical requests, excluded from the cache key
+VOLATILE_PARAMS = {
+    "a_bogus", "X-Bogus", "msToken", "verifyFp", "fp", "webid", "w_rid", "wts", "_", "_signature",
+    "xsec_token", "xsec_source",
+}
+
+# Request kwargs that do not change the response
+IGNORED_KWARGS = {"headers", "cookies", "timeout", "proxy", "follow_redirects"}
+
+# Value types that can be stored by every cache backend
+CACHEABLE_TYPES = (dict, list, str, bytes)
+
+
+def _normalize(value: Any) -> Any:
+    """Drop volatile params from a params/body dict, bodies sent as JSON strings are parsed first"""
+    if isinstance(value, (str, bytes)):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return value.decode() if isinstance(value, bytes) else value
+    if isinstance(value, dict):
+        return {k: v for k, v in value.items() if k not in VOLATILE_PARAMS}
+    return value
+
+
+def _operation_name(kwargs: Dict) -> str:
+    body = _normalize(kwargs.get("data") or kwargs.get("json"))
+    if isinstance(body, dict):
+        return body.get("operationName") or ""
+    return ""
+
+
+def build_endpoint(url: str, kwargs: Dict) -> str:
+    """Endpoint matched against API_RESPONSE_CACHE_TTL: host + path, graphql requests append #operationName"""
+    parts = urlsplit(url)
+    endpoint = f"{parts.netloc}{parts.path}"
+    operation_name = _operation_name(kwargs)
+    if operation_name:
+        endpoint = f"{endpoint}#{operation_name}"
+    return endpoint
+
+
+def build_cache_key(method: str, url: str, kwargs: Dict) -> str:
+    """Cache key from method + url + normalized params/body, independent of param order and signatures"""
+    parts = urlsplit(url)
+    params = dict(parse_qsl(parts.query, keep_blank_values=True))
+    others = {}
+    for k, v in kwargs.items():
+        if k in IGNORED_KWARGS:
+            continue
+        if k == "params" and isinstance(v, dict):
+            params.update(v)
+        else:
+            others[k] = _normalize(v)
+    params = {k: v for k, v in params.items() if k not in VOLATILE_PARAMS}
+    raw = json.dumps(
+        [method.upper(), f"{parts.scheme}://{parts.netloc}{parts.path}", params, others],
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return CACHE_KEY_PREFIX + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ApiResponseCache:
+    """
+    Request-level cache with single-flight: concurrent identical requests share one in-flight call.
+    Only successful responses are cached: errors are shared with the waiting callers but never stored, and
+    responses rejected by the is_cacheable check (risk control or login pages returned without an error) are
+    returned but not stored either.
+    """
+
+    def __init__(self, cache_client: AbstractCache, ttl_rules: Dict[str, int]):
+        self._cache_client = cache_client
+        self._ttl_rules = ttl_rules
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "shared": 0}
+
+    def match_ttl(self, method: str, url: str, kwargs: Dict) -> Optional[int]:
+        """
+        Cache seconds of the request, None if the endpoint is not cached
+        """
+        endpoint = build_endpoint(url, kwargs)
+        for pattern, ttl in self._ttl_rules.items():
+            if fnmatch.fnmatchcase(endpoint, pattern):
+                return ttl
+        return None
+
+    async def fetch(self, key: str, ttl: int, call: Callable[[], Awaitable[Any]],
+                    is_cacheable: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Return the cached response of key, or run call once and cache its result
+        :param key: cache key
+        :param ttl: cache seconds
+        :param call: coroutine function sending the real request
+        :param is_cacheable: check of the response, False keeps it out of the cache
+        :return:
+        """
+        value = await self._cache_client.aget(key)
+        if value is not None:
+            self.stats["hits"] += 1
+            return copy.deepcopy(value)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["shared"] += 1
+            # shield, so a cancelled waiter does not cancel the shared call
+            return copy.deepcopy(await asyncio.shield(inflight))
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved, there may be no waiters
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if isinstance(value, CACHEABLE_TYPES) and (is_cacheable is None or is_cacheable(value)):
+                try:
+                    await self._cache_client.aset(key, value, ttl)
+                except Exception as e:
+                    utils.logger.warning(f"[ApiResponseCache.fetch] store response failed: {e}")
+            return copy.deepcopy(value)
+        finally:
+            self._inflight.pop(key, None)
+
+
+_api_response_cache: Optional[ApiResponseCache] = None
+
+
+def get_api_response_cache() -> ApiResponseCache:
+    """Process-wide response cache shared by all api clients"""
+    global _api_response_cache
+    if _api_response_cache is None:
+        cache_client = CacheFactory.create_async_cache(config.API_RESPONSE_CACHE_TYPE)
+        _api_response_cache = ApiResponseCache(cache_client, config.API_RESPONSE_CACHE_TTL)
+    return _api_response_cache
+
+
+def cache_api_response(request_func: Callable) -> Callable:
+    """
+    Decorator for AbstractApiClient.request, serves endpoints listed in API_RESPONSE_CACHE_TTL from the cache.
+    Responses are only stored when the client's is_cacheable_response accepts them
+    """
+
+    @functools.wraps(request_func)
+    async def wrapper(self, method, url, *args, **kwargs):
+        if not config.ENABLE_API_RESPONSE_CACHE or args:
+            return await request_func(self, method, url, *args, **kwargs)
+        response_cache = get_api_response_cache()
+        ttl = response_cache.match_ttl(method, url, kwargs)
+        if ttl is None:
+            return await request_func(self, method, url, **kwargs)
+        key = build_cache_key(method, url, kwargs)
+        return await response_cache.fetch(
+            key, ttl, lambda: request_func(self, method, url, **kwargs),
+            lambda response: self.is_cacheable_response(method, url, response),
+        )
+
+    return wrapper
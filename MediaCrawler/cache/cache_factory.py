@@ -47,3 +47,21 @@ class CacheFactory:
             return RedisCache()
         else:
             raise ValueError(f'Unknown cache type: {cache_type}')
+
+    @staticmethod
+    def create_async_cache(cache_type: str, *args, **kwargs):
+        """
+        Create cache object for async callers, the a* methods (aget/aset/akeys/amget/amset) do not block the event loop
+        :param cache_type: Cache type
+        :param args: Arguments
+        :param kwargs: Keyword arguments
+        :return:
+        """
+        if cache_type == 'memory':
+            from .local_cache import ExpiringLocalCache
+            return ExpiringLocalCache(*args, **kwargs)
+        elif cache_type == 'redis':
+            from .redis_cache import AsyncRedisCache
+            return AsyncRedisCache(*args, **kwargs)
+        else:
+            raise ValueError(f'Unknown cache type: {cache_type}')
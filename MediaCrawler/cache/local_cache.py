@@ -25,22 +25,43 @@
 # @Desc    : Local cache
 
 import asyncio
+import fnmatch
+import heapq
+import itertools
 import time
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Tuple
 
 from cache.abs_cache import AbstractCache
 
+EVICTION_POLICY_LRU = "lru"
+EVICTION_POLICY_LFU = "lfu"
+
 
 class ExpiringLocalCache(AbstractCache):
 
-    def __init__(self, cron_interval: int = 10):
+    def __init__(self, cron_interval: int = 10, max_size: int = 10000, eviction_policy: str = EVICTION_POLICY_LRU):
         """
         Initialize local cache
         :param cron_interval: Time interval for scheduled cache cleanup
+        :param max_size: Maximum number of keys, the least recently (lru) or least frequently (lfu) used key is evicted beyond it
+        :param eviction_policy: lru | lfu
         :return:
         """
+        if eviction_policy not in (EVICTION_POLICY_LRU, EVICTION_POLICY_LFU):
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
         self._cron_interval = cron_interval
-        self._cache_container: Dict[str, Tuple[Any, float]] = {}
+        self._max_size = max_size
+        self._eviction_policy = eviction_policy
+        # Ordered by recency of use, the first key is the least recently used one
+        self._cache_container: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        # Min-heap of (expire_time, key), entries of overwritten keys are skipped lazily
+        self._expire_heap: List[Tuple[float, str]] = []
+        # lfu only: access counts and a lazy min-heap of (count, seq, key)
+        self._frequencies: Dict[str, int] = {}
+        self._frequency_heap: List[Tuple[int, int, str]] = []
+        self._seq = itertools.count()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
         self._cron_task: Optional[asyncio.Task] = None
         # Start scheduled cleanup task
         self._schedule_clear()
@@ -53,6 +74,9 @@ class ExpiringLocalCache(AbstractCache):
         if self._cron_task is not None:
             self._cron_task.cancel()
 
+    def __len__(self) -> int:
+        return len(self._cache_container)
+
     def get(self, key: str) -> Optional[Any]:
         """
         Get the value of a key from the cache
@@ -61,13 +85,18 @@ class ExpiringLocalCache(AbstractCache):
         """
         value, expire_time = self._cache_container.get(key, (None, 0))
         if value is None:
+            self._stats["misses"] += 1
             return None
 
         # If the key has expired, delete it and return None
         if expire_time < time.time():
-            del self._cache_container[key]
+            self._remove(key)
+            self._stats["expirations"] += 1
+            self._stats["misses"] += 1
             return None
 
+        self._stats["hits"] += 1
+        self._touch(key)
         return value
 
     def set(self, key: str, value: Any, expire_time: int) -> None:
@@ -78,22 +107,88 @@ class ExpiringLocalCache(AbstractCache):
         :param expire_time:
         :return:
         """
-        self._cache_container[key] = (value, time.time() + expire_time)
+        # Evict before inserting, otherwise lfu would evict the new key itself
+        if key not in self._cache_container:
+            while self._cache_container and len(self._cache_container) >= self._max_size:
+                self._evict()
+        expire_at = time.time() + expire_time
+        self._cache_container[key] = (value, expire_at)
+        heapq.heappush(self._expire_heap, (expire_at, key))
+        self._touch(key)
+        self._compact_heaps()
 
     def keys(self, pattern: str) -> List[str]:
         """
         Get all keys matching the pattern
-        :param pattern: Matching pattern
+        :param pattern: Glob pattern, same syntax as redis KEYS (*, ?, [abc])
         :return:
         """
         if pattern == '*':
             return list(self._cache_container.keys())
 
-        # For local cache wildcard, temporarily replace * with empty string
-        if '*' in pattern:
-            pattern = pattern.replace('*', '')
+        return [key for key in self._cache_container.keys() if fnmatch.fnmatchcase(key, pattern)]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Cache statistics
+        :return: hits, misses, evictions, expirations and current size
+        """
+        return {**self._stats, "size": len(self._cache_container)}
+
+    def _touch(self, key: str):
+        """
+        Record a use of the key for the eviction policy
+        :param key:
+        :return:
+        """
+        if self._eviction_policy == EVICTION_POLICY_LRU:
+            self._cache_container.move_to_end(key)
+            return
+        count = self._frequencies.get(key, 0) + 1
+        self._frequencies[key] = count
+        heapq.heappush(self._frequency_heap, (count, next(self._seq), key))
+        # Reads push entries too, so a read-heavy cache has to compact here and not only in set()
+        self._compact_frequency_heap()
+
+    def _remove(self, key: str):
+        self._cache_container.pop(key, None)
+        self._frequencies.pop(key, None)
 
-        return [key for key in self._cache_container.keys() if pattern in key]
+    def _evict(self):
+        """
+        Evict one key according to the eviction policy
+        :return:
+        """
+        if self._eviction_policy == EVICTION_POLICY_LRU:
+            self._cache_container.popitem(last=False)
+            self._stats["evictions"] += 1
+            return
+        while self._frequency_heap:
+            count, _, key = heapq.heappop(self._frequency_heap)
+            if self._frequencies.get(key) == count:
+                self._remove(key)
+                self._stats["evictions"] += 1
+                return
+
+    def _compact_heaps(self):
+        """
+        Rebuild the lazy heaps once stale entries outnumber live keys
+        :return:
+        """
+        size = len(self._cache_container)
+        if len(self._expire_heap) > 2 * size + 64:
+            self._expire_heap = [(expire_time, key) for key, (_, expire_time) in self._cache_container.items()]
+            heapq.heapify(self._expire_heap)
+        self._compact_frequency_heap()
+
+    def _compact_frequency_heap(self):
+        """
+        Rebuild the lfu heap once stale entries outnumber live keys, amortized O(1) per touch
+        :return:
+        """
+        if len(self._frequency_heap) > 2 * len(self._cache_container) + 64:
+            self._frequency_heap = [(count, next(self._seq), key) for key, count in self._frequencies.items()]
+            heapq.heapify(self._frequency_heap)
 
     def _schedule_clear(self):
         """
@@ -111,12 +206,17 @@ class ExpiringLocalCache(AbstractCache):
 
     def _clear(self):
         """
-        Clean up cache based on expiration time
+        Clean up expired keys, pops the expiry heap so only expired entries are visited
         :return:
         """
-        for key, (value, expire_time) in self._cache_container.items():
-            if expire_time < time.time():
-                del self._cache_container[key]
+        now = time.time()
+        while self._expire_heap and self._expire_heap[0][0] < now:
+            expire_time, key = heapq.heappop(self._expire_heap)
+            entry = self._cache_container.get(key)
+            # Skip entries of keys that were overwritten or already removed
+            if entry is not None and entry[1] == expire_time:
+                self._remove(key)
+                self._stats["expirations"] += 1
 
     async def _start_clear_cron(self):
         """
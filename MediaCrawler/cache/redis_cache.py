@@ -23,21 +23,41 @@
 # @Name    : Programmer AJiang-Relakkes
 # @Time    : 2024/5/29 22:57
 # @Desc    : RedisCache implementation
-import pickle
 import time
-from typing import Any, List
+from typing import Any, Dict, List, Optional
 
 from redis import Redis
+from redis import asyncio as aioredis
 
 from cache.abs_cache import AbstractCache
+from cache.serializer import Serializer, get_serializer
 from config import db_config
+from tools import utils
+
+SCAN_COUNT = 1000
+
+
+def _default_serializer() -> Serializer:
+    return get_serializer(db_config.REDIS_CACHE_SERIALIZER, db_config.REDIS_CACHE_COMPRESS_MIN_SIZE)
+
+
+def _loads(serializer: Serializer, value: Optional[bytes]) -> Any:
+    """Deserialize a cached value, values that cannot be decoded are treated as a cache miss"""
+    if value is None:
+        return None
+    try:
+        return serializer.loads(value)
+    except Exception as e:
+        utils.logger.warning(f"[RedisCache] drop undecodable cache value: {e}")
+        return None
 
 
 class RedisCache(AbstractCache):
 
-    def __init__(self) -> None:
+    def __init__(self, serializer: Optional[Serializer] = None) -> None:
         # Connect to redis, return redis client
         self._redis_client = self._connet_redis()
+        self._serializer = serializer or _default_serializer()
 
     @staticmethod
     def _connet_redis() -> Redis:
@@ -58,10 +78,7 @@ class RedisCache(AbstractCache):
         :param key:
         :return:
         """
-        value = self._redis_client.get(key)
-        if value is None:
-            return None
-        return pickle.loads(value)
+        return _loads(self._serializer, self._redis_client.get(key))
 
     def set(self, key: str, value: Any, expire_time: int) -> None:
         """
@@ -71,13 +88,82 @@ class RedisCache(AbstractCache):
         :param expire_time:
         :return:
         """
-        self._redis_client.set(key, pickle.dumps(value), ex=expire_time)
+        self._redis_client.set(key, self._serializer.dumps(value), ex=expire_time)
 
     def keys(self, pattern: str) -> List[str]:
         """
-        Get all keys matching the pattern
+        Get all keys matching the pattern, iterates with SCAN instead of the blocking KEYS command
+        """
+        return [key.decode() for key in self._redis_client.scan_iter(match=pattern, count=SCAN_COUNT)]
+
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get the values of multiple keys in one round trip
+        """
+        if not keys:
+            return []
+        return [_loads(self._serializer, value) for value in self._redis_client.mget(keys)]
+
+    def mset(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        """
+        Set multiple key-value pairs in one pipelined round trip
+        """
+        if not mapping:
+            return
+        pipe = self._redis_client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.set(key, self._serializer.dumps(value), ex=expire_time)
+        pipe.execute()
+
+
+class AsyncRedisCache(RedisCache):
+    """
+    Redis cache for async crawlers, the a* methods run on a pooled redis.asyncio client and do not block the event loop.
+    The sync methods are kept for callers outside of the event loop.
+    """
+
+    def __init__(self, serializer: Optional[Serializer] = None) -> None:
+        super().__init__(serializer)
+        self._async_client = self._connect_async_redis()
+
+    @staticmethod
+    def _connect_async_redis() -> aioredis.Redis:
+        pool = aioredis.ConnectionPool(
+            host=db_config.REDIS_DB_HOST,
+            port=db_config.REDIS_DB_PORT,
+            db=db_config.REDIS_DB_NUM,
+            password=db_config.REDIS_DB_PWD,
+            max_connections=db_config.REDIS_MAX_CONNECTIONS,
+        )
+        return aioredis.Redis(connection_pool=pool)
+
+    async def aget(self, key: str) -> Any:
+        return _loads(self._serializer, await self._async_client.get(key))
+
+    async def aset(self, key: str, value: Any, expire_time: int) -> None:
+        await self._async_client.set(key, self._serializer.dumps(value), ex=expire_time)
+
+    async def akeys(self, pattern: str) -> List[str]:
+        return [key.decode() async for key in self._async_client.scan_iter(match=pattern, count=SCAN_COUNT)]
+
+    async def amget(self, keys: List[str]) -> List[Optional[Any]]:
+        if not keys:
+            return []
+        return [_loads(self._serializer, value) for value in await self._async_client.mget(keys)]
+
+    async def amset(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        if not mapping:
+            return
+        async with self._async_client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, self._serializer.dumps(value), ex=expire_time)
+            await pipe.execute()
+
+    async def aclose(self) -> None:
+        """
+        Close the async client and release pooled connections
         """
-        return [key.decode() for key in self._redis_client.keys(pattern)]
+        await self._async_client.close(close_connection_pool=True)
 
 
 if __name__ == '__main__':
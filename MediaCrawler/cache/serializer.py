@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/cache/serializer.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : Cache value serializers
+
+import importlib.util
+import pickle
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any
+
+# orjson and msgpack are optional, they are only imported when their serializer is selected
+ORJSON_AVAILABLE = importlib.util.find_spec("orjson") is not None
+MSGPACK_AVAILABLE = importlib.util.find_spec("msgpack") is not None
+
+
+class Serializer(ABC):
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class PickleSerializer(Serializer):
+    """Any python object, compatible with values written by older versions"""
+
+    def dumps(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+class OrjsonSerializer(Serializer):
+    """JSON compatible values only, fastest for dict/list/str payloads"""
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError as e:
+            raise ImportError("orjson serializer requires orjson, please run: pip install orjson") from e
+        self._orjson = orjson
+
+    def dumps(self, value: Any) -> bytes:
+        return self._orjson.dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgpackSerializer(Serializer):
+    """Compact binary encoding, supports bytes values"""
+
+    def __init__(self):
+        try:
+            import msgpack
+        except ImportError as e:
+            raise ImportError("msgpack serializer requires msgpack, please run: pip install msgpack") from e
+        self._msgpack = msgpack
+
+    def dumps(self, value: Any) -> bytes:
+        return self._msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return self._msgpack.unpackb(data, raw=False)
+
+
+class CompressedSerializer(Serializer):
+    """
+    zlib compression on top of another serializer, payloads smaller than min_size are stored uncompressed.
+    One flag byte marks whether the payload is compressed.
+    """
+
+    _RAW = b"\x00"
+    _ZLIB = b"\x01"
+
+    def __init__(self, serializer: Serializer, min_size: int = 1024, level: int = 6):
+        self._serializer = serializer
+        self._min_size = min_size
+        self._level = level
+
+    def dumps(self, value: Any) -> bytes:
+        data = self._serializer.dumps(value)
+        if len(data) < self._min_size:
+            return self._RAW + data
+        return self._ZLIB + zlib.compress(data, self._level)
+
+    def loads(self, data: bytes) -> Any:
+        flag, payload = data[:1], data[1:]
+        if flag == self._ZLIB:
+            payload = zlib.decompress(payload)
+        return self._serializer.loads(payload)
+
+
+SERIALIZERS = {
+    "pickle": PickleSerializer,
+    "orjson": OrjsonSerializer,
+    "msgpack": MsgpackSerializer,
+}
+
+
+def get_serializer(name: str = "pickle", compress_min_size: int = 0) -> Serializer:
+    """
+    Create a serializer by name
+    :param name: pickle | orjson | msgpack
+    :param compress_min_size: zlib compress payloads of at least this many bytes, 0 disables compression
+    :return:
+    """
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown cache serializer: {name}")
+    serializer = SERIALIZERS[name]()
+    if compress_min_size > 0:
+        serializer = CompressedSerializer(serializer, min_size=compress_min_size)
+    return serializer
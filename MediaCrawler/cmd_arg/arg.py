@@ -224,6 +224,14 @@ async def parse_cmd(argv: Optional[Sequence[str]] = None):
                 rich_help_panel="Storage Configuration",
             ),
         ] = None,
+        migrate_db: Annotated[
+            Optional[InitDbOptionEnum],
+            typer.Option(
+                "--migrate_db",
+                help="Migrate existing database tables to the current schema (sqlite | mysql)",
+                rich_help_panel="Storage Configuration",
+            ),
+        ] = None,
         cookies: Annotated[
             str,
             typer.Option(
@@ -264,6 +272,14 @@ async def parse_cmd(argv: Optional[Sequence[str]] = None):
                 rich_help_panel="Basic Configuration",
             ),
         ] = config.CRAWLER_MAX_NOTES_COUNT,
+        resume: Annotated[
+            str,
+            typer.Option(
+                "--resume",
+                help="Job ID of an interrupted crawl, continues it from its checkpoint with the saved settings (see ENABLE_CRAWL_CHECKPOINT)",
+                rich_help_panel="Runtime Configuration",
+            ),
+        ] = "",
     ) -> SimpleNamespace:
         """MediaCrawler 命令行入口"""
 
@@ -271,6 +287,7 @@ async def parse_cmd(argv: Optional[Sequence[str]] = None):
         enable_sub_comment = _to_bool(get_sub_comment)
         enable_headless = _to_bool(headless)
         init_db_value = init_db.value if init_db else None
+        migrate_db_value = migrate_db.value if migrate_db else None
 
         # Parse specified_id and creator_id into lists
         specified_id_list = [id.strip() for id in specified_id.split(",") if id.strip()] if specified_id else []
@@ -327,10 +344,12 @@ async def parse_cmd(argv: Optional[Sequence[str]] = None):
             headless=config.HEADLESS,
             save_data_option=config.SAVE_DATA_OPTION,
             init_db=init_db_value,
+            migrate_db=migrate_db_value,
             cookies=config.COOKIES,
             specified_id=specified_id,
             creator_id=creator_id,
             client_job_id=config.CLIENT_JOB_ID,
+            resume=resume.strip(),
         )
 
     command = typer.main.get_command(app)
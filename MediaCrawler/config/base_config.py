@@ -33,7 +33,25 @@ ENABLE_IP_PROXY = False
 IP_PROXY_POOL_COUNT = 2
 
 # 代理IP提供商名称
-IP_PROXY_PROVIDER_NAME = "kuaidaili"  # kuaidaili | wandouhttp
+IP_PROXY_PROVIDER_NAME = "kuaidaili"  # kuaidaili | wandouhttp | local
+
+# 本地代理文件（IP_PROXY_PROVIDER_NAME = "local" 时使用），每行一个代理: ip:port 或 ip:port:user:password
+LOCAL_PROXY_FILE = "./proxy/local_proxies.txt"
+# 本地代理的有效期（秒），0 表示永不过期
+LOCAL_PROXY_TTL = 0
+
+# 是否开启代理池后台健康检查：提前并发校验代理、统计延迟和成功率、淘汰失效代理并补充新代理
+ENABLE_IP_PROXY_HEALTH_CHECK = True
+# 健康检查间隔（秒）
+IP_PROXY_HEALTH_CHECK_INTERVAL = 30
+# 单个代理校验超时时间（秒）
+IP_PROXY_VALIDATE_TIMEOUT = 10
+# 代理连续失败多少次后淘汰
+IP_PROXY_MAX_FAILURES = 3
+# 当前代理距离过期不足多少秒时，提前选好替换代理
+IP_PROXY_PREFETCH_SECONDS = 60
+# 代理分配策略: round_robin(并发请求轮流使用池中所有健康代理) | sticky(同一帖子/视频的请求固定使用同一代理) | current(所有请求共用当前代理)
+IP_PROXY_ASSIGN_STRATEGY = "round_robin"
 
 # 设置为True不会打开浏览器（无头浏览器）
 # 设置False会打开一个浏览器
@@ -44,6 +62,18 @@ HEADLESS = False
 # 是否保存登录状态
 SAVE_LOGIN_STATE = True
 
+# 浏览器页面资源拦截配置，登录完成后生效（扫码登录需要加载二维码图片）
+# 浏览器页面只用于获取 cookie、localStorage 和页面内签名函数，不需要渲染图片视频
+# off: 不拦截; light: 拦截图片、音视频、字体;
+# minimal: 在 light 基础上拦截样式表和埋点上报，并且只加载 BROWSER_SCRIPT_ALLOWLIST 中对应平台域名的脚本
+BROWSER_RESOURCE_PROFILE = "off"
+
+# minimal 模式下各平台允许加载脚本的域名（包含子域名），未配置的平台不过滤脚本
+# 小红书的 mnsv2 签名函数来自 xiaohongshu.com / xhscdn.com 下的脚本
+BROWSER_SCRIPT_ALLOWLIST = {
+    "xhs": ["xiaohongshu.com", "xhscdn.com"],
+}
+
 # ==================== CDP (Chrome DevTools Protocol) 配置 ====================
 # 是否启用CDP模式 - 使用用户现有的Chrome/Edge浏览器进行爬取，提供更好的反检测能力
 # 启用后将自动检测并启动用户的Chrome/Edge浏览器，通过CDP协议进行控制
@@ -71,6 +101,18 @@ BROWSER_LAUNCH_TIMEOUT = 60
 # 设置为False可以保持浏览器运行，便于调试
 AUTO_CLOSE_BROWSER = True
 
+# 是否使用常驻浏览器守护进程（仅CDP模式）
+# 开启后首次运行启动的浏览器会一直保持运行，后续运行直接通过CDP连接，跳过浏览器启动并复用已登录的状态
+# 守护进程状态保存在 browser_data/cdp_daemon.json，可通过 python -m tools.browser_daemon status/start/stop 管理
+# 开启后 AUTO_CLOSE_BROWSER 不再生效
+ENABLE_CDP_DAEMON = False
+
+# 守护浏览器累计服务的运行次数达到该值后，在下一次运行开始时重启浏览器，0 表示不限制
+CDP_DAEMON_MAX_RUNS = 50
+
+# 守护浏览器所有进程占用内存（MB）超过该值后，在下一次运行开始时重启浏览器，0 表示不限制
+CDP_DAEMON_MAX_MEMORY_MB = 4096
+
 # 数据保存类型选项配置,支持五种类型：csv、db、json、sqlite、excel, 最好保存到DB，有排重的功能。
 SAVE_DATA_OPTION = "json"  # csv or db or json or sqlite or excel
 
@@ -99,6 +141,40 @@ CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES = 10
 # 老版本项目使用了 db, 则需参考 schema/tables.sql line 287 增加表字段
 ENABLE_GET_SUB_COMMENTS = False
 
+# 是否记录互动数据快照（点赞、评论、收藏等计数），每次更新内容时追加一行到 data/{platform}/metrics/snapshots.csv
+# 可用于跨任务计算互动增量、增长速度和热度趋势
+ENABLE_METRICS_SNAPSHOT = True
+
+# 是否累计评论词频：评论入库时按 平台/来源关键词/评论日期 分词累加到 data/{platform}/words/word_freq.db，所有任务共用
+# 已累计的评论 ID 会被记录，重复爬取的评论只计一次；可直接查询跨任务的热词和话题趋势，无需重新读取数据文件
+ENABLE_WORD_FREQ_AGGREGATE = False
+# 缓存多少条评论后批量分词并写入，运行结束时写入剩余评论
+WORD_FREQ_AGGREGATE_BATCH_SIZE = 1000
+
+# 是否记录爬取断点：当前关键词、下一页页码、search_id、已爬完评论的帖子和每个帖子的评论游标写入 CRAWL_CHECKPOINT_DIR/{job_id}.json
+# 任务中断（浏览器崩溃、WebUI 停止任务）后使用 python main.py --resume <job_id> 按原配置从断点继续爬取
+ENABLE_CRAWL_CHECKPOINT = True
+CRAWL_CHECKPOINT_DIR = "data/checkpoints"
+# 评论游标等频繁变化的状态最少间隔多少秒写一次文件，每爬完一页会立即写入
+CRAWL_CHECKPOINT_INTERVAL = 5
+
+# 是否开启接口响应缓存，同一次运行（或使用 redis 时跨运行）重复出现的创作者主页、帖子详情等请求直接返回缓存结果，节省请求配额
+# 并发的相同请求只会发起一次，其余请求共享结果
+ENABLE_API_RESPONSE_CACHE = True
+# 缓存后端: memory | redis，使用 redis 才能跨运行复用
+API_RESPONSE_CACHE_TYPE = "memory"
+# 需要缓存的接口及缓存秒数，key 为 glob 规则，匹配 "域名+路径"（快手 graphql 请求追加 "#operationName"），未匹配的接口不缓存
+API_RESPONSE_CACHE_TTL = {
+    "*xiaohongshu.com/user/profile/*": 3600,  # 小红书创作者主页
+    "*xiaohongshu.com/api/sns/web/v1/feed": 600,  # 小红书帖子详情
+    "*douyin.com/aweme/v1/web/user/profile/other/": 3600,  # 抖音创作者信息
+    "*douyin.com/aweme/v1/web/aweme/detail/": 600,  # 抖音视频详情
+    "*bilibili.com/x/space/wbi/acc/info": 3600,  # B站创作者信息
+    "*bilibili.com/x/web-interface/view/detail": 600,  # B站视频详情
+    "*kuaishou.com/graphql#visionProfile": 3600,  # 快手创作者信息
+    "*kuaishou.com/graphql#visionVideoDetail": 600,  # 快手视频详情
+}
+
 # 词云相关
 # 是否开启生成评论词云图
 ENABLE_GET_WORDCLOUD = False
@@ -115,9 +191,28 @@ STOP_WORDS_FILE = "./docs/hit_stopwords.txt"
 # 中文字体文件路径
 FONT_PATH = "./docs/STZHONGS.TTF"
 
+# 词云分词进程数，0 表示 CPU 核数 - 1；评论文件按块流式读取，分词和词云图片渲染都在子进程中执行
+WORDCLOUD_PROCESS_POOL_WORKERS = 0
+# 每个分词任务的评论条数，评论总数不超过该值时直接在后台线程中分词，不启动进程池
+WORDCLOUD_CHUNK_SIZE = 5000
+
 # 爬取间隔时间
 CRAWLER_MAX_SLEEP_SEC = 2
 
+# 是否开启进程池解析：贴吧、知乎、小红书等整页 HTML 的解析放到子进程中执行，避免高并发时解析占满事件循环所在的单核
+ENABLE_PARSE_PROCESS_POOL = False
+# 解析进程数，0 表示 CPU 核数 - 1
+PARSE_PROCESS_POOL_WORKERS = 0
+# 页面内容小于该字符数时直接在当前进程解析（传输数据的开销大于解析本身）
+PARSE_PROCESS_POOL_MIN_SIZE = 50000
+
+# 是否输出性能指标：各平台/接口的请求耗时、签名耗时、重试次数、存储写入耗时、进行中的请求数、每秒入库条数
+# 运行中每隔 PERF_METRICS_FLUSH_INTERVAL 秒写入 PERF_METRICS_FILE，运行结束时打印 JSON 汇总
+# WebUI API 通过 /metrics（Prometheus 格式）和 /api/metrics/summary 读取该文件
+ENABLE_PERF_METRICS = True
+PERF_METRICS_FILE = "data/metrics/perf_metrics.json"
+PERF_METRICS_FLUSH_INTERVAL = 5
+
 from .bilibili_config import *
 from .xhs_config import *
 from .dy_config import *
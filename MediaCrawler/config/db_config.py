@@ -35,12 +35,24 @@ mysql_db_config = {
     "db_name": MYSQL_DB_NAME,
 }
 
+# mysql connection pool config
+MYSQL_POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", 10))
+MYSQL_MAX_OVERFLOW = int(os.getenv("MYSQL_MAX_OVERFLOW", 20))
+MYSQL_POOL_RECYCLE = int(os.getenv("MYSQL_POOL_RECYCLE", 3600))  # seconds
+MYSQL_POOL_PRE_PING = os.getenv("MYSQL_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
 
 # redis config
 REDIS_DB_HOST = "127.0.0.1"  # your redis host
 REDIS_DB_PWD = os.getenv("REDIS_DB_PWD", "123456")  # your redis password
 REDIS_DB_PORT = os.getenv("REDIS_DB_PORT", 6379)  # your redis port
 REDIS_DB_NUM = os.getenv("REDIS_DB_NUM", 0)  # your redis db num
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))  # connection pool size of the async client
+# cache value serializer: pickle | orjson | msgpack, pickle stays readable for values written by older versions
+# values written with another serializer/compression setting are treated as cache misses
+REDIS_CACHE_SERIALIZER = os.getenv("REDIS_CACHE_SERIALIZER", "pickle")
+# zlib compress cache values of at least this many bytes, 0 disables compression
+REDIS_CACHE_COMPRESS_MIN_SIZE = int(os.getenv("REDIS_CACHE_COMPRESS_MIN_SIZE", 0))
 
 # cache type
 CACHE_TYPE_REDIS = "redis"
@@ -49,8 +61,12 @@ CACHE_TYPE_MEMORY = "memory"
 # sqlite config
 SQLITE_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "database", "sqlite_tables.db")
 
+# sqlite busy timeout, concurrent writers wait this long for the lock instead of failing with "database is locked"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 30000))
+
 sqlite_db_config = {
-    "db_path": SQLITE_DB_PATH
+    "db_path": SQLITE_DB_PATH,
+    "busy_timeout_ms": SQLITE_BUSY_TIMEOUT_MS,
 }
 
 # mongodb config
@@ -67,3 +83,8 @@ mongodb_config = {
     "password": MONGODB_PWD,
     "db_name": MONGODB_DB_NAME,
 }
+
+# mongodb bulk write config: buffered upserts are flushed once a collection
+# buffers MONGODB_BULK_WRITE_SIZE items or MONGODB_BULK_FLUSH_INTERVAL seconds have passed
+MONGODB_BULK_WRITE_SIZE = int(os.getenv("MONGODB_BULK_WRITE_SIZE", 100))
+MONGODB_BULK_FLUSH_INTERVAL = float(os.getenv("MONGODB_BULK_FLUSH_INTERVAL", 2.0))
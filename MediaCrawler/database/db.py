@@ -30,7 +30,8 @@ if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
 from tools import utils
-from database.db_session import create_tables
+from database.db_session import create_tables, dispose_engines
+from database.schema_migration import migrate_schema
 
 async def init_table_schema(db_type: str):
     """
@@ -46,8 +47,18 @@ async def init_table_schema(db_type: str):
 async def init_db(db_type: str = None):
     await init_table_schema(db_type)
 
+async def migrate_db(db_type: str):
+    """
+    Migrates existing tables to the current ORM models (typed counters, unique keys, composite indexes).
+    Args:
+        db_type: The type of database, 'sqlite' or 'mysql'.
+    """
+    utils.logger.info(f"[migrate_db] begin migrate {db_type} table schema ...")
+    await migrate_schema(db_type)
+    utils.logger.info(f"[migrate_db] {db_type} table schema migrate successful")
+
 async def close():
     """
-    Placeholder for closing database connections if needed in the future.
+    Close pooled database connections.
     """
-    pass
+    await dispose_engines()
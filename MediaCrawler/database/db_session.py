@@ -16,16 +16,26 @@
 # 详细许可条款请参阅项目根目录下的LICENSE文件。
 # 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
 
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from contextlib import asynccontextmanager
 from .models import Base
 import config
 from config.db_config import mysql_db_config, sqlite_db_config
+from tools import utils
 
-# Keep a cache of engines
+# Keep a cache of engines and their session factories
 _engines = {}
+_session_factories = {}
+
+# Session shared by all writes inside a batch_session() block of the current task
+_batch_session_var: ContextVar[Optional[AsyncSession]] = ContextVar("batch_session", default=None)
+
+SQL_DB_TYPES = ("sqlite", "mysql", "db")
 
 
 async def create_database_if_not_exists(db_type: str):
@@ -38,6 +48,15 @@ async def create_database_if_not_exists(db_type: str):
         await engine.dispose()
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets readers run alongside the writer, NORMAL sync is safe under WAL, busy_timeout queues writers"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(sqlite_db_config['busy_timeout_ms'])}")
+    cursor.close()
+
+
 def get_async_engine(db_type: str = None):
     if db_type is None:
         db_type = config.SAVE_DATA_OPTION
@@ -50,16 +69,44 @@ def get_async_engine(db_type: str = None):
 
     if db_type == "sqlite":
         db_url = f"sqlite+aiosqlite:///{sqlite_db_config['db_path']}"
+        engine = create_async_engine(
+            db_url,
+            echo=False,
+            connect_args={"timeout": sqlite_db_config["busy_timeout_ms"] / 1000},
+        )
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
     elif db_type == "mysql" or db_type == "db":
         db_url = f"mysql+asyncmy://{mysql_db_config['user']}:{mysql_db_config['password']}@{mysql_db_config['host']}:{mysql_db_config['port']}/{mysql_db_config['db_name']}"
+        engine = create_async_engine(
+            db_url,
+            echo=False,
+            pool_size=config.MYSQL_POOL_SIZE,
+            max_overflow=config.MYSQL_MAX_OVERFLOW,
+            pool_recycle=config.MYSQL_POOL_RECYCLE,
+            pool_pre_ping=config.MYSQL_POOL_PRE_PING,
+        )
     else:
         raise ValueError(f"Unsupported database type: {db_type}")
 
-    engine = create_async_engine(db_url, echo=False)
     _engines[db_type] = engine
     return engine
 
 
+def get_session_factory(db_type: str = None) -> Optional[async_sessionmaker]:
+    if db_type is None:
+        db_type = config.SAVE_DATA_OPTION
+
+    if db_type in _session_factories:
+        return _session_factories[db_type]
+
+    engine = get_async_engine(db_type)
+    if not engine:
+        return None
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    _session_factories[db_type] = factory
+    return factory
+
+
 async def create_tables(db_type: str = None):
     if db_type is None:
         db_type = config.SAVE_DATA_OPTION
@@ -70,19 +117,96 @@ async def create_tables(db_type: str = None):
             await conn.run_sync(Base.metadata.create_all)
 
 
+def _is_duplicate_key(error: IntegrityError) -> bool:
+    """Unique constraint violation (sqlite UNIQUE constraint failed, mysql errno 1062), not NOT NULL / FK / CHECK"""
+    args = getattr(error.orig, "args", ())
+    if args and args[0] == 1062:
+        return True
+    return "UNIQUE constraint failed" in str(error.orig)
+
+
 @asynccontextmanager
 async def get_session() -> AsyncSession:
-    engine = get_async_engine(config.SAVE_DATA_OPTION)
-    if not engine:
+    batch_session = _batch_session_var.get()
+    if batch_session is not None:
+        # Inside batch_session() every write gets its own savepoint, a failing item only loses itself
+        savepoint = await batch_session.begin_nested()
+        try:
+            yield batch_session
+            await batch_session.flush()
+            await savepoint.commit()
+        except IntegrityError as e:
+            await savepoint.rollback()
+            if not _is_duplicate_key(e):
+                raise
+            utils.logger.warning(f"[get_session] Duplicate key, write skipped: {e.orig}")
+        except BaseException:
+            await savepoint.rollback()
+            raise
+        return
+
+    session_factory = get_session_factory(config.SAVE_DATA_OPTION)
+    if not session_factory:
         yield None
         return
-    AsyncSessionFactory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    session = AsyncSessionFactory()
+    session = session_factory()
     try:
         yield session
         await session.commit()
+    except IntegrityError as e:
+        # A concurrent task inserted the same natural key first, the unique index keeps the table clean
+        await session.rollback()
+        if not _is_duplicate_key(e):
+            raise
+        utils.logger.warning(f"[get_session] Duplicate key, write skipped: {e.orig}")
     except Exception as e:
         await session.rollback()
         raise e
     finally:
         await session.close()
+
+
+@asynccontextmanager
+async def batch_session():
+    """
+    Share one session (and one commit) across all get_session() calls in this block.
+    Each get_session() call writes inside its own savepoint: a duplicate key skips only that item, any other
+    error rolls back only that item and is raised after the items written before it are committed.
+    A failing commit of the batch itself is raised as well.
+    Does nothing when the current save option is not a SQL database.
+    The shared session must not be used by concurrent tasks, so only wrap sequential writes.
+    """
+    if config.SAVE_DATA_OPTION not in SQL_DB_TYPES or _batch_session_var.get() is not None:
+        yield
+        return
+
+    session_factory = get_session_factory(config.SAVE_DATA_OPTION)
+    if not session_factory:
+        yield
+        return
+    session = session_factory()
+    try:
+        if session.bind.dialect.name == "sqlite":
+            # The savepoints open a deferred transaction, its read snapshot can not be upgraded to a write
+            # once another connection committed (SQLITE_BUSY without busy_timeout), so take the write lock first
+            await session.execute(text("BEGIN IMMEDIATE"))
+        token = _batch_session_var.set(session)
+        try:
+            yield
+        finally:
+            _batch_session_var.reset(token)
+            # Items written before a failure are kept, like the per item commits the batch replaces
+            await session.commit()
+    except BaseException:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
+async def dispose_engines():
+    """Close all pooled connections"""
+    for engine in _engines.values():
+        await engine.dispose()
+    _engines.clear()
+    _session_factories.clear()
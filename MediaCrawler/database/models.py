@@ -16,39 +16,60 @@
 # 详细许可条款请参阅项目根目录下的LICENSE文件。
 # 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
 
-from sqlalchemy import create_engine, Column, Integer, Text, String, BigInteger
+from sqlalchemy import create_engine, Column, Integer, Text, String, BigInteger, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.types import TypeDecorator
+
+from tools import utils
 
 Base = declarative_base()
 
+
+class Count(TypeDecorator):
+    """Interaction counter stored as BIGINT, platform strings such as "1.2万" or "10+" are parsed on write"""
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return utils.parse_count(value)
+
+
 class BilibiliVideo(Base):
     __tablename__ = 'bilibili_video'
+    __table_args__ = (
+        Index("ix_bilibili_video_source_keyword_add_ts", "source_keyword", "add_ts"),
+    )
     id = Column(Integer, primary_key=True)
     video_id = Column(BigInteger, nullable=False, index=True, unique=True)
     video_url = Column(Text, nullable=False)
     user_id = Column(BigInteger, index=True)
     nickname = Column(Text)
     avatar = Column(Text)
-    liked_count = Column(Integer)
+    liked_count = Column(Count)
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
     video_type = Column(Text)
     title = Column(Text)
     desc = Column(Text)
     create_time = Column(BigInteger, index=True)
-    disliked_count = Column(Text)
-    video_play_count = Column(Text)
-    video_favorite_count = Column(Text)
-    video_share_count = Column(Text)
-    video_coin_count = Column(Text)
-    video_danmaku = Column(Text)
-    video_comment = Column(Text)
+    disliked_count = Column(Count)
+    video_play_count = Column(Count)
+    video_favorite_count = Column(Count)
+    video_share_count = Column(Count)
+    video_coin_count = Column(Count)
+    video_danmaku = Column(Count)
+    video_comment = Column(Count)
     video_cover_url = Column(Text)
-    source_keyword = Column(Text, default='')
+    source_keyword = Column(String(255), default='')
 
 class BilibiliVideoComment(Base):
     __tablename__ = 'bilibili_video_comment'
+    __table_args__ = (
+        Index("ix_bilibili_video_comment_video_id_create_time", "video_id", "create_time"),
+    )
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
     nickname = Column(Text)
@@ -57,31 +78,34 @@ class BilibiliVideoComment(Base):
     avatar = Column(Text)
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
-    comment_id = Column(BigInteger, index=True)
+    comment_id = Column(BigInteger, unique=True, index=True)
     video_id = Column(BigInteger, index=True)
     content = Column(Text)
     create_time = Column(BigInteger)
-    sub_comment_count = Column(Text)
+    sub_comment_count = Column(Count)
     parent_comment_id = Column(String(255))
-    like_count = Column(Text, default='0')
+    like_count = Column(Count, default=0)
 
 class BilibiliUpInfo(Base):
     __tablename__ = 'bilibili_up_info'
     id = Column(Integer, primary_key=True)
-    user_id = Column(BigInteger, index=True)
+    user_id = Column(BigInteger, unique=True, index=True)
     nickname = Column(Text)
     sex = Column(Text)
     sign = Column(Text)
     avatar = Column(Text)
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
-    total_fans = Column(Integer)
-    total_liked = Column(Integer)
+    total_fans = Column(Count)
+    total_liked = Column(Count)
     user_rank = Column(Integer)
     is_official = Column(Integer)
 
 class BilibiliContactInfo(Base):
     __tablename__ = 'bilibili_contact_info'
+    __table_args__ = (
+        UniqueConstraint("up_id", "fan_id", name="uq_bilibili_contact_info_up_id_fan_id"),
+    )
     id = Column(Integer, primary_key=True)
     up_id = Column(BigInteger, index=True)
     fan_id = Column(BigInteger, index=True)
@@ -97,20 +121,23 @@ class BilibiliContactInfo(Base):
 class BilibiliUpDynamic(Base):
     __tablename__ = 'bilibili_up_dynamic'
     id = Column(Integer, primary_key=True)
-    dynamic_id = Column(BigInteger, index=True)
+    dynamic_id = Column(BigInteger, unique=True, index=True)
     user_id = Column(String(255))
     user_name = Column(Text)
     text = Column(Text)
     type = Column(Text)
     pub_ts = Column(BigInteger)
-    total_comments = Column(Integer)
-    total_forwards = Column(Integer)
-    total_liked = Column(Integer)
+    total_comments = Column(Count)
+    total_forwards = Column(Count)
+    total_liked = Column(Count)
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
 
 class DouyinAweme(Base):
     __tablename__ = 'douyin_aweme'
+    __table_args__ = (
+        Index("ix_douyin_aweme_source_keyword_add_ts", "source_keyword", "add_ts"),
+    )
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
     sec_uid = Column(String(255))
@@ -122,24 +149,27 @@ class DouyinAweme(Base):
     ip_location = Column(Text)
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
-    aweme_id = Column(BigInteger, index=True)
+    aweme_id = Column(BigInteger, unique=True, index=True)
     aweme_type = Column(Text)
     title = Column(Text)
     desc = Column(Text)
     create_time = Column(BigInteger, index=True)
-    liked_count = Column(Text)
-    comment_count = Column(Text)
-    share_count = Column(Text)
-    collected_count = Column(Text)
+    liked_count = Column(Count)
+    comment_count = Column(Count)
+    share_count = Column(Count)
+    collected_count = Column(Count)
     aweme_url = Column(Text)
     cover_url = Column(Text)
     video_download_url = Column(Text)
     music_download_url = Column(Text)
     note_download_url = Column(Text)
-    source_keyword = Column(Text, default='')
+    source_keyword = Column(String(255), default='')
 
 class DouyinAwemeComment(Base):
     __tablename__ = 'douyin_aweme_comment'
+    __table_args__ = (
+        Index("ix_douyin_aweme_comment_aweme_id_create_time", "aweme_id", "create_time"),
+    )
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
     sec_uid = Column(String(255))
@@ -151,19 +181,19 @@ class DouyinAwemeComment(Base):
     ip_location = Column(Text)
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
-    comment_id = Column(BigInteger, index=True)
+    comment_id = Column(BigInteger, unique=True, index=True)
     aweme_id = Column(BigInteger, index=True)
     content = Column(Text)
     create_time = Column(BigInteger)
-    sub_comment_count = Column(Text)
+    sub_comment_count = Column(Count)
     parent_comment_id = Column(String(255))
-    like_count = Column(Text, default='0')
+    like_count = Column(Count, default=0)
     pictures = Column(Text, default='')
 
 class DyCreator(Base):
     __tablename__ = 'dy_creator'
     id = Column(Integer, primary_key=True)
-    user_id = Column(String(255))
+    user_id = Column(String(255), unique=True, index=True)
     nickname = Column(Text)
     avatar = Column(Text)
     ip_location = Column(Text)
@@ -171,47 +201,56 @@ class DyCreator(Base):
     last_modify_ts = Column(BigInteger)
     desc = Column(Text)
     gender = Column(Text)
-    follows = Column(Text)
-    fans = Column(Text)
-    interaction = Column(Text)
-    videos_count = Column(String(255))
+    follows = Column(Count)
+    fans = Column(Count)
+    interaction = Column(Count)
+    videos_count = Column(Count)
 
 class KuaishouVideo(Base):
     __tablename__ = 'kuaishou_video'
+    __table_args__ = (
+        Index("ix_kuaishou_video_source_keyword_add_ts", "source_keyword", "add_ts"),
+    )
     id = Column(Integer, primary_key=True)
     user_id = Column(String(64))
     nickname = Column(Text)
     avatar = Column(Text)
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
-    video_id = Column(String(255), index=True)
+    video_id = Column(String(255), unique=True, index=True)
     video_type = Column(Text)
     title = Column(Text)
     desc = Column(Text)
     create_time = Column(BigInteger, index=True)
-    liked_count = Column(Text)
-    viewd_count = Column(Text)
+    liked_count = Column(Count)
+    viewd_count = Column(Count)
     video_url = Column(Text)
     video_cover_url = Column(Text)
     video_play_url = Column(Text)
-    source_keyword = Column(Text, default='')
+    source_keyword = Column(String(255), default='')
 
 class KuaishouVideoComment(Base):
     __tablename__ = 'kuaishou_video_comment'
+    __table_args__ = (
+        Index("ix_kuaishou_video_comment_video_id_create_time", "video_id", "create_time"),
+    )
     id = Column(Integer, primary_key=True)
     user_id = Column(Text)
     nickname = Column(Text)
     avatar = Column(Text)
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
-    comment_id = Column(BigInteger, index=True)
+    comment_id = Column(BigInteger, unique=True, index=True)
     video_id = Column(String(255), index=True)
     content = Column(Text)
     create_time = Column(BigInteger)
-    sub_comment_count = Column(Text)
+    sub_comment_count = Column(Count)
 
 class WeiboNote(Base):
     __tablename__ = 'weibo_note'
+    __table_args__ = (
+        Index("ix_weibo_note_source_keyword_add_ts", "source_keyword", "add_ts"),
+    )
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
     nickname = Column(Text)
@@ -221,18 +260,21 @@ class WeiboNote(Base):
     ip_location = Column(Text, default='')
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
-    note_id = Column(BigInteger, index=True)
+    note_id = Column(BigInteger, unique=True, index=True)
     content = Column(Text)
     create_time = Column(BigInteger, index=True)
     create_date_time = Column(String(255), index=True)
-    liked_count = Column(Text)
-    comments_count = Column(Text)
-    shared_count = Column(Text)
+    liked_count = Column(Count)
+    comments_count = Column(Count)
+    shared_count = Column(Count)
     note_url = Column(Text)
-    source_keyword = Column(Text, default='')
+    source_keyword = Column(String(255), default='')
 
 class WeiboNoteComment(Base):
     __tablename__ = 'weibo_note_comment'
+    __table_args__ = (
+        Index("ix_weibo_note_comment_note_id_create_time", "note_id", "create_time"),
+    )
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
     nickname = Column(Text)
@@ -242,19 +284,19 @@ class WeiboNoteComment(Base):
     ip_location = Column(Text, default='')
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
-    comment_id = Column(BigInteger, index=True)
+    comment_id = Column(BigInteger, unique=True, index=True)
     note_id = Column(BigInteger, index=True)
     content = Column(Text)
     create_time = Column(BigInteger)
     create_date_time = Column(String(255), index=True)
-    comment_like_count = Column(Text)
-    sub_comment_count = Column(Text)
+    comment_like_count = Column(Count)
+    sub_comment_count = Column(Count)
     parent_comment_id = Column(String(255))
 
 class WeiboCreator(Base):
     __tablename__ = 'weibo_creator'
     id = Column(Integer, primary_key=True)
-    user_id = Column(String(255))
+    user_id = Column(String(255), unique=True, index=True)
     nickname = Column(Text)
     avatar = Column(Text)
     ip_location = Column(Text)
@@ -262,14 +304,14 @@ class WeiboCreator(Base):
     last_modify_ts = Column(BigInteger)
     desc = Column(Text)
     gender = Column(Text)
-    follows = Column(Text)
-    fans = Column(Text)
+    follows = Column(Count)
+    fans = Column(Count)
     tag_list = Column(Text)
 
 class XhsCreator(Base):
     __tablename__ = 'xhs_creator'
     id = Column(Integer, primary_key=True)
-    user_id = Column(String(255))
+    user_id = Column(String(255), unique=True, index=True)
     nickname = Column(Text)
     avatar = Column(Text)
     ip_location = Column(Text)
@@ -277,13 +319,16 @@ class XhsCreator(Base):
     last_modify_ts = Column(BigInteger)
     desc = Column(Text)
     gender = Column(Text)
-    follows = Column(Text)
-    fans = Column(Text)
-    interaction = Column(Text)
+    follows = Column(Count)
+    fans = Column(Count)
+    interaction = Column(Count)
     tag_list = Column(Text)
 
 class XhsNote(Base):
     __tablename__ = 'xhs_note'
+    __table_args__ = (
+        Index("ix_xhs_note_source_keyword_add_ts", "source_keyword", "add_ts"),
+    )
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
     nickname = Column(Text)
@@ -291,25 +336,28 @@ class XhsNote(Base):
     ip_location = Column(Text)
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
-    note_id = Column(String(255), index=True)
+    note_id = Column(String(255), unique=True, index=True)
     type = Column(Text)
     title = Column(Text)
     desc = Column(Text)
     video_url = Column(Text)
     time = Column(BigInteger, index=True)
     last_update_time = Column(BigInteger)
-    liked_count = Column(Text)
-    collected_count = Column(Text)
-    comment_count = Column(Text)
-    share_count = Column(Text)
+    liked_count = Column(Count)
+    collected_count = Column(Count)
+    comment_count = Column(Count)
+    share_count = Column(Count)
     image_list = Column(Text)
     tag_list = Column(Text)
     note_url = Column(Text)
-    source_keyword = Column(Text, default='')
+    source_keyword = Column(String(255), default='')
     xsec_token = Column(Text)
 
 class XhsNoteComment(Base):
     __tablename__ = 'xhs_note_comment'
+    __table_args__ = (
+        Index("ix_xhs_note_comment_note_id_create_time", "note_id", "create_time"),
+    )
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
     nickname = Column(Text)
@@ -317,19 +365,22 @@ class XhsNoteComment(Base):
     ip_location = Column(Text)
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
-    comment_id = Column(String(255), index=True)
+    comment_id = Column(String(255), unique=True, index=True)
     create_time = Column(BigInteger, index=True)
     note_id = Column(String(255))
     content = Column(Text)
     sub_comment_count = Column(Integer)
     pictures = Column(Text)
     parent_comment_id = Column(String(255))
-    like_count = Column(Text)
+    like_count = Column(Count)
 
 class TiebaNote(Base):
     __tablename__ = 'tieba_note'
+    __table_args__ = (
+        Index("ix_tieba_note_source_keyword_add_ts", "source_keyword", "add_ts"),
+    )
     id = Column(Integer, primary_key=True)
-    note_id = Column(String(644), index=True)
+    note_id = Column(String(644), unique=True, index=True)
     title = Column(Text)
     desc = Column(Text)
     note_url = Column(Text)
@@ -345,12 +396,15 @@ class TiebaNote(Base):
     ip_location = Column(Text, default='')
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
-    source_keyword = Column(Text, default='')
+    source_keyword = Column(String(255), default='')
 
 class TiebaComment(Base):
     __tablename__ = 'tieba_comment'
+    __table_args__ = (
+        Index("ix_tieba_comment_note_id_publish_time", "note_id", "publish_time"),
+    )
     id = Column(Integer, primary_key=True)
-    comment_id = Column(String(255), index=True)
+    comment_id = Column(String(255), unique=True, index=True)
     parent_comment_id = Column(String(255), default='')
     content = Column(Text)
     user_link = Column(Text, default='')
@@ -370,7 +424,7 @@ class TiebaComment(Base):
 class TiebaCreator(Base):
     __tablename__ = 'tieba_creator'
     id = Column(Integer, primary_key=True)
-    user_id = Column(String(64))
+    user_id = Column(String(64), unique=True, index=True)
     user_name = Column(Text)
     nickname = Column(Text)
     avatar = Column(Text)
@@ -378,14 +432,17 @@ class TiebaCreator(Base):
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
     gender = Column(Text)
-    follows = Column(Text)
-    fans = Column(Text)
+    follows = Column(Count)
+    fans = Column(Count)
     registration_duration = Column(Text)
 
 class ZhihuContent(Base):
     __tablename__ = 'zhihu_content'
+    __table_args__ = (
+        Index("ix_zhihu_content_source_keyword_add_ts", "source_keyword", "add_ts"),
+    )
     id = Column(Integer, primary_key=True)
-    content_id = Column(String(64), index=True)
+    content_id = Column(String(64), unique=True, index=True)
     content_type = Column(Text)
     content_text = Column(Text)
     content_url = Column(Text)
@@ -394,9 +451,9 @@ class ZhihuContent(Base):
     desc = Column(Text)
     created_time = Column(String(32), index=True)
     updated_time = Column(Text)
-    voteup_count = Column(Integer, default=0)
-    comment_count = Column(Integer, default=0)
-    source_keyword = Column(Text)
+    voteup_count = Column(Count, default=0)
+    comment_count = Column(Count, default=0)
+    source_keyword = Column(String(255), default='')
     user_id = Column(String(255))
     user_link = Column(Text)
     user_nickname = Column(Text)
@@ -412,15 +469,18 @@ class ZhihuContent(Base):
 
 class ZhihuComment(Base):
     __tablename__ = 'zhihu_comment'
+    __table_args__ = (
+        Index("ix_zhihu_comment_content_id_publish_time", "content_id", "publish_time"),
+    )
     id = Column(Integer, primary_key=True)
-    comment_id = Column(String(64), index=True)
+    comment_id = Column(String(64), unique=True, index=True)
     parent_comment_id = Column(String(64))
     content = Column(Text)
     publish_time = Column(String(32), index=True)
     ip_location = Column(Text)
     sub_comment_count = Column(Integer, default=0)
-    like_count = Column(Integer, default=0)
-    dislike_count = Column(Integer, default=0)
+    like_count = Column(Count, default=0)
+    dislike_count = Column(Count, default=0)
     content_id = Column(String(64), index=True)
     content_type = Column(Text)
     user_id = Column(String(64))
@@ -440,13 +500,13 @@ class ZhihuCreator(Base):
     url_token = Column(Text)
     gender = Column(Text)
     ip_location = Column(Text)
-    follows = Column(Integer, default=0)
-    fans = Column(Integer, default=0)
+    follows = Column(Count, default=0)
+    fans = Column(Count, default=0)
     anwser_count = Column(Integer, default=0)
     video_count = Column(Integer, default=0)
     question_count = Column(Integer, default=0)
     article_count = Column(Integer, default=0)
     column_count = Column(Integer, default=0)
-    get_voteup_count = Column(Integer, default=0)
+    get_voteup_count = Column(Count, default=0)
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
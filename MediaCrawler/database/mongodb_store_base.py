@@ -18,12 +18,28 @@
 
 """MongoDB storage base class: Provides connection management and common storage methods"""
 import asyncio
-from typing import Dict, List, Optional
+import json
+import time
+from typing import Dict, List, Optional, Tuple
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 from config import db_config
 from tools import utils
 
 
+# Natural keys of each collection, used for the upsert query and the unique index
+MONGODB_UNIQUE_KEYS: Dict[str, Dict[str, str]] = {
+    "xhs": {"contents": "note_id", "comments": "comment_id", "creators": "user_id"},
+    "douyin": {"contents": "aweme_id", "comments": "comment_id", "creators": "user_id"},
+    "kuaishou": {"contents": "video_id", "comments": "comment_id", "creators": "user_id"},
+    "bilibili": {"contents": "video_id", "comments": "comment_id", "creators": "user_id"},
+    "weibo": {"contents": "note_id", "comments": "comment_id", "creators": "user_id"},
+    "tieba": {"contents": "note_id", "comments": "comment_id", "creators": "user_id"},
+    "zhihu": {"contents": "note_id", "comments": "comment_id", "creators": "user_id"},
+}
+
+
 class MongoDBConnection:
     """MongoDB connection management (singleton pattern)"""
     _instance = None
@@ -34,6 +50,8 @@ class MongoDBConnection:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(MongoDBConnection, cls).__new__(cls)
+            cls._instance._collections = {}
+            cls._instance._bulk_writer = MongoBulkWriter(cls._instance)
         return cls._instance
 
     async def get_client(self) -> AsyncIOMotorClient:
@@ -76,15 +94,154 @@ class MongoDBConnection:
             utils.logger.error(f"[MongoDBConnection] Connection failed: {e}")
             raise
 
+    async def get_collection(self, collection_name: str) -> AsyncIOMotorCollection:
+        """Get collection handle (cached per connection)"""
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            db = await self.get_db()
+            collection = self._collections.setdefault(collection_name, db[collection_name])
+        return collection
+
+    @property
+    def bulk_writer(self) -> "MongoBulkWriter":
+        """Shared bulk writer, store instances are created per item so buffers live on the connection"""
+        return self._bulk_writer
+
+    async def ensure_indexes(self):
+        """Create unique indexes on the natural keys of every known collection"""
+        await self.get_db()
+        for prefix, suffix_keys in MONGODB_UNIQUE_KEYS.items():
+            for suffix, key in suffix_keys.items():
+                collection_name = f"{prefix}_{suffix}"
+                try:
+                    collection = await self.get_collection(collection_name)
+                    await collection.create_index([(key, 1)], unique=True)
+                except Exception as e:
+                    utils.logger.error(f"[MongoDBConnection] Create unique index {collection_name}.{key} failed: {e}")
+        utils.logger.info("[MongoDBConnection] Unique indexes ensured")
+
     async def close(self):
-        """Close connection"""
+        """Flush pending writes and close connection"""
+        # add() never connects, flush connects on demand, so buffered upserts are written even
+        # when nothing connected before (e.g. ensure_indexes failed at startup)
+        await self._bulk_writer.close()
         if self._client is not None:
             self._client.close()
             self._client = None
             self._db = None
+            self._collections.clear()
             utils.logger.info("[MongoDBConnection] Connection closed")
 
 
+class MongoBulkWriter:
+    """Buffers upserts per collection and writes them with unordered bulk_write
+
+    A buffer is flushed when it holds `batch_size` items or when `flush_interval`
+    seconds have passed since its last flush, a background task flushes buffers
+    that receive no further writes. Upserts with the same query are
+    merged in the buffer, so the last write of a key always wins even though the
+    batch is sent with ordered=False.
+    """
+
+    def __init__(self, connection: MongoDBConnection, batch_size: Optional[int] = None, flush_interval: Optional[float] = None):
+        self._connection = connection
+        self.batch_size = batch_size or db_config.MONGODB_BULK_WRITE_SIZE
+        self.flush_interval = db_config.MONGODB_BULK_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        # collection_name -> {query_key: (query, data)}
+        self._buffers: Dict[str, Dict[str, Tuple[Dict, Dict]]] = {}
+        self._last_flush: Dict[str, float] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        # set by close(), the interval task stops after the flush it is in instead of being cancelled mid write
+        self._closing = False
+        self._interval_flushing = False
+
+    @staticmethod
+    def _query_key(query: Dict) -> str:
+        return json.dumps(query, sort_keys=True, default=str)
+
+    def pending_count(self, collection_name: Optional[str] = None) -> int:
+        """Number of buffered upserts (of one collection, or of all collections)"""
+        if collection_name is not None:
+            return len(self._buffers.get(collection_name, {}))
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    async def add(self, collection_name: str, query: Dict, data: Dict) -> bool:
+        """Buffer an upsert, flushing the collection if it is due"""
+        buffer = self._buffers.setdefault(collection_name, {})
+        self._last_flush.setdefault(collection_name, time.monotonic())
+        key = self._query_key(query)
+        if key in buffer:
+            buffer[key][1].update(data)
+        else:
+            buffer[key] = (query, dict(data))
+
+        if len(buffer) >= self.batch_size or time.monotonic() - self._last_flush[collection_name] >= self.flush_interval:
+            return await self.flush(collection_name)
+        self._ensure_flush_task()
+        return True
+
+    def _ensure_flush_task(self):
+        if self.flush_interval > 0 and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._run_interval_flush())
+
+    async def _run_interval_flush(self):
+        """Flush buffers idle for flush_interval, add() only checks the interval when the next item arrives"""
+        while self._buffers and not self._closing:
+            await asyncio.sleep(self.flush_interval)
+            now = time.monotonic()
+            self._interval_flushing = True
+            try:
+                for collection_name in list(self._buffers):
+                    if self._closing:
+                        break
+                    if now - self._last_flush.get(collection_name, now) >= self.flush_interval:
+                        await self.flush(collection_name)
+            finally:
+                self._interval_flushing = False
+
+    async def flush(self, collection_name: str) -> bool:
+        """Write the buffered upserts of one collection"""
+        buffer = self._buffers.pop(collection_name, None)
+        self._last_flush[collection_name] = time.monotonic()
+        if not buffer:
+            return True
+
+        operations = [UpdateOne(query, {"$set": data}, upsert=True) for query, data in buffer.values()]
+        try:
+            collection = await self._connection.get_collection(collection_name)
+            await collection.bulk_write(operations, ordered=False)
+            return True
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            utils.logger.error(
+                f"[MongoBulkWriter] Bulk write to {collection_name} finished with {len(write_errors)}/{len(operations)} errors: "
+                f"{write_errors[:1]}"
+            )
+            return False
+        except Exception as e:
+            utils.logger.error(f"[MongoBulkWriter] Bulk write to {collection_name} failed ({len(operations)} items): {e}")
+            return False
+
+    async def flush_all(self) -> bool:
+        """Write the buffered upserts of every collection"""
+        results = [await self.flush(collection_name) for collection_name in list(self._buffers)]
+        return all(results)
+
+    async def close(self) -> bool:
+        """Stop the interval flush and write everything that is still buffered"""
+        task, self._flush_task = self._flush_task, None
+        if task is not None and not task.done():
+            self._closing = True
+            # Cancel only a sleeping task, a popped buffer in bulk_write would be lost
+            if not self._interval_flushing:
+                task.cancel()
+            try:
+                await asyncio.gather(task, return_exceptions=True)
+            finally:
+                self._closing = False
+        return await self.flush_all()
+
+
 class MongoDBStoreBase:
     """MongoDB storage base class: Provides common CRUD operations"""
 
@@ -96,25 +253,27 @@ class MongoDBStoreBase:
         self.collection_prefix = collection_prefix
         self._connection = MongoDBConnection()
 
+    def _collection_name(self, collection_suffix: str) -> str:
+        return f"{self.collection_prefix}_{collection_suffix}"
+
     async def get_collection(self, collection_suffix: str) -> AsyncIOMotorCollection:
         """Get collection: {prefix}_{suffix}"""
-        db = await self._connection.get_db()
-        collection_name = f"{self.collection_prefix}_{collection_suffix}"
-        return db[collection_name]
+        return await self._connection.get_collection(self._collection_name(collection_suffix))
 
     async def save_or_update(self, collection_suffix: str, query: Dict, data: Dict) -> bool:
-        """Save or update data (upsert)"""
-        try:
-            collection = await self.get_collection(collection_suffix)
-            await collection.update_one(query, {"$set": data}, upsert=True)
-            return True
-        except Exception as e:
-            utils.logger.error(f"[MongoDBStoreBase] Save failed ({self.collection_prefix}_{collection_suffix}): {e}")
-            return False
+        """Save or update data (buffered upsert, written in bulk)"""
+        return await self._connection.bulk_writer.add(self._collection_name(collection_suffix), query, data)
+
+    async def flush(self, collection_suffix: Optional[str] = None) -> bool:
+        """Write buffered upserts of one collection, or of all collections"""
+        if collection_suffix is None:
+            return await self._connection.bulk_writer.flush_all()
+        return await self._connection.bulk_writer.flush(self._collection_name(collection_suffix))
 
     async def find_one(self, collection_suffix: str, query: Dict) -> Optional[Dict]:
         """Query a single record"""
         try:
+            await self.flush(collection_suffix)
             collection = await self.get_collection(collection_suffix)
             return await collection.find_one(query)
         except Exception as e:
@@ -124,6 +283,7 @@ class MongoDBStoreBase:
     async def find_many(self, collection_suffix: str, query: Dict, limit: int = 0) -> List[Dict]:
         """Query multiple records (limit=0 means no limit)"""
         try:
+            await self.flush(collection_suffix)
             collection = await self.get_collection(collection_suffix)
             cursor = collection.find(query)
             if limit > 0:
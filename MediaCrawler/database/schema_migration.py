@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/database/schema_migration.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Migrate existing SQLite/MySQL tables to the current ORM schema (database/models.py).
+
+Tables whose indexes do not match the models are rebuilt:
+rename to {table}_old -> create from model -> copy rows -> drop {table}_old.
+While copying, counters are parsed into integers by the Count column type, over-long
+strings are truncated to the new column length, and rows duplicating a natural key
+(keeping the most recently inserted one) are dropped so the unique indexes can be built.
+"""
+
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import MetaData, String, Table, UniqueConstraint, inspect, select, text
+from sqlalchemy.engine import Connection
+
+from database.db_session import create_database_if_not_exists, get_async_engine
+from database.models import Base
+from tools import utils
+
+COPY_BATCH_SIZE = 1000
+
+
+def _unique_key_columns(table: Table) -> List[Tuple[str, ...]]:
+    """Column tuples that must be unique in the new table"""
+    keys = [tuple(index.columns.keys()) for index in table.indexes if index.unique]
+    keys += [tuple(constraint.columns.keys()) for constraint in table.constraints
+             if isinstance(constraint, UniqueConstraint)]
+    return keys
+
+
+def _is_up_to_date(conn: Connection, table: Table) -> bool:
+    inspector = inspect(conn)
+    existing_names = {index["name"] for index in inspector.get_indexes(table.name)}
+    existing_names |= {constraint["name"] for constraint in inspector.get_unique_constraints(table.name)}
+    expected_names = {index.name for index in table.indexes}
+    expected_names |= {constraint.name for constraint in table.constraints
+                       if isinstance(constraint, UniqueConstraint) and constraint.name}
+    return expected_names <= existing_names
+
+
+def _fit_row(table: Table, row: Dict) -> Dict:
+    """Truncate strings that no longer fit, counters are converted by the Count type on insert"""
+    for column in table.columns:
+        value = row.get(column.name)
+        if isinstance(column.type, String) and column.type.length and isinstance(value, str):
+            row[column.name] = value[:column.type.length]
+    return row
+
+
+def _rebuild_table(conn: Connection, table: Table):
+    preparer = conn.dialect.identifier_preparer
+    old_name = f"{table.name}_old"
+
+    # Index names are global in SQLite, drop them before the renamed table releases its name
+    old_table = Table(table.name, MetaData(), autoload_with=conn)
+    for index in old_table.indexes:
+        index.drop(conn)
+    conn.execute(text(f"ALTER TABLE {preparer.quote(table.name)} RENAME TO {preparer.quote(old_name)}"))
+    old_table = Table(old_name, MetaData(), autoload_with=conn)
+    table.create(conn)
+
+    columns = [column.name for column in table.columns if column.name in old_table.c]
+    unique_keys = _unique_key_columns(table)
+    seen: List[Set[Tuple]] = [set() for _ in unique_keys]
+    copied = skipped = 0
+    last_id = None
+    while True:
+        stmt = select(*[old_table.c[name] for name in columns]).order_by(old_table.c.id.desc()).limit(COPY_BATCH_SIZE)
+        if last_id is not None:
+            stmt = stmt.where(old_table.c.id < last_id)
+        rows = [dict(row) for row in conn.execute(stmt).mappings()]
+        if not rows:
+            break
+        last_id = rows[-1]["id"]
+
+        batch = []
+        for row in rows:
+            row_keys = [tuple(row.get(name) for name in key) for key in unique_keys]
+            if any(None not in row_key and row_key in seen[i] for i, row_key in enumerate(row_keys)):
+                skipped += 1
+                continue
+            for i, row_key in enumerate(row_keys):
+                seen[i].add(row_key)
+            batch.append(_fit_row(table, row))
+        if batch:
+            conn.execute(table.insert(), batch)
+            copied += len(batch)
+
+    old_table.drop(conn)
+    utils.logger.info(f"[schema_migration] {table.name} rebuilt, copied {copied} rows, dropped {skipped} duplicates")
+
+
+def _migrate_tables(conn: Connection):
+    existing_tables = set(inspect(conn).get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        if _is_up_to_date(conn, table):
+            utils.logger.info(f"[schema_migration] {table.name} is up to date")
+            continue
+        _rebuild_table(conn, table)
+    # Create tables that did not exist yet
+    Base.metadata.create_all(conn)
+
+
+async def migrate_schema(db_type: str):
+    """
+    Migrate the tables of the given database to the current ORM schema.
+    Args:
+        db_type: The type of database, 'sqlite' or 'mysql'.
+    """
+    await create_database_if_not_exists(db_type)
+    engine = get_async_engine(db_type)
+    async with engine.begin() as conn:
+        await conn.run_sync(_migrate_tables)
@@ -30,44 +30,49 @@ if sys.stderr and hasattr(sys.stderr, 'buffer'):
         sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
 import asyncio
+import importlib
+import json
 from typing import Optional, Type
 
 import cmd_arg
 import config
 from database import db
 from base.base_crawler import AbstractCrawler
-from media_platform.bilibili import BilibiliCrawler
-from media_platform.douyin import DouYinCrawler
-from media_platform.kuaishou import KuaishouCrawler
-from media_platform.tieba import TieBaCrawler
-from media_platform.weibo import WeiboCrawler
-from media_platform.xhs import XiaoHongShuCrawler
-from media_platform.zhihu import ZhihuCrawler
+from proxy.proxy_mixin import ProxyRefreshMixin
 from tools.async_file_writer import AsyncFileWriter
+from tools import checkpoint, perf_metrics, progress
+from tools.parse_pool import shutdown_parse_pool
 from var import crawler_type_var
 
 
 class CrawlerFactory:
-    CRAWLERS: dict[str, Type[AbstractCrawler]] = {
-        "xhs": XiaoHongShuCrawler,
-        "dy": DouYinCrawler,
-        "ks": KuaishouCrawler,
-        "bili": BilibiliCrawler,
-        "wb": WeiboCrawler,
-        "tieba": TieBaCrawler,
-        "zhihu": ZhihuCrawler,
+    # platform -> (module, class name), only the selected platform package is imported
+    CRAWLERS: dict[str, tuple[str, str]] = {
+        "xhs": ("media_platform.xhs", "XiaoHongShuCrawler"),
+        "dy": ("media_platform.douyin", "DouYinCrawler"),
+        "ks": ("media_platform.kuaishou", "KuaishouCrawler"),
+        "bili": ("media_platform.bilibili", "BilibiliCrawler"),
+        "wb": ("media_platform.weibo", "WeiboCrawler"),
+        "tieba": ("media_platform.tieba", "TieBaCrawler"),
+        "zhihu": ("media_platform.zhihu", "ZhihuCrawler"),
     }
 
     @staticmethod
-    def create_crawler(platform: str) -> AbstractCrawler:
-        crawler_class = CrawlerFactory.CRAWLERS.get(platform)
-        if not crawler_class:
+    def get_crawler_class(platform: str) -> Type[AbstractCrawler]:
+        crawler_path = CrawlerFactory.CRAWLERS.get(platform)
+        if not crawler_path:
             supported = ", ".join(sorted(CrawlerFactory.CRAWLERS))
             raise ValueError(f"Invalid media platform: {platform!r}. Supported: {supported}")
-        return crawler_class()
+        module_name, class_name = crawler_path
+        return getattr(importlib.import_module(module_name), class_name)
+
+    @staticmethod
+    def create_crawler(platform: str) -> AbstractCrawler:
+        return CrawlerFactory.get_crawler_class(platform)()
 
 
 crawler: Optional[AbstractCrawler] = None
+metrics_writer_task: Optional[asyncio.Task] = None
 
 
 def _flush_excel_if_needed() -> None:
@@ -83,8 +88,33 @@ def _flush_excel_if_needed() -> None:
         print(f"[Main] Error flushing Excel data: {e}")
 
 
+async def _init_mongodb_if_needed() -> None:
+    if config.SAVE_DATA_OPTION != "mongodb":
+        return
+
+    try:
+        from database.mongodb_store_base import MongoDBConnection
+
+        await MongoDBConnection().ensure_indexes()
+    except Exception as e:
+        print(f"[Main] Error ensuring MongoDB indexes: {e}")
+
+
+async def _close_mongodb_if_needed() -> None:
+    if config.SAVE_DATA_OPTION != "mongodb":
+        return
+
+    try:
+        from database.mongodb_store_base import MongoDBConnection
+
+        # Flushes buffered bulk writes before closing
+        await MongoDBConnection().close()
+    except Exception as e:
+        print(f"[Main] Error closing MongoDB connection: {e}")
+
+
 async def _generate_wordcloud_if_needed() -> None:
-    if config.SAVE_DATA_OPTION != "json" or not config.ENABLE_GET_WORDCLOUD:
+    if config.SAVE_DATA_OPTION not in ("json", "csv") or not config.ENABLE_GET_WORDCLOUD:
         return
 
     try:
@@ -97,6 +127,37 @@ async def _generate_wordcloud_if_needed() -> None:
         print(f"[Main] Error generating wordcloud: {e}")
 
 
+async def _flush_word_frequency_if_needed() -> None:
+    if not config.ENABLE_WORD_FREQ_AGGREGATE:
+        return
+
+    from store.word_frequency import flush_word_frequency
+
+    await flush_word_frequency()
+
+
+def _start_perf_metrics_if_needed() -> None:
+    global metrics_writer_task
+    if not config.ENABLE_PERF_METRICS:
+        return
+
+    perf_metrics.registry.reset()
+    metrics_writer_task = asyncio.create_task(perf_metrics.run_snapshot_writer())
+
+
+def _report_perf_metrics_if_needed() -> None:
+    if metrics_writer_task is None:
+        return
+
+    metrics_writer_task.cancel()
+    try:
+        snapshot = perf_metrics.write_snapshot()
+        summary = perf_metrics.summarize(snapshot)
+        print(f"[Main] Perf metrics summary: {json.dumps(summary, ensure_ascii=False, indent=2)}")
+    except Exception as e:
+        print(f"[Main] Error writing perf metrics: {e}")
+
+
 async def main() -> None:
     global crawler
 
@@ -105,20 +166,38 @@ async def main() -> None:
         await db.init_db(args.init_db)
         print(f"Database {args.init_db} initialized successfully.")
         return
+    if args.migrate_db:
+        await db.migrate_db(args.migrate_db)
+        print(f"Database {args.migrate_db} migrated successfully.")
+        return
+
+    # A resumed job restores its saved settings, so this runs before anything reads config
+    checkpoint.start_checkpoint(args.resume or None)
+    await _init_mongodb_if_needed()
+    _start_perf_metrics_if_needed()
+    progress.start_progress()
 
     crawler = CrawlerFactory.create_crawler(platform=config.PLATFORM)
     await crawler.start()
+    checkpoint.mark_finished()
 
     _flush_excel_if_needed()
 
     # Generate wordcloud after crawling is complete
-    # Only for JSON save mode
+    # Only for JSON and CSV save modes
     await _generate_wordcloud_if_needed()
 
 
 async def async_cleanup() -> None:
     global crawler
     if crawler:
+        if getattr(crawler, "ip_proxy_pool", None):
+            await crawler.ip_proxy_pool.close()
+
+        for api_client in list(vars(crawler).values()):
+            if isinstance(api_client, ProxyRefreshMixin):
+                await api_client.close_http_clients()
+
         if getattr(crawler, "cdp_manager", None):
             try:
                 await crawler.cdp_manager.cleanup(force=True)
@@ -138,6 +217,15 @@ async def async_cleanup() -> None:
     if config.SAVE_DATA_OPTION in ("db", "sqlite"):
         await db.close()
 
+    await _close_mongodb_if_needed()
+    await _flush_word_frequency_if_needed()
+
+    shutdown_parse_pool()
+
+    _report_perf_metrics_if_needed()
+    progress.finish_progress()
+    checkpoint.finish_checkpoint()
+
 if __name__ == "__main__":
     from tools.app_runner import run
 
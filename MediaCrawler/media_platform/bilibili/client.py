@@ -24,7 +24,8 @@
 import asyncio
 import json
 import random
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from urllib.parse import urlencode
 
 import httpx
@@ -33,15 +34,20 @@ from playwright.async_api import BrowserContext, Page
 import config
 from base.base_crawler import AbstractApiClient
 from proxy.proxy_mixin import ProxyRefreshMixin
-from tools import utils
+from tools import checkpoint, utils
 
 if TYPE_CHECKING:
     from proxy.proxy_ip_pool import ProxyIpPool
 
-from .exception import DataFetchError
+from .exception import DataFetchError, WbiSignError
 from .field import CommentOrderType, SearchOrderType
 from .help import BilibiliSign
 
+# wbi img/sub keys rotate about once a day, re-read them periodically instead of on every request
+WBI_KEYS_CACHE_TTL = 30 * 60
+# Response codes of a rejected wbi signature, the request is signed again with refreshed keys
+WBI_SIGN_ERROR_CODES = (-403, -352)
+
 
 class BilibiliClient(AbstractApiClient, ProxyRefreshMixin):
 
@@ -61,20 +67,24 @@ class BilibiliClient(AbstractApiClient, ProxyRefreshMixin):
         self._host = "https://api.bilibili.com"
         self.playwright_page = playwright_page
         self.cookie_dict = cookie_dict
+        # Signer of the cached wbi key pair
+        self._wbi_sign: Optional[BilibiliSign] = None
+        self._wbi_sign_expire_at = 0.0
+        self._wbi_sign_lock = asyncio.Lock()
+        # Key pair of the last rejected signature, never reused from localStorage
+        self._rejected_wbi_keys: Optional[Tuple[str, str]] = None
         # Initialize proxy pool (from ProxyRefreshMixin)
         self.init_proxy_pool(proxy_ip_pool)
 
     async def request(self, method, url, **kwargs) -> Any:
-        # Check if proxy has expired before each request
-        await self._refresh_proxy_if_expired()
-
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            response = await client.request(method, url, timeout=self.timeout, **kwargs)
+        response = await self._send_request(method, url, timeout=self.timeout, **kwargs)
         try:
             data: Dict = response.json()
         except json.JSONDecodeError:
             utils.logger.error(f"[BilibiliClient.request] Failed to decode JSON from response. status_code: {response.status_code}, response_text: {response.text}")
             raise DataFetchError(f"Failed to decode JSON, content: {response.text}")
+        if data.get("code") in WBI_SIGN_ERROR_CODES:
+            raise WbiSignError(data.get("message", "wbi sign error"))
         if data.get("code") != 0:
             raise DataFetchError(data.get("message", "unkonw error"))
         else:
@@ -90,21 +100,62 @@ class BilibiliClient(AbstractApiClient, ProxyRefreshMixin):
         """
         if not req_data:
             return {}
-        img_key, sub_key = await self.get_wbi_keys()
-        return BilibiliSign(img_key, sub_key).sign(req_data)
+        wbi_sign = await self._get_wbi_sign()
+        return wbi_sign.sign(req_data)
 
-    async def get_wbi_keys(self) -> Tuple[str, str]:
+    async def _get_wbi_sign(self) -> BilibiliSign:
+        """
+        Signer of the cached wbi key pair, the keys are re-read after WBI_KEYS_CACHE_TTL or after a rejected signature
+        :return:
+        """
+        async with self._wbi_sign_lock:
+            if self._wbi_sign is None or time.monotonic() >= self._wbi_sign_expire_at:
+                img_key, sub_key = await self.get_wbi_keys()
+                if (img_key, sub_key) == self._rejected_wbi_keys:
+                    # localStorage still holds the rejected keys, ask the server for the current ones
+                    img_key, sub_key = await self.get_wbi_keys(from_nav=True)
+                self._wbi_sign = BilibiliSign(img_key, sub_key)
+                self._wbi_sign_expire_at = time.monotonic() + WBI_KEYS_CACHE_TTL
+            return self._wbi_sign
+
+    def _invalidate_wbi_sign(self, wbi_sign: BilibiliSign) -> None:
+        """Drop the cached signer after its signature was rejected, concurrent failures refresh only once"""
+        if self._wbi_sign is wbi_sign:
+            self._rejected_wbi_keys = (wbi_sign.img_key, wbi_sign.sub_key)
+            self._wbi_sign = None
+
+    async def _signed_request(self, send: Callable[[Dict], Awaitable[Dict]], req_data: Optional[Dict]) -> Dict:
+        """
+        Sign req_data and send it, signing once more with refreshed wbi keys if the signature is rejected
+        :param send: sends the signed request data
+        :param req_data: request data to sign
+        :return:
+        """
+        if not req_data:
+            return await send({})
+        wbi_sign = await self._get_wbi_sign()
+        try:
+            return await send(wbi_sign.sign(dict(req_data)))
+        except WbiSignError as e:
+            utils.logger.warning(f"[BilibiliClient._signed_request] wbi signature rejected: {e}, refreshing wbi keys")
+            self._invalidate_wbi_sign(wbi_sign)
+            return await send(await self.pre_request_data(dict(req_data)))
+
+    async def get_wbi_keys(self, from_nav: bool = False) -> Tuple[str, str]:
         """
         Get the latest img_key and sub_key
+        :param from_nav: skip localStorage and read the keys from the nav api
         :return:
         """
-        local_storage = await self.playwright_page.evaluate("() => window.localStorage")
-        wbi_img_urls = local_storage.get("wbi_img_urls", "")
-        if not wbi_img_urls:
-            img_url_from_storage = local_storage.get("wbi_img_url")
-            sub_url_from_storage = local_storage.get("wbi_sub_url")
-            if img_url_from_storage and sub_url_from_storage:
-                wbi_img_urls = f"{img_url_from_storage}-{sub_url_from_storage}"
+        wbi_img_urls = ""
+        if not from_nav:
+            local_storage = await self.playwright_page.evaluate("() => window.localStorage")
+            wbi_img_urls = local_storage.get("wbi_img_urls", "")
+            if not wbi_img_urls:
+                img_url_from_storage = local_storage.get("wbi_img_url")
+                sub_url_from_storage = local_storage.get("wbi_sub_url")
+                if img_url_from_storage and sub_url_from_storage:
+                    wbi_img_urls = f"{img_url_from_storage}-{sub_url_from_storage}"
         if wbi_img_urls and "-" in wbi_img_urls:
             img_url, sub_url = wbi_img_urls.split("-")
         else:
@@ -116,18 +167,23 @@ class BilibiliClient(AbstractApiClient, ProxyRefreshMixin):
         return img_key, sub_key
 
     async def get(self, uri: str, params=None, enable_params_sign: bool = True) -> Dict:
-        final_uri = uri
+        async def send(params) -> Dict:
+            final_uri = uri
+            if isinstance(params, dict):
+                final_uri = (f"{uri}?"
+                             f"{urlencode(params)}")
+            return await self.request(method="GET", url=f"{self._host}{final_uri}", headers=self.headers)
+
         if enable_params_sign:
-            params = await self.pre_request_data(params)
-        if isinstance(params, dict):
-            final_uri = (f"{uri}?"
-                         f"{urlencode(params)}")
-        return await self.request(method="GET", url=f"{self._host}{final_uri}", headers=self.headers)
+            return await self._signed_request(send, params)
+        return await send(params)
 
     async def post(self, uri: str, data: dict) -> Dict:
-        data = await self.pre_request_data(data)
-        json_str = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
-        return await self.request(method="POST", url=f"{self._host}{uri}", data=json_str, headers=self.headers)
+        async def send(data) -> Dict:
+            json_str = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+            return await self.request(method="POST", url=f"{self._host}{uri}", data=json_str, headers=self.headers)
+
+        return await self._signed_request(send, data)
 
     async def pong(self) -> bool:
         """get a note to check if login state is ok"""
@@ -272,9 +328,10 @@ class BilibiliClient(AbstractApiClient, ProxyRefreshMixin):
         """
         result = []
         is_end = False
-        next_page = 0
+        # A resumed crawl continues after the last stored comment page of the video
+        next_page, crawled_count = checkpoint.comment_cursor(video_id, 0)
         max_retries = 3
-        while not is_end and len(result) < max_count:
+        while not is_end and crawled_count + len(result) < max_count:
             comments_res = None
             for attempt in range(max_retries):
                 try:
@@ -315,14 +372,14 @@ class BilibiliClient(AbstractApiClient, ProxyRefreshMixin):
                     comment_id = comment['rpid']
                     if (comment.get("rcount", 0) > 0):
                         {await self.get_video_all_level_two_comments(video_id, comment_id, CommentOrderType.DEFAULT, 10, crawl_interval, callback)}
-            if len(result) + len(comment_list) > max_count:
-                comment_list = comment_list[:max_count - len(result)]
+            if crawled_count + len(result) + len(comment_list) > max_count:
+                comment_list = comment_list[:max_count - crawled_count - len(result)]
             if callback:  # If there is a callback function, execute it
                 await callback(video_id, comment_list)
             await asyncio.sleep(crawl_interval)
             if not is_fetch_sub_comments:
                 result.extend(comment_list)
-                continue
+            checkpoint.save_comment_cursor(video_id, next_page, crawled_count + len(result))
         return result
 
     async def get_video_all_level_two_comments(
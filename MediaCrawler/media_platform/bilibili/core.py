@@ -28,7 +28,6 @@ import os
 from asyncio import Task
 from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
-import pandas as pd
 
 from playwright.async_api import (
     BrowserContext,
@@ -42,9 +41,11 @@ from playwright._impl._errors import TargetClosedError
 import config
 from base.base_crawler import AbstractCrawler
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
+from proxy.proxy_mixin import sticky_proxy
 from store import bilibili as bilibili_store
-from tools import utils
+from tools import checkpoint, progress, utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.resource_blocker import apply_resource_profile
 from var import crawler_type_var, source_keyword_var
 
 from .client import BilibiliClient
@@ -107,6 +108,9 @@ class BilibiliCrawler(AbstractCrawler):
                 await login_obj.begin()
                 await self.bili_client.update_cookies(browser_context=self.browser_context)
 
+            # Login has finished, the page is only needed for cookies and signing from here on
+            await apply_resource_profile(self.browser_context, "bili")
+
             crawler_type_var.set(config.CRAWLER_TYPE)
             if config.CRAWLER_TYPE == "search":
                 await self.search()
@@ -186,12 +190,13 @@ class BilibiliCrawler(AbstractCrawler):
         if config.CRAWLER_MAX_NOTES_COUNT < bili_limit_count:
             config.CRAWLER_MAX_NOTES_COUNT = bili_limit_count
         start_page = config.START_PAGE  # start page number
-        for keyword in config.KEYWORDS.split(","):
+        for keyword in checkpoint.iter_keywords(config.KEYWORDS.split(",")):
             source_keyword_var.set(keyword)
             utils.logger.info(f"[BilibiliCrawler.search_by_keywords] Current search keyword: {keyword}")
             page = 1
+            resume_page = checkpoint.resume_page(start_page)
             while (page - start_page + 1) * bili_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
-                if page < start_page:
+                if page < resume_page:
                     utils.logger.info(f"[BilibiliCrawler.search_by_keywords] Skip page: {page}")
                     page += 1
                     continue
@@ -226,23 +231,29 @@ class BilibiliCrawler(AbstractCrawler):
                         await bilibili_store.update_up_info(video_item)
                         await self.get_bilibili_video(video_item, semaphore)
                 page += 1
+                progress.page_done()
 
                 # Sleep after page navigation
                 await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
                 utils.logger.info(f"[BilibiliCrawler.search_by_keywords] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
 
                 await self.batch_get_video_comments(video_id_list)
+                checkpoint.page_done(page)
 
     async def search_by_keywords_in_time_range(self, daily_limit: bool):
         """
         Search bilibili video with keywords in a given time range.
         :param daily_limit: if True, strictly limit the number of notes per day and total.
         """
+        # pandas is only needed for the day range, keep it out of the crawler import
+        import pandas as pd
+
         utils.logger.info(f"[BilibiliCrawler.search_by_keywords_in_time_range] Begin search with daily_limit={daily_limit}")
         bili_limit_count = 20
         start_page = config.START_PAGE
 
-        for keyword in config.KEYWORDS.split(","):
+        # Resumes at keyword granularity, videos whose comments are done are not crawled again
+        for keyword in checkpoint.iter_keywords(config.KEYWORDS.split(",")):
             source_keyword_var.set(keyword)
             utils.logger.info(f"[BilibiliCrawler.search_by_keywords_in_time_range] Current search keyword: {keyword}")
             total_notes_crawled_for_keyword = 0
@@ -307,6 +318,7 @@ class BilibiliCrawler(AbstractCrawler):
                                 await self.get_bilibili_video(video_item, semaphore)
 
                         page += 1
+                        progress.page_done()
 
                         # Sleep after page navigation
                         await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
@@ -343,7 +355,9 @@ class BilibiliCrawler(AbstractCrawler):
         :param semaphore:
         :return:
         """
-        async with semaphore:
+        if checkpoint.comments_completed(video_id):
+            return
+        async with semaphore, sticky_proxy(video_id):
             try:
                 utils.logger.info(f"[BilibiliCrawler.get_comments] begin get video_id: {video_id} comments ...")
                 await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
@@ -355,6 +369,7 @@ class BilibiliCrawler(AbstractCrawler):
                     callback=bilibili_store.batch_update_bilibili_video_comments,
                     max_count=config.CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
                 )
+                checkpoint.comments_done(video_id)
 
             except DataFetchError as ex:
                 utils.logger.error(f"[BilibiliCrawler.get_comments] get video_id: {video_id} comment error: {ex}")
@@ -420,7 +435,7 @@ class BilibiliCrawler(AbstractCrawler):
         :param semaphore:
         :return:
         """
-        async with semaphore:
+        async with semaphore, sticky_proxy(bvid or aid):
             try:
                 result = await self.bili_client.get_video_info(aid=aid, bvid=bvid)
 
@@ -444,7 +459,7 @@ class BilibiliCrawler(AbstractCrawler):
         :param semaphore:
         :return:
         """
-        async with semaphore:
+        async with semaphore, sticky_proxy(aid):
             try:
                 result = await self.bili_client.get_video_play_url(aid=aid, cid=cid)
                 return result
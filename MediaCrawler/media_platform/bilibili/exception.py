@@ -30,5 +30,9 @@ class DataFetchError(RequestError):
     """something error when fetch"""
 
 
+class WbiSignError(DataFetchError):
+    """wbi signature rejected, usually because the img/sub keys have been rotated"""
+
+
 class IPBlockError(RequestError):
     """fetch so fast that the server block us ip"""
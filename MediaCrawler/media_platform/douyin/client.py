@@ -20,6 +20,7 @@
 import asyncio
 import copy
 import json
+import time
 import urllib.parse
 from typing import TYPE_CHECKING, Any, Callable, Dict, Union, Optional
 
@@ -28,7 +29,7 @@ from playwright.async_api import BrowserContext
 
 from base.base_crawler import AbstractApiClient
 from proxy.proxy_mixin import ProxyRefreshMixin
-from tools import utils
+from tools import checkpoint, utils
 from var import request_keyword_var
 
 if TYPE_CHECKING:
@@ -38,6 +39,43 @@ from .exception import *
 from .field import *
 from .help import *
 
+# 缓存的接口必须返回的字段，风控和未登录时返回 status_code 0 但该字段为空
+DOUYIN_CACHE_REQUIRED_FIELDS = {
+    "/aweme/v1/web/aweme/detail/": "aweme_detail",
+    "/aweme/v1/web/user/profile/other/": "user",
+}
+
+# 请求公共参数中不随请求变化的部分
+DOUYIN_STATIC_PARAMS = {
+    "device_platform": "webapp",
+    "aid": "6383",
+    "channel": "channel_pc_web",
+    "version_code": "190600",
+    "version_name": "19.6.0",
+    "update_version_code": "170400",
+    "pc_client_type": "1",
+    "cookie_enabled": "true",
+    "browser_language": "zh-CN",
+    "browser_platform": "MacIntel",
+    "browser_name": "Chrome",
+    "browser_version": "125.0.0.0",
+    "browser_online": "true",
+    "engine_name": "Blink",
+    "os_name": "Mac OS",
+    "os_version": "10.15.7",
+    "cpu_core_num": "8",
+    "device_memory": "8",
+    "engine_version": "109.0",
+    "platform": "PC",
+    "screen_width": "2560",
+    "screen_height": "1440",
+    'effective_type': '4g',
+    "round_trip_time": "50",
+}
+
+# msToken 由页面定期刷新到 localStorage，按该间隔重新读取，请求失败时立即重新读取
+MS_TOKEN_REFRESH_INTERVAL = 5 * 60
+
 
 class DouYinClient(AbstractApiClient, ProxyRefreshMixin):
 
@@ -57,9 +95,29 @@ class DouYinClient(AbstractApiClient, ProxyRefreshMixin):
         self._host = "https://www.douyin.com"
         self.playwright_page = playwright_page
         self.cookie_dict = cookie_dict
+        # 会话级公共参数：webid 在整个会话内保持不变
+        self._common_params = {**DOUYIN_STATIC_PARAMS, "webid": get_web_id()}
+        self._ms_token: Optional[str] = None
+        self._ms_token_expire_at = 0.0
+        self._ms_token_lock = asyncio.Lock()
         # 初始化代理池（来自 ProxyRefreshMixin）
         self.init_proxy_pool(proxy_ip_pool)
 
+    async def _get_ms_token(self) -> Optional[str]:
+        """
+        获取缓存的 msToken，过期后从页面 localStorage 重新读取，避免每个请求都经过浏览器
+        """
+        async with self._ms_token_lock:
+            if time.monotonic() >= self._ms_token_expire_at:
+                local_storage: Dict = await self.playwright_page.evaluate("() => window.localStorage")  # type: ignore
+                self._ms_token = local_storage.get("xmst")
+                self._ms_token_expire_at = time.monotonic() + MS_TOKEN_REFRESH_INTERVAL
+            return self._ms_token
+
+    def _invalidate_ms_token(self) -> None:
+        """请求失败后下一次请求重新读取 msToken"""
+        self._ms_token_expire_at = 0.0
+
     async def __process_req_params(
         self,
         uri: str,
@@ -71,36 +129,8 @@ class DouYinClient(AbstractApiClient, ProxyRefreshMixin):
         if not params:
             return
         headers = headers or self.headers
-        local_storage: Dict = await self.playwright_page.evaluate("() => window.localStorage")  # type: ignore
-        common_params = {
-            "device_platform": "webapp",
-            "aid": "6383",
-            "channel": "channel_pc_web",
-            "version_code": "190600",
-            "version_name": "19.6.0",
-            "update_version_code": "170400",
-            "pc_client_type": "1",
-            "cookie_enabled": "true",
-            "browser_language": "zh-CN",
-            "browser_platform": "MacIntel",
-            "browser_name": "Chrome",
-            "browser_version": "125.0.0.0",
-            "browser_online": "true",
-            "engine_name": "Blink",
-            "os_name": "Mac OS",
-            "os_version": "10.15.7",
-            "cpu_core_num": "8",
-            "device_memory": "8",
-            "engine_version": "109.0",
-            "platform": "PC",
-            "screen_width": "2560",
-            "screen_height": "1440",
-            'effective_type': '4g',
-            "round_trip_time": "50",
-            "webid": get_web_id(),
-            "msToken": local_storage.get("xmst"),
-        }
-        params.update(common_params)
+        params.update(self._common_params)
+        params["msToken"] = await self._get_ms_token()
         query_string = urllib.parse.urlencode(params)
 
         # 20240927 a-bogus更新（JS版本）
@@ -113,19 +143,26 @@ class DouYinClient(AbstractApiClient, ProxyRefreshMixin):
             params["a_bogus"] = a_bogus
 
     async def request(self, method, url, **kwargs):
-        # 每次请求前检测代理是否过期
-        await self._refresh_proxy_if_expired()
-
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            response = await client.request(method, url, timeout=self.timeout, **kwargs)
+        response = await self._send_request(method, url, timeout=self.timeout, **kwargs)
         try:
             if response.text == "" or response.text == "blocked":
                 utils.logger.error(f"request params incrr, response.text: {response.text}")
+                self._report_proxy_result(False)
                 raise Exception("account blocked")
             return response.json()
         except Exception as e:
+            self._invalidate_ms_token()
             raise DataFetchError(f"{e}, {response.text}")
 
+    def is_cacheable_response(self, method, url, response) -> bool:
+        """
+        只缓存业务成功的响应，风控、需要登录的响应不进入接口缓存
+        """
+        if not isinstance(response, dict) or response.get("status_code") != 0:
+            return False
+        required_field = DOUYIN_CACHE_REQUIRED_FIELDS.get(urllib.parse.urlsplit(url).path)
+        return required_field is None or response.get(required_field) is not None
+
     async def get(self, uri: str, params: Optional[Dict] = None, headers: Optional[Dict] = None):
         """
         GET请求
@@ -255,22 +292,24 @@ class DouYinClient(AbstractApiClient, ProxyRefreshMixin):
         """
         result = []
         comments_has_more = 1
-        comments_cursor = 0
-        while comments_has_more and len(result) < max_count:
+        # 断点续爬时从该帖子最后一页已保存评论之后继续
+        comments_cursor, crawled_count = checkpoint.comment_cursor(aweme_id, 0)
+        while comments_has_more and crawled_count + len(result) < max_count:
             comments_res = await self.get_aweme_comments(aweme_id, comments_cursor)
             comments_has_more = comments_res.get("has_more", 0)
             comments_cursor = comments_res.get("cursor", 0)
             comments = comments_res.get("comments", [])
             if not comments:
                 continue
-            if len(result) + len(comments) > max_count:
-                comments = comments[:max_count - len(result)]
+            if crawled_count + len(result) + len(comments) > max_count:
+                comments = comments[:max_count - crawled_count - len(result)]
             result.extend(comments)
             if callback:  # 如果有回调函数，就执行回调函数
                 await callback(aweme_id, comments)
 
             await asyncio.sleep(crawl_interval)
             if not is_fetch_sub_comments:
+                checkpoint.save_comment_cursor(aweme_id, comments_cursor, crawled_count + len(result))
                 continue
             # 获取二级评论
             for comment in comments:
@@ -293,6 +332,7 @@ class DouYinClient(AbstractApiClient, ProxyRefreshMixin):
                         if callback:  # 如果有回调函数，就执行回调函数
                             await callback(aweme_id, sub_comments)
                         await asyncio.sleep(crawl_interval)
+            checkpoint.save_comment_cursor(aweme_id, comments_cursor, crawled_count + len(result))
         return result
 
     async def get_user_info(self, sec_user_id: str):
@@ -34,9 +34,11 @@ from playwright.async_api import (
 import config
 from base.base_crawler import AbstractCrawler
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
+from proxy.proxy_mixin import sticky_proxy
 from store import douyin as douyin_store
-from tools import utils
+from tools import checkpoint, progress, utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.resource_blocker import apply_resource_profile
 from var import crawler_type_var, source_keyword_var
 
 from .client import DouYinClient
@@ -101,6 +103,10 @@ class DouYinCrawler(AbstractCrawler):
                 )
                 await login_obj.begin()
                 await self.dy_client.update_cookies(browser_context=self.browser_context)
+
+            # Login has finished, the page is only needed for cookies and signing from here on
+            await apply_resource_profile(self.browser_context, "dy")
+
             crawler_type_var.set(config.CRAWLER_TYPE)
             if config.CRAWLER_TYPE == "search":
                 # Search for notes and retrieve their comment information.
@@ -120,14 +126,15 @@ class DouYinCrawler(AbstractCrawler):
         if config.CRAWLER_MAX_NOTES_COUNT < dy_limit_count:
             config.CRAWLER_MAX_NOTES_COUNT = dy_limit_count
         start_page = config.START_PAGE  # start page number
-        for keyword in config.KEYWORDS.split(","):
+        for keyword in checkpoint.iter_keywords(config.KEYWORDS.split(",")):
             source_keyword_var.set(keyword)
             utils.logger.info(f"[DouYinCrawler.search] Current keyword: {keyword}")
             aweme_list: List[str] = []
             page = 0
-            dy_search_id = ""
+            resume_page = checkpoint.resume_page(start_page)
+            dy_search_id = checkpoint.search_id("")
             while (page - start_page + 1) * dy_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
-                if page < start_page:
+                if page < resume_page:
                     utils.logger.info(f"[DouYinCrawler.search] Skip {page}")
                     page += 1
                     continue
@@ -147,10 +154,12 @@ class DouYinCrawler(AbstractCrawler):
                     break
 
                 page += 1
+                progress.page_done()
                 if "data" not in posts_res:
                     utils.logger.error(f"[DouYinCrawler.search] search douyin keyword: {keyword} failed，账号也许被风控了。")
                     break
                 dy_search_id = posts_res.get("extra", {}).get("logid", "")
+                checkpoint.set_search_id(dy_search_id)
                 page_aweme_list = []
                 for post_item in posts_res.get("data"):
                     try:
@@ -164,6 +173,7 @@ class DouYinCrawler(AbstractCrawler):
                 
                 # Batch get note comments for the current page
                 await self.batch_get_note_comments(page_aweme_list)
+                checkpoint.page_done(page)
 
                 # Sleep after each page navigation
                 await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
@@ -207,7 +217,7 @@ class DouYinCrawler(AbstractCrawler):
 
     async def get_aweme_detail(self, aweme_id: str, semaphore: asyncio.Semaphore) -> Any:
         """Get note detail"""
-        async with semaphore:
+        async with semaphore, sticky_proxy(aweme_id):
             try:
                 result = await self.dy_client.get_video_by_id(aweme_id)
                 # Sleep after fetching aweme detail
@@ -238,7 +248,9 @@ class DouYinCrawler(AbstractCrawler):
             await asyncio.wait(task_list)
 
     async def get_comments(self, aweme_id: str, semaphore: asyncio.Semaphore) -> None:
-        async with semaphore:
+        if checkpoint.comments_completed(aweme_id):
+            return
+        async with semaphore, sticky_proxy(aweme_id):
             try:
                 # 将关键词列表传递给 get_aweme_all_comments 方法
                 # Use fixed crawling interval
@@ -250,6 +262,7 @@ class DouYinCrawler(AbstractCrawler):
                     callback=douyin_store.batch_update_dy_aweme_comments,
                     max_count=config.CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
                 )
+                checkpoint.comments_done(aweme_id)
                 # Sleep after fetching comments
                 await asyncio.sleep(crawl_interval)
                 utils.logger.info(f"[DouYinCrawler.get_comments] Sleeping for {crawl_interval} seconds after fetching comments for aweme {aweme_id}")
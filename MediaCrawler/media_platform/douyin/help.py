@@ -26,6 +26,7 @@
 
 import random
 import re
+from functools import lru_cache
 from typing import Optional
 
 import execjs
@@ -33,8 +34,15 @@ from playwright.async_api import Page
 
 from model.m_douyin import VideoUrlInfo, CreatorUrlInfo
 from tools.crawler_util import extract_url_params_to_dict
+from tools.perf_metrics import measure_sign
+
+
+@lru_cache(maxsize=1)
+def get_douyin_sign_obj():
+    """Compile libs/douyin.js on first use instead of at import time"""
+    with open('libs/douyin.js', encoding='utf-8-sig') as f:
+        return execjs.compile(f.read())
 
-douyin_sign_obj = execjs.compile(open('libs/douyin.js', encoding='utf-8-sig').read())
 
 def get_web_id():
     """
@@ -64,6 +72,7 @@ async def get_a_bogus(url: str, params: str, post_data: dict, user_agent: str, p
     """
     return get_a_bogus_from_js(url, params, user_agent)
 
+@measure_sign("dy", "execjs")
 def get_a_bogus_from_js(url: str, params: str, user_agent: str):
     """
     Get a_bogus parameter through js
@@ -78,7 +87,7 @@ def get_a_bogus_from_js(url: str, params: str, user_agent: str):
     sign_js_name = "sign_datail"
     if "/reply" in url:
         sign_js_name = "sign_reply"
-    return douyin_sign_obj.call(sign_js_name, params, user_agent)
+    return get_douyin_sign_obj().call(sign_js_name, params, user_agent)
 
 
 
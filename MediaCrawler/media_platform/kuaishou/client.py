@@ -24,13 +24,12 @@ import json
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 from urllib.parse import urlencode
 
-import httpx
 from playwright.async_api import BrowserContext, Page
 
 import config
 from base.base_crawler import AbstractApiClient
 from proxy.proxy_mixin import ProxyRefreshMixin
-from tools import utils
+from tools import checkpoint, utils
 
 if TYPE_CHECKING:
     from proxy.proxy_ip_pool import ProxyIpPool
@@ -61,11 +60,7 @@ class KuaiShouClient(AbstractApiClient, ProxyRefreshMixin):
         self.init_proxy_pool(proxy_ip_pool)
 
     async def request(self, method, url, **kwargs) -> Any:
-        # Check if proxy is expired before each request
-        await self._refresh_proxy_if_expired()
-
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            response = await client.request(method, url, timeout=self.timeout, **kwargs)
+        response = await self._send_request(method, url, timeout=self.timeout, **kwargs)
         data: Dict = response.json()
         if data.get("errors"):
             raise DataFetchError(data.get("errors", "unkonw error"))
@@ -213,15 +208,16 @@ class KuaiShouClient(AbstractApiClient, ProxyRefreshMixin):
         """
 
         result = []
-        pcursor = ""
+        # A resumed crawl continues after the last stored comment page of the video
+        pcursor, crawled_count = checkpoint.comment_cursor(photo_id, "")
 
-        while pcursor != "no_more" and len(result) < max_count:
+        while pcursor != "no_more" and crawled_count + len(result) < max_count:
             comments_res = await self.get_video_comments(photo_id, pcursor)
             vision_commen_list = comments_res.get("visionCommentList", {})
             pcursor = vision_commen_list.get("pcursor", "")
             comments = vision_commen_list.get("rootComments", [])
-            if len(result) + len(comments) > max_count:
-                comments = comments[: max_count - len(result)]
+            if crawled_count + len(result) + len(comments) > max_count:
+                comments = comments[: max_count - crawled_count - len(result)]
             if callback:  # If there is a callback function, execute the callback function
                 await callback(photo_id, comments)
             result.extend(comments)
@@ -230,6 +226,7 @@ class KuaiShouClient(AbstractApiClient, ProxyRefreshMixin):
                 comments, photo_id, crawl_interval, callback
             )
             result.extend(sub_comments)
+            checkpoint.save_comment_cursor(photo_id, pcursor, crawled_count + len(result))
         return result
 
     async def get_comments_all_sub_comments(
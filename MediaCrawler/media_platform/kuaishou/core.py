@@ -37,9 +37,11 @@ import config
 from base.base_crawler import AbstractCrawler
 from model.m_kuaishou import VideoUrlInfo, CreatorUrlInfo
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
+from proxy.proxy_mixin import sticky_proxy
 from store import kuaishou as kuaishou_store
-from tools import utils
+from tools import checkpoint, progress, utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.resource_blocker import apply_resource_profile
 from var import comment_tasks_var, crawler_type_var, source_keyword_var
 
 from .client import KuaiShouClient
@@ -110,6 +112,9 @@ class KuaishouCrawler(AbstractCrawler):
                     browser_context=self.browser_context
                 )
 
+            # Login has finished, the page is only needed for cookies and signing from here on
+            await apply_resource_profile(self.browser_context, "ks")
+
             crawler_type_var.set(config.CRAWLER_TYPE)
             if config.CRAWLER_TYPE == "search":
                 # Search for videos and retrieve their comment information.
@@ -131,17 +136,18 @@ class KuaishouCrawler(AbstractCrawler):
         if config.CRAWLER_MAX_NOTES_COUNT < ks_limit_count:
             config.CRAWLER_MAX_NOTES_COUNT = ks_limit_count
         start_page = config.START_PAGE
-        for keyword in config.KEYWORDS.split(","):
-            search_session_id = ""
+        for keyword in checkpoint.iter_keywords(config.KEYWORDS.split(",")):
+            search_session_id = checkpoint.search_id("")
             source_keyword_var.set(keyword)
             utils.logger.info(
                 f"[KuaishouCrawler.search] Current search keyword: {keyword}"
             )
             page = 1
+            resume_page = checkpoint.resume_page(start_page)
             while (
                 page - start_page + 1
             ) * ks_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
-                if page < start_page:
+                if page < resume_page:
                     utils.logger.info(f"[KuaishouCrawler.search] Skip page: {page}")
                     page += 1
                     continue
@@ -167,18 +173,21 @@ class KuaishouCrawler(AbstractCrawler):
                     )
                     continue
                 search_session_id = vision_search_photo.get("searchSessionId", "")
+                checkpoint.set_search_id(search_session_id)
                 for video_detail in vision_search_photo.get("feeds"):
                     video_id_list.append(video_detail.get("photo", {}).get("id"))
                     await kuaishou_store.update_kuaishou_video(video_item=video_detail)
 
                 # batch fetch video comments
                 page += 1
+                progress.page_done()
 
                 # Sleep after page navigation
                 await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
                 utils.logger.info(f"[KuaishouCrawler.search] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
 
                 await self.batch_get_video_comments(video_id_list)
+                checkpoint.page_done(page)
 
     async def get_specified_videos(self):
         """Get the information and comments of the specified post"""
@@ -208,7 +217,7 @@ class KuaishouCrawler(AbstractCrawler):
         self, video_id: str, semaphore: asyncio.Semaphore
     ) -> Optional[Dict]:
         """Get video detail task"""
-        async with semaphore:
+        async with semaphore, sticky_proxy(video_id):
             try:
                 result = await self.ks_client.get_video_info(video_id)
 
@@ -264,7 +273,9 @@ class KuaishouCrawler(AbstractCrawler):
         :param semaphore:
         :return:
         """
-        async with semaphore:
+        if checkpoint.comments_completed(video_id):
+            return
+        async with semaphore, sticky_proxy(video_id):
             try:
                 utils.logger.info(
                     f"[KuaishouCrawler.get_comments] begin get video_id: {video_id} comments ..."
@@ -280,6 +291,7 @@ class KuaishouCrawler(AbstractCrawler):
                     callback=kuaishou_store.batch_update_ks_video_comments,
                     max_count=config.CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
                 )
+                checkpoint.comments_done(video_id)
             except DataFetchError as ex:
                 utils.logger.error(
                     f"[KuaishouCrawler.get_comments] get video_id: {video_id} comment error: {ex}"
@@ -22,7 +22,6 @@ import json
 from typing import Any, Callable, Dict, List, Optional, Union
 from urllib.parse import urlencode, quote
 
-import requests
 from playwright.async_api import BrowserContext, Page
 from tenacity import RetryError, retry, stop_after_attempt, wait_fixed
 
@@ -30,23 +29,27 @@ import config
 from base.base_crawler import AbstractApiClient
 from model.m_baidu_tieba import TiebaComment, TiebaCreator, TiebaNote
 from proxy.proxy_ip_pool import ProxyIpPool
+from proxy.proxy_mixin import ProxyRefreshMixin
 from tools import utils
+from tools.perf_metrics import record_retry
+from tools.parse_pool import run_in_parse_pool
 
 from .field import SearchNoteType, SearchSortType
 from .help import TieBaExtractor
 
 
-class BaiduTieBaClient(AbstractApiClient):
+class BaiduTieBaClient(AbstractApiClient, ProxyRefreshMixin):
 
     def __init__(
         self,
         timeout=10,
-        ip_pool=None,
-        default_ip_proxy=None,
+        proxy=None,
+        *,
         headers: Dict[str, str] = None,
         playwright_page: Optional[Page] = None,
+        proxy_ip_pool: Optional["ProxyIpPool"] = None,
     ):
-        self.ip_pool: Optional[ProxyIpPool] = ip_pool
+        self.proxy = proxy
         self.timeout = timeout
         # Use provided headers (including real browser UA) or default headers
         self.headers = headers or {
@@ -55,84 +58,25 @@ class BaiduTieBaClient(AbstractApiClient):
         }
         self._host = "https://tieba.baidu.com"
         self._page_extractor = TieBaExtractor()
-        self.default_ip_proxy = default_ip_proxy
         self.playwright_page = playwright_page  # Playwright page object
+        # Initialize proxy pool (from ProxyRefreshMixin)
+        self.init_proxy_pool(proxy_ip_pool)
 
-    def _sync_request(self, method, url, proxy=None, **kwargs):
+    @retry(stop=stop_after_attempt(3), wait=wait_fixed(1), before_sleep=record_retry)
+    async def request(self, method, url, return_ori_content=False, **kwargs) -> Union[str, Any]:
         """
-        Synchronous requests method
-        Args:
-            method: Request method
-            url: Request URL
-            proxy: Proxy IP
-            **kwargs: Other request parameters
-
-        Returns:
-            Response object
-        """
-        # Construct proxy dictionary
-        proxies = None
-        if proxy:
-            proxies = {
-                "http": proxy,
-                "https": proxy,
-            }
-
-        # Send request
-        response = requests.request(
-            method=method,
-            url=url,
-            headers=self.headers,
-            proxies=proxies,
-            timeout=self.timeout,
-            **kwargs
-        )
-        return response
-
-    async def _refresh_proxy_if_expired(self) -> None:
-        """
-        Check if proxy is expired and automatically refresh if necessary
-        """
-        if self.ip_pool is None:
-            return
-
-        if self.ip_pool.is_current_proxy_expired():
-            utils.logger.info(
-                "[BaiduTieBaClient._refresh_proxy_if_expired] Proxy expired, refreshing..."
-            )
-            new_proxy = await self.ip_pool.get_or_refresh_proxy()
-            # Update proxy URL
-            _, self.default_ip_proxy = utils.format_proxy_info(new_proxy)
-            utils.logger.info(
-                f"[BaiduTieBaClient._refresh_proxy_if_expired] New proxy: {new_proxy.ip}:{new_proxy.port}"
-            )
-
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(1))
-    async def request(self, method, url, return_ori_content=False, proxy=None, **kwargs) -> Union[str, Any]:
-        """
-        Common request method wrapper for requests, handles request responses
+        Common request method wrapper for httpx, handles request responses
         Args:
             method: Request method
             url: Request URL
             return_ori_content: Whether to return original content
-            proxy: Proxy IP
             **kwargs: Other request parameters, such as headers, request body, etc.
 
         Returns:
 
         """
-        # Check if proxy is expired before each request
-        await self._refresh_proxy_if_expired()
-
-        actual_proxy = proxy if proxy else self.default_ip_proxy
-
-        # Execute synchronous requests in thread pool
-        response = await asyncio.to_thread(
-            self._sync_request,
-            method,
-            url,
-            actual_proxy,
-            **kwargs
+        response = await self._send_request(
+            method, url, headers=self.headers, timeout=self.timeout, follow_redirects=True, **kwargs
         )
 
         if response.status_code != 200:
@@ -142,6 +86,7 @@ class BaiduTieBaClient(AbstractApiClient):
 
         if response.text == "" or response.text == "blocked":
             utils.logger.error(f"request params incorrect, response.text: {response.text}")
+            self._report_proxy_result(False)
             raise Exception("account blocked")
 
         if return_ori_content:
@@ -168,11 +113,10 @@ class BaiduTieBaClient(AbstractApiClient):
             res = await self.request(method="GET", url=f"{self._host}{final_uri}", return_ori_content=return_ori_content, **kwargs)
             return res
         except RetryError as e:
-            if self.ip_pool:
-                proxie_model = await self.ip_pool.get_proxy()
-                _, proxy = utils.format_proxy_info(proxie_model)
-                res = await self.request(method="GET", url=f"{self._host}{final_uri}", return_ori_content=return_ori_content, proxy=proxy, **kwargs)
-                self.default_ip_proxy = proxy
+            if self._proxy_ip_pool:
+                proxie_model = await self._proxy_ip_pool.get_proxy()
+                _, self.proxy = utils.format_proxy_info(proxie_model)
+                res = await self.request(method="GET", url=f"{self._host}{final_uri}", return_ori_content=return_ori_content, **kwargs)
                 return res
 
             utils.logger.error(f"[BaiduTieBaClient.get] Reached maximum retry attempts, IP is blocked, please try a new IP proxy: {e}")
@@ -291,7 +235,7 @@ class BaiduTieBaClient(AbstractApiClient):
             utils.logger.info(f"[BaiduTieBaClient.get_notes_by_keyword] Successfully retrieved search page HTML, length: {len(page_content)}")
 
             # Extract search results
-            notes = self._page_extractor.extract_search_note_list(page_content)
+            notes = await run_in_parse_pool(self._page_extractor.extract_search_note_list, page_content)
             utils.logger.info(f"[BaiduTieBaClient.get_notes_by_keyword] Extracted {len(notes)} posts")
             return notes
 
@@ -328,7 +272,7 @@ class BaiduTieBaClient(AbstractApiClient):
             utils.logger.info(f"[BaiduTieBaClient.get_note_by_id] Successfully retrieved post detail HTML, length: {len(page_content)}")
 
             # Extract post details
-            note_detail = self._page_extractor.extract_note_detail(page_content)
+            note_detail = await run_in_parse_pool(self._page_extractor.extract_note_detail, page_content)
             return note_detail
 
         except Exception as e:
@@ -375,8 +319,8 @@ class BaiduTieBaClient(AbstractApiClient):
                 page_content = await self.playwright_page.content()
 
                 # Extract comments
-                comments = self._page_extractor.extract_tieba_note_parment_comments(
-                    page_content, note_id=note_detail.note_id
+                comments = await run_in_parse_pool(
+                    self._page_extractor.extract_tieba_note_parment_comments, page_content, note_detail.note_id
                 )
 
                 if not comments:
@@ -461,8 +405,8 @@ class BaiduTieBaClient(AbstractApiClient):
                     page_content = await self.playwright_page.content()
 
                     # Extract sub-comments
-                    sub_comments = self._page_extractor.extract_tieba_note_sub_comments(
-                        page_content, parent_comment=parment_comment
+                    sub_comments = await run_in_parse_pool(
+                        self._page_extractor.extract_tieba_note_sub_comments, page_content, parment_comment
                     )
 
                     if not sub_comments:
@@ -519,7 +463,7 @@ class BaiduTieBaClient(AbstractApiClient):
             utils.logger.info(f"[BaiduTieBaClient.get_notes_by_tieba_name] Successfully retrieved Tieba page HTML, length: {len(page_content)}")
 
             # Extract post list
-            notes = self._page_extractor.extract_tieba_note_list(page_content)
+            notes = await run_in_parse_pool(self._page_extractor.extract_tieba_note_list, page_content)
             utils.logger.info(f"[BaiduTieBaClient.get_notes_by_tieba_name] Extracted {len(notes)} posts")
             return notes
 
@@ -626,7 +570,9 @@ class BaiduTieBaClient(AbstractApiClient):
         # Baidu Tieba is special, the first 10 posts are directly displayed on the homepage and need special handling, cannot be obtained through API
         result: List[TiebaNote] = []
         if creator_page_html_content:
-            thread_id_list = (self._page_extractor.extract_tieba_thread_id_list_from_creator_page(creator_page_html_content))
+            thread_id_list = await run_in_parse_pool(
+                self._page_extractor.extract_tieba_thread_id_list_from_creator_page, creator_page_html_content
+            )
             utils.logger.info(f"[BaiduTieBaClient.get_all_notes_by_creator] got user_name:{user_name} thread_id_list len : {len(thread_id_list)}")
             note_detail_task = [self.get_note_by_id(thread_id) for thread_id in thread_id_list]
             notes = await asyncio.gather(*note_detail_task)
@@ -36,8 +36,10 @@ from base.base_crawler import AbstractCrawler
 from model.m_baidu_tieba import TiebaCreator, TiebaNote
 from proxy.proxy_ip_pool import IpInfoModel, ProxyIpPool, create_ip_pool
 from store import tieba as tieba_store
-from tools import utils
+from tools import checkpoint, progress, utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.parse_pool import run_in_parse_pool
+from tools.resource_blocker import apply_resource_profile
 from var import crawler_type_var, source_keyword_var
 
 from .client import BaiduTieBaClient
@@ -57,6 +59,7 @@ class TieBaCrawler(AbstractCrawler):
         self.user_agent = utils.get_user_agent()
         self._page_extractor = TieBaExtractor()
         self.cdp_manager = None
+        self.ip_proxy_pool = None  # Proxy IP pool for automatic proxy refresh
 
     async def start(self) -> None:
         """
@@ -69,10 +72,10 @@ class TieBaCrawler(AbstractCrawler):
             utils.logger.info(
                 "[BaiduTieBaCrawler.start] Begin create ip proxy pool ..."
             )
-            ip_proxy_pool = await create_ip_pool(
+            self.ip_proxy_pool = await create_ip_pool(
                 config.IP_PROXY_POOL_COUNT, enable_validate_ip=True
             )
-            ip_proxy_info: IpInfoModel = await ip_proxy_pool.get_proxy()
+            ip_proxy_info: IpInfoModel = await self.ip_proxy_pool.get_proxy()
             playwright_proxy_format, httpx_proxy_format = utils.format_proxy_info(ip_proxy_info)
             utils.logger.info(
                 f"[BaiduTieBaCrawler.start] Init default ip proxy, value: {httpx_proxy_format}"
@@ -110,7 +113,7 @@ class TieBaCrawler(AbstractCrawler):
             # Create a client to interact with the baidutieba website.
             self.tieba_client = await self.create_tieba_client(
                 httpx_proxy_format,
-                ip_proxy_pool if config.ENABLE_IP_PROXY else None
+                self.ip_proxy_pool
             )
 
             # Check login status and perform login if necessary
@@ -125,6 +128,9 @@ class TieBaCrawler(AbstractCrawler):
                 await login_obj.begin()
                 await self.tieba_client.update_cookies(browser_context=self.browser_context)
 
+            # Login has finished, the page is only needed for cookies and signing from here on
+            await apply_resource_profile(self.browser_context, "tieba")
+
             crawler_type_var.set(config.CRAWLER_TYPE)
             if config.CRAWLER_TYPE == "search":
                 # Search for notes and retrieve their comment information.
@@ -154,16 +160,17 @@ class TieBaCrawler(AbstractCrawler):
         if config.CRAWLER_MAX_NOTES_COUNT < tieba_limit_count:
             config.CRAWLER_MAX_NOTES_COUNT = tieba_limit_count
         start_page = config.START_PAGE
-        for keyword in config.KEYWORDS.split(","):
+        for keyword in checkpoint.iter_keywords(config.KEYWORDS.split(",")):
             source_keyword_var.set(keyword)
             utils.logger.info(
                 f"[BaiduTieBaCrawler.search] Current search keyword: {keyword}"
             )
             page = 1
+            resume_page = checkpoint.resume_page(start_page)
             while (
                 page - start_page + 1
             ) * tieba_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
-                if page < start_page:
+                if page < resume_page:
                     utils.logger.info(f"[BaiduTieBaCrawler.search] Skip page {page}")
                     page += 1
                     continue
@@ -197,6 +204,8 @@ class TieBaCrawler(AbstractCrawler):
                     utils.logger.info(f"[TieBaCrawler.search] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page}")
 
                     page += 1
+                    progress.page_done()
+                    checkpoint.page_done(page)
                 except Exception as ex:
                     utils.logger.error(
                         f"[BaiduTieBaCrawler.search] Search keywords error, current page: {page}, current keyword: {keyword}, err: {ex}"
@@ -338,6 +347,8 @@ class TieBaCrawler(AbstractCrawler):
         Returns:
 
         """
+        if checkpoint.comments_completed(note_detail.note_id):
+            return
         async with semaphore:
             utils.logger.info(
                 f"[BaiduTieBaCrawler.get_comments] Begin get note id comments {note_detail.note_id}"
@@ -353,6 +364,7 @@ class TieBaCrawler(AbstractCrawler):
                 callback=tieba_store.batch_update_tieba_note_comments,
                 max_count=config.CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
             )
+            checkpoint.comments_done(note_detail.note_id)
 
     async def get_creators_and_notes(self) -> None:
         """
@@ -367,8 +379,8 @@ class TieBaCrawler(AbstractCrawler):
             creator_page_html_content = await self.tieba_client.get_creator_info_by_url(
                 creator_url=creator_url
             )
-            creator_info: TiebaCreator = self._page_extractor.extract_creator_info(
-                creator_page_html_content
+            creator_info: TiebaCreator = await run_in_parse_pool(
+                self._page_extractor.extract_creator_info, creator_page_html_content
             )
             if creator_info:
                 utils.logger.info(
@@ -565,8 +577,7 @@ class TieBaCrawler(AbstractCrawler):
         # Build complete browser request headers, simulating real browser behavior
         tieba_client = BaiduTieBaClient(
             timeout=10,
-            ip_pool=ip_pool,
-            default_ip_proxy=httpx_proxy,
+            proxy=httpx_proxy,
             headers={
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
                 "Accept-Language": "zh-CN,zh;q=0.9",
@@ -586,6 +597,7 @@ class TieBaCrawler(AbstractCrawler):
                 "sec-ch-ua-platform": '"macOS"',
             },
             playwright_page=self.context_page,  # Pass in playwright page object
+            proxy_ip_pool=ip_pool,  # Pass proxy pool for automatic refresh
         )
         return tieba_client
 
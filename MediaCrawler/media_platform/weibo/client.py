@@ -36,7 +36,8 @@ from tenacity import retry, stop_after_attempt, wait_fixed
 
 import config
 from proxy.proxy_mixin import ProxyRefreshMixin
-from tools import utils
+from tools import checkpoint, utils
+from tools.perf_metrics import record_retry
 
 if TYPE_CHECKING:
     from proxy.proxy_ip_pool import ProxyIpPool
@@ -67,14 +68,10 @@ class WeiboClient(ProxyRefreshMixin):
         # Initialize proxy pool (from ProxyRefreshMixin)
         self.init_proxy_pool(proxy_ip_pool)
 
-    @retry(stop=stop_after_attempt(5), wait=wait_fixed(3))
+    @retry(stop=stop_after_attempt(5), wait=wait_fixed(3), before_sleep=record_retry)
     async def request(self, method, url, **kwargs) -> Union[Response, Dict]:
-        # Check if proxy is expired before each request
-        await self._refresh_proxy_if_expired()
-
         enable_return_response = kwargs.pop("return_response", False)
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            response = await client.request(method, url, timeout=self.timeout, **kwargs)
+        response = await self._send_request(method, url, timeout=self.timeout, **kwargs)
 
         if enable_return_response:
             return response
@@ -207,23 +204,24 @@ class WeiboClient(ProxyRefreshMixin):
         :return:
         """
         result = []
-        is_end = False
-        max_id = -1
-        max_id_type = 0
-        while not is_end and len(result) < max_count:
+        # A resumed crawl continues after the last stored comment page of the note
+        (max_id, max_id_type), crawled_count = checkpoint.comment_cursor(note_id, (-1, 0))
+        is_end = max_id == 0
+        while not is_end and crawled_count + len(result) < max_count:
             comments_res = await self.get_note_comments(note_id, max_id, max_id_type)
             max_id: int = comments_res.get("max_id")
             max_id_type: int = comments_res.get("max_id_type")
             comment_list: List[Dict] = comments_res.get("data", [])
             is_end = max_id == 0
-            if len(result) + len(comment_list) > max_count:
-                comment_list = comment_list[:max_count - len(result)]
+            if crawled_count + len(result) + len(comment_list) > max_count:
+                comment_list = comment_list[:max_count - crawled_count - len(result)]
             if callback:  # If callback function exists, execute it
                 await callback(note_id, comment_list)
             await asyncio.sleep(crawl_interval)
             result.extend(comment_list)
             sub_comment_result = await self.get_comments_all_sub_comments(note_id, comment_list, callback)
             result.extend(sub_comment_result)
+            checkpoint.save_comment_cursor(note_id, (max_id, max_id_type), crawled_count + len(result))
         return result
 
     @staticmethod
@@ -39,9 +39,11 @@ from playwright.async_api import (
 import config
 from base.base_crawler import AbstractCrawler
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
+from proxy.proxy_mixin import sticky_proxy
 from store import weibo as weibo_store
-from tools import utils
+from tools import checkpoint, progress, utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.resource_blocker import apply_resource_profile
 from var import crawler_type_var, source_keyword_var
 
 from .client import WeiboClient
@@ -119,6 +121,9 @@ class WeiboCrawler(AbstractCrawler):
                     urls=[self.mobile_index_url]
                 )
 
+            # Login has finished, the page is only needed for cookies and signing from here on
+            await apply_resource_profile(self.browser_context, "wb")
+
             crawler_type_var.set(config.CRAWLER_TYPE)
             if config.CRAWLER_TYPE == "search":
                 # Search for video and retrieve their comment information.
@@ -157,12 +162,13 @@ class WeiboCrawler(AbstractCrawler):
             utils.logger.error(f"[WeiboCrawler.search] Invalid WEIBO_SEARCH_TYPE: {config.WEIBO_SEARCH_TYPE}")
             return
 
-        for keyword in config.KEYWORDS.split(","):
+        for keyword in checkpoint.iter_keywords(config.KEYWORDS.split(",")):
             source_keyword_var.set(keyword)
             utils.logger.info(f"[WeiboCrawler.search] Current search keyword: {keyword}")
             page = 1
+            resume_page = checkpoint.resume_page(start_page)
             while (page - start_page + 1) * weibo_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
-                if page < start_page:
+                if page < resume_page:
                     utils.logger.info(f"[WeiboCrawler.search] Skip page: {page}")
                     page += 1
                     continue
@@ -181,12 +187,14 @@ class WeiboCrawler(AbstractCrawler):
                             await self.get_note_images(mblog)
 
                 page += 1
+                progress.page_done()
 
                 # Sleep after page navigation
                 await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
                 utils.logger.info(f"[WeiboCrawler.search] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
 
                 await self.batch_get_notes_comments(note_id_list)
+                checkpoint.page_done(page)
 
     async def get_specified_notes(self):
         """
@@ -208,7 +216,7 @@ class WeiboCrawler(AbstractCrawler):
         :param semaphore:
         :return:
         """
-        async with semaphore:
+        async with semaphore, sticky_proxy(note_id):
             try:
                 result = await self.wb_client.get_note_info_by_id(note_id)
 
@@ -249,7 +257,9 @@ class WeiboCrawler(AbstractCrawler):
         :param semaphore:
         :return:
         """
-        async with semaphore:
+        if checkpoint.comments_completed(note_id):
+            return
+        async with semaphore, sticky_proxy(note_id):
             try:
                 utils.logger.info(f"[WeiboCrawler.get_note_comments] begin get note_id: {note_id} comments ...")
 
@@ -263,6 +273,7 @@ class WeiboCrawler(AbstractCrawler):
                     callback=weibo_store.batch_update_weibo_note_comments,
                     max_count=config.CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
                 )
+                checkpoint.comments_done(note_id)
             except DataFetchError as ex:
                 utils.logger.error(f"[WeiboCrawler.get_note_comments] get note_id: {note_id} comment error: {ex}")
             except Exception as e:
@@ -29,7 +29,9 @@ from tenacity import retry, stop_after_attempt, wait_fixed
 import config
 from base.base_crawler import AbstractApiClient
 from proxy.proxy_mixin import ProxyRefreshMixin
-from tools import utils
+from tools import checkpoint, utils
+from tools.perf_metrics import record_retry
+from tools.parse_pool import run_in_parse_pool
 
 if TYPE_CHECKING:
     from proxy.proxy_ip_pool import ProxyIpPool
@@ -109,7 +111,7 @@ class XiaoHongShuClient(AbstractApiClient, ProxyRefreshMixin):
         self.headers.update(headers)
         return self.headers
 
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(1))
+    @retry(stop=stop_after_attempt(3), wait=wait_fixed(1), before_sleep=record_retry)
     async def request(self, method, url, **kwargs) -> Union[str, Any]:
         """
         Wrapper for httpx common request method, processes request response
@@ -121,13 +123,9 @@ class XiaoHongShuClient(AbstractApiClient, ProxyRefreshMixin):
         Returns:
 
         """
-        # Check if proxy is expired before each request
-        await self._refresh_proxy_if_expired()
-
         # return response.text
         return_response = kwargs.pop("return_response", False)
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            response = await client.request(method, url, timeout=self.timeout, **kwargs)
+        response = await self._send_request(method, url, timeout=self.timeout, **kwargs)
 
         if response.status_code == 471 or response.status_code == 461:
             # someday someone maybe will bypass captcha
@@ -143,11 +141,23 @@ class XiaoHongShuClient(AbstractApiClient, ProxyRefreshMixin):
         if data["success"]:
             return data.get("data", data.get("success", {}))
         elif data["code"] == self.IP_ERROR_CODE:
+            self._report_proxy_result(False)
             raise IPBlockError(self.IP_ERROR_STR)
         else:
             err_msg = data.get("msg", None) or f"{response.text}"
             raise DataFetchError(err_msg)
 
+    def is_cacheable_response(self, method, url, response) -> bool:
+        """
+        Only cache complete pages and non-empty note details, login walls and error pages are returned by
+        request() without raising
+        """
+        if isinstance(response, str):
+            return self._last_response_status() == 200 and "window.__INITIAL_STATE__" in response
+        if url.endswith("/api/sns/web/v1/feed"):
+            return isinstance(response, dict) and bool(response.get("items"))
+        return True
+
     async def get(self, uri: str, params: Optional[Dict] = None) -> Dict:
         """
         GET request, signs request headers
@@ -389,8 +399,9 @@ class XiaoHongShuClient(AbstractApiClient, ProxyRefreshMixin):
         """
         result = []
         comments_has_more = True
-        comments_cursor = ""
-        while comments_has_more and len(result) < max_count:
+        # A resumed crawl continues after the last stored comment page of the note
+        comments_cursor, crawled_count = checkpoint.comment_cursor(note_id, "")
+        while comments_has_more and crawled_count + len(result) < max_count:
             comments_res = await self.get_note_comments(
                 note_id=note_id, xsec_token=xsec_token, cursor=comments_cursor
             )
@@ -402,8 +413,8 @@ class XiaoHongShuClient(AbstractApiClient, ProxyRefreshMixin):
                 )
                 break
             comments = comments_res["comments"]
-            if len(result) + len(comments) > max_count:
-                comments = comments[: max_count - len(result)]
+            if crawled_count + len(result) + len(comments) > max_count:
+                comments = comments[: max_count - crawled_count - len(result)]
             if callback:
                 await callback(note_id, comments)
             await asyncio.sleep(crawl_interval)
@@ -415,6 +426,7 @@ class XiaoHongShuClient(AbstractApiClient, ProxyRefreshMixin):
                 callback=callback,
             )
             result.extend(sub_comments)
+            checkpoint.save_comment_cursor(note_id, comments_cursor, crawled_count + len(result))
         return result
 
     async def get_comments_all_sub_comments(
@@ -506,7 +518,7 @@ class XiaoHongShuClient(AbstractApiClient, ProxyRefreshMixin):
         html_content = await self.request(
             "GET", self._domain + uri, return_response=True, headers=self.headers
         )
-        return self._extractor.extract_creator_info_from_html(html_content)
+        return await run_in_parse_pool(self._extractor.extract_creator_info_from_html, html_content)
 
     async def get_notes_by_creator(
         self,
@@ -613,7 +625,7 @@ class XiaoHongShuClient(AbstractApiClient, ProxyRefreshMixin):
         data = {"original_url": f"{self._domain}/discovery/item/{note_id}"}
         return await self.post(uri, data=data, return_response=True)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(1))
+    @retry(stop=stop_after_attempt(3), wait=wait_fixed(1), before_sleep=record_retry)
     async def get_note_by_id_from_html(
         self,
         note_id: str,
@@ -647,4 +659,4 @@ class XiaoHongShuClient(AbstractApiClient, ProxyRefreshMixin):
             method="GET", url=url, return_response=True, headers=copy_headers
         )
 
-        return self._extractor.extract_note_detail_from_html(note_id, html)
+        return await run_in_parse_pool(self._extractor.extract_note_detail_from_html, note_id, html)
@@ -19,10 +19,44 @@
 
 import json
 import re
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 import humps
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+INITIAL_STATE_PREFIX = "window.__INITIAL_STATE__="
+
+# `undefined` as a JS value (after : , or [ and before , } or ]), never inside string content
+_UNDEFINED_VALUE_RE = re.compile(r"(?<=[:,\[])undefined(?=[,}\]])")
+
+
+def locate_initial_state(html: str) -> Optional[str]:
+    """Slice the __INITIAL_STATE__ object out of the page, without scanning the html with a regex"""
+    start = html.find(INITIAL_STATE_PREFIX)
+    if start == -1:
+        return None
+    start += len(INITIAL_STATE_PREFIX)
+    end = html.find("</script>", start)
+    if end == -1:
+        return None
+    return html[start:end].rstrip().rstrip(";")
+
+
+def parse_initial_state(state: str, undefined_as: str = "null") -> Any:
+    """Parse the state object, JS undefined values are replaced by undefined_as"""
+    if "undefined" in state:
+        state = _UNDEFINED_VALUE_RE.sub(undefined_as, state)
+    try:
+        return _json_loads(state)
+    except ValueError:
+        # Raw control characters inside strings, only the lenient json parser accepts them
+        return json.loads(state, strict=False)
+
 
 class XiaoHongShuExtractor:
     def __init__(self):
@@ -30,6 +64,7 @@ class XiaoHongShuExtractor:
 
     def extract_note_detail_from_html(self, note_id: str, html: str) -> Optional[Dict]:
         """Extract note details from HTML
+        Only the note subtree is decamelized, the rest of the page state is left as parsed
 
         Args:
             html (str): HTML string
@@ -41,13 +76,14 @@ class XiaoHongShuExtractor:
             # Either a CAPTCHA appeared or the note doesn't exist
             return None
 
-        state = re.findall(r"window.__INITIAL_STATE__=({.*})</script>", html)[
-            0
-        ].replace("undefined", '""')
-        if state != "{}":
-            note_dict = humps.decamelize(json.loads(state))
-            return note_dict["note"]["note_detail_map"][note_id]["note"]
-        return None
+        state = locate_initial_state(html)
+        if not state or state == "{}":
+            return None
+        # undefined was mapped to "" before, keep it for the stored fields
+        note_detail = parse_initial_state(state, undefined_as='""').get("note", {}).get("noteDetailMap", {}).get(note_id)
+        if not note_detail or not note_detail.get("note"):
+            return None
+        return humps.decamelize(note_detail["note"])
 
     def extract_creator_info_from_html(self, html: str) -> Optional[Dict]:
         """Extract user information from HTML
@@ -58,12 +94,10 @@ class XiaoHongShuExtractor:
         Returns:
             Dict: User information dictionary
         """
-        match = re.search(
-            r"<script>window.__INITIAL_STATE__=(.+)<\/script>", html, re.M
-        )
-        if match is None:
+        state = locate_initial_state(html)
+        if state is None:
             return None
-        info = json.loads(match.group(1).replace(":undefined", ":null"), strict=False)
+        info = parse_initial_state(state, undefined_as="null")
         if info is None:
             return None
         return info.get("user").get("userPageData")
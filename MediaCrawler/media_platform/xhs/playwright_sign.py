@@ -26,6 +26,8 @@ from urllib.parse import urlparse, quote
 
 from playwright.async_api import Page
 
+from tools.perf_metrics import measure_sign
+
 from .xhs_sign import b64_encode, encode_utf8, get_trace_id, mrc
 
 
@@ -168,6 +170,7 @@ async def sign_xs_with_playwright(
     return _build_xs_payload(x3_value, data_type)
 
 
+@measure_sign("xhs", "playwright")
 async def sign_with_playwright(
     page: Page,
     uri: str,
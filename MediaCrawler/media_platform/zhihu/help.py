@@ -30,10 +30,12 @@ from constant import zhihu as zhihu_constant
 from model.m_zhihu import ZhihuComment, ZhihuContent, ZhihuCreator
 from tools import utils
 from tools.crawler_util import extract_text_from_html
+from tools.perf_metrics import measure_sign
 
 ZHIHU_SGIN_JS = None
 
 
+@measure_sign("zhihu", "execjs")
 def sign(url: str, cookies: str) -> Dict:
     """
     zhihu sign algorithm
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/proxy/mock_proxy_server.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : In-process mock HTTP forward proxies with configurable latency and failure rate.
+#            They answer every plain http request themselves, so proxy validation and rotation can be
+#            exercised without vendors or network access. Validate against an http:// url, https needs CONNECT.
+import asyncio
+import random
+from typing import List, Optional
+
+from proxy.types import IpInfoModel
+
+MOCK_VALIDATE_URL = "http://proxy-check.local/"
+
+
+class MockHttpProxyServer:
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        :param latency: Seconds every response is delayed
+        :param failure_rate: Probability that a request is answered with 502
+        :param seed: Random seed, for reproducible failures
+        """
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.request_count = 0
+        self._random = random.Random(seed)
+        self._servers: List[asyncio.AbstractServer] = []
+
+    async def start(self, count: int = 1) -> List[IpInfoModel]:
+        """
+        Start count proxies listening on ephemeral localhost ports
+        :return: the proxies
+        """
+        proxies = []
+        for _ in range(count):
+            server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+            self._servers.append(server)
+            port = server.sockets[0].getsockname()[1]
+            proxies.append(IpInfoModel(ip="127.0.0.1", port=port, user="", password="", protocol="http://"))
+        return proxies
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                content_length = 0
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        content_length = int(value.strip())
+                if content_length:
+                    await reader.readexactly(content_length)
+
+                self.request_count += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                if self._random.random() < self.failure_rate:
+                    status, body = b"502 Bad Gateway", b"bad gateway"
+                else:
+                    status, body = b"200 OK", b"ok"
+                writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: " + str(len(body)).encode()
+                             + b"\r\nContent-Type: text/plain\r\n\r\n" + body)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/proxy/providers/local_proxy.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : Local proxy provider, serves proxies from a text file or a given list without any vendor API
+import os
+import time
+from typing import List, Optional
+
+import config
+from proxy.base_proxy import IpGetError, ProxyProvider
+from proxy.types import IpInfoModel
+from tools import utils
+
+
+def parse_proxy_line(line: str) -> Optional[IpInfoModel]:
+    """
+    Parse one proxy line: ip:port or ip:port:user:password, blank lines and lines starting with # are skipped
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    parts = line.split(":")
+    if len(parts) not in (2, 4):
+        utils.logger.warning(f"[LocalProxyProvider] skip invalid proxy line: {line}")
+        return None
+    user, password = (parts[2], parts[3]) if len(parts) == 4 else ("", "")
+    return IpInfoModel(ip=parts[0], port=int(parts[1]), user=user, password=password)
+
+
+class LocalProxyProvider(ProxyProvider):
+
+    def __init__(self, file_path: str = "", proxies: Optional[List[IpInfoModel]] = None, ttl: int = 0):
+        """
+        Local proxy provider, for self-hosted proxies and for exercising the proxy pool offline
+        :param file_path: Proxy list file, one proxy per line, re-read when it changes
+        :param proxies: Proxies given directly, used instead of the file
+        :param ttl: Seconds each handed out proxy stays valid, 0 means never expires
+        """
+        self.file_path = file_path
+        self.ttl = ttl
+        self._proxies: List[IpInfoModel] = list(proxies or [])
+        self._file_mtime: Optional[float] = None
+        self._cursor = 0
+
+    def _load_file(self):
+        if not self.file_path:
+            return
+        if not os.path.exists(self.file_path):
+            raise IpGetError(f"local proxy file not found: {self.file_path}")
+        mtime = os.path.getmtime(self.file_path)
+        if mtime == self._file_mtime:
+            return
+        with open(self.file_path, encoding="utf-8") as f:
+            self._proxies = [proxy for proxy in map(parse_proxy_line, f) if proxy is not None]
+        self._file_mtime = mtime
+
+    async def get_proxy(self, num: int) -> List[IpInfoModel]:
+        """
+        Hand out num proxies, rotating through the list so consecutive calls return different proxies
+        :param num:
+        :return:
+        """
+        self._load_file()
+        if not self._proxies:
+            raise IpGetError("local proxy list is empty")
+        expired_time_ts = int(time.time()) + self.ttl if self.ttl else None
+        result = []
+        for _ in range(min(num, len(self._proxies))):
+            proxy = self._proxies[self._cursor % len(self._proxies)]
+            self._cursor += 1
+            result.append(proxy.model_copy(update={"expired_time_ts": expired_time_ts}))
+        return result
+
+
+def new_local_proxy() -> LocalProxyProvider:
+    """
+    Construct local proxy provider from config
+    Returns:
+
+    """
+    return LocalProxyProvider(file_path=config.LOCAL_PROXY_FILE, ttl=config.LOCAL_PROXY_TTL)
@@ -55,7 +55,7 @@ class WanDouHttpProxy(ProxyProvider):
         """
 
         # Prioritize getting IP from cache
-        ip_cache_list = self.ip_cache.load_all_ip(
+        ip_cache_list = await self.ip_cache.load_all_ip(
             proxy_brand_name=self.proxy_brand_name
         )
         if len(ip_cache_list) >= num:
@@ -91,7 +91,7 @@ class WanDouHttpProxy(ProxyProvider):
                     ip_key = f"WANDOUHTTP_{ip_info_model.ip}_{ip_info_model.port}"
                     ip_value = ip_info_model.model_dump_json()
                     ip_infos.append(ip_info_model)
-                    self.ip_cache.set_ip(
+                    await self.ip_cache.set_ip(
                         ip_key, ip_value, ex=ip_info_model.expired_time_ts - current_ts
                     )
             else:
@@ -21,8 +21,13 @@
 # @Author  : relakkes@gmail.com
 # @Time    : 2023/12/2 13:45
 # @Desc    : IP proxy pool implementation
+import asyncio
+import functools
 import random
-from typing import Dict, List
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 
 import httpx
 from tenacity import retry, stop_after_attempt, wait_fixed
@@ -30,13 +35,63 @@ from tenacity import retry, stop_after_attempt, wait_fixed
 import config
 from proxy.providers import (
     new_kuai_daili_proxy,
+    new_local_proxy,
     new_wandou_http_proxy,
 )
 from tools import utils
+from tools.perf_metrics import record_retry
 
 from .base_proxy import ProxyProvider
 from .types import IpInfoModel, ProviderNameEnum
 
+# Weight of the newest sample in the latency moving average
+LATENCY_EWMA_ALPHA = 0.3
+
+
+@functools.lru_cache(maxsize=1)
+def _validate_ssl_context():
+    """Shared by all validation clients, building the default ssl context costs ~100ms of CPU per httpx client"""
+    return httpx.create_ssl_context()
+
+
+@dataclass
+class ProxyStats:
+    """Health of one proxy, fed by background validation and request results"""
+
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    latency: Optional[float] = None  # moving average in seconds
+    last_checked: float = 0.0
+
+    @property
+    def success_rate(self) -> float:
+        # Laplace smoothing, an unchecked proxy starts at 0.5
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+    @property
+    def score(self) -> float:
+        """Higher is better: success rate per second of latency"""
+        latency = self.latency if self.latency is not None else 1.0
+        return self.success_rate / max(latency, 0.05)
+
+    def record(self, success: bool, latency: Optional[float] = None):
+        self.last_checked = time.time()
+        if success:
+            self.successes += 1
+            self.consecutive_failures = 0
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+        if latency is not None:
+            self.latency = latency if self.latency is None else (
+                LATENCY_EWMA_ALPHA * latency + (1 - LATENCY_EWMA_ALPHA) * self.latency
+            )
+
+
+def proxy_key(proxy: IpInfoModel) -> str:
+    return f"{proxy.ip}:{proxy.port}"
+
 
 class ProxyIpPool:
 
@@ -56,6 +111,11 @@ class ProxyIpPool:
         self.proxy_list: List[IpInfoModel] = []
         self.ip_provider: ProxyProvider = ip_provider
         self.current_proxy: IpInfoModel | None = None  # Currently used proxy
+        self.proxy_stats: Dict[str, ProxyStats] = {}
+        self._next_proxy: IpInfoModel | None = None  # Replacement prefetched before current_proxy expires
+        self._health_check_task: Optional[asyncio.Task] = None
+        self._round_robin_index = -1
+        self._lock = asyncio.Lock()
 
     async def load_proxies(self) -> None:
         """
@@ -65,6 +125,12 @@ class ProxyIpPool:
         """
         self.proxy_list = await self.ip_provider.get_proxy(self.ip_pool_count)
 
+    def _proxy_url(self, proxy: IpInfoModel) -> str:
+        # httpx 0.28.1 requires passing proxy URL string directly, not a dictionary
+        if proxy.user and proxy.password:
+            return f"http://{proxy.user}:{proxy.password}@{proxy.ip}:{proxy.port}"
+        return f"http://{proxy.ip}:{proxy.port}"
+
     async def _is_valid_proxy(self, proxy: IpInfoModel) -> bool:
         """
         Validate if proxy IP is valid
@@ -75,13 +141,8 @@ class ProxyIpPool:
             f"[ProxyIpPool._is_valid_proxy] testing {proxy.ip} is it valid "
         )
         try:
-            # httpx 0.28.1 requires passing proxy URL string directly, not a dictionary
-            if proxy.user and proxy.password:
-                proxy_url = f"http://{proxy.user}:{proxy.password}@{proxy.ip}:{proxy.port}"
-            else:
-                proxy_url = f"http://{proxy.ip}:{proxy.port}"
-
-            async with httpx.AsyncClient(proxy=proxy_url) as client:
+            async with httpx.AsyncClient(proxy=self._proxy_url(proxy), timeout=config.IP_PROXY_VALIDATE_TIMEOUT,
+                                         verify=_validate_ssl_context()) as client:
                 response = await client.get(self.valid_ip_url)
             if response.status_code == 200:
                 return True
@@ -93,24 +154,122 @@ class ProxyIpPool:
             )
             raise e
 
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(1))
+    def get_stats(self, proxy: IpInfoModel) -> ProxyStats:
+        return self.proxy_stats.setdefault(proxy_key(proxy), ProxyStats())
+
+    def report_result(self, proxy: IpInfoModel, success: bool, latency: Optional[float] = None) -> None:
+        """
+        Record the outcome of a request sent through proxy
+        Args:
+            proxy: the proxy used
+            success: whether the request succeeded
+            latency: request duration in seconds
+        """
+        self.get_stats(proxy).record(success, latency)
+
+    async def _check_proxy(self, proxy: IpInfoModel) -> bool:
+        start = time.perf_counter()
+        try:
+            valid = await self._is_valid_proxy(proxy)
+        except Exception:
+            valid = False
+        self.report_result(proxy, valid, time.perf_counter() - start if valid else None)
+        return valid
+
+    def _is_healthy(self, proxy: IpInfoModel, buffer_seconds: int = 30) -> bool:
+        if proxy.is_expired(buffer_seconds):
+            return False
+        return self.get_stats(proxy).consecutive_failures < config.IP_PROXY_MAX_FAILURES
+
+    def _evict_unhealthy(self) -> None:
+        healthy = [proxy for proxy in self.proxy_list if self._is_healthy(proxy)]
+        for proxy in self.proxy_list:
+            if proxy not in healthy:
+                self.proxy_stats.pop(proxy_key(proxy), None)
+        self.proxy_list = healthy
+
+    async def check_proxies(self) -> None:
+        """
+        Validate all proxies concurrently, evict expired or failing ones and top the pool up from the provider
+        """
+        if self.enable_validate_ip and self.proxy_list:
+            await asyncio.gather(*[self._check_proxy(proxy) for proxy in self.proxy_list])
+        self._evict_unhealthy()
+        missing = self.ip_pool_count - len(self.proxy_list)
+        if missing > 0:
+            new_proxies = await self.ip_provider.get_proxy(missing)
+            if self.enable_validate_ip and new_proxies:
+                await asyncio.gather(*[self._check_proxy(proxy) for proxy in new_proxies])
+            # Re-read the pool after awaiting, get_proxy may have topped it up meanwhile
+            known = {proxy_key(proxy) for proxy in self.proxy_list}
+            self.proxy_list.extend(proxy for proxy in new_proxies if proxy_key(proxy) not in known)
+            self._evict_unhealthy()
+
+    def _best_proxy(self, exclude: Optional[IpInfoModel] = None) -> Optional[IpInfoModel]:
+        """Best scored healthy proxy, only validated ones when validation is enabled"""
+        candidates = [
+            proxy for proxy in self.proxy_list
+            if self._is_healthy(proxy) and (exclude is None or proxy_key(proxy) != proxy_key(exclude))
+            and (not self.enable_validate_ip or self.get_stats(proxy).successes > 0)
+        ]
+        if not candidates:
+            return None
+        best_score = max(self.get_stats(proxy).score for proxy in candidates)
+        # Random among equally scored proxies, so unchecked pools still spread the load
+        return random.choice([proxy for proxy in candidates if self.get_stats(proxy).score == best_score])
+
+    def assign_proxy(self, sticky_key: Optional[str] = None) -> Optional[IpInfoModel]:
+        """
+        Proxy for one request, spreads concurrent requests over all healthy proxies (IP_PROXY_ASSIGN_STRATEGY)
+        Args:
+            sticky_key: e.g. note id, with the sticky strategy requests of the same key keep the same proxy
+
+        Returns:
+            None if the strategy is "current" or no proxy is healthy, callers then use current_proxy
+        """
+        strategy = config.IP_PROXY_ASSIGN_STRATEGY
+        if strategy == "current":
+            return None
+        candidates = [proxy for proxy in self.proxy_list if self._is_healthy(proxy)]
+        if not candidates:
+            return None
+        if strategy == "sticky" and sticky_key is not None:
+            # Rendezvous hashing, a key only moves when its proxy leaves the pool
+            return max(candidates, key=lambda proxy: zlib.crc32(f"{sticky_key}|{proxy_key(proxy)}".encode()))
+        self._round_robin_index = (self._round_robin_index + 1) % len(candidates)
+        return candidates[self._round_robin_index]
+
+    def _prefetch_replacement(self) -> None:
+        """Pick the replacement of current_proxy ahead of time, so expiry does not wait for validation"""
+        if self.current_proxy is None or not self.is_current_proxy_expired(config.IP_PROXY_PREFETCH_SECONDS):
+            return
+        if self._next_proxy is None or not self._is_healthy(self._next_proxy):
+            self._next_proxy = self._best_proxy(exclude=self.current_proxy)
+
+    @retry(stop=stop_after_attempt(3), wait=wait_fixed(1), before_sleep=record_retry)
     async def get_proxy(self) -> IpInfoModel:
         """
-        Randomly extract a proxy IP from the proxy pool
+        Get the best scored healthy proxy IP from the proxy pool
         :return:
         """
-        if len(self.proxy_list) == 0:
-            await self._reload_proxies()
-
-        proxy = random.choice(self.proxy_list)
-        self.proxy_list.remove(proxy)  # Remove an IP once extracted
-        if self.enable_validate_ip:
-            if not await self._is_valid_proxy(proxy):
+        async with self._lock:
+            proxy = None
+            if self._next_proxy is not None and self._is_healthy(self._next_proxy):
+                proxy = self._next_proxy
+            else:
+                proxy = self._best_proxy(exclude=self.current_proxy) or self._best_proxy()
+            if proxy is None:
+                # Nothing validated ahead of time (health checker not running or pool exhausted)
+                await self.check_proxies()
+                proxy = self._best_proxy()
+            if proxy is None:
+                self.proxy_list = []
                 raise Exception(
-                    "[ProxyIpPool.get_proxy] current ip invalid and again get it"
+                    "[ProxyIpPool.get_proxy] no valid ip in the pool and again get it"
                 )
-        self.current_proxy = proxy  # Save currently used proxy
-        return proxy
+            self._next_proxy = None
+            self.current_proxy = proxy  # Save currently used proxy
+            return proxy
 
     def is_current_proxy_expired(self, buffer_seconds: int = 30) -> bool:
         """
@@ -148,10 +307,46 @@ class ProxyIpPool:
         self.proxy_list = []
         await self.load_proxies()
 
+    def start_health_check(self, interval: Optional[float] = None) -> None:
+        """
+        Start the background maintainer: validates proxies ahead of time, evicts failing ones,
+        tops the pool up and prefetches the replacement of the current proxy
+        Args:
+            interval: seconds between two rounds, defaults to config.IP_PROXY_HEALTH_CHECK_INTERVAL
+        """
+        if self._health_check_task is not None and not self._health_check_task.done():
+            return
+        interval = interval or config.IP_PROXY_HEALTH_CHECK_INTERVAL
+        self._health_check_task = asyncio.create_task(self._health_check_loop(interval))
+
+    async def _health_check_loop(self, interval: float) -> None:
+        while True:
+            try:
+                await self.check_proxies()
+                self._prefetch_replacement()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                utils.logger.error(f"[ProxyIpPool._health_check_loop] health check failed: {e}")
+            await asyncio.sleep(interval)
+
+    async def close(self) -> None:
+        """
+        Stop the background maintainer
+        """
+        if self._health_check_task is not None:
+            self._health_check_task.cancel()
+            try:
+                await self._health_check_task
+            except asyncio.CancelledError:
+                pass
+            self._health_check_task = None
+
 
 IpProxyProvider: Dict[str, ProxyProvider] = {
     ProviderNameEnum.KUAI_DAILI_PROVIDER.value: new_kuai_daili_proxy(),
     ProviderNameEnum.WANDOU_HTTP_PROVIDER.value: new_wandou_http_proxy(),
+    ProviderNameEnum.LOCAL_PROVIDER.value: new_local_proxy(),
 }
 
 
@@ -168,6 +363,8 @@ async def create_ip_pool(ip_pool_count: int, enable_validate_ip: bool) -> ProxyI
         ip_provider=IpProxyProvider.get(config.IP_PROXY_PROVIDER_NAME),
     )
     await pool.load_proxies()
+    if config.ENABLE_IP_PROXY_HEALTH_CHECK:
+        pool.start_health_check()
     return pool
 
 
@@ -23,12 +23,59 @@
 # @Time    : 2025/11/25
 # @Desc    : Auto-refresh proxy Mixin class for use by various platform clients
 
-from typing import TYPE_CHECKING, Optional
+import time
+from contextvars import ContextVar
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import TYPE_CHECKING, Dict, Optional, Set
 
-from tools import utils
+import httpx
+
+import config
+from tools import perf_metrics, utils
 
 if TYPE_CHECKING:
     from proxy.proxy_ip_pool import ProxyIpPool
+    from proxy.types import IpInfoModel
+
+# Sticky key of the current task (e.g. note id), requests of the same key keep the same proxy
+_sticky_key_var: ContextVar[Optional[str]] = ContextVar("proxy_sticky_key", default=None)
+# Proxy used by the last request of the current task, so request() can report business level failures
+_request_proxy_var: ContextVar[Optional["IpInfoModel"]] = ContextVar("request_proxy", default=None)
+# Status code of the last response of the current task, for checks on request() results that carry no status
+_response_status_var: ContextVar[Optional[int]] = ContextVar("response_status", default=None)
+
+# Response status codes meaning the exit IP is blocked (xhs captcha)
+PROXY_BLOCKED_STATUS_CODES = (461, 471)
+
+
+class sticky_proxy:
+    """
+    Bind the requests of the current task to one proxy when IP_PROXY_ASSIGN_STRATEGY is sticky.
+    Usable as `with sticky_proxy(note_id):` or `async with semaphore, sticky_proxy(note_id):`
+    """
+
+    def __init__(self, key):
+        self._key = str(key) if key is not None else None
+        self._token = None
+
+    def __enter__(self):
+        self._token = _sticky_key_var.set(self._key)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _sticky_key_var.reset(self._token)
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.__exit__(exc_type, exc_val, exc_tb)
+
+
+def _proxy_url(proxy: "IpInfoModel") -> str:
+    if proxy.user and proxy.password:
+        return f"http://{proxy.user}:{proxy.password}@{proxy.ip}:{proxy.port}"
+    return f"http://{proxy.ip}:{proxy.port}"
 
 
 class ProxyRefreshMixin:
@@ -38,7 +85,8 @@ class ProxyRefreshMixin:
     Usage:
     1. Let client class inherit this Mixin
     2. Call init_proxy_pool(proxy_ip_pool) in client's __init__
-    3. Call await _refresh_proxy_if_expired() before each request method call
+    3. Call await _refresh_proxy_if_expired() before each request method call,
+       or send requests with await _send_request(...) to spread them over the whole proxy pool
 
     Requirements:
     - client class must have self.proxy attribute to store current proxy URL
@@ -53,6 +101,11 @@ class ProxyRefreshMixin:
             proxy_ip_pool: Proxy IP pool instance
         """
         self._proxy_ip_pool = proxy_ip_pool
+        # proxy url -> pooled http client, keeps connections alive per exit IP
+        self._http_clients: Dict[Optional[str], httpx.AsyncClient] = {}
+        # pooled client -> requests in flight on it, pruned clients are closed once their last request is done
+        self._http_client_requests: Dict[httpx.AsyncClient, int] = {}
+        self._retired_http_clients: Set[httpx.AsyncClient] = set()
 
     async def _refresh_proxy_if_expired(self) -> None:
         """
@@ -68,10 +121,112 @@ class ProxyRefreshMixin:
             )
             new_proxy = await self._proxy_ip_pool.get_or_refresh_proxy()
             # Update httpx proxy URL
-            if new_proxy.user and new_proxy.password:
-                self.proxy = f"http://{new_proxy.user}:{new_proxy.password}@{new_proxy.ip}:{new_proxy.port}"
-            else:
-                self.proxy = f"http://{new_proxy.ip}:{new_proxy.port}"
+            self.proxy = _proxy_url(new_proxy)
             utils.logger.info(
                 f"[{self.__class__.__name__}._refresh_proxy_if_expired] New proxy: {new_proxy.ip}:{new_proxy.port}"
             )
+
+    def _get_http_client(self, proxy_url: Optional[str]) -> httpx.AsyncClient:
+        """
+        Pooled http client of one proxy. The cookie jar accepts nothing, cookies are only sent through headers
+        like the per-request clients did
+        """
+        clients = self.__dict__.setdefault("_http_clients", {})
+        client = clients.get(proxy_url)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(proxy=proxy_url, cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])))
+            clients[proxy_url] = client
+        return client
+
+    async def _prune_http_clients(self) -> None:
+        """
+        Remove pooled clients of proxies that left the pool. A client with requests still in flight is closed by
+        its last request instead of here
+        """
+        if self._proxy_ip_pool is None:
+            return
+        alive = {_proxy_url(proxy) for proxy in self._proxy_ip_pool.proxy_list} | {self.proxy}
+        clients = self.__dict__.get("_http_clients", {})
+        requests = self.__dict__.setdefault("_http_client_requests", {})
+        for proxy_url in [url for url in clients if url not in alive]:
+            client = clients.pop(proxy_url)
+            if requests.get(client):
+                self.__dict__.setdefault("_retired_http_clients", set()).add(client)
+            else:
+                await client.aclose()
+
+    async def _release_http_client(self, client: httpx.AsyncClient) -> None:
+        """End of one request on a pooled client, closes a pruned client after its last request"""
+        requests = self.__dict__.setdefault("_http_client_requests", {})
+        requests[client] -= 1
+        if requests[client] > 0:
+            return
+        del requests[client]
+        retired = self.__dict__.get("_retired_http_clients", set())
+        if client in retired:
+            retired.discard(client)
+            await client.aclose()
+
+    async def _send_request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request through the proxy assigned to the current task.
+        With a proxy pool, requests are assigned round-robin (or sticky per sticky_proxy key) over all healthy
+        proxies, otherwise the single self.proxy is used. Transport errors and blocked status codes are
+        reported to the pool and feed into proxy eviction.
+        """
+        pool = self._proxy_ip_pool
+        proxy = pool.assign_proxy(_sticky_key_var.get()) if pool is not None else None
+        if proxy is None:
+            await self._refresh_proxy_if_expired()
+            proxy = pool.current_proxy if pool is not None else None
+        proxy_url = _proxy_url(proxy) if proxy is not None else self.proxy
+        _request_proxy_var.set(proxy)
+        _response_status_var.set(None)
+
+        if proxy_url not in self.__dict__.get("_http_clients", {}):
+            # A new proxy showed up, close the clients of proxies that left the pool
+            await self._prune_http_clients()
+        client = self._get_http_client(proxy_url)
+        requests = self.__dict__.setdefault("_http_client_requests", {})
+        requests[client] = requests.get(client, 0) + 1
+        status = "error"
+        start = time.perf_counter()
+        perf_metrics.INFLIGHT_REQUESTS.inc(platform=config.PLATFORM)
+        try:
+            response = await client.request(method, url, **kwargs)
+            status = response.status_code
+            _response_status_var.set(status)
+        except httpx.TransportError:
+            self._report_proxy_result(False)
+            raise
+        finally:
+            perf_metrics.INFLIGHT_REQUESTS.dec(platform=config.PLATFORM)
+            perf_metrics.observe_request(url, status, time.perf_counter() - start)
+            await self._release_http_client(client)
+        blocked = response.status_code in PROXY_BLOCKED_STATUS_CODES
+        self._report_proxy_result(not blocked, time.perf_counter() - start)
+        return response
+
+    @staticmethod
+    def _last_response_status() -> Optional[int]:
+        """Status code of the last response received by the current task, None after a transport error"""
+        return _response_status_var.get()
+
+    def _report_proxy_result(self, success: bool, latency: Optional[float] = None) -> None:
+        """
+        Report the outcome of the last request of the current task to the proxy pool,
+        call it with success=False when the platform reports a blocked IP (e.g. IPBlockError)
+        """
+        proxy = _request_proxy_var.get()
+        if self._proxy_ip_pool is not None and proxy is not None:
+            self._proxy_ip_pool.report_result(proxy, success, latency)
+
+    async def close_http_clients(self) -> None:
+        """Close all pooled http clients, including pruned ones still waiting for their requests"""
+        clients = self.__dict__.get("_http_clients", {})
+        while clients:
+            _, client = clients.popitem()
+            await client.aclose()
+        retired = self.__dict__.get("_retired_http_clients", set())
+        while retired:
+            await retired.pop().aclose()
@@ -25,6 +25,9 @@
 from typing import List
 
 import config
+from database.db_session import batch_session
+from store.metrics_snapshot import record_metrics_snapshot
+from store.word_frequency import record_comment_words
 from var import source_keyword_var
 
 from ._store_impl import *
@@ -78,6 +81,7 @@ async def update_bilibili_video(video_item: Dict):
     }
     utils.logger.info(f"[store.bilibili.update_bilibili_video] bilibili video id:{video_id}, title:{save_content_item.get('title')}")
     await BiliStoreFactory.create_store().store_content(content_item=save_content_item)
+    await record_metrics_snapshot("bilibili", save_content_item)
 
 
 async def update_up_info(video_item: Dict):
@@ -102,8 +106,9 @@ async def update_up_info(video_item: Dict):
 async def batch_update_bilibili_video_comments(video_id: str, comments: List[Dict]):
     if not comments:
         return
-    for comment_item in comments:
-        await update_bilibili_video_comment(video_id, comment_item)
+    async with batch_session():
+        for comment_item in comments:
+            await update_bilibili_video_comment(video_id, comment_item)
 
 
 async def update_bilibili_video_comment(video_id: str, comment_item: Dict):
@@ -129,6 +134,7 @@ async def update_bilibili_video_comment(video_id: str, comment_item: Dict):
     }
     utils.logger.info(f"[store.bilibili.update_bilibili_video_comment] Bilibili video comment: {comment_id}, content: {save_comment_item.get('content')}")
     await BiliStoreFactory.create_store().store_comment(comment_item=save_comment_item)
+    await record_comment_words("bilibili", save_comment_item)
 
 
 async def store_video(aid, video_content, extension_file_name):
@@ -149,53 +155,56 @@ async def store_video(aid, video_content, extension_file_name):
 async def batch_update_bilibili_creator_fans(creator_info: Dict, fans_list: List[Dict]):
     if not fans_list:
         return
-    for fan_item in fans_list:
-        fan_info: Dict = {
-            "id": fan_item.get("mid"),
-            "name": fan_item.get("uname"),
-            "sign": fan_item.get("sign"),
-            "avatar": fan_item.get("face"),
-        }
-        await update_bilibili_creator_contact(creator_info=creator_info, fan_info=fan_info)
+    async with batch_session():
+        for fan_item in fans_list:
+            fan_info: Dict = {
+                "id": fan_item.get("mid"),
+                "name": fan_item.get("uname"),
+                "sign": fan_item.get("sign"),
+                "avatar": fan_item.get("face"),
+            }
+            await update_bilibili_creator_contact(creator_info=creator_info, fan_info=fan_info)
 
 
 async def batch_update_bilibili_creator_followings(creator_info: Dict, followings_list: List[Dict]):
     if not followings_list:
         return
-    for following_item in followings_list:
-        following_info: Dict = {
-            "id": following_item.get("mid"),
-            "name": following_item.get("uname"),
-            "sign": following_item.get("sign"),
-            "avatar": following_item.get("face"),
-        }
-        await update_bilibili_creator_contact(creator_info=following_info, fan_info=creator_info)
+    async with batch_session():
+        for following_item in followings_list:
+            following_info: Dict = {
+                "id": following_item.get("mid"),
+                "name": following_item.get("uname"),
+                "sign": following_item.get("sign"),
+                "avatar": following_item.get("face"),
+            }
+            await update_bilibili_creator_contact(creator_info=following_info, fan_info=creator_info)
 
 
 async def batch_update_bilibili_creator_dynamics(creator_info: Dict, dynamics_list: List[Dict]):
     if not dynamics_list:
         return
-    for dynamic_item in dynamics_list:
-        dynamic_id: str = dynamic_item["id_str"]
-        dynamic_text: str = ""
-        if dynamic_item["modules"]["module_dynamic"].get("desc"):
-            dynamic_text = dynamic_item["modules"]["module_dynamic"]["desc"]["text"]
-        dynamic_type: str = dynamic_item["type"].split("_")[-1]
-        dynamic_pub_ts: str = dynamic_item["modules"]["module_author"]["pub_ts"]
-        dynamic_stat: Dict = dynamic_item["modules"]["module_stat"]
-        dynamic_comment: int = dynamic_stat["comment"]["count"]
-        dynamic_forward: int = dynamic_stat["forward"]["count"]
-        dynamic_like: int = dynamic_stat["like"]["count"]
-        dynamic_info: Dict = {
-            "dynamic_id": dynamic_id,
-            "text": dynamic_text,
-            "type": dynamic_type,
-            "pub_ts": dynamic_pub_ts,
-            "total_comments": dynamic_comment,
-            "total_forwards": dynamic_forward,
-            "total_liked": dynamic_like,
-        }
-        await update_bilibili_creator_dynamic(creator_info=creator_info, dynamic_info=dynamic_info)
+    async with batch_session():
+        for dynamic_item in dynamics_list:
+            dynamic_id: str = dynamic_item["id_str"]
+            dynamic_text: str = ""
+            if dynamic_item["modules"]["module_dynamic"].get("desc"):
+                dynamic_text = dynamic_item["modules"]["module_dynamic"]["desc"]["text"]
+            dynamic_type: str = dynamic_item["type"].split("_")[-1]
+            dynamic_pub_ts: str = dynamic_item["modules"]["module_author"]["pub_ts"]
+            dynamic_stat: Dict = dynamic_item["modules"]["module_stat"]
+            dynamic_comment: int = dynamic_stat["comment"]["count"]
+            dynamic_forward: int = dynamic_stat["forward"]["count"]
+            dynamic_like: int = dynamic_stat["like"]["count"]
+            dynamic_info: Dict = {
+                "dynamic_id": dynamic_id,
+                "text": dynamic_text,
+                "type": dynamic_type,
+                "pub_ts": dynamic_pub_ts,
+                "total_comments": dynamic_comment,
+                "total_forwards": dynamic_forward,
+                "total_liked": dynamic_like,
+            }
+            await update_bilibili_creator_dynamic(creator_info=creator_info, dynamic_info=dynamic_info)
 
 
 async def update_bilibili_creator_contact(creator_info: Dict, fan_info: Dict):
@@ -38,7 +38,7 @@ from base.base_crawler import AbstractStore
 from database.db_session import get_session
 from database.models import BilibiliVideoComment, BilibiliVideo, BilibiliUpInfo, BilibiliUpDynamic, BilibiliContactInfo
 from tools.async_file_writer import AsyncFileWriter
-from tools import utils, words
+from tools import utils
 from var import crawler_type_var
 from database.mongodb_store_base import MongoDBStoreBase
 
@@ -140,7 +140,6 @@ class BiliDbStoreImplement(AbstractStore):
             else:
                 for key, value in content_item.items():
                     setattr(video_detail, key, value)
-            await session.commit()
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -160,7 +159,6 @@ class BiliDbStoreImplement(AbstractStore):
             else:
                 for key, value in comment_item.items():
                     setattr(comment_detail, key, value)
-            await session.commit()
 
     async def store_creator(self, creator: Dict):
         """
@@ -180,7 +178,6 @@ class BiliDbStoreImplement(AbstractStore):
             else:
                 for key, value in creator.items():
                     setattr(creator_detail, key, value)
-            await session.commit()
 
     async def store_contact(self, contact_item: Dict):
         """
@@ -203,7 +200,6 @@ class BiliDbStoreImplement(AbstractStore):
             else:
                 for key, value in contact_item.items():
                     setattr(contact_detail, key, value)
-            await session.commit()
 
     async def store_dynamic(self, dynamic_item):
         """
@@ -223,7 +219,6 @@ class BiliDbStoreImplement(AbstractStore):
             else:
                 for key, value in dynamic_item.items():
                     setattr(dynamic_detail, key, value)
-            await session.commit()
 
 
 class BiliJsonStoreImplement(AbstractStore):
@@ -24,6 +24,9 @@
 from typing import List
 
 import config
+from database.db_session import batch_session
+from store.metrics_snapshot import record_metrics_snapshot
+from store.word_frequency import record_comment_words
 from var import source_keyword_var
 
 from ._store_impl import *
@@ -184,13 +187,15 @@ async def update_douyin_aweme(aweme_item: Dict):
     }
     utils.logger.info(f"[store.douyin.update_douyin_aweme] douyin aweme id:{aweme_id}, title:{save_content_item.get('title')}")
     await DouyinStoreFactory.create_store().store_content(content_item=save_content_item)
+    await record_metrics_snapshot("douyin", save_content_item)
 
 
 async def batch_update_dy_aweme_comments(aweme_id: str, comments: List[Dict]):
     if not comments:
         return
-    for comment_item in comments:
-        await update_dy_aweme_comment(aweme_id, comment_item)
+    async with batch_session():
+        for comment_item in comments:
+            await update_dy_aweme_comment(aweme_id, comment_item)
 
 
 async def update_dy_aweme_comment(aweme_id: str, comment_item: Dict):
@@ -224,6 +229,7 @@ async def update_dy_aweme_comment(aweme_id: str, comment_item: Dict):
     utils.logger.info(f"[store.douyin.update_dy_aweme_comment] douyin aweme comment: {comment_id}, content: {save_comment_item.get('content')}")
 
     await DouyinStoreFactory.create_store().store_comment(comment_item=save_comment_item)
+    await record_comment_words("douyin", save_comment_item)
 
 
 async def save_creator(user_id: str, creator: Dict):
@@ -34,7 +34,7 @@ import config
 from base.base_crawler import AbstractStore
 from database.db_session import get_session
 from database.models import DouyinAweme, DouyinAwemeComment, DyCreator
-from tools import utils, words
+from tools import utils
 from tools.async_file_writer import AsyncFileWriter
 from var import crawler_type_var
 from database.mongodb_store_base import MongoDBStoreBase
@@ -110,7 +110,6 @@ class DouyinDbStoreImplement(AbstractStore):
             else:
                 for key, value in content_item.items():
                     setattr(aweme_detail, key, value)
-            await session.commit()
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -130,7 +129,6 @@ class DouyinDbStoreImplement(AbstractStore):
             else:
                 for key, value in comment_item.items():
                     setattr(comment_detail, key, value)
-            await session.commit()
 
     async def store_creator(self, creator: Dict):
         """
@@ -150,7 +148,6 @@ class DouyinDbStoreImplement(AbstractStore):
             else:
                 for key, value in creator.items():
                     setattr(user_detail, key, value)
-            await session.commit()
 
 
 class DouyinJsonStoreImplement(AbstractStore):
@@ -25,6 +25,9 @@
 from typing import List
 
 import config
+from database.db_session import batch_session
+from store.metrics_snapshot import record_metrics_snapshot
+from store.word_frequency import record_comment_words
 from var import source_keyword_var
 
 from ._store_impl import *
@@ -75,14 +78,16 @@ async def update_kuaishou_video(video_item: Dict):
     utils.logger.info(
         f"[store.kuaishou.update_kuaishou_video] Kuaishou video id:{video_id}, title:{save_content_item.get('title')}")
     await KuaishouStoreFactory.create_store().store_content(content_item=save_content_item)
+    await record_metrics_snapshot("kuaishou", save_content_item)
 
 
 async def batch_update_ks_video_comments(video_id: str, comments: List[Dict]):
     utils.logger.info(f"[store.kuaishou.batch_update_ks_video_comments] video_id:{video_id}, comments:{comments}")
     if not comments:
         return
-    for comment_item in comments:
-        await update_ks_video_comment(video_id, comment_item)
+    async with batch_session():
+        for comment_item in comments:
+            await update_ks_video_comment(video_id, comment_item)
 
 
 async def update_ks_video_comment(video_id: str, comment_item: Dict):
@@ -101,6 +106,7 @@ async def update_ks_video_comment(video_id: str, comment_item: Dict):
     utils.logger.info(
         f"[store.kuaishou.update_ks_video_comment] Kuaishou video comment: {comment_id}, content: {save_comment_item.get('content')}")
     await KuaishouStoreFactory.create_store().store_comment(comment_item=save_comment_item)
+    await record_comment_words("kuaishou", save_comment_item)
 
 async def save_creator(user_id: str, creator: Dict):
     ownerCount = creator.get('ownerCount', {})
@@ -37,7 +37,7 @@ import config
 from base.base_crawler import AbstractStore
 from database.db_session import get_session
 from database.models import KuaishouVideo, KuaishouVideoComment
-from tools import utils, words
+from tools import utils
 from var import crawler_type_var
 from database.mongodb_store_base import MongoDBStoreBase
 
@@ -110,7 +110,6 @@ class KuaishouDbStoreImplement(AbstractStore):
             else:
                 for key, value in content_item.items():
                     setattr(video_detail, key, value)
-            await session.commit()
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -131,7 +130,6 @@ class KuaishouDbStoreImplement(AbstractStore):
             else:
                 for key, value in comment_item.items():
                     setattr(comment_detail, key, value)
-            await session.commit()
 
 
 class KuaishouJsonStoreImplement(AbstractStore):
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/store/metrics_snapshot.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Interaction metrics snapshots
+Content stores overwrite counters such as liked_count in place, so every content update also appends one compact
+row (id, ts, counters as ints) to data/{platform}/metrics/snapshots.csv. The file is shared by all jobs and
+save options, which makes deltas, velocity and trending queries possible across re-crawls.
+"""
+
+import csv
+import os
+import pathlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiofiles
+
+import config
+from tools import utils
+
+# platform -> (id field, counter fields), field names match the dicts passed to store_content
+METRICS_SNAPSHOT_FIELDS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "xhs": ("note_id", ("liked_count", "collected_count", "comment_count", "share_count")),
+    "douyin": ("aweme_id", ("liked_count", "collected_count", "comment_count", "share_count")),
+    "kuaishou": ("video_id", ("liked_count", "viewd_count")),
+    "bilibili": ("video_id", ("liked_count", "video_play_count", "video_favorite_count", "video_share_count",
+                              "video_coin_count", "video_danmaku", "video_comment")),
+    "weibo": ("note_id", ("liked_count", "comments_count", "shared_count")),
+    "tieba": ("note_id", ("total_replay_num",)),
+    "zhihu": ("content_id", ("voteup_count", "comment_count")),
+}
+
+# (ts, counters)
+Snapshot = Tuple[int, Dict[str, int]]
+
+
+class MetricsSnapshotStore:
+    """Append-only metrics history of one platform"""
+
+    # platform -> {content_id: last written counters}, skips rewriting unchanged counters within a process
+    _last_written: Dict[str, Dict[str, Tuple[int, ...]]] = {}
+
+    def __init__(self, platform: str, base_dir: str = "data"):
+        if platform not in METRICS_SNAPSHOT_FIELDS:
+            raise ValueError(f"[MetricsSnapshotStore] Unsupported platform: {platform}")
+        self.platform = platform
+        self.id_field, self.metric_fields = METRICS_SNAPSHOT_FIELDS[platform]
+        self.file_path = os.path.join(base_dir, platform, "metrics", "snapshots.csv")
+
+    def _ensure_file(self):
+        if os.path.exists(self.file_path):
+            return
+        pathlib.Path(os.path.dirname(self.file_path)).mkdir(parents=True, exist_ok=True)
+        try:
+            # Exclusive create, so concurrent writers never write the header twice
+            with open(self.file_path, "x", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow([self.id_field, "ts", *self.metric_fields])
+        except FileExistsError:
+            pass
+
+    async def record(self, content_item: Dict, ts: Optional[int] = None) -> bool:
+        """
+        Append a snapshot of the counters in content_item
+        Args:
+            content_item: dict passed to store_content
+            ts: unix timestamp in seconds, defaults to now
+
+        Returns:
+            True if a row was written, False if skipped (no id, or counters unchanged since the last write)
+        """
+        content_id = content_item.get(self.id_field)
+        if not content_id:
+            return False
+        counters = tuple(utils.parse_count(content_item.get(field)) for field in self.metric_fields)
+        last_written = self._last_written.setdefault(self.platform, {})
+        content_id = str(content_id)
+        if last_written.get(content_id) == counters:
+            return False
+
+        self._ensure_file()
+        row = ",".join((content_id, str(utils.get_unix_timestamp() if ts is None else ts), *map(str, counters)))
+        async with aiofiles.open(self.file_path, "a", newline="", encoding="utf-8") as f:
+            await f.write(row + "\n")
+        last_written[content_id] = counters
+        return True
+
+    def iter_snapshots(self, content_ids: Optional[Iterable[str]] = None) -> Iterable[Tuple[str, Snapshot]]:
+        """Stream (content_id, (ts, counters)) rows in file order"""
+        if not os.path.exists(self.file_path):
+            return
+        wanted = {str(content_id) for content_id in content_ids} if content_ids is not None else None
+        with open(self.file_path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return
+            metric_fields = header[2:]
+            for row in reader:
+                if not row or (wanted is not None and row[0] not in wanted):
+                    continue
+                yield row[0], (int(row[1]), {field: int(value) for field, value in zip(metric_fields, row[2:])})
+
+    def load_snapshots(self, content_ids: Optional[Iterable[str]] = None) -> Dict[str, List[Snapshot]]:
+        """Snapshots grouped by content id, ordered by ts"""
+        result: Dict[str, List[Snapshot]] = {}
+        for content_id, snapshot in self.iter_snapshots(content_ids):
+            result.setdefault(content_id, []).append(snapshot)
+        for snapshots in result.values():
+            snapshots.sort(key=lambda snapshot: snapshot[0])
+        return result
+
+    def get_deltas(self, content_id: str) -> List[Dict]:
+        """
+        Counter changes between consecutive snapshots of one content
+        Returns:
+            [{"ts": ..., "interval": seconds since previous snapshot, "deltas": {metric: change}}]
+        """
+        snapshots = self.load_snapshots([content_id]).get(str(content_id), [])
+        return [
+            {
+                "ts": ts,
+                "interval": ts - prev_ts,
+                "deltas": {field: value - prev_counters.get(field, 0) for field, value in counters.items()},
+            }
+            for (prev_ts, prev_counters), (ts, counters) in zip(snapshots, snapshots[1:])
+        ]
+
+    @staticmethod
+    def _velocity(snapshots: List[Snapshot], metric: str, since_ts: Optional[int] = None) -> Optional[float]:
+        if since_ts is not None:
+            snapshots = [snapshot for snapshot in snapshots if snapshot[0] >= since_ts]
+        if len(snapshots) < 2:
+            return None
+        (first_ts, first_counters), (last_ts, last_counters) = snapshots[0], snapshots[-1]
+        if last_ts <= first_ts:
+            return None
+        return (last_counters.get(metric, 0) - first_counters.get(metric, 0)) * 3600 / (last_ts - first_ts)
+
+    def get_velocity(self, content_id: str, metric: str, since_ts: Optional[int] = None) -> Optional[float]:
+        """
+        Average growth per hour of one counter
+        Args:
+            content_id: note/video id
+            metric: counter field, e.g. liked_count
+            since_ts: only use snapshots from this unix timestamp on
+
+        Returns:
+            growth per hour, None if there are fewer than two snapshots
+        """
+        snapshots = self.load_snapshots([content_id]).get(str(content_id), [])
+        return self._velocity(snapshots, metric, since_ts)
+
+    def get_trending(self, metric: str, top_n: int = 10, since_ts: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Contents with the highest growth per hour of one counter
+        Returns:
+            [(content_id, velocity)] sorted by velocity desc
+        """
+        velocities = []
+        for content_id, snapshots in self.load_snapshots().items():
+            velocity = self._velocity(snapshots, metric, since_ts)
+            if velocity is not None:
+                velocities.append((content_id, velocity))
+        velocities.sort(key=lambda item: item[1], reverse=True)
+        return velocities[:top_n]
+
+
+async def record_metrics_snapshot(platform: str, content_item: Dict):
+    """Store helper, called after every content update"""
+    if not config.ENABLE_METRICS_SNAPSHOT:
+        return
+    try:
+        await MetricsSnapshotStore(platform).record(content_item)
+    except Exception as e:
+        utils.logger.error(f"[store.metrics_snapshot.record_metrics_snapshot] {platform} snapshot failed: {e}")
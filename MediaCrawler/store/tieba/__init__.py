@@ -22,6 +22,9 @@
 from typing import List
 
 from model.m_baidu_tieba import TiebaComment, TiebaCreator, TiebaNote
+from database.db_session import batch_session
+from store.metrics_snapshot import record_metrics_snapshot
+from store.word_frequency import record_comment_words
 from var import source_keyword_var
 
 from ._store_impl import *
@@ -57,8 +60,9 @@ async def batch_update_tieba_notes(note_list: List[TiebaNote]):
     """
     if not note_list:
         return
-    for note_item in note_list:
-        await update_tieba_note(note_item)
+    async with batch_session():
+        for note_item in note_list:
+            await update_tieba_note(note_item)
 
 
 async def update_tieba_note(note_item: TiebaNote):
@@ -76,6 +80,7 @@ async def update_tieba_note(note_item: TiebaNote):
     utils.logger.info(f"[store.tieba.update_tieba_note] tieba note: {save_note_item}")
 
     await TieBaStoreFactory.create_store().store_content(save_note_item)
+    await record_metrics_snapshot("tieba", save_note_item)
 
 
 async def batch_update_tieba_note_comments(note_id: str, comments: List[TiebaComment]):
@@ -90,8 +95,9 @@ async def batch_update_tieba_note_comments(note_id: str, comments: List[TiebaCom
     """
     if not comments:
         return
-    for comment_item in comments:
-        await update_tieba_note_comment(note_id, comment_item)
+    async with batch_session():
+        for comment_item in comments:
+            await update_tieba_note_comment(note_id, comment_item)
 
 
 async def update_tieba_note_comment(note_id: str, comment_item: TiebaComment):
@@ -108,6 +114,7 @@ async def update_tieba_note_comment(note_id: str, comment_item: TiebaComment):
     save_comment_item.update({"last_modify_ts": utils.get_current_timestamp()})
     utils.logger.info(f"[store.tieba.update_tieba_note_comment] tieba note id: {note_id} comment:{save_comment_item}")
     await TieBaStoreFactory.create_store().store_comment(save_comment_item)
+    await record_comment_words("tieba", save_comment_item)
 
 
 async def save_creator(user_info: TiebaCreator):
@@ -36,7 +36,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import config
 from base.base_crawler import AbstractStore
 from database.models import TiebaNote, TiebaComment, TiebaCreator
-from tools import utils, words
+from tools import utils
 from database.db_session import get_session
 from var import crawler_type_var
 from tools.async_file_writer import AsyncFileWriter
@@ -115,7 +115,6 @@ class TieBaDbStoreImplement(AbstractStore):
             else:
                 db_note = TiebaNote(**content_item)
                 session.add(db_note)
-            await session.commit()
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -134,7 +133,6 @@ class TieBaDbStoreImplement(AbstractStore):
             else:
                 db_comment = TiebaComment(**comment_item)
                 session.add(db_comment)
-            await session.commit()
 
     async def store_creator(self, creator: Dict):
         """
@@ -153,7 +151,6 @@ class TieBaDbStoreImplement(AbstractStore):
             else:
                 db_creator = TiebaCreator(**creator)
                 session.add(db_creator)
-            await session.commit()
 
 
 class TieBaJsonStoreImplement(AbstractStore):
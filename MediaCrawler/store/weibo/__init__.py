@@ -25,6 +25,9 @@
 import re
 from typing import List
 
+from database.db_session import batch_session
+from store.metrics_snapshot import record_metrics_snapshot
+from store.word_frequency import record_comment_words
 from var import source_keyword_var
 
 from .weibo_store_media import *
@@ -60,8 +63,9 @@ async def batch_update_weibo_notes(note_list: List[Dict]):
     """
     if not note_list:
         return
-    for note_item in note_list:
-        await update_weibo_note(note_item)
+    async with batch_session():
+        for note_item in note_list:
+            await update_weibo_note(note_item)
 
 
 async def update_weibo_note(note_item: Dict):
@@ -104,6 +108,7 @@ async def update_weibo_note(note_item: Dict):
     }
     utils.logger.info(f"[store.weibo.update_weibo_note] weibo note id:{note_id}, title:{save_content_item.get('content')[:24]} ...")
     await WeibostoreFactory.create_store().store_content(content_item=save_content_item)
+    await record_metrics_snapshot("weibo", save_content_item)
 
 
 async def batch_update_weibo_note_comments(note_id: str, comments: List[Dict]):
@@ -118,8 +123,9 @@ async def batch_update_weibo_note_comments(note_id: str, comments: List[Dict]):
     """
     if not comments:
         return
-    for comment_item in comments:
-        await update_weibo_note_comment(note_id, comment_item)
+    async with batch_session():
+        for comment_item in comments:
+            await update_weibo_note_comment(note_id, comment_item)
 
 
 async def update_weibo_note_comment(note_id: str, comment_item: Dict):
@@ -159,6 +165,7 @@ async def update_weibo_note_comment(note_id: str, comment_item: Dict):
     }
     utils.logger.info(f"[store.weibo.update_weibo_note_comment] Weibo note comment: {comment_id}, content: {save_comment_item.get('content', '')[:24]} ...")
     await WeibostoreFactory.create_store().store_comment(comment_item=save_comment_item)
+    await record_comment_words("weibo", save_comment_item)
 
 
 async def update_weibo_note_image(picid: str, pic_content, extension_file_name):
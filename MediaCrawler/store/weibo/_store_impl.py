@@ -36,7 +36,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import config
 from base.base_crawler import AbstractStore
 from database.models import WeiboCreator, WeiboNote, WeiboNoteComment
-from tools import utils, words
+from tools import utils
 from tools.async_file_writer import AsyncFileWriter
 from database.db_session import get_session
 from var import crawler_type_var
@@ -123,7 +123,6 @@ class WeiboDbStoreImplement(AbstractStore):
                 content_item["last_modify_ts"] = utils.get_current_timestamp()
                 db_note = WeiboNote(**content_item)
                 session.add(db_note)
-            await session.commit()
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -149,7 +148,6 @@ class WeiboDbStoreImplement(AbstractStore):
                 comment_item["last_modify_ts"] = utils.get_current_timestamp()
                 db_comment = WeiboNoteComment(**comment_item)
                 session.add(db_comment)
-            await session.commit()
 
     async def store_creator(self, creator: Dict):
         """
@@ -175,7 +173,6 @@ class WeiboDbStoreImplement(AbstractStore):
                 creator["last_modify_ts"] = utils.get_current_timestamp()
                 db_creator = WeiboCreator(**creator)
                 session.add(db_creator)
-            await session.commit()
 
 
 class WeiboJsonStoreImplement(AbstractStore):
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/store/word_frequency.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Incremental comment word frequency
+Comments are buffered as they are stored, tokenized in batches off the event loop and folded into token counts per
+source keyword and comment day in data/{platform}/words/word_freq.db. The database is shared by all jobs and save
+options and remembers the folded comment ids, so re-crawled comments are counted once and top words or topic trends
+across jobs are answered from the aggregates without re-reading any data file.
+"""
+
+import asyncio
+import os
+import pathlib
+import re
+import sqlite3
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import config
+from tools import utils
+from var import source_keyword_var
+
+# Platform names passed to record_comment_words by the platform stores
+WORD_FREQ_PLATFORMS = ("xhs", "douyin", "kuaishou", "bilibili", "weibo", "tieba", "zhihu")
+
+# Comment time fields across platforms, unix seconds / milliseconds or "YYYY-MM-DD ..." strings
+COMMENT_TIME_FIELDS = ("create_time", "publish_time")
+
+_DATE_PREFIX = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS word_counts (
+    keyword TEXT NOT NULL,
+    day TEXT NOT NULL,
+    word TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (keyword, day, word)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_word_counts_day_word ON word_counts (day, word);
+CREATE TABLE IF NOT EXISTS daily_comments (
+    keyword TEXT NOT NULL,
+    day TEXT NOT NULL,
+    comments INTEGER NOT NULL,
+    PRIMARY KEY (keyword, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS folded_comments (
+    comment_id TEXT PRIMARY KEY
+) WITHOUT ROWID;
+"""
+
+# (comment_id, keyword, day, text)
+PendingComment = Tuple[str, str, str, str]
+
+
+def comment_day(comment_item: Dict) -> str:
+    """Publish day of a comment, the current day when the platform gives no usable time"""
+    for field in COMMENT_TIME_FIELDS:
+        value = comment_item.get(field)
+        if isinstance(value, str) and _DATE_PREFIX.match(value):
+            return value[:10]
+        try:
+            ts = int(value)
+        except (TypeError, ValueError):
+            continue
+        if ts > 0:
+            # Milliseconds on xhs / kuaishou
+            ts = ts // 1000 if ts > 10 ** 11 else ts
+            return time.strftime("%Y-%m-%d", time.localtime(ts))
+    return utils.get_current_date()
+
+
+def _keyword_filter(keyword: Optional[str]) -> Tuple[str, List]:
+    return (" AND keyword = ?", [keyword]) if keyword is not None else ("", [])
+
+
+class WordFrequencyStore:
+    """Aggregated comment token counts of one platform"""
+
+    # platform -> comments waiting to be folded in
+    _pending: Dict[str, List[PendingComment]] = {}
+    # platform -> lock serializing the flushes of this process
+    _flush_locks: Dict[str, asyncio.Lock] = {}
+    _tokenizer_ready = False
+
+    def __init__(self, platform: str, base_dir: str = "data"):
+        self.platform = platform
+        self.file_path = os.path.join(base_dir, platform, "words", "word_freq.db")
+
+    def _connect(self) -> sqlite3.Connection:
+        pathlib.Path(os.path.dirname(self.file_path)).mkdir(parents=True, exist_ok=True)
+        # Jobs of several crawler processes may fold at the same time
+        conn = sqlite3.connect(self.file_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    async def add(self, comment_item: Dict, keyword: Optional[str] = None) -> bool:
+        """
+        Buffer one stored comment, the buffer is folded in every WORD_FREQ_AGGREGATE_BATCH_SIZE comments
+        Args:
+            comment_item: dict passed to store_comment
+            keyword: source keyword, defaults to the keyword of the current search task
+
+        Returns:
+            True if buffered, False if the comment has no id or no text
+        """
+        from tools.words import COMMENT_TEXT_FIELDS
+
+        comment_id = comment_item.get("comment_id")
+        text = next((comment_item[field] for field in COMMENT_TEXT_FIELDS if comment_item.get(field)), "")
+        if not comment_id or not isinstance(text, str) or not text:
+            return False
+        keyword = source_keyword_var.get() if keyword is None else keyword
+        pending = self._pending.setdefault(self.platform, [])
+        pending.append((str(comment_id), keyword, comment_day(comment_item), text))
+        if len(pending) >= config.WORD_FREQ_AGGREGATE_BATCH_SIZE:
+            await self.flush()
+        return True
+
+    async def flush(self) -> int:
+        """
+        Tokenize the buffered comments in a thread and fold them into the aggregates
+        Returns:
+            number of comments folded in, comments folded by an earlier job are skipped
+        """
+        lock = self._flush_locks.setdefault(self.platform, asyncio.Lock())
+        async with lock:
+            pending = self._pending.pop(self.platform, [])
+            if not pending:
+                return 0
+            try:
+                return await asyncio.to_thread(self._fold, pending)
+            except Exception:
+                # Keep the batch for the next flush, comments buffered meanwhile stay behind it
+                self._pending.setdefault(self.platform, [])[:0] = pending
+                utils.logger.warning(
+                    f"[WordFrequencyStore.flush] {self.platform} fold failed, {len(pending)} comments kept buffered"
+                )
+                raise
+
+    @classmethod
+    def _count_words(cls, texts: List[str]):
+        from tools import words
+
+        if not cls._tokenizer_ready:
+            words.init_tokenizer(words.load_stop_words(config.STOP_WORDS_FILE), config.CUSTOM_WORDS)
+            cls._tokenizer_ready = True
+        return words.count_words(texts)
+
+    def _fold(self, pending: List[PendingComment]) -> int:
+        conn = self._connect()
+        try:
+            # Tokenize outside the write lock, skipping the comments already folded by an earlier job
+            candidates: Dict[str, Tuple[str, str, str]] = {}
+            for comment_id, keyword, day, text in pending:
+                candidates.setdefault(comment_id, (keyword, day, text))
+            for folded_id in self._folded_ids(conn, list(candidates)):
+                del candidates[folded_id]
+            groups: Dict[Tuple[str, str], Dict[str, str]] = defaultdict(dict)
+            for comment_id, (keyword, day, text) in candidates.items():
+                groups[(keyword, day)][comment_id] = text
+            word_counts = {group: self._count_words(list(texts.values())) for group, texts in groups.items()}
+
+            # Hold the write lock from the dedup insert to the commit, so concurrent jobs never fold a comment twice
+            conn.execute("BEGIN IMMEDIATE")
+            folded = 0
+            for (keyword, day), texts in groups.items():
+                new_texts = [
+                    text for comment_id, text in texts.items()
+                    if conn.execute(
+                        "INSERT OR IGNORE INTO folded_comments (comment_id) VALUES (?)", (comment_id,)
+                    ).rowcount
+                ]
+                if not new_texts:
+                    continue
+                counts = word_counts[(keyword, day)]
+                if len(new_texts) < len(texts):
+                    # Another job folded some of these comments since the check above, recount the rest
+                    counts = self._count_words(new_texts)
+                conn.executemany(
+                    "INSERT INTO word_counts (keyword, day, word, count) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (keyword, day, word) DO UPDATE SET count = count + excluded.count",
+                    [(keyword, day, word, count) for word, count in counts.items()],
+                )
+                conn.execute(
+                    "INSERT INTO daily_comments (keyword, day, comments) VALUES (?, ?, ?) "
+                    "ON CONFLICT (keyword, day) DO UPDATE SET comments = comments + excluded.comments",
+                    (keyword, day, len(new_texts)),
+                )
+                folded += len(new_texts)
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return folded
+
+    @staticmethod
+    def _folded_ids(conn: sqlite3.Connection, comment_ids: List[str], chunk_size: int = 500) -> List[str]:
+        """Comment ids of the list that are already folded in"""
+        folded = []
+        for i in range(0, len(comment_ids), chunk_size):
+            chunk = comment_ids[i:i + chunk_size]
+            folded.extend(row[0] for row in conn.execute(
+                f"SELECT comment_id FROM folded_comments WHERE comment_id IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+        return folded
+
+    def _query(self, sql: str, params: List) -> List[Tuple]:
+        if not os.path.exists(self.file_path):
+            return []
+        conn = self._connect()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def get_keywords(self) -> List[Dict]:
+        """Source keywords with their folded comment counts and covered days"""
+        rows = self._query(
+            "SELECT keyword, SUM(comments), MIN(day), MAX(day) FROM daily_comments GROUP BY keyword ORDER BY 2 DESC", []
+        )
+        return [
+            {"keyword": keyword, "comments": comments, "first_day": first_day, "last_day": last_day}
+            for keyword, comments, first_day, last_day in rows
+        ]
+
+    def get_top_words(self, top_n: int = 20, keyword: Optional[str] = None, since_day: Optional[str] = None,
+                      until_day: Optional[str] = None) -> List[Tuple[str, int]]:
+        """
+        Most frequent words
+        Args:
+            top_n: number of words
+            keyword: only comments of this source keyword, all keywords when None
+            since_day: first day "YYYY-MM-DD", inclusive
+            until_day: last day "YYYY-MM-DD", inclusive
+
+        Returns:
+            [(word, count)] sorted by count desc
+        """
+        keyword_sql, params = _keyword_filter(keyword)
+        return self._query(
+            f"SELECT word, SUM(count) AS total FROM word_counts WHERE day >= ? AND day <= ?{keyword_sql} "
+            "GROUP BY word ORDER BY total DESC, word LIMIT ?",
+            [since_day or "", until_day or "9999-12-31", *params, top_n],
+        )
+
+    def get_word_series(self, word: str, keyword: Optional[str] = None, since_day: Optional[str] = None,
+                        until_day: Optional[str] = None) -> List[Tuple[str, int]]:
+        """Daily counts of one word, [(day, count)] ordered by day"""
+        keyword_sql, params = _keyword_filter(keyword)
+        return self._query(
+            f"SELECT day, SUM(count) FROM word_counts WHERE word = ? AND day >= ? AND day <= ?{keyword_sql} "
+            "GROUP BY day ORDER BY day",
+            [word, since_day or "", until_day or "9999-12-31", *params],
+        )
+
+    def get_trending_words(self, days: int = 7, until_day: Optional[str] = None, keyword: Optional[str] = None,
+                           top_n: int = 20) -> List[Dict]:
+        """
+        Words whose count grew the most in the last `days` days compared to the `days` days before
+        Args:
+            days: window size in days
+            until_day: last day of the current window "YYYY-MM-DD", defaults to today
+            keyword: only comments of this source keyword, all keywords when None
+            top_n: number of words
+
+        Returns:
+            [{"word", "count", "previous_count", "delta"}] sorted by delta desc
+        """
+        until_ts = time.mktime(time.strptime(until_day or utils.get_current_date(), "%Y-%m-%d"))
+        window_start = time.strftime("%Y-%m-%d", time.localtime(until_ts - (days - 1) * 86400))
+        previous_start = time.strftime("%Y-%m-%d", time.localtime(until_ts - (2 * days - 1) * 86400))
+        until_day = time.strftime("%Y-%m-%d", time.localtime(until_ts))
+        keyword_sql, params = _keyword_filter(keyword)
+        rows = self._query(
+            "SELECT word, SUM(CASE WHEN day >= ? THEN count ELSE 0 END) AS current, "
+            "SUM(CASE WHEN day < ? THEN count ELSE 0 END) AS previous "
+            f"FROM word_counts WHERE day >= ? AND day <= ?{keyword_sql} "
+            "GROUP BY word HAVING current > previous ORDER BY current - previous DESC, word LIMIT ?",
+            [window_start, window_start, previous_start, until_day, *params, top_n],
+        )
+        return [
+            {"word": word, "count": current, "previous_count": previous, "delta": current - previous}
+            for word, current, previous in rows
+        ]
+
+
+async def record_comment_words(platform: str, comment_item: Dict):
+    """Store helper, called after every comment update"""
+    if not config.ENABLE_WORD_FREQ_AGGREGATE:
+        return
+    try:
+        await WordFrequencyStore(platform).add(comment_item)
+    except Exception as e:
+        utils.logger.error(f"[store.word_frequency.record_comment_words] {platform} word frequency failed: {e}")
+
+
+async def flush_word_frequency():
+    """Fold in the comments still buffered, called once the crawl is finished"""
+    for platform in list(WordFrequencyStore._pending):
+        try:
+            await WordFrequencyStore(platform).flush()
+        except Exception as e:
+            utils.logger.error(f"[store.word_frequency.flush_word_frequency] {platform} word frequency failed: {e}")
@@ -24,6 +24,9 @@
 from typing import List
 
 import config
+from database.db_session import batch_session
+from store.metrics_snapshot import record_metrics_snapshot
+from store.word_frequency import record_comment_words
 from var import source_keyword_var
 
 from .xhs_store_media import *
@@ -128,6 +131,7 @@ async def update_xhs_note(note_item: Dict):
     }
     utils.logger.info(f"[store.xhs.update_xhs_note] xhs note: {local_db_item}")
     await XhsStoreFactory.create_store().store_content(local_db_item)
+    await record_metrics_snapshot("xhs", local_db_item)
 
 
 async def batch_update_xhs_note_comments(note_id: str, comments: List[Dict]):
@@ -142,8 +146,9 @@ async def batch_update_xhs_note_comments(note_id: str, comments: List[Dict]):
     """
     if not comments:
         return
-    for comment_item in comments:
-        await update_xhs_note_comment(note_id, comment_item)
+    async with batch_session():
+        for comment_item in comments:
+            await update_xhs_note_comment(note_id, comment_item)
 
 
 async def update_xhs_note_comment(note_id: str, comment_item: Dict):
@@ -177,6 +182,7 @@ async def update_xhs_note_comment(note_id: str, comment_item: Dict):
     }
     utils.logger.info(f"[store.xhs.update_xhs_note_comment] xhs note comment:{local_db_item}")
     await XhsStoreFactory.create_store().store_comment(local_db_item)
+    await record_comment_words("xhs", local_db_item)
 
 
 async def save_creator(user_id: str, creator: Dict):
@@ -37,7 +37,6 @@ from tools.time_util import get_current_timestamp
 from var import crawler_type_var
 from database.mongodb_store_base import MongoDBStoreBase
 from tools import utils
-from store.excel_store_base import ExcelStoreBase
 
 class XhsCsvStoreImplement(AbstractStore):
     def __init__(self, **kwargs):
@@ -132,10 +131,10 @@ class XhsDbStoreImplement(AbstractStore):
             video_url=content_item.get("video_url"),
             time=content_item.get("time"),
             last_update_time=content_item.get("last_update_time"),
-            liked_count=str(content_item.get("liked_count")),
-            collected_count=str(content_item.get("collected_count")),
-            comment_count=str(content_item.get("comment_count")),
-            share_count=str(content_item.get("share_count")),
+            liked_count=content_item.get("liked_count"),
+            collected_count=content_item.get("collected_count"),
+            comment_count=content_item.get("comment_count"),
+            share_count=content_item.get("share_count"),
             image_list=json.dumps(content_item.get("image_list")),
             tag_list=json.dumps(content_item.get("tag_list")),
             note_url=content_item.get("note_url"),
@@ -149,10 +148,10 @@ class XhsDbStoreImplement(AbstractStore):
         last_modify_ts = int(get_current_timestamp())
         update_data = {
             "last_modify_ts": last_modify_ts,
-            "liked_count": str(content_item.get("liked_count")),
-            "collected_count": str(content_item.get("collected_count")),
-            "comment_count": str(content_item.get("comment_count")),
-            "share_count": str(content_item.get("share_count")),
+            "liked_count": content_item.get("liked_count"),
+            "collected_count": content_item.get("collected_count"),
+            "comment_count": content_item.get("comment_count"),
+            "share_count": content_item.get("share_count"),
             "last_update_time": content_item.get("last_update_time"),
         }
         stmt = update(XhsNote).where(XhsNote.note_id == note_id).values(**update_data)
@@ -192,7 +191,7 @@ class XhsDbStoreImplement(AbstractStore):
             sub_comment_count=comment_item.get("sub_comment_count"),
             pictures=json.dumps(comment_item.get("pictures")),
             parent_comment_id=comment_item.get("parent_comment_id"),
-            like_count=str(comment_item.get("like_count"))
+            like_count=comment_item.get("like_count")
         )
         session.add(comment)
 
@@ -201,7 +200,7 @@ class XhsDbStoreImplement(AbstractStore):
         last_modify_ts = int(get_current_timestamp())
         update_data = {
             "last_modify_ts": last_modify_ts,
-            "like_count": str(comment_item.get("like_count")),
+            "like_count": comment_item.get("like_count"),
             "sub_comment_count": comment_item.get("sub_comment_count"),
         }
         stmt = update(XhsNoteComment).where(XhsNoteComment.comment_id == comment_id).values(**update_data)
@@ -234,9 +233,9 @@ class XhsDbStoreImplement(AbstractStore):
             last_modify_ts=last_modify_ts,
             desc=creator_item.get("desc"),
             gender=creator_item.get("gender"),
-            follows=str(creator_item.get("follows")),
-            fans=str(creator_item.get("fans")),
-            interaction=str(creator_item.get("interaction")),
+            follows=creator_item.get("follows"),
+            fans=creator_item.get("fans"),
+            interaction=creator_item.get("interaction"),
             tag_list=json.dumps(creator_item.get("tag_list"))
         )
         session.add(creator)
@@ -249,9 +248,9 @@ class XhsDbStoreImplement(AbstractStore):
             "nickname": creator_item.get("nickname"),
             "avatar": creator_item.get("avatar"),
             "desc": creator_item.get("desc"),
-            "follows": str(creator_item.get("follows")),
-            "fans": str(creator_item.get("fans")),
-            "interaction": str(creator_item.get("interaction")),
+            "follows": creator_item.get("follows"),
+            "fans": creator_item.get("fans"),
+            "interaction": creator_item.get("interaction"),
             "tag_list": json.dumps(creator_item.get("tag_list"))
         }
         stmt = update(XhsCreator).where(XhsCreator.user_id == user_id).values(**update_data)
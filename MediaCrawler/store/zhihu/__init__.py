@@ -31,6 +31,9 @@ from ._store_impl import (ZhihuCsvStoreImplement,
                                           ZhihuMongoStoreImplement,
                                           ZhihuExcelStoreImplement)
 from tools import utils
+from database.db_session import batch_session
+from store.metrics_snapshot import record_metrics_snapshot
+from store.word_frequency import record_comment_words
 from var import source_keyword_var
 
 
@@ -63,8 +66,9 @@ async def batch_update_zhihu_contents(contents: List[ZhihuContent]):
     if not contents:
         return
 
-    for content_item in contents:
-        await update_zhihu_content(content_item)
+    async with batch_session():
+        for content_item in contents:
+            await update_zhihu_content(content_item)
 
 async def update_zhihu_content(content_item: ZhihuContent):
     """
@@ -80,6 +84,7 @@ async def update_zhihu_content(content_item: ZhihuContent):
     local_db_item.update({"last_modify_ts": utils.get_current_timestamp()})
     utils.logger.info(f"[store.zhihu.update_zhihu_content] zhihu content: {local_db_item}")
     await ZhihuStoreFactory.create_store().store_content(local_db_item)
+    await record_metrics_snapshot("zhihu", local_db_item)
 
 
 
@@ -95,8 +100,9 @@ async def batch_update_zhihu_note_comments(comments: List[ZhihuComment]):
     if not comments:
         return
 
-    for comment_item in comments:
-        await update_zhihu_content_comment(comment_item)
+    async with batch_session():
+        for comment_item in comments:
+            await update_zhihu_content_comment(comment_item)
 
 
 async def update_zhihu_content_comment(comment_item: ZhihuComment):
@@ -112,6 +118,7 @@ async def update_zhihu_content_comment(comment_item: ZhihuComment):
     local_db_item.update({"last_modify_ts": utils.get_current_timestamp()})
     utils.logger.info(f"[store.zhihu.update_zhihu_note_comment] zhihu content comment:{local_db_item}")
     await ZhihuStoreFactory.create_store().store_comment(local_db_item)
+    await record_comment_words("zhihu", local_db_item)
 
 
 async def save_creator(creator: ZhihuCreator):
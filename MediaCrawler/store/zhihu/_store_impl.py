@@ -37,7 +37,7 @@ import config
 from base.base_crawler import AbstractStore
 from database.db_session import get_session
 from database.models import ZhihuContent, ZhihuComment, ZhihuCreator
-from tools import utils, words
+from tools import utils
 from var import crawler_type_var
 from tools.async_file_writer import AsyncFileWriter
 from database.mongodb_store_base import MongoDBStoreBase
@@ -114,7 +114,6 @@ class ZhihuDbStoreImplement(AbstractStore):
             else:
                 new_content = ZhihuContent(**content_item)
                 session.add(new_content)
-            await session.commit()
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -133,7 +132,6 @@ class ZhihuDbStoreImplement(AbstractStore):
             else:
                 new_comment = ZhihuComment(**comment_item)
                 session.add(new_comment)
-            await session.commit()
 
     async def store_creator(self, creator: Dict):
         """
@@ -152,7 +150,6 @@ class ZhihuDbStoreImplement(AbstractStore):
             else:
                 new_creator = ZhihuCreator(**creator)
                 session.add(new_creator)
-            await session.commit()
 
 
 class ZhihuJsonStoreImplement(AbstractStore):
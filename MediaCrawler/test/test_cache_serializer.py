@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/test/test_cache_serializer.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+import asyncio
+import unittest
+
+from cache.local_cache import ExpiringLocalCache
+from cache.serializer import (MSGPACK_AVAILABLE, CompressedSerializer, OrjsonSerializer, PickleSerializer,
+                              get_serializer)
+
+
+class TestCacheSerializer(unittest.TestCase):
+
+    def test_pickle_round_trip(self):
+        value = {"list": [1, 2, 3], "tuple": (1, "a")}
+        serializer = PickleSerializer()
+        self.assertEqual(serializer.loads(serializer.dumps(value)), value)
+
+    def test_orjson_round_trip(self):
+        value = {"note_id": "abc", "liked_count": 10, "tags": ["a", "b"]}
+        serializer = OrjsonSerializer()
+        self.assertEqual(serializer.loads(serializer.dumps(value)), value)
+
+    @unittest.skipUnless(MSGPACK_AVAILABLE, "msgpack is not installed")
+    def test_msgpack_round_trip(self):
+        serializer = get_serializer("msgpack")
+        value = {"key": b"\x00\x01", "n": 1}
+        self.assertEqual(serializer.loads(serializer.dumps(value)), value)
+
+    def test_compression_threshold(self):
+        serializer = CompressedSerializer(PickleSerializer(), min_size=100)
+        small, large = "x", "x" * 10000
+        self.assertEqual(serializer.loads(serializer.dumps(small)), small)
+        self.assertEqual(serializer.loads(serializer.dumps(large)), large)
+        self.assertLess(len(serializer.dumps(large)), 1000)
+
+    def test_unknown_serializer(self):
+        with self.assertRaises(ValueError):
+            get_serializer("yaml")
+
+
+class TestAbstractCacheBatchAndAsync(unittest.TestCase):
+
+    def test_batch_and_async_defaults(self):
+        async def run():
+            cache = ExpiringLocalCache(cron_interval=10)
+            cache.mset({"a": 1, "b": 2}, 10)
+            await cache.amset({"c": 3}, 10)
+            self.assertEqual(cache.mget(["a", "missing"]), [1, None])
+            self.assertEqual(await cache.amget(["b", "c"]), [2, 3])
+            self.assertEqual(await cache.aget("a"), 1)
+            self.assertEqual(sorted(await cache.akeys("*")), ["a", "b", "c"])
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -51,6 +51,67 @@ class TestExpiringLocalCache(unittest.TestCase):
         time.sleep(12)
         self.assertIsNone(self.cache.get('key'))
 
+    def test_clear_expired_keys(self):
+        for i in range(5):
+            self.cache.set(f'key{i}', 'value', -1)
+        self.cache.set('alive', 'value', 10)
+        self.cache._clear()
+        self.assertEqual(self.cache.keys('*'), ['alive'])
+        self.assertEqual(self.cache.stats()['expirations'], 5)
+
+    def test_clear_skips_overwritten_key(self):
+        self.cache.set('key', 'old', -1)
+        self.cache.set('key', 'new', 10)
+        self.cache._clear()
+        self.assertEqual(self.cache.get('key'), 'new')
+
+    def test_lru_eviction(self):
+        cache = ExpiringLocalCache(cron_interval=10, max_size=2)
+        cache.set('a', 1, 10)
+        cache.set('b', 2, 10)
+        cache.get('a')
+        cache.set('c', 3, 10)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_lfu_eviction(self):
+        cache = ExpiringLocalCache(cron_interval=10, max_size=2, eviction_policy='lfu')
+        cache.set('a', 1, 10)
+        cache.set('b', 2, 10)
+        cache.get('b')
+        cache.get('a')
+        cache.get('a')
+        cache.set('c', 3, 10)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(len(cache), 2)
+
+    def test_lfu_heap_bounded_by_reads(self):
+        cache = ExpiringLocalCache(cron_interval=10, max_size=2, eviction_policy='lfu')
+        cache.set('a', 1, 10)
+        cache.set('b', 2, 10)
+        for _ in range(10000):
+            cache.get('a')
+        self.assertLessEqual(len(cache._frequency_heap), 2 * len(cache) + 65)
+        cache.set('c', 3, 10)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+
+    def test_keys_glob(self):
+        self.cache.set('xhs_user_1', 1, 10)
+        self.cache.set('xhs_note_1', 1, 10)
+        self.cache.set('dy_user_1', 1, 10)
+        self.assertEqual(sorted(self.cache.keys('xhs_*')), ['xhs_note_1', 'xhs_user_1'])
+        self.assertEqual(self.cache.keys('*_user_?'), ['xhs_user_1', 'dy_user_1'])
+
+    def test_stats(self):
+        self.cache.set('key', 'value', 10)
+        self.cache.get('key')
+        self.cache.get('missing')
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (1, 1, 1))
+
     def tearDown(self):
         del self.cache
 
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/test/test_mongodb_bulk_writer.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+import asyncio
+import unittest
+
+from database.mongodb_store_base import MongoBulkWriter
+
+
+class FakeCollection:
+    def __init__(self):
+        self.bulk_calls = []
+
+    async def bulk_write(self, operations, ordered=True):
+        self.bulk_calls.append((operations, ordered))
+
+
+class SlowCollection(FakeCollection):
+    async def bulk_write(self, operations, ordered=True):
+        await asyncio.sleep(0.2)
+        await super().bulk_write(operations, ordered)
+
+
+class FakeConnection:
+    def __init__(self, collection_class=FakeCollection):
+        self.collections = {}
+        self.collection_class = collection_class
+
+    async def get_collection(self, collection_name):
+        return self.collections.setdefault(collection_name, self.collection_class())
+
+
+class TestMongoBulkWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = FakeConnection()
+
+    def test_flush_on_batch_size(self):
+        async def test():
+            writer = MongoBulkWriter(self.connection, batch_size=3, flush_interval=3600)
+            for i in range(2):
+                await writer.add("xhs_comments", {"comment_id": str(i)}, {"comment_id": str(i)})
+            self.assertEqual(writer.pending_count("xhs_comments"), 2)
+            self.assertNotIn("xhs_comments", self.connection.collections)
+
+            await writer.add("xhs_comments", {"comment_id": "2"}, {"comment_id": "2"})
+            self.assertEqual(writer.pending_count(), 0)
+            operations, ordered = self.connection.collections["xhs_comments"].bulk_calls[0]
+            self.assertEqual(len(operations), 3)
+            self.assertFalse(ordered)
+
+        asyncio.run(test())
+
+    def test_flush_on_interval(self):
+        async def test():
+            writer = MongoBulkWriter(self.connection, batch_size=100, flush_interval=0)
+            await writer.add("xhs_contents", {"note_id": "a"}, {"note_id": "a"})
+            self.assertEqual(writer.pending_count(), 0)
+            self.assertEqual(len(self.connection.collections["xhs_contents"].bulk_calls), 1)
+
+        asyncio.run(test())
+
+    def test_idle_buffer_is_flushed(self):
+        async def test():
+            writer = MongoBulkWriter(self.connection, batch_size=100, flush_interval=0.05)
+            await writer.add("xhs_contents", {"note_id": "a"}, {"note_id": "a"})
+            self.assertEqual(writer.pending_count(), 1)
+            await asyncio.sleep(0.2)
+            self.assertEqual(writer.pending_count(), 0)
+            self.assertEqual(len(self.connection.collections["xhs_contents"].bulk_calls), 1)
+
+        asyncio.run(test())
+
+    def test_close_writes_pending(self):
+        async def test():
+            writer = MongoBulkWriter(self.connection, batch_size=100, flush_interval=3600)
+            await writer.add("xhs_comments", {"comment_id": "1"}, {"comment_id": "1"})
+            self.assertTrue(await writer.close())
+            self.assertEqual(writer.pending_count(), 0)
+            self.assertEqual(len(self.connection.collections["xhs_comments"].bulk_calls), 1)
+
+        asyncio.run(test())
+
+    def test_close_during_interval_bulk_write(self):
+        async def test():
+            connection = FakeConnection(SlowCollection)
+            writer = MongoBulkWriter(connection, batch_size=100, flush_interval=0.05)
+            await writer.add("xhs_contents", {"note_id": "a"}, {"note_id": "a"})
+            # The interval task popped the buffer and waits for bulk_write
+            await asyncio.sleep(0.1)
+            self.assertEqual(writer.pending_count(), 0)
+            self.assertTrue(await writer.close())
+            self.assertEqual(len(connection.collections["xhs_contents"].bulk_calls), 1)
+
+        asyncio.run(test())
+
+    def test_same_key_is_merged(self):
+        async def test():
+            writer = MongoBulkWriter(self.connection, batch_size=100, flush_interval=3600)
+            await writer.add("xhs_contents", {"note_id": "a"}, {"note_id": "a", "liked_count": 1, "title": "t"})
+            await writer.add("xhs_contents", {"note_id": "a"}, {"note_id": "a", "liked_count": 2})
+            self.assertEqual(writer.pending_count(), 1)
+
+            self.assertTrue(await writer.flush_all())
+            operations, _ = self.connection.collections["xhs_contents"].bulk_calls[0]
+            self.assertEqual(len(operations), 1)
+            self.assertEqual(operations[0]._doc, {"$set": {"note_id": "a", "liked_count": 2, "title": "t"}})
+
+        asyncio.run(test())
+
+
+if __name__ == '__main__':
+    unittest.main()
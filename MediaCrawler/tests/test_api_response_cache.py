@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_api_response_cache.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for the api response cache
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from base.base_crawler import AbstractApiClient
+from cache import api_response_cache
+from cache.api_response_cache import ApiResponseCache, build_cache_key
+from cache.local_cache import ExpiringLocalCache
+from media_platform.douyin.client import DouYinClient
+from media_platform.xhs.client import XiaoHongShuClient
+from proxy import proxy_mixin
+
+TTL_RULES = {
+    "*example.com/user/profile/*": 60,
+    "*example.com/graphql#visionProfile": 60,
+    "*example.com/aweme/v1/web/aweme/detail/": 60,
+}
+
+
+class FakeClient(AbstractApiClient):
+    def __init__(self):
+        self.calls = 0
+
+    async def request(self, method, url, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if kwargs.get("params", {}).get("fail"):
+            raise ValueError("request failed")
+        return {"url": url, "calls": self.calls}
+
+    async def update_cookies(self, browser_context):
+        pass
+
+
+@pytest.fixture
+def response_cache(monkeypatch):
+    monkeypatch.setattr(api_response_cache.config, "ENABLE_API_RESPONSE_CACHE", True)
+    cache = None
+
+    def factory():
+        nonlocal cache
+        if cache is None:
+            cache = ApiResponseCache(ExpiringLocalCache(cron_interval=10), TTL_RULES)
+        return cache
+
+    monkeypatch.setattr(api_response_cache, "get_api_response_cache", factory)
+    return factory
+
+
+def test_cache_key_ignores_param_order_and_signatures():
+    key_a = build_cache_key("GET", "https://example.com/api?b=2&a=1", {"params": {"w_rid": "x", "wts": 1}})
+    key_b = build_cache_key("get", "https://example.com/api", {"params": {"a": "1", "b": "2", "w_rid": "y"},
+                                                               "headers": {"X-S": "sign"}})
+    key_c = build_cache_key("GET", "https://example.com/api", {"params": {"a": "1", "b": "3"}})
+    assert key_a == key_b
+    assert key_a != key_c
+
+
+def test_json_body_is_normalized():
+    body_a = json.dumps({"operationName": "visionProfile", "variables": {"userId": "u1"}})
+    body_b = json.dumps({"variables": {"userId": "u1"}, "operationName": "visionProfile"}, indent=2)
+    assert build_cache_key("POST", "https://example.com/graphql", {"data": body_a}) == \
+           build_cache_key("POST", "https://example.com/graphql", {"data": body_b})
+
+
+def test_single_flight_and_hits(response_cache):
+    async def run():
+        client = FakeClient()
+        url = "https://www.example.com/user/profile/u1"
+        results = await asyncio.gather(*[client.request("GET", url) for _ in range(5)])
+        again = await client.request("GET", url)
+        return client.calls, results, again
+
+    calls, results, again = asyncio.run(run())
+    assert calls == 1
+    assert all(result == {"url": "https://www.example.com/user/profile/u1", "calls": 1} for result in results)
+    assert again["calls"] == 1
+    assert response_cache().stats == {"hits": 1, "misses": 1, "shared": 4}
+
+
+def test_uncached_endpoint_and_operation(response_cache):
+    async def run():
+        client = FakeClient()
+        await client.request("GET", "https://www.example.com/search")
+        await client.request("GET", "https://www.example.com/search")
+        await client.request("POST", "https://www.example.com/graphql", data='{"operationName": "visionSearchPhoto"}')
+        await client.request("POST", "https://www.example.com/graphql", data='{"operationName": "visionSearchPhoto"}')
+        await client.request("POST", "https://www.example.com/graphql", data='{"operationName": "visionProfile"}')
+        await client.request("POST", "https://www.example.com/graphql", data='{"operationName": "visionProfile"}')
+        return client.calls
+
+    assert asyncio.run(run()) == 5
+
+
+def test_errors_are_shared_but_not_cached(response_cache):
+    async def run():
+        client = FakeClient()
+        url = "https://www.example.com/user/profile/u1"
+        results = await asyncio.gather(*[client.request("GET", url, params={"fail": 1}) for _ in range(3)],
+                                       return_exceptions=True)
+        with pytest.raises(ValueError):
+            await client.request("GET", url, params={"fail": 1})
+        return client.calls, results
+
+    calls, results = asyncio.run(run())
+    assert calls == 2
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cached_value_is_copied(response_cache):
+    async def run():
+        client = FakeClient()
+        url = "https://www.example.com/user/profile/u1"
+        first = await client.request("GET", url)
+        first["mutated"] = True
+        return await client.request("GET", url)
+
+    assert "mutated" not in asyncio.run(run())
+
+
+class RiskControlClient(FakeClient):
+    """Returns a risk control payload first, like platforms that answer blocked requests without an error"""
+
+    async def request(self, method, url, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            return {"status_code": 0, "aweme_detail": None}
+        return {"status_code": 0, "aweme_detail": {"aweme_id": "a1"}}
+
+    def is_cacheable_response(self, method, url, response):
+        return DouYinClient.is_cacheable_response(self, method, url, response)
+
+
+def test_rejected_response_is_not_served_again(response_cache):
+    async def run():
+        client = RiskControlClient()
+        url = "https://www.example.com/aweme/v1/web/aweme/detail/"
+        return [await client.request("GET", url) for _ in range(3)], client.calls
+
+    results, calls = asyncio.run(run())
+    assert results[0]["aweme_detail"] is None
+    assert results[1] == results[2] == {"status_code": 0, "aweme_detail": {"aweme_id": "a1"}}
+    assert calls == 2
+
+
+def test_platform_cacheable_checks():
+    detail_url = "https://www.douyin.com/aweme/v1/web/aweme/detail/"
+    profile_url = "https://www.douyin.com/aweme/v1/web/user/profile/other/"
+    assert DouYinClient.is_cacheable_response(None, "GET", detail_url, {"status_code": 0, "aweme_detail": {}})
+    assert not DouYinClient.is_cacheable_response(None, "GET", detail_url, {"status_code": 0, "aweme_detail": None})
+    assert not DouYinClient.is_cacheable_response(None, "GET", profile_url, {"status_code": 8, "user": {}})
+    assert not DouYinClient.is_cacheable_response(None, "GET", profile_url, {"status_code": 0})
+
+    xhs_client = XiaoHongShuClient.__new__(XiaoHongShuClient)
+    page_url = "https://www.xiaohongshu.com/user/profile/u1"
+    page = "<script>window.__INITIAL_STATE__={}</script>"
+
+    def page_cacheable(status, html):
+        proxy_mixin._response_status_var.set(status)
+        return xhs_client.is_cacheable_response("GET", page_url, html)
+
+    assert page_cacheable(200, page)
+    assert not page_cacheable(302, page)
+    assert not page_cacheable(200, "<html>login</html>")
+    assert not xhs_client.is_cacheable_response("POST", "https://edith.xiaohongshu.com/api/sns/web/v1/feed", {})
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_benchmarks.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Smoke tests of the offline benchmark suite: the mock platform server, the end-to-end crawl and the micro benchmarks
+"""
+
+import asyncio
+import sys
+from argparse import Namespace
+
+import httpx
+import pytest
+
+import config
+from benchmarks import crawl_benchmark, hot_path_benchmark, store_benchmark
+from benchmarks.mock_platform_server import PLATFORM_ROUTES, MockPlatformServer
+from benchmarks.report import compare_reports
+from config.db_config import sqlite_db_config
+
+
+def test_mock_server_routes_fixtures():
+    async def run():
+        server = MockPlatformServer(PLATFORM_ROUTES["bili"])
+        base_url = await server.start()
+        try:
+            async with httpx.AsyncClient() as client:
+                search = await client.get(f"{base_url}/x/web-interface/wbi/search/type?keyword=a&page=1")
+                missing = await client.get(f"{base_url}/unknown")
+        finally:
+            await server.close()
+        return search, missing, server.request_count
+
+    search, missing, request_count = asyncio.run(run())
+    assert search.status_code == 200
+    assert len(search.json()["data"]["result"]) == 20
+    assert missing.status_code == 404
+    assert request_count == 2
+
+
+@pytest.mark.parametrize("platform", ["bili", "tieba"])
+@pytest.mark.parametrize("save_option", ["json", "sqlite"])
+def test_crawl_benchmark_stores_items(platform, save_option):
+    args = Namespace(keywords=1, pages=1, concurrency=2, comments=5, sub_comments=False, latency_ms=0)
+    result = asyncio.run(crawl_benchmark.bench_crawl(platform, save_option, args))
+    page_size = crawl_benchmark.PLATFORMS[platform][0]
+    assert result["items"]["content"] == page_size
+    assert result["items"]["comment"] > 0
+    assert result["items_per_sec"] > 0
+    assert result["requests"] > 1
+
+
+def test_hot_path_benchmark_runs_all_suites():
+    args = Namespace(only="extract,sign", min_time=0.01)
+    report = asyncio.run(hot_path_benchmark.run_benchmark(args))
+    assert set(report["extract"]) >= {"tieba_search", "xhs_note_detail", "zhihu_search"}
+    assert set(report["sign"]) >= {"bili_wbi", "xhs_headers"}
+    assert all(case["ops_per_sec"] > 0 for suite in report.values() for case in suite.values())
+
+
+@pytest.mark.parametrize("save_option", ["csv", "json", "sqlite"])
+def test_store_benchmark_reports_checkpoints(monkeypatch, save_option):
+    for name in ("PLATFORM", "SAVE_DATA_OPTION", "CRAWLER_TYPE", "ENABLE_GET_WORDCLOUD"):
+        monkeypatch.setattr(config, name, getattr(config, name))
+    monkeypatch.setitem(sqlite_db_config, "db_path", sqlite_db_config["db_path"])
+    args = {"rows": [20, 50], "max_seconds": 60, "text_length": 20, "comments_per_content": 4}
+    result = asyncio.run(store_benchmark.bench_store("bili", save_option, 1, "batch", args))
+    assert set(result) == {"20_rows", "50_rows", "final"}
+    assert result["20_rows"]["rows_per_sec"] > 0
+    assert result["final"]["rows"] == 50
+    assert result["final"]["file_size_mb"] > 0
+    assert result["final"]["rows_on_disk"] == 50
+    assert "known_failure" not in result["final"]
+
+
+def test_peak_rss_without_resource_module(monkeypatch):
+    # resource is POSIX only, psutil is optional
+    monkeypatch.setitem(sys.modules, "resource", None)
+    monkeypatch.setitem(sys.modules, "psutil", None)
+    assert store_benchmark.peak_rss_mb() is None
+
+
+def test_compare_reports_flags_throughput_drops_only():
+    baseline = {"bili": {"json": {"items_per_sec": 100.0, "elapsed_seconds": 1.0}}}
+    slower = {"bili": {"json": {"items_per_sec": 70.0, "elapsed_seconds": 9.0}}}
+    similar = {"bili": {"json": {"items_per_sec": 90.0, "elapsed_seconds": 9.0}}}
+    assert len(compare_reports(slower, baseline, tolerance=0.2)) == 1
+    assert compare_reports(similar, baseline, tolerance=0.2) == []
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_bilibili_wbi.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for Bilibili wbi signing and wbi key caching
+"""
+
+import asyncio
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+
+from media_platform.bilibili.client import BilibiliClient
+from media_platform.bilibili.help import BilibiliSign
+
+IMG_URL = "https://i0.hdslb.com/bfs/wbi/7cd084941338484aae1ad9425b84077c.png"
+SUB_URL = "https://i0.hdslb.com/bfs/wbi/4932caff0ff746eab6f01bf08b70ac45.png"
+NEW_IMG_URL = "https://i0.hdslb.com/bfs/wbi/00000000000000000000000000000000aaaa.png"
+NEW_SUB_URL = "https://i0.hdslb.com/bfs/wbi/11111111111111111111111111111111bbbb.png"
+
+
+class FakePage:
+    def __init__(self):
+        self.evaluate_count = 0
+
+    async def evaluate(self, expression):
+        self.evaluate_count += 1
+        return {"wbi_img_urls": f"{IMG_URL}-{SUB_URL}"}
+
+
+@pytest.fixture(autouse=True)
+def no_response_cache(monkeypatch):
+    monkeypatch.setattr("config.ENABLE_API_RESPONSE_CACHE", False)
+
+
+def _client(handler) -> BilibiliClient:
+    client = BilibiliClient(headers={}, playwright_page=FakePage(), cookie_dict={})
+    client._http_clients[None] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_sign_matches_reference(monkeypatch):
+    monkeypatch.setattr("tools.utils.get_unix_timestamp", lambda: 1702204169)
+    sign = BilibiliSign("7cd084941338484aae1ad9425b84077c", "4932caff0ff746eab6f01bf08b70ac45")
+    assert sign.get_salt() == "ea1db124af3c7062474693fa704f4ff8"
+    assert sign.sign({"foo": "114", "bar": "514", "zab": 1919810})["w_rid"] == "8f6f2b5b3d485fe1886cec6a0be8c5d4"
+
+
+def test_wbi_keys_read_once():
+    signed = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        signed.append("w_rid" in parse_qs(urlparse(str(request.url)).query) or b"w_rid" in request.content)
+        return httpx.Response(200, json={"code": 0, "data": {}})
+
+    async def run():
+        client = _client(handler)
+        await asyncio.gather(*(client.get("/x/web-interface/wbi/search/type", {"page": i}) for i in range(5)))
+        await client.post("/x/v2/reply/add", {"oid": 1})
+        await client.close_http_clients()
+        return client.playwright_page.evaluate_count
+
+    assert asyncio.run(run()) == 1
+    assert signed == [True] * 6
+
+
+def test_rejected_signature_refreshes_keys_from_nav():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path == "/x/web-interface/nav":
+            return httpx.Response(200, json={"code": 0, "data": {"wbi_img": {"img_url": NEW_IMG_URL, "sub_url": NEW_SUB_URL}}})
+        if len(requests) == 1:
+            return httpx.Response(200, json={"code": -352, "message": "risk control"})
+        return httpx.Response(200, json={"code": 0, "data": {"ok": True}})
+
+    async def run():
+        client = _client(handler)
+        result = await client.get("/x/web/search", {"keyword": "python"})
+        await client.close_http_clients()
+        return client, result
+
+    client, result = asyncio.run(run())
+    assert result == {"ok": True}
+    assert requests == ["/x/web/search", "/x/web-interface/nav", "/x/web/search"]
+    assert client._wbi_sign.img_key == "00000000000000000000000000000000aaaa"
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_browser_daemon.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for the shared CDP browser daemon
+"""
+
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from tools import browser_daemon
+from tools.browser_daemon import BrowserDaemon, get_process_tree_memory_mb
+
+WS_URL = "ws://localhost/devtools/browser/daemon-1"
+
+
+@pytest.fixture
+def devtools_port():
+    """Minimal /json/version endpoint of a running browser"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps({"webSocketDebuggerUrl": WS_URL}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("localhost", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    killed = []
+    monkeypatch.setattr(browser_daemon, "_kill_process_tree", lambda pid, timeout=5: killed.append(pid))
+    monkeypatch.setattr(browser_daemon, "_is_daemon_browser", lambda state: state["pid"] not in daemon.stale_pids)
+    monkeypatch.setattr("config.CDP_DAEMON_MAX_RUNS", 3)
+    monkeypatch.setattr("config.CDP_DAEMON_MAX_MEMORY_MB", 0)
+    daemon = BrowserDaemon(state_file=str(tmp_path / "cdp_daemon.json"))
+    daemon.killed = killed
+    daemon.stale_pids = set()
+    daemon.launched = []
+
+    async def fake_launch(browser_path, headless):
+        daemon.launched.append(browser_path)
+        return {"pid": 1000 + len(daemon.launched), "debug_port": daemon.launch_port, "ws_url": WS_URL,
+                "headless": headless, "started_at": 0, "runs": 0, "warm_pages": {}}
+
+    monkeypatch.setattr(daemon, "_launch", fake_launch)
+    return daemon
+
+
+def _closed_port() -> int:
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+async def _browser_path() -> str:
+    return "/usr/bin/chrome"
+
+
+def test_reuses_healthy_browser(daemon, devtools_port):
+    daemon.launch_port = devtools_port
+    first = asyncio.run(daemon.acquire(_browser_path, headless=True))
+    second = asyncio.run(daemon.acquire(_browser_path, headless=True))
+    assert daemon.launched == ["/usr/bin/chrome"]
+    assert second["pid"] == first["pid"]
+    assert daemon.load_state()["runs"] == 2
+    assert daemon.killed == []
+
+
+def test_relaunches_unresponsive_browser(daemon, devtools_port):
+    daemon.launch_port = devtools_port
+    daemon.save_state({"pid": 42, "debug_port": _closed_port(), "ws_url": WS_URL, "runs": 1, "warm_pages": {}})
+    state = asyncio.run(daemon.acquire(_browser_path, headless=True))
+    assert daemon.killed == [42]
+    assert state["pid"] == 1001 and state["runs"] == 1
+
+
+def test_forgets_browser_whose_pid_was_reused(daemon, devtools_port):
+    daemon.launch_port = devtools_port
+    daemon.stale_pids.add(42)
+    daemon.save_state({"pid": 42, "debug_port": _closed_port(), "ws_url": WS_URL, "runs": 1, "warm_pages": {}})
+    state = asyncio.run(daemon.acquire(_browser_path, headless=True))
+    assert daemon.killed == []
+    assert state["pid"] == 1001
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="the command line is read through psutil or /proc")
+def test_is_daemon_browser():
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)", "--remote-debugging-port=9333"])
+    try:
+        state = {"pid": process.pid, "debug_port": 9333, "started_at": int(time.time()) + 1}
+        # Wait for the exec, before it the child still shows the command line of pytest
+        deadline = time.monotonic() + 5
+        while "--remote-debugging-port" not in (browser_daemon._get_process_info(process.pid)[0] or ""):
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        assert browser_daemon._is_daemon_browser(state)
+        assert not browser_daemon._is_daemon_browser({**state, "debug_port": 9334})
+        # Started after the state was written: the pid was reused by another process
+        assert not browser_daemon._is_daemon_browser({**state, "started_at": int(time.time()) - 3600})
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_recycles_after_max_runs(daemon, devtools_port):
+    daemon.launch_port = devtools_port
+    for _ in range(3):
+        asyncio.run(daemon.acquire(_browser_path, headless=True))
+    state = asyncio.run(daemon.acquire(_browser_path, headless=True))
+    assert daemon.killed == [1001]
+    assert state["pid"] == 1002 and state["runs"] == 1
+
+
+def test_recycles_on_memory(daemon, monkeypatch):
+    monkeypatch.setattr("config.CDP_DAEMON_MAX_MEMORY_MB", 100)
+    monkeypatch.setattr(browser_daemon, "get_process_tree_memory_mb", lambda pid: 150.0)
+    assert daemon.get_recycle_reason({"pid": 1, "runs": 0}) == "uses 150 MB memory"
+    monkeypatch.setattr(browser_daemon, "get_process_tree_memory_mb", lambda pid: 50.0)
+    assert daemon.get_recycle_reason({"pid": 1, "runs": 0}) is None
+
+
+def test_stop_forgets_browser(daemon, devtools_port):
+    daemon.launch_port = devtools_port
+    asyncio.run(daemon.acquire(_browser_path, headless=True))
+    asyncio.run(daemon.stop())
+    assert daemon.killed == [1001]
+    assert daemon.load_state() is None
+    assert asyncio.run(daemon.status()) == {"running": False}
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="process group memory is measured through psutil or /proc")
+def test_process_tree_memory():
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"], start_new_session=True)
+    try:
+        memory_mb = get_process_tree_memory_mb(process.pid)
+        assert memory_mb is None or memory_mb > 1
+    finally:
+        process.kill()
+        process.wait()
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_checkpoint.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for the resumable crawl checkpoints (tools/checkpoint.py) and `main.py --resume`
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import cmd_arg
+import config
+from api.schemas import CrawlerStartRequest
+from api.services.crawler_manager import CrawlerManager
+from media_platform.xhs.client import XiaoHongShuClient
+from tools import checkpoint
+
+
+@pytest.fixture(autouse=True)
+def _checkpoint_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CRAWL_CHECKPOINT_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "CRAWL_CHECKPOINT_INTERVAL", 0)
+    monkeypatch.setattr(config, "ENABLE_CRAWL_CHECKPOINT", True)
+    # Settings restored by a resume and overridden by the command line parser
+    for key in (*checkpoint.CHECKPOINT_CONFIG_KEYS, "HEADLESS", "CDP_HEADLESS", "COOKIES"):
+        if hasattr(config, key):
+            monkeypatch.setattr(config, key, getattr(config, key))
+    monkeypatch.setattr(config, "PLATFORM", "xhs")
+    monkeypatch.setattr(config, "CRAWLER_TYPE", "search")
+    monkeypatch.setattr(config, "KEYWORDS", "a,b")
+    monkeypatch.setattr(config, "CLIENT_JOB_ID", "")
+    yield
+    checkpoint._checkpoint = checkpoint.CrawlCheckpoint()
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _crawl(pages_per_keyword, crawled, stop_at=None):
+    """
+    Minimal search loop shaped like the platform crawlers: notes n1/n2 on every page,
+    raises Interrupted while crawling the comments of stop_at = (keyword, page, note)
+    """
+    start_page = config.START_PAGE
+    for keyword in checkpoint.iter_keywords(config.KEYWORDS.split(",")):
+        page = 1
+        resume_page = checkpoint.resume_page(start_page)
+        search_id = checkpoint.search_id(f"sid-{keyword}")
+        while page <= pages_per_keyword:
+            if page < resume_page:
+                page += 1
+                continue
+            crawled.append(("page", keyword, page, search_id))
+            for note in ("n1", "n2"):
+                note_id = f"{keyword}-{page}-{note}"
+                if checkpoint.comments_completed(note_id):
+                    continue
+                if stop_at == (keyword, page, note):
+                    raise Interrupted()
+                crawled.append(("comments", note_id))
+                checkpoint.comments_done(note_id)
+            page += 1
+            checkpoint.page_done(page)
+    checkpoint.mark_finished()
+
+
+def test_new_job_saves_settings_and_status():
+    config.CLIENT_JOB_ID = "job/1"
+    ckpt = checkpoint.start_checkpoint()
+    assert ckpt.job_id == "job_1"
+    checkpoint.finish_checkpoint()
+
+    with open(checkpoint.checkpoint_path("job_1"), encoding="utf-8") as f:
+        state = json.load(f)
+    assert state["status"] == "interrupted"
+    assert state["config"]["KEYWORDS"] == "a,b"
+    assert state["config"]["PLATFORM"] == "xhs"
+
+
+def test_resume_continues_from_checkpoint():
+    job_id = checkpoint.start_checkpoint().job_id
+    first_run = []
+    with pytest.raises(Interrupted):
+        _crawl(3, first_run, stop_at=("b", 2, "n2"))
+    checkpoint.finish_checkpoint()
+    assert first_run[-1] == ("comments", "b-2-n1")
+
+    # The resumed run gets its settings from the checkpoint, not from the command line
+    config.KEYWORDS = "other"
+    config.START_PAGE = 1
+    checkpoint.start_checkpoint(job_id)
+    assert config.KEYWORDS == "a,b"
+
+    second_run = []
+    _crawl(3, second_run)
+    checkpoint.finish_checkpoint()
+    assert second_run == [
+        ("page", "b", 2, "sid-b"),
+        ("comments", "b-2-n2"),
+        ("page", "b", 3, "sid-b"),
+        ("comments", "b-3-n1"),
+        ("comments", "b-3-n2"),
+    ]
+    with open(checkpoint.checkpoint_path(job_id), encoding="utf-8") as f:
+        assert json.load(f)["status"] == "finished"
+
+
+def test_resume_unknown_job():
+    with pytest.raises(ValueError):
+        checkpoint.start_checkpoint("missing")
+
+
+def test_disabled_checkpoint_skips_nothing(tmp_path):
+    config.ENABLE_CRAWL_CHECKPOINT = False
+    checkpoint.start_checkpoint()
+    crawled = []
+    _crawl(1, crawled)
+    _crawl(1, crawled)
+    assert len(crawled) == 12
+    assert not list(tmp_path.iterdir())
+
+
+def test_xhs_comment_cursor_resume():
+    pages = {
+        "": {"has_more": True, "cursor": "c1", "comments": [{"id": "1"}, {"id": "2"}]},
+        "c1": {"has_more": True, "cursor": "c2", "comments": [{"id": "3"}, {"id": "4"}]},
+        "c2": {"has_more": False, "cursor": "", "comments": [{"id": "5"}]},
+    }
+    requested = []
+
+    async def get_note_comments(note_id, xsec_token, cursor=""):
+        requested.append(cursor)
+        if cursor == "c2" and len(requested) == 3:
+            raise Interrupted()
+        return pages[cursor]
+
+    config.ENABLE_GET_SUB_COMMENTS = False
+    client = XiaoHongShuClient(headers={}, playwright_page=None, cookie_dict={})
+    client.get_note_comments = get_note_comments
+    stored = []
+
+    async def callback(note_id, comments):
+        stored.extend(comment["id"] for comment in comments)
+
+    job_id = checkpoint.start_checkpoint().job_id
+    with pytest.raises(Interrupted):
+        asyncio.run(client.get_note_all_comments("note", "token", crawl_interval=0, callback=callback, max_count=10))
+    checkpoint.finish_checkpoint()
+
+    checkpoint.start_checkpoint(job_id)
+    assert checkpoint.comment_cursor("note") == ("c2", 4)
+    asyncio.run(client.get_note_all_comments("note", "token", crawl_interval=0, callback=callback, max_count=10))
+    assert requested == ["", "c1", "c2", "c2"]
+    assert stored == ["1", "2", "3", "4", "5"]
+
+
+def test_resume_cli_flag():
+    args = asyncio.run(cmd_arg.parse_cmd(["--platform", "xhs", "--resume", "xhs_search_1"]))
+    assert args.resume == "xhs_search_1"
+    assert asyncio.run(cmd_arg.parse_cmd(["--platform", "xhs"])).resume == ""
+
+    request = CrawlerStartRequest(platform="xhs", keywords="a", resume_job_id="xhs_search_1")
+    command = CrawlerManager()._build_command(request)
+    assert command[command.index("--resume") + 1] == "xhs_search_1"
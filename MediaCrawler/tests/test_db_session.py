@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_db_session.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for SQL engine and session management
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import IntegrityError
+
+import config
+from config.db_config import sqlite_db_config
+from database import db_session
+from database.models import BilibiliVideo, XhsNoteComment
+from store.xhs import batch_update_xhs_note_comments
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """Point the sqlite store at a temporary database"""
+    monkeypatch.setattr(config, "SAVE_DATA_OPTION", "sqlite")
+    monkeypatch.setitem(sqlite_db_config, "db_path", str(tmp_path / "test.db"))
+    asyncio.run(db_session.dispose_engines())
+    asyncio.run(db_session.create_tables("sqlite"))
+    yield
+    asyncio.run(db_session.dispose_engines())
+
+
+def _comment(comment_id: str, like_count: int = 0):
+    return {
+        "id": comment_id,
+        "create_time": 1700000000,
+        "ip_location": "Beijing",
+        "content": f"comment {comment_id}",
+        "user_info": {"user_id": "u1", "nickname": "n1", "image": ""},
+        "sub_comment_count": 0,
+        "like_count": like_count,
+    }
+
+
+def test_session_factory_is_reused(sqlite_db):
+    assert db_session.get_session_factory("sqlite") is db_session.get_session_factory("sqlite")
+
+
+def test_sqlite_pragmas(sqlite_db):
+    async def run():
+        async with db_session.get_session() as session:
+            journal_mode = (await session.execute(text("PRAGMA journal_mode"))).scalar()
+            synchronous = (await session.execute(text("PRAGMA synchronous"))).scalar()
+            busy_timeout = (await session.execute(text("PRAGMA busy_timeout"))).scalar()
+        await db_session.dispose_engines()
+        return journal_mode, synchronous, busy_timeout
+
+    journal_mode, synchronous, busy_timeout = asyncio.run(run())
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+    assert busy_timeout == sqlite_db_config["busy_timeout_ms"]
+
+
+def test_batch_session_shares_one_session(sqlite_db):
+    async def run():
+        async with db_session.batch_session():
+            async with db_session.get_session() as first:
+                pass
+            async with db_session.get_session() as second:
+                pass
+        await db_session.dispose_engines()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is second
+
+
+def test_batch_update_comments(sqlite_db):
+    async def run():
+        await batch_update_xhs_note_comments("note_1", [_comment("c1"), _comment("c2"), _comment("c1", like_count=5)])
+        async with db_session.get_session() as session:
+            count = (await session.execute(select(func.count()).select_from(XhsNoteComment))).scalar()
+            like_count = (await session.execute(
+                select(XhsNoteComment.like_count).where(XhsNoteComment.comment_id == "c1")
+            )).scalar()
+        await db_session.dispose_engines()
+        return count, like_count
+
+    count, like_count = asyncio.run(run())
+    assert count == 2
+    assert like_count == 5
+
+
+def _comment_row(comment_id: str) -> XhsNoteComment:
+    return XhsNoteComment(comment_id=comment_id, note_id="note_1", content=f"comment {comment_id}")
+
+
+def _stored_comment_ids():
+    async def run():
+        async with db_session.get_session() as session:
+            rows = (await session.execute(select(XhsNoteComment.comment_id))).scalars().all()
+        await db_session.dispose_engines()
+        return sorted(rows)
+
+    return asyncio.run(run())
+
+
+def test_batch_failing_item_keeps_siblings(sqlite_db):
+    async def run():
+        async with db_session.batch_session():
+            async with db_session.get_session() as session:
+                session.add(_comment_row("c1"))
+            async with db_session.get_session() as session:
+                session.add(_comment_row("c2"))
+                await session.flush()
+                raise ValueError("bad item")
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+    assert _stored_comment_ids() == ["c1"]
+
+
+def test_batch_duplicate_key_skips_only_that_item(sqlite_db):
+    async def run():
+        async with db_session.batch_session():
+            for comment_id in ("c1", "c1", "c2"):
+                async with db_session.get_session() as session:
+                    session.add(_comment_row(comment_id))
+
+    asyncio.run(run())
+    assert _stored_comment_ids() == ["c1", "c2"]
+
+
+def test_concurrent_batches_wait_for_the_write_lock(sqlite_db):
+    async def write_batch(prefix: str):
+        async with db_session.batch_session():
+            for i in range(5):
+                await batch_update_xhs_note_comments("note_1", [_comment(f"{prefix}{i}")])
+                async with db_session.get_session() as session:
+                    await session.execute(select(func.count()).select_from(XhsNoteComment))
+                await asyncio.sleep(0)
+
+    async def run():
+        await asyncio.gather(write_batch("a"), write_batch("b"), write_batch("c"))
+        await db_session.dispose_engines()
+
+    asyncio.run(run())
+    assert len(_stored_comment_ids()) == 15
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_not_null_violation_is_raised(sqlite_db, batch):
+    async def write():
+        async with db_session.get_session() as session:
+            # video_url is NOT NULL
+            session.add(BilibiliVideo(video_id=1))
+
+    async def run():
+        try:
+            if batch:
+                async with db_session.batch_session():
+                    await write()
+            else:
+                await write()
+        finally:
+            await db_session.dispose_engines()
+
+    with pytest.raises(IntegrityError, match="NOT NULL"):
+        asyncio.run(run())
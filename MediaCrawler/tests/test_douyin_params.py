@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_douyin_params.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for the session scoped Douyin request params
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from media_platform.douyin.client import DOUYIN_STATIC_PARAMS, DouYinClient
+from media_platform.douyin.exception import DataFetchError
+
+# Search requests are not a_bogus signed, so the tests do not need node
+SEARCH_URI = "/aweme/v1/web/general/search/single/"
+
+
+class FakePage:
+    def __init__(self):
+        self.evaluate_count = 0
+
+    async def evaluate(self, expression):
+        self.evaluate_count += 1
+        return {"xmst": f"token-{self.evaluate_count}"}
+
+
+@pytest.fixture(autouse=True)
+def no_response_cache(monkeypatch):
+    monkeypatch.setattr("config.ENABLE_API_RESPONSE_CACHE", False)
+
+
+def _client(handler) -> DouYinClient:
+    client = DouYinClient(headers={"User-Agent": "test-agent"}, playwright_page=FakePage(), cookie_dict={})
+    client._http_clients[None] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_params_cached_per_session():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(dict(request.url.params))
+        return httpx.Response(200, json={"status_code": 0})
+
+    async def run():
+        client = _client(handler)
+        await asyncio.gather(*(client.get(SEARCH_URI, {"keyword": str(i)}) for i in range(5)))
+        await client.close_http_clients()
+        return client.playwright_page.evaluate_count
+
+    assert asyncio.run(run()) == 1
+    assert len({params["webid"] for params in seen}) == 1
+    assert {params["msToken"] for params in seen} == {"token-1"}
+    assert all(params[key] == value for params in seen for key, value in DOUYIN_STATIC_PARAMS.items())
+
+
+def test_failed_request_refreshes_ms_token():
+    tokens = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        tokens.append(request.url.params["msToken"])
+        if len(tokens) == 1:
+            return httpx.Response(200, text="blocked")
+        return httpx.Response(200, json={"status_code": 0})
+
+    async def run():
+        client = _client(handler)
+        with pytest.raises(DataFetchError):
+            await client.get(SEARCH_URI, {"keyword": "a"})
+        await client.get(SEARCH_URI, {"keyword": "b"})
+        await client.close_http_clients()
+
+    asyncio.run(run())
+    assert tokens == ["token-1", "token-2"]
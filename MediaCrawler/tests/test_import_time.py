@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_import_time.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Import-time budget of main.py: platform packages and optional subsystems must stay lazy
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Generous wall clock budget for `import main`, the eager imports took about 3 seconds
+IMPORT_BUDGET_SECONDS = 2.5
+
+# Modules only needed by a selected platform or an optional feature
+LAZY_MODULES = [
+    "media_platform.xhs", "media_platform.douyin", "media_platform.kuaishou", "media_platform.bilibili",
+    "media_platform.weibo", "media_platform.tieba", "media_platform.zhihu",
+    "execjs", "cv2", "numpy", "jieba", "matplotlib", "wordcloud", "pandas", "IPython",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "loaded": [name for name in %r if name in sys.modules]}))
+""" % (LAZY_MODULES,)
+
+
+def _probe_import() -> dict:
+    # Warm run compiles the bytecode cache, the second run measures the import itself
+    for _ in range(2):
+        result = subprocess.run([sys.executable, "-c", PROBE], cwd=PROJECT_ROOT, capture_output=True, text=True,
+                                timeout=120, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture(scope="module")
+def import_probe() -> dict:
+    return _probe_import()
+
+
+def test_main_does_not_import_lazy_modules(import_probe):
+    assert import_probe["loaded"] == []
+
+
+def test_main_import_within_budget(import_probe):
+    assert import_probe["elapsed"] < IMPORT_BUDGET_SECONDS
+
+
+@pytest.mark.parametrize("platform", ["xhs", "dy", "ks", "bili", "wb", "tieba", "zhihu"])
+def test_crawler_registry_resolves(platform):
+    from base.base_crawler import AbstractCrawler
+    from main import CrawlerFactory
+
+    assert issubclass(CrawlerFactory.get_crawler_class(platform), AbstractCrawler)
+
+
+def test_unknown_platform_rejected():
+    from main import CrawlerFactory
+
+    with pytest.raises(ValueError):
+        CrawlerFactory.get_crawler_class("unknown")
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_local_proxy.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for the local proxy provider and the mock proxy server
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from proxy.base_proxy import IpGetError
+from proxy.mock_proxy_server import MOCK_VALIDATE_URL, MockHttpProxyServer
+from proxy.providers.local_proxy import LocalProxyProvider
+from proxy.proxy_ip_pool import ProxyIpPool
+
+
+def test_file_provider_parses_and_rotates(tmp_path):
+    proxy_file = tmp_path / "proxies.txt"
+    proxy_file.write_text("# comment\n1.1.1.1:8000\n\n2.2.2.2:8001:user:pwd\nbroken\n", encoding="utf-8")
+    provider = LocalProxyProvider(file_path=str(proxy_file), ttl=60)
+
+    first = asyncio.run(provider.get_proxy(1))[0]
+    second = asyncio.run(provider.get_proxy(5))
+    assert (first.ip, first.port, first.user) == ("1.1.1.1", 8000, "")
+    assert [(proxy.ip, proxy.user, proxy.password) for proxy in second] == [("2.2.2.2", "user", "pwd"),
+                                                                           ("1.1.1.1", "", "")]
+    assert abs(first.expired_time_ts - (int(time.time()) + 60)) <= 1
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(IpGetError):
+        asyncio.run(LocalProxyProvider(file_path=str(tmp_path / "missing.txt")).get_proxy(1))
+
+
+def test_pool_validates_through_mock_proxies():
+    async def run():
+        healthy_server = MockHttpProxyServer()
+        broken_server = MockHttpProxyServer(failure_rate=1.0)
+        proxies = await healthy_server.start(2) + await broken_server.start(1)
+        pool = ProxyIpPool(ip_pool_count=3, enable_validate_ip=True,
+                           ip_provider=LocalProxyProvider(proxies=proxies))
+        pool.valid_ip_url = MOCK_VALIDATE_URL
+        await pool.load_proxies()
+        await pool.check_proxies()
+        valid = {proxy.port for proxy in pool.proxy_list if pool.get_stats(proxy).successes}
+        await healthy_server.close()
+        await broken_server.close()
+        return valid, {proxy.port for proxy in proxies[:2]}, healthy_server.request_count
+
+    valid, expected, request_count = asyncio.run(run())
+    assert valid == expected
+    assert request_count == 2
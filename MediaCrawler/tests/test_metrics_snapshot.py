@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_metrics_snapshot.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for interaction metrics snapshots
+"""
+
+import asyncio
+
+import pytest
+
+from store.metrics_snapshot import MetricsSnapshotStore
+
+
+@pytest.fixture
+def snapshot_store(tmp_path):
+    MetricsSnapshotStore._last_written.clear()
+    yield MetricsSnapshotStore("xhs", base_dir=str(tmp_path))
+    MetricsSnapshotStore._last_written.clear()
+
+
+def _note(note_id: str, liked_count, comment_count=0):
+    return {"note_id": note_id, "liked_count": liked_count, "comment_count": comment_count, "title": "ignored"}
+
+
+def test_record_is_compact_and_skips_unchanged(snapshot_store):
+    async def run():
+        written = [
+            await snapshot_store.record(_note("n1", "10"), ts=1000),
+            await snapshot_store.record(_note("n1", "10"), ts=2000),
+            await snapshot_store.record(_note("n1", "1.2万"), ts=3000),
+            await snapshot_store.record({"liked_count": 1}, ts=3000),
+        ]
+        return written
+
+    assert asyncio.run(run()) == [True, False, True, False]
+    with open(snapshot_store.file_path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines == [
+        "note_id,ts,liked_count,collected_count,comment_count,share_count",
+        "n1,1000,10,0,0,0",
+        "n1,3000,12000,0,0,0",
+    ]
+
+
+def test_deltas_and_velocity(snapshot_store):
+    async def run():
+        await snapshot_store.record(_note("n1", 10, 1), ts=0)
+        await snapshot_store.record(_note("n1", 40, 3), ts=3600)
+        await snapshot_store.record(_note("n1", 100, 3), ts=7200)
+
+    asyncio.run(run())
+    deltas = snapshot_store.get_deltas("n1")
+    assert [delta["interval"] for delta in deltas] == [3600, 3600]
+    assert deltas[0]["deltas"]["liked_count"] == 30
+    assert deltas[1]["deltas"]["comment_count"] == 0
+    assert snapshot_store.get_velocity("n1", "liked_count") == 45.0
+    assert snapshot_store.get_velocity("n1", "liked_count", since_ts=3600) == 60.0
+    assert snapshot_store.get_velocity("missing", "liked_count") is None
+
+
+def test_trending(snapshot_store):
+    async def run():
+        for note_id, start, end in (("slow", 10, 20), ("fast", 10, 500), ("single", 1, 1)):
+            await snapshot_store.record(_note(note_id, start), ts=0)
+            if note_id != "single":
+                await snapshot_store.record(_note(note_id, end), ts=3600)
+
+    asyncio.run(run())
+    assert snapshot_store.get_trending("liked_count", top_n=5) == [("fast", 490.0), ("slow", 10.0)]
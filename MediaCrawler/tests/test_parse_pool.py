@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_parse_pool.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for the optional parsing process pool
+"""
+
+import asyncio
+
+import config
+from media_platform.tieba.help import TieBaExtractor
+from model.m_baidu_tieba import TiebaCreator
+from tools import parse_pool
+
+CREATOR_PAGE = (
+    "<html><body><p class='space'><a href='/home/main?un=tester&id=tb.1.abc'>home</a></p>"
+    "<span class='userinfo_username '>Tester</span>"
+    "<div class='userinfo_left_head'><img src='https://avatar'/></div>"
+    "</body></html>"
+)
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_runs_inline_when_disabled(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_PARSE_PROCESS_POOL", False, raising=False)
+    creator = _run(parse_pool.run_in_parse_pool(TieBaExtractor().extract_creator_info, CREATOR_PAGE))
+    assert isinstance(creator, TiebaCreator)
+    assert creator.user_name == "tester"
+    assert parse_pool._parse_pool is None
+
+
+def test_small_payload_runs_inline(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_PARSE_PROCESS_POOL", True, raising=False)
+    monkeypatch.setattr(config, "PARSE_PROCESS_POOL_MIN_SIZE", len(CREATOR_PAGE) + 1, raising=False)
+    _run(parse_pool.run_in_parse_pool(TieBaExtractor().extract_creator_info, CREATOR_PAGE))
+    assert parse_pool._parse_pool is None
+
+
+def test_extractor_in_worker_process(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_PARSE_PROCESS_POOL", True, raising=False)
+    monkeypatch.setattr(config, "PARSE_PROCESS_POOL_WORKERS", 1, raising=False)
+    monkeypatch.setattr(config, "PARSE_PROCESS_POOL_MIN_SIZE", 0, raising=False)
+    try:
+        inline = TieBaExtractor().extract_creator_info(CREATOR_PAGE)
+        creator = _run(parse_pool.run_in_parse_pool(TieBaExtractor().extract_creator_info, CREATOR_PAGE))
+        assert parse_pool._parse_pool is not None
+        assert creator == inline
+    finally:
+        parse_pool.shutdown_parse_pool()
+    assert parse_pool._parse_pool is None
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_perf_metrics.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for the hot-path perf metrics
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from tenacity import retry, stop_after_attempt, wait_fixed
+
+import config
+from base.base_crawler import AbstractStore
+from tools import perf_metrics
+from tools.perf_metrics import measure_sign, record_retry, registry
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry(monkeypatch):
+    monkeypatch.setattr(config, "PLATFORM", "tieba")
+    monkeypatch.setattr(config, "ENABLE_API_RESPONSE_CACHE", False)
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def _samples(metric):
+    return {tuple(sorted(sample["labels"].items())): sample for sample in metric.snapshot()["samples"]}
+
+
+def test_normalize_endpoint_collapses_ids():
+    assert perf_metrics.normalize_endpoint(
+        "https://edith.xiaohongshu.com/api/sns/web/v1/feed?a=1"
+    ) == "edith.xiaohongshu.com/api/sns/web/v1/feed"
+    assert perf_metrics.normalize_endpoint(
+        "https://www.xiaohongshu.com/user/profile/5f58bd990000000001003753"
+    ) == "www.xiaohongshu.com/user/profile/:id"
+    assert perf_metrics.normalize_endpoint("https://tieba.baidu.com/p/9123456789") == "tieba.baidu.com/p/:id"
+
+
+def test_summary_quantiles_and_items_per_second():
+    for value in (0.004, 0.02, 0.02, 0.2, 3.0):
+        perf_metrics.SIGN_DURATION.observe(value, platform="xhs", method="playwright")
+    perf_metrics.ITEMS_STORED.inc(10, platform="xhs", item="content")
+    snapshot = registry.snapshot()
+    snapshot["updated_at"] = snapshot["started_at"] + 5
+
+    summary = perf_metrics.summarize(snapshot)
+    sign = summary["sign_duration_seconds"]["platform=xhs,method=playwright"]
+    assert sign["count"] == 5
+    assert sign["p50"] == 0.025
+    assert sign["p95"] == 3.0
+    assert sign["max"] == 3.0
+    assert summary["items_per_second"] == {"platform=xhs,item=content": 2.0}
+    # Metrics without samples are left out
+    assert "retries_total" not in summary
+
+
+def test_render_prometheus_cumulative_buckets():
+    perf_metrics.REQUEST_DURATION.observe(0.03, platform="xhs", endpoint='a"b', status=200)
+    perf_metrics.REQUEST_DURATION.observe(50, platform="xhs", endpoint='a"b', status=200)
+    text = perf_metrics.render_prometheus(registry.snapshot())
+
+    labels = 'platform="xhs",endpoint="a\\"b",status="200"'
+    assert "# TYPE mediacrawler_request_duration_seconds histogram" in text
+    assert f'mediacrawler_request_duration_seconds_bucket{{{labels},le="0.025"}} 0' in text
+    assert f'mediacrawler_request_duration_seconds_bucket{{{labels},le="0.05"}} 1' in text
+    assert f'mediacrawler_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"mediacrawler_request_duration_seconds_count{{{labels}}} 2" in text
+    assert "mediacrawler_metrics_updated_timestamp_seconds " in text
+
+
+def test_client_requests_are_timed():
+    from media_platform.tieba.client import BaiduTieBaClient
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"no": 0})
+
+    async def run():
+        client = BaiduTieBaClient(headers={"User-Agent": "test-agent"})
+        client._http_clients[None] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await client.get("/f", params={"kw": "x"})
+        await client.get("/p/9123456789", return_ori_content=True)
+        await client.close_http_clients()
+
+    asyncio.run(run())
+    samples = _samples(perf_metrics.REQUEST_DURATION)
+    forum = samples[(("endpoint", "tieba.baidu.com/f"), ("platform", "tieba"), ("status", "200"))]
+    post = samples[(("endpoint", "tieba.baidu.com/p/:id"), ("platform", "tieba"), ("status", "200"))]
+    assert forum["count"] == post["count"] == 1
+    assert _samples(perf_metrics.INFLIGHT_REQUESTS)[(("platform", "tieba"),)]["value"] == 0
+
+
+def test_store_writes_and_items_are_counted():
+    class DummyStore(AbstractStore):
+        async def store_content(self, content_item):
+            await asyncio.sleep(0)
+
+        async def store_comment(self, comment_item):
+            pass
+
+        async def store_creator(self, creator):
+            pass
+
+    async def run():
+        store = DummyStore()
+        for i in range(3):
+            await store.store_content({"id": i})
+        await store.store_comment({})
+
+    asyncio.run(run())
+    items = _samples(perf_metrics.ITEMS_STORED)
+    assert items[(("item", "content"), ("platform", "tieba"))]["value"] == 3
+    assert items[(("item", "comment"), ("platform", "tieba"))]["value"] == 1
+    store_duration = _samples(perf_metrics.STORE_DURATION)
+    assert store_duration[(("item", "content"), ("platform", "tieba"), ("store", "DummyStore"))]["count"] == 3
+
+
+def test_sign_and_retry_are_recorded():
+    attempts = []
+
+    @retry(stop=stop_after_attempt(3), wait=wait_fixed(0), before_sleep=record_retry)
+    @measure_sign("dy", "execjs")
+    def flaky_sign():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ValueError("sign failed")
+        return "a_bogus"
+
+    assert flaky_sign() == "a_bogus"
+    assert _samples(perf_metrics.SIGN_DURATION)[(("method", "execjs"), ("platform", "dy"))]["count"] == 3
+    retries = list(_samples(perf_metrics.REQUEST_RETRIES).values())
+    assert [sample["value"] for sample in retries] == [2]
+    assert retries[0]["labels"]["function"].endswith("flaky_sign")
+
+
+def test_api_serves_snapshot_file(tmp_path, monkeypatch):
+    from api.main import app
+    from api.routers import metrics as metrics_router
+
+    metrics_file = tmp_path / "perf_metrics.json"
+    monkeypatch.setattr(metrics_router, "METRICS_FILE", metrics_file)
+    client = TestClient(app)
+    assert client.get("/api/metrics/summary").status_code == 404
+
+    perf_metrics.ITEMS_STORED.inc(platform="tieba", item="content")
+    perf_metrics.write_snapshot(str(metrics_file))
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'mediacrawler_items_stored_total{platform="tieba",item="content"} 1' in response.text
+    assert client.get("/api/metrics/summary").json()["items_stored_total"] == {"platform=tieba,item=content": 1}
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_progress.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for the structured crawl progress events and their aggregation by the WebUI CrawlerManager
+"""
+
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import config
+from api.services.crawler_manager import CrawlerManager
+from api.schemas import CrawlerProgress
+from base.base_crawler import AbstractStore
+from tools import progress
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture(autouse=True)
+def _search_config(monkeypatch):
+    monkeypatch.setattr(config, "PLATFORM", "xhs")
+    monkeypatch.setattr(config, "CRAWLER_TYPE", "search")
+    monkeypatch.setattr(config, "KEYWORDS", "a,b")
+    monkeypatch.setattr(config, "CRAWLER_MAX_NOTES_COUNT", 20)
+    yield
+    progress.finish_progress()
+
+
+def _events(path: Path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_target_contents_per_crawler_type(monkeypatch):
+    assert progress.get_target_contents() == 40
+    monkeypatch.setattr(config, "CRAWLER_TYPE", "detail")
+    monkeypatch.setattr(config, "XHS_SPECIFIED_NOTE_URL_LIST", ["u1", "u2", "u3"])
+    assert progress.get_target_contents() == 3
+    monkeypatch.setattr(config, "CRAWLER_TYPE", "creator")
+    assert progress.get_target_contents() is None
+
+
+def test_reporter_writes_events(tmp_path, monkeypatch):
+    class DummyStore(AbstractStore):
+        async def store_content(self, content_item):
+            pass
+
+        async def store_comment(self, comment_item):
+            pass
+
+        async def store_creator(self, creator):
+            pass
+
+    async def run():
+        store = DummyStore()
+        for _ in range(10):
+            await store.store_content({})
+        await store.store_comment({})
+
+    monkeypatch.setattr(progress, "PROGRESS_FLUSH_INTERVAL", 0)
+    path = tmp_path / "progress.jsonl"
+    reporter = progress.start_progress(str(path))
+    progress.page_done()
+    asyncio.run(run())
+    logging.getLogger("MediaCrawler").error("search failed: %s", "IP blocked")
+    progress.finish_progress()
+
+    events = _events(path)
+    assert events[0]["event"] == "run_started"
+    assert events[0]["target_contents"] == 40
+    assert [event["contents"] for event in events if event["event"] == "progress"][-1] == 10
+    error = next(event for event in events if event["event"] == "error")
+    assert error["message"] == "search failed: IP blocked"
+    assert error["source"].startswith("test_progress.py:")
+    finished = events[-1]
+    assert finished["event"] == "run_finished"
+    assert (finished["pages"], finished["contents"], finished["comments"], finished["errors"]) == (1, 10, 1, 1)
+    assert finished["eta_seconds"] is not None
+    # The handler is removed with the run, later errors are not reported
+    logging.getLogger("MediaCrawler").error("after the run")
+    assert reporter.counts["errors"] == 1
+
+
+def test_progress_events_are_throttled(tmp_path):
+    path = tmp_path / "progress.jsonl"
+    progress.start_progress(str(path))
+    for _ in range(100):
+        progress.page_done()
+    assert sum(event["event"] == "progress" for event in _events(path)) <= 1
+
+
+def test_reporter_without_channel_only_counts():
+    reporter = progress.start_progress()
+    progress.page_done()
+    assert reporter.path is None
+    assert reporter.counts["pages"] == 1
+
+
+def test_manager_aggregates_complete_lines(tmp_path):
+    path = tmp_path / "progress.jsonl"
+    manager = CrawlerManager()
+    manager.progress = CrawlerProgress()
+    lines = [
+        {"event": "run_started", "platform": "xhs", "crawler_type": "search", "target_contents": 40},
+        {"event": "progress", "pages": 2, "contents": 10, "comments": 30, "creators": 0, "errors": 0,
+         "target_contents": 40, "elapsed_seconds": 5.0, "eta_seconds": 15.0},
+        {"event": "error", "message": "IP blocked", "source": "core.py:1"},
+    ]
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines) + '{"event": "progr', encoding="utf-8")
+
+    manager._read_progress_events(path)
+    status = manager.get_status()["progress"]
+    assert status["stage"] == "crawling"
+    assert (status["pages"], status["contents"], status["comments"], status["errors"]) == (2, 10, 30, 1)
+    assert status["eta_seconds"] == 15.0
+    assert status["last_error"] == "IP blocked"
+
+    # The partial line is read once it is complete
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('ess", "pages": 3, "contents": 20, "errors": 1}\n')
+    manager._read_progress_events(path)
+    assert (manager.progress.pages, manager.progress.contents) == (3, 20)
+
+
+def test_manager_watches_crawler_process(tmp_path):
+    script = (
+        "import logging\n"
+        "from tools import progress\n"
+        "progress.start_progress()\n"
+        "progress.page_done()\n"
+        "logging.getLogger('MediaCrawler').error('boom')\n"
+        "progress.finish_progress()\n"
+    )
+    path = tmp_path / "progress.jsonl"
+    path.touch()
+    process = subprocess.Popen(
+        [sys.executable, "-c", script],
+        cwd=str(PROJECT_ROOT),
+        env={**os.environ, progress.PROGRESS_FILE_ENV: str(path)},
+    )
+    manager = CrawlerManager()
+    manager.progress = CrawlerProgress()
+    manager._progress_file = path
+
+    asyncio.run(asyncio.wait_for(manager._watch_progress(process, path), timeout=60))
+    assert manager.progress.stage == "finished"
+    assert (manager.progress.pages, manager.progress.errors) == (1, 1)
+    assert manager.progress.last_error == "boom"
+    assert not path.exists()
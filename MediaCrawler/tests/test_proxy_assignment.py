@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_proxy_assignment.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for per-task proxy assignment
+"""
+
+import asyncio
+from collections import Counter
+
+import httpx
+import pytest
+
+from proxy.proxy_ip_pool import ProxyIpPool, proxy_key
+from proxy.proxy_mixin import ProxyRefreshMixin, sticky_proxy
+from proxy.types import IpInfoModel
+from tests.test_proxy_pool import FakeProvider
+
+
+def _make_pool(count: int = 3) -> ProxyIpPool:
+    pool = ProxyIpPool(ip_pool_count=count, enable_validate_ip=False, ip_provider=FakeProvider())
+    asyncio.run(pool.load_proxies())
+    return pool
+
+
+class FakeApiClient(ProxyRefreshMixin):
+    """Records the proxy of every request instead of sending it"""
+
+    def __init__(self, pool: ProxyIpPool, status_code: int = 200):
+        self.proxy = None
+        self.status_code = status_code
+        self.used_proxies = []
+        self.init_proxy_pool(pool)
+
+    def _get_http_client(self, proxy_url):
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.used_proxies.append((request.headers.get("X-Note"), proxy_url))
+            return httpx.Response(self.status_code, json={})
+
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture
+def strategy(monkeypatch):
+    def set_strategy(value: str):
+        monkeypatch.setattr("config.IP_PROXY_ASSIGN_STRATEGY", value)
+
+    return set_strategy
+
+
+def test_round_robin_spreads_requests(strategy):
+    strategy("round_robin")
+    pool = _make_pool(3)
+    assigned = Counter(proxy_key(pool.assign_proxy()) for _ in range(9))
+    assert len(assigned) == 3
+    assert set(assigned.values()) == {3}
+
+
+def test_sticky_keeps_key_on_one_proxy(strategy):
+    strategy("sticky")
+    pool = _make_pool(3)
+    first = pool.assign_proxy("note_1")
+    assert all(pool.assign_proxy("note_1") == first for _ in range(5))
+    assert len({proxy_key(pool.assign_proxy(f"note_{i}")) for i in range(30)}) > 1
+
+
+def test_current_strategy_disables_assignment(strategy):
+    strategy("current")
+    assert _make_pool(2).assign_proxy() is None
+
+
+def test_concurrent_tasks_use_different_proxies(strategy):
+    strategy("sticky")
+    pool = _make_pool(3)
+    client = FakeApiClient(pool)
+
+    async def task(note_id: str):
+        async with sticky_proxy(note_id):
+            await client._send_request("GET", "https://example.com/a", headers={"X-Note": note_id})
+            await asyncio.sleep(0)
+            await client._send_request("GET", "https://example.com/b", headers={"X-Note": note_id})
+
+    async def run():
+        await asyncio.gather(*[task(f"note_{i}") for i in range(20)])
+
+    asyncio.run(run())
+    proxies_by_note = {}
+    for note_id, proxy_url in client.used_proxies:
+        proxies_by_note.setdefault(note_id, set()).add(proxy_url)
+    # Both requests of a task went through the same proxy, tasks are spread over the pool
+    assert len(proxies_by_note) == 20
+    assert all(len(proxy_urls) == 1 for proxy_urls in proxies_by_note.values())
+    assert len(set.union(*proxies_by_note.values())) > 1
+
+
+def test_blocked_responses_evict_proxy(strategy, monkeypatch):
+    strategy("round_robin")
+    monkeypatch.setattr("config.IP_PROXY_MAX_FAILURES", 2)
+    pool = _make_pool(2)
+    client = FakeApiClient(pool, status_code=461)
+
+    async def run():
+        for _ in range(4):
+            await client._send_request("GET", "https://example.com")
+        await pool.check_proxies()
+
+    asyncio.run(run())
+    # Both blocked proxies were evicted and replaced from the provider
+    assert sorted(proxy.ip for proxy in pool.proxy_list) == ["10.0.0.3", "10.0.0.4"]
+
+
+class PooledFakeApiClient(ProxyRefreshMixin):
+    """Pools one mock client per proxy, requests wait until `release` is set"""
+
+    def __init__(self, pool: ProxyIpPool):
+        self.proxy = None
+        self.init_proxy_pool(pool)
+        self.release = asyncio.Event()
+
+    def _get_http_client(self, proxy_url):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await self.release.wait()
+            return httpx.Response(200, json={})
+
+        if proxy_url not in self._http_clients:
+            self._http_clients[proxy_url] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return self._http_clients[proxy_url]
+
+
+def test_pruned_client_closes_after_inflight_request(strategy):
+    strategy("round_robin")
+    pool = _make_pool(2)
+    client = PooledFakeApiClient(pool)
+
+    async def run():
+        request = asyncio.create_task(client._send_request("GET", "https://example.com"))
+        await asyncio.sleep(0.01)
+        (busy_client,) = client._http_clients.values()
+        idle_client = client._get_http_client("http://10.0.0.9:8080")
+        # Both proxies leave the pool while a request is still running on one of them
+        pool.proxy_list.clear()
+        await client._prune_http_clients()
+        pruned = (busy_client.is_closed, idle_client.is_closed, client._http_clients)
+        client.release.set()
+        response = await request
+        return pruned, response, busy_client
+
+    (busy_closed, idle_closed, pooled), response, busy_client = asyncio.run(run())
+    assert (busy_closed, idle_closed, pooled) == (False, True, {})
+    assert response.status_code == 200
+    assert busy_client.is_closed
+    assert client._http_client_requests == {}
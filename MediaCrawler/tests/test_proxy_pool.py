@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_proxy_pool.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for proxy pool health checking and scored selection, using an in-memory provider
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Set
+
+import pytest
+
+from proxy.base_proxy import ProxyProvider
+from proxy.proxy_ip_pool import ProxyIpPool, ProxyStats
+from proxy.types import IpInfoModel
+
+
+class FakeProvider(ProxyProvider):
+    def __init__(self, expired_time_ts=None):
+        self.served = 0
+        self.expired_time_ts = expired_time_ts
+
+    async def get_proxy(self, num: int) -> List[IpInfoModel]:
+        proxies = []
+        for _ in range(num):
+            self.served += 1
+            proxies.append(IpInfoModel(ip=f"10.0.0.{self.served}", port=8000, user="", password="",
+                                       expired_time_ts=self.expired_time_ts))
+        return proxies
+
+
+class FakeValidatingPool(ProxyIpPool):
+    def __init__(self, provider: ProxyProvider, ip_pool_count: int = 3):
+        super().__init__(ip_pool_count=ip_pool_count, enable_validate_ip=True, ip_provider=provider)
+        self.latencies: Dict[str, float] = {}
+        self.broken: Set[str] = set()
+        self.checked: List[str] = []
+
+    async def _is_valid_proxy(self, proxy: IpInfoModel) -> bool:
+        self.checked.append(proxy.ip)
+        await asyncio.sleep(self.latencies.get(proxy.ip, 0))
+        return proxy.ip not in self.broken
+
+
+def test_stats_score_prefers_fast_and_reliable():
+    fast, slow, flaky = ProxyStats(), ProxyStats(), ProxyStats()
+    for _ in range(5):
+        fast.record(True, 0.1)
+        slow.record(True, 1.0)
+        flaky.record(False)
+    flaky.record(True, 0.1)
+    assert fast.score > slow.score
+    assert fast.score > flaky.score
+    assert flaky.consecutive_failures == 0
+
+
+def test_get_proxy_returns_best_validated_proxy():
+    async def run():
+        pool = FakeValidatingPool(FakeProvider())
+        await pool.load_proxies()
+        pool.latencies = {"10.0.0.1": 0.05, "10.0.0.2": 0.0, "10.0.0.3": 0.0}
+        pool.broken = {"10.0.0.3"}
+        await pool.check_proxies()
+        checked_before = len(pool.checked)
+        proxy = await pool.get_proxy()
+        return pool, proxy, checked_before
+
+    pool, proxy, checked_before = asyncio.run(run())
+    assert proxy.ip == "10.0.0.2"
+    # No validation round-trip on the hot path once the pool has been checked
+    assert len(pool.checked) == checked_before
+
+
+def test_failing_proxies_are_evicted_and_replaced():
+    async def run():
+        pool = FakeValidatingPool(FakeProvider(), ip_pool_count=2)
+        await pool.load_proxies()
+        pool.broken = {"10.0.0.1"}
+        for _ in range(3):
+            await pool.check_proxies()
+        return pool
+
+    pool = asyncio.run(run())
+    assert sorted(proxy.ip for proxy in pool.proxy_list) == ["10.0.0.2", "10.0.0.3"]
+
+
+def test_background_checker_prefetches_replacement():
+    async def run():
+        pool = FakeValidatingPool(FakeProvider(expired_time_ts=int(time.time()) + 45), ip_pool_count=2)
+        await pool.load_proxies()
+        current = await pool.get_proxy()
+        pool.start_health_check(interval=0.01)
+        await asyncio.sleep(0.05)
+        await pool.close()
+        return current, pool._next_proxy
+
+    current, next_proxy = asyncio.run(run())
+    assert next_proxy is not None
+    assert next_proxy.ip != current.ip
+
+
+def test_get_proxy_raises_when_no_valid_proxy():
+    async def run():
+        pool = FakeValidatingPool(FakeProvider(), ip_pool_count=1)
+        pool.broken = {f"10.0.0.{i}" for i in range(1, 10)}
+        await pool.load_proxies()
+        await pool.get_proxy()
+
+    with pytest.raises(Exception):
+        asyncio.run(run())
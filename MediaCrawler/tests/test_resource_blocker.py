@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_resource_blocker.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for browser resource interception profiles
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from tools.resource_blocker import ResourceBlocker, apply_resource_profile
+
+
+class FakeRoute:
+    def __init__(self, resource_type: str, url: str):
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.result = None
+
+    async def abort(self, error_code=None):
+        self.result = "abort"
+
+    async def fallback(self):
+        self.result = "fallback"
+
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+
+    async def route(self, url, handler):
+        self.routes.append((url, handler))
+
+    async def unroute(self, url, handler):
+        self.routes.remove((url, handler))
+
+
+def test_light_blocks_media_only():
+    blocker = ResourceBlocker("light")
+    assert blocker.should_block("image", "https://sns-img.xhscdn.com/a.jpg")
+    assert blocker.should_block("media", "https://v.douyin.com/a.mp4")
+    assert blocker.should_block("font", "https://a.com/f.woff2")
+    assert not blocker.should_block("script", "https://cdn.example.com/tracker.js")
+    assert not blocker.should_block("xhr", "https://hm.baidu.com/hm.gif")
+    assert not blocker.should_block("document", "https://www.xiaohongshu.com/explore")
+
+
+def test_minimal_keeps_allowlisted_scripts():
+    blocker = ResourceBlocker("minimal", ["xiaohongshu.com", "xhscdn.com"])
+    assert not blocker.should_block("script", "https://fe-static.xhscdn.com/as/v1/3e44/public/main.js")
+    assert not blocker.should_block("script", "https://www.xiaohongshu.com/app.js")
+    assert blocker.should_block("script", "https://cdn.example.com/lib.js")
+    assert blocker.should_block("script", "https://notxhscdn.com/lib.js")
+    assert blocker.should_block("stylesheet", "https://www.xiaohongshu.com/app.css")
+    assert blocker.should_block("xhr", "https://hm.baidu.com/hm.gif")
+    assert not blocker.should_block("xhr", "https://edith.xiaohongshu.com/api/sns/web/v1/feed")
+
+
+def test_minimal_without_allowlist_keeps_scripts():
+    blocker = ResourceBlocker("minimal")
+    assert not blocker.should_block("script", "https://s1.hdslb.com/bfs/static/jinkela/home.js")
+    assert blocker.should_block("image", "https://i0.hdslb.com/a.png")
+
+
+def test_unknown_profile_rejected():
+    with pytest.raises(ValueError):
+        ResourceBlocker("heavy")
+
+
+def test_route_handler_aborts_and_counts():
+    async def run():
+        context = FakeContext()
+        blocker = ResourceBlocker("light")
+        await blocker.attach(context)
+        _, handler = context.routes[0]
+        routes = [FakeRoute("image", "https://a.com/1.png"), FakeRoute("xhr", "https://a.com/api")]
+        for route in routes:
+            await handler(route)
+        await blocker.detach()
+        return context, blocker, routes
+
+    context, blocker, routes = asyncio.run(run())
+    assert [route.result for route in routes] == ["abort", "fallback"]
+    assert (blocker.blocked_count, blocker.allowed_count) == (1, 1)
+    assert context.routes == []
+
+
+def test_apply_profile_follows_config(monkeypatch):
+    context = FakeContext()
+    monkeypatch.setattr("config.BROWSER_RESOURCE_PROFILE", "off")
+    assert asyncio.run(apply_resource_profile(context, "xhs")) is None
+    assert context.routes == []
+
+    monkeypatch.setattr("config.BROWSER_RESOURCE_PROFILE", "minimal")
+    blocker = asyncio.run(apply_resource_profile(context, "xhs"))
+    assert blocker.script_allowlist == ("xiaohongshu.com", "xhscdn.com")
+    assert len(context.routes) == 1
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_schema_migration.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for migrating old SQLite tables to the current schema
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+from sqlalchemy import inspect
+
+from config.db_config import sqlite_db_config
+from database import db_session
+from database.schema_migration import migrate_schema
+from tools.crawler_util import parse_count
+
+OLD_XHS_NOTE_COMMENT_DDL = """
+CREATE TABLE xhs_note_comment (
+    id INTEGER NOT NULL PRIMARY KEY,
+    user_id VARCHAR(255), nickname TEXT, avatar TEXT, ip_location TEXT,
+    add_ts BIGINT, last_modify_ts BIGINT,
+    comment_id VARCHAR(255), create_time BIGINT, note_id VARCHAR(255),
+    content TEXT, sub_comment_count INTEGER, pictures TEXT,
+    parent_comment_id VARCHAR(255), like_count TEXT
+)
+"""
+
+
+@pytest.fixture
+def old_sqlite_db(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "old.db")
+    monkeypatch.setitem(sqlite_db_config, "db_path", db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute(OLD_XHS_NOTE_COMMENT_DDL)
+    conn.execute("CREATE INDEX ix_xhs_note_comment_comment_id ON xhs_note_comment (comment_id)")
+    conn.executemany(
+        "INSERT INTO xhs_note_comment (id, comment_id, note_id, create_time, like_count) VALUES (?, ?, ?, ?, ?)",
+        [(1, "c1", "n1", 1, "3"), (2, "c2", "n1", 2, "1.2万"), (3, "c1", "n1", 1, "5"), (4, "c3", "n2", 3, "None")],
+    )
+    conn.commit()
+    conn.close()
+    asyncio.run(db_session.dispose_engines())
+    yield db_path
+    asyncio.run(db_session.dispose_engines())
+
+
+def test_migrate_old_table(old_sqlite_db):
+    async def run():
+        await migrate_schema("sqlite")
+        # Running again must be a no-op
+        await migrate_schema("sqlite")
+        await db_session.dispose_engines()
+
+    asyncio.run(run())
+
+    conn = sqlite3.connect(old_sqlite_db)
+    rows = conn.execute("SELECT id, comment_id, like_count, typeof(like_count) FROM xhs_note_comment ORDER BY id").fetchall()
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    conn.close()
+
+    # The duplicate c1 keeps the most recently inserted row
+    assert rows == [(2, "c2", 12000, "integer"), (3, "c1", 5, "integer"), (4, "c3", 0, "integer")]
+    assert "xhs_note_comment_old" not in tables
+    assert "xhs_note" in tables
+
+
+def test_migrated_indexes(old_sqlite_db):
+    async def run():
+        await migrate_schema("sqlite")
+        engine = db_session.get_async_engine("sqlite")
+        async with engine.connect() as conn:
+            indexes = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_indexes("xhs_note_comment"))
+        await db_session.dispose_engines()
+        return {index["name"]: index for index in indexes}
+
+    indexes = asyncio.run(run())
+    assert indexes["ix_xhs_note_comment_comment_id"]["unique"]
+    assert indexes["ix_xhs_note_comment_note_id_create_time"]["column_names"] == ["note_id", "create_time"]
+
+
+@pytest.mark.parametrize("value, expected", [
+    (123, 123), ("123", 123), ("1,234", 1234), ("10+", 10), ("1.2万", 12000), ("1.2w", 12000),
+    ("3亿", 300000000), ("1.13亿", 113000000), ("2.5k", 2500), (None, 0), ("", 0), ("None", 0),
+])
+def test_parse_count(value, expected):
+    assert parse_count(value) == expected
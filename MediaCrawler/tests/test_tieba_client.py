@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_tieba_client.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for the async http transport of BaiduTieBaClient
+"""
+
+import asyncio
+
+import httpx
+
+from media_platform.tieba.client import BaiduTieBaClient
+
+
+def _client(handler) -> BaiduTieBaClient:
+    client = BaiduTieBaClient(headers={"User-Agent": "test-agent", "Cookie": "BDUSS=1"})
+    # Pooled client of the "no proxy" slot, the same slot every request goes through
+    client._http_clients[None] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_requests_share_pooled_client():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.path, request.headers["User-Agent"], request.headers["Cookie"]))
+        return httpx.Response(200, json={"no": 0})
+
+    async def run():
+        client = _client(handler)
+        pooled = client._http_clients[None]
+        results = await asyncio.gather(*(client.get(f"/f/{i}") for i in range(5)))
+        assert client._http_clients == {None: pooled}
+        await client.close_http_clients()
+        return results
+
+    assert asyncio.run(run()) == [{"no": 0}] * 5
+    assert sorted(path for path, _, _ in seen) == [f"/f/{i}" for i in range(5)]
+    assert {(ua, cookie) for _, ua, cookie in seen} == {("test-agent", "BDUSS=1")}
+
+
+def test_follows_redirects_and_returns_text():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if not request.url.query:
+            return httpx.Response(302, headers={"Location": "https://tieba.baidu.com/p/1?pn=1"})
+        return httpx.Response(200, text="<html>note</html>")
+
+    async def run():
+        client = _client(handler)
+        try:
+            return await client.get("/p/1", return_ori_content=True)
+        finally:
+            await client.close_http_clients()
+
+    assert asyncio.run(run()) == "<html>note</html>"
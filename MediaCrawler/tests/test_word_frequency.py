@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_word_frequency.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for the incremental comment word frequency aggregates
+"""
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import config
+from api.main import app
+from api.routers import data as data_router
+from store import word_frequency
+from store.word_frequency import WordFrequencyStore, comment_day
+
+
+@pytest.fixture
+def word_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_WORD_FREQ_AGGREGATE", True)
+    monkeypatch.setattr(config, "WORD_FREQ_AGGREGATE_BATCH_SIZE", 100)
+    monkeypatch.setattr(config, "CUSTOM_WORDS", {"编程副业": "专业术语"})
+    WordFrequencyStore._pending.clear()
+    yield WordFrequencyStore("xhs", base_dir=str(tmp_path))
+    WordFrequencyStore._pending.clear()
+
+
+def _comment(comment_id, content, create_time="2025-03-01 10:00"):
+    return {"comment_id": comment_id, "content": content, "create_time": create_time}
+
+
+def test_comment_day_formats(monkeypatch):
+    ts = int(time.mktime(time.strptime("2025-03-02 12:00", "%Y-%m-%d %H:%M")))
+    assert comment_day({"create_time": ts}) == "2025-03-02"
+    assert comment_day({"create_time": ts * 1000}) == "2025-03-02"
+    assert comment_day({"publish_time": "2025-03-03 08:15"}) == "2025-03-03"
+    monkeypatch.setattr(word_frequency.utils, "get_current_date", lambda: "2025-03-04")
+    assert comment_day({"create_time": ""}) == "2025-03-04"
+
+
+def test_fold_counts_each_comment_once(word_store):
+    async def run():
+        await word_store.add(_comment("c1", "编程副业真的能赚钱吗"), keyword="副业")
+        await word_store.add(_comment("c2", "学习编程副业"), keyword="副业")
+        await word_store.add({"comment_id": "c3", "content": ""}, keyword="副业")
+        first = await word_store.flush()
+        # A later job re-crawls c1 and finds c4
+        await word_store.add(_comment("c1", "编程副业真的能赚钱吗"), keyword="副业")
+        await word_store.add(_comment("c4", "编程副业"), keyword="兼职")
+        second = await WordFrequencyStore("xhs", base_dir=word_store.file_path.rsplit("/xhs/", 1)[0]).flush()
+        return first, second
+
+    assert asyncio.run(run()) == (2, 1)
+    assert word_store.get_top_words(1) == [("编程副业", 3)]
+    assert word_store.get_top_words(1, keyword="兼职") == [("编程副业", 1)]
+    assert {row["keyword"]: row["comments"] for row in word_store.get_keywords()} == {"副业": 2, "兼职": 1}
+
+
+def test_buffer_flushes_at_batch_size(word_store, monkeypatch):
+    monkeypatch.setattr(config, "WORD_FREQ_AGGREGATE_BATCH_SIZE", 2)
+
+    async def run():
+        await word_store.add(_comment("c1", "编程副业"), keyword="")
+        pending_after_first = len(WordFrequencyStore._pending["xhs"])
+        await word_store.add(_comment("c2", "编程副业"), keyword="")
+        return pending_after_first
+
+    assert asyncio.run(run()) == 1
+    assert "xhs" not in WordFrequencyStore._pending
+    assert word_store.get_top_words(1) == [("编程副业", 2)]
+
+
+
+def test_tokenize_outside_write_lock(word_store, monkeypatch):
+    count_words = WordFrequencyStore._count_words
+    lock_free = []
+
+    def count_words_probe(texts):
+        # Another job must be able to take the write lock while this one tokenizes
+        conn = sqlite3.connect(word_store.file_path, timeout=0, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("ROLLBACK")
+            lock_free.append(True)
+        finally:
+            conn.close()
+        return count_words(texts)
+
+    monkeypatch.setattr(WordFrequencyStore, "_count_words", staticmethod(count_words_probe))
+
+    async def run():
+        await word_store.add(_comment("c1", "编程副业"), keyword="k")
+        await word_store.add(_comment("c2", "编程副业", "2025-03-02"), keyword="k")
+        return await word_store.flush()
+
+    assert asyncio.run(run()) == 2
+    assert lock_free == [True, True]
+
+
+def test_failed_fold_keeps_batch(word_store, monkeypatch):
+    def fail(texts):
+        raise sqlite3.OperationalError("database is locked")
+
+    async def run():
+        await word_store.add(_comment("c1", "编程副业"), keyword="k")
+        with monkeypatch.context() as patch:
+            patch.setattr(WordFrequencyStore, "_count_words", staticmethod(fail))
+            with pytest.raises(sqlite3.OperationalError):
+                await word_store.flush()
+        await word_store.add(_comment("c2", "编程副业"), keyword="k")
+        kept = [comment[0] for comment in WordFrequencyStore._pending["xhs"]]
+        return kept, await word_store.flush()
+
+    assert asyncio.run(run()) == (["c1", "c2"], 2)
+    assert word_store.get_top_words(1) == [("编程副业", 2)]
+
+def test_trending_words_and_series(word_store):
+    async def run():
+        await word_store.add(_comment("c1", "编程副业", "2025-03-01"), keyword="k")
+        for i in range(3):
+            await word_store.add(_comment(f"c{i + 2}", "编程副业 兼职", "2025-03-09"), keyword="k")
+        await word_store.flush()
+
+    asyncio.run(run())
+    trending = word_store.get_trending_words(days=7, until_day="2025-03-10", keyword="k")
+    assert trending == [
+        {"word": "兼职", "count": 3, "previous_count": 0, "delta": 3},
+        {"word": "编程副业", "count": 3, "previous_count": 1, "delta": 2},
+    ]
+    assert word_store.get_word_series("编程副业") == [("2025-03-01", 1), ("2025-03-09", 3)]
+    assert word_store.get_top_words(5, since_day="2025-03-05") == [("兼职", 3), ("编程副业", 3)]
+
+
+def test_record_comment_words_disabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_WORD_FREQ_AGGREGATE", False)
+    WordFrequencyStore._pending.clear()
+    asyncio.run(word_frequency.record_comment_words("xhs", _comment("c1", "编程副业")))
+    assert WordFrequencyStore._pending == {}
+
+
+def test_words_api(word_store, tmp_path, monkeypatch):
+    asyncio.run(word_store.add(_comment("c1", "编程副业"), keyword="k"))
+    asyncio.run(word_store.flush())
+    monkeypatch.setattr(data_router, "DATA_DIR", tmp_path)
+    client = TestClient(app)
+
+    assert client.get("/api/data/words/xhs/top").json() == {"words": [{"word": "编程副业", "count": 1}]}
+    assert client.get("/api/data/words/xhs/keywords").json()["keywords"][0]["keyword"] == "k"
+    trending = client.get("/api/data/words/xhs/trending", params={"until_day": "2025-03-02"}).json()
+    assert trending["words"][0]["word"] == "编程副业"
+    assert client.get("/api/data/words/unknown/top").status_code == 404
+    assert client.get("/api/data/words/xhs/trending", params={"until_day": "bad"}).status_code == 400
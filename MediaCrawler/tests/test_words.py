@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_words.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for the streaming comment word frequency and word cloud generation
+"""
+
+import asyncio
+import csv
+import io
+import json
+
+import pytest
+
+import config
+from tools import words
+
+COMMENTS = ["编程副业真的能赚钱吗", "学习编程副业的经验分享", "", "副业收入不稳定"]
+
+
+def _items():
+    return [{"comment_id": str(i), "content": text} for i, text in enumerate(COMMENTS)]
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    monkeypatch.setattr(config, "WORDCLOUD_PROCESS_POOL_WORKERS", 2)
+    monkeypatch.setattr(config, "CUSTOM_WORDS", {"编程副业": "专业术语"})
+    generator = words.AsyncWordCloudGenerator()
+    yield generator
+    generator.shutdown()
+
+
+def test_iter_json_values_streams_array_across_reads():
+    items = [{"content": f"评论{i}", "nested": {"list": [1, 2, ", ]"]}} for i in range(50)]
+    text = json.dumps(items, ensure_ascii=False, indent=4)
+    assert list(words.iter_json_values(io.StringIO(text), read_size=7)) == items
+
+
+def test_iter_json_values_reads_jsonl_and_single_object():
+    lines = "\n".join(json.dumps({"content": str(i)}) for i in range(3)) + "\n"
+    assert [value["content"] for value in words.iter_json_values(io.StringIO(lines), read_size=5)] == ["0", "1", "2"]
+    assert list(words.iter_json_values(io.StringIO('{"content": "a"}'))) == [{"content": "a"}]
+    assert list(words.iter_json_values(io.StringIO("[]"))) == []
+
+
+def test_iter_comment_texts_json_and_csv(tmp_path):
+    json_file = tmp_path / "comments.json"
+    json_file.write_text(json.dumps(_items(), ensure_ascii=False, indent=4), encoding="utf-8")
+    csv_file = tmp_path / "comments.csv"
+    with open(csv_file, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["comment_id", "content"])
+        writer.writeheader()
+        writer.writerows(_items())
+
+    expected = [text for text in COMMENTS if text]
+    assert list(words.iter_comment_texts(str(json_file))) == expected
+    assert list(words.iter_comment_texts(str(csv_file))) == expected
+
+
+def test_chunked_pool_count_matches_single_pass(monkeypatch, generator):
+    texts = [text for text in COMMENTS if text] * 5
+    monkeypatch.setattr(config, "WORDCLOUD_CHUNK_SIZE", len(texts))
+    single = asyncio.run(generator.count_word_frequency(iter(texts)))
+    assert generator._pool is None
+
+    monkeypatch.setattr(config, "WORDCLOUD_CHUNK_SIZE", 2)
+    chunked = asyncio.run(generator.count_word_frequency(iter(texts)))
+    assert generator._pool is not None
+    assert chunked == single
+    assert chunked["编程副业"] == 10
+    assert all(word not in generator.stop_words for word in chunked)
+
+
+def test_generate_from_file_writes_frequency_and_cloud(monkeypatch, tmp_path, generator):
+    monkeypatch.setattr(config, "FONT_PATH", None)
+    comments_file = tmp_path / "comments.json"
+    comments_file.write_text(json.dumps(_items(), ensure_ascii=False), encoding="utf-8")
+    prefix = str(tmp_path / "search_comments")
+
+    asyncio.run(generator.generate_word_frequency_and_cloud_from_file(str(comments_file), prefix))
+
+    word_freq = json.loads((tmp_path / "search_comments_word_freq.json").read_text(encoding="utf-8"))
+    assert word_freq["编程副业"] == 2
+    assert (tmp_path / "search_comments_word_cloud.png").stat().st_size > 0
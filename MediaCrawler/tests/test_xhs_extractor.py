@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_xhs_extractor.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for XiaoHongShuExtractor HTML state extraction
+"""
+
+import json
+
+from media_platform.xhs.extractor import XiaoHongShuExtractor, locate_initial_state
+
+
+def _page(state: str) -> str:
+    return f'<html><head></head><body><script>window.__INITIAL_STATE__={state}</script><script>var a=1;</script></body></html>'
+
+
+def _note_state(note_id: str) -> str:
+    note = {
+        "noteId": note_id,
+        "desc": "value is undefined, not a JS undefined",
+        "interactInfo": {"likedCount": "10", "commentCount": "2"},
+        "imageList": [{"urlDefault": "https://a"}],
+    }
+    state = {"global": {"appSettings": {"someFlag": True}}, "note": {"noteDetailMap": {note_id: {"note": note}}}}
+    raw = json.dumps(state, ensure_ascii=False, separators=(",", ":"))
+    # JS undefined values as they appear in the page
+    return raw.replace('"someFlag":true', '"someFlag":undefined').replace('"commentCount":"2"', '"commentCount":undefined')
+
+
+def test_locate_initial_state():
+    assert locate_initial_state(_page('{"a":1}')) == '{"a":1}'
+    assert locate_initial_state("<html></html>") is None
+
+
+def test_extract_note_detail_keeps_undefined_text():
+    note = XiaoHongShuExtractor().extract_note_detail_from_html("abc123", _page(_note_state("abc123")))
+    assert note["note_id"] == "abc123"
+    assert note["desc"] == "value is undefined, not a JS undefined"
+    assert note["interact_info"] == {"liked_count": "10", "comment_count": ""}
+    assert note["image_list"][0]["url_default"] == "https://a"
+
+
+def test_extract_note_detail_missing_note():
+    extractor = XiaoHongShuExtractor()
+    assert extractor.extract_note_detail_from_html("other", _page(_note_state("abc123"))) is None
+    assert extractor.extract_note_detail_from_html("abc123", "<html>captcha</html>") is None
+
+
+def test_extract_creator_info():
+    state = '{"user":{"userPageData":{"basicInfo":{"nickname":"n","desc":"line\nbreak"},"tags":undefined}}}'
+    info = XiaoHongShuExtractor().extract_creator_info_from_html(_page(state))
+    assert info == {"basicInfo": {"nickname": "n", "desc": "line\nbreak"}, "tags": None}
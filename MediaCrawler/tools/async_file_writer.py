@@ -25,14 +25,17 @@ from typing import Dict, List
 import aiofiles
 import config
 from tools.utils import utils
-from tools.words import AsyncWordCloudGenerator
 
 class AsyncFileWriter:
     def __init__(self, platform: str, crawler_type: str):
         self.lock = asyncio.Lock()
         self.platform = platform
         self.crawler_type = crawler_type
-        self.wordcloud_generator = AsyncWordCloudGenerator() if config.ENABLE_GET_WORDCLOUD else None
+        self.wordcloud_generator = None
+        if config.ENABLE_GET_WORDCLOUD:
+            # jieba/matplotlib/wordcloud are only imported when word clouds are enabled
+            from tools.words import AsyncWordCloudGenerator
+            self.wordcloud_generator = AsyncWordCloudGenerator()
 
     def _sanitize_job_id(self, job_id: str) -> str:
         cleaned = "".join(
@@ -96,46 +99,25 @@ class AsyncFileWriter:
         if not self.wordcloud_generator:
             return
 
-        try:
-            # Read comments from JSON file
-            comments_file_path = self._get_file_path('json', 'comments')
-            if not os.path.exists(comments_file_path) or os.path.getsize(comments_file_path) == 0:
-                utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] No comments file found at {comments_file_path}")
-                return
-
-            async with aiofiles.open(comments_file_path, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                if not content:
-                    utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] Comments file is empty")
-                    return
-
-                comments_data = json.loads(content)
-                if not isinstance(comments_data, list):
-                    comments_data = [comments_data]
-
-            # Filter comments data to only include 'content' field
-            # Handle different comment data structures across platforms
-            filtered_data = []
-            for comment in comments_data:
-                if isinstance(comment, dict):
-                    # Try different possible content field names
-                    content_text = comment.get('content') or comment.get('comment_text') or comment.get('text') or ''
-                    if content_text:
-                        filtered_data.append({'content': content_text})
-
-            if not filtered_data:
-                utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] No valid comment content found")
-                return
+        # The comments file of the current save option, streamed in chunks instead of loaded at once
+        file_type = 'csv' if config.SAVE_DATA_OPTION == 'csv' else 'json'
+        comments_file_path = self._get_file_path(file_type, 'comments')
+        if not os.path.exists(comments_file_path) or os.path.getsize(comments_file_path) == 0:
+            utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] No comments file found at {comments_file_path}")
+            return
 
+        try:
             # Generate wordcloud
             words_base_path = f"data/{self.platform}/words"
             pathlib.Path(words_base_path).mkdir(parents=True, exist_ok=True)
             job_prefix = self._job_prefix()
             words_file_prefix = f"{words_base_path}/{job_prefix}{self.crawler_type}_comments_{utils.get_current_date()}"
 
-            utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] Generating wordcloud from {len(filtered_data)} comments")
-            await self.wordcloud_generator.generate_word_frequency_and_cloud(filtered_data, words_file_prefix)
+            utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] Generating wordcloud from {comments_file_path}")
+            await self.wordcloud_generator.generate_word_frequency_and_cloud_from_file(comments_file_path, words_file_prefix)
             utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] Wordcloud generated successfully at {words_file_prefix}")
 
         except Exception as e:
             utils.logger.error(f"[AsyncFileWriter.generate_wordcloud_from_comments] Error generating wordcloud: {e}")
+        finally:
+            self.wordcloud_generator.shutdown()
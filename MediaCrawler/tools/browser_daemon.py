@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tools/browser_daemon.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : Long-lived CDP browser shared by consecutive crawler runs (ENABLE_CDP_DAEMON).
+#            The first run launches a detached browser and records it in browser_data/cdp_daemon.json,
+#            later runs attach over CDP instead of launching one, so the profile, login state and caches stay warm.
+#            Usage: python -m tools.browser_daemon status|start|stop
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import signal
+import subprocess
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from playwright.async_api import BrowserContext, Page
+
+import config
+from tools import utils
+from tools.browser_launcher import BrowserLauncher
+
+try:
+    import psutil
+except ImportError:  # optional, memory is read from /proc on Linux without it
+    psutil = None
+
+DAEMON_STATE_FILE = os.path.join("browser_data", "cdp_daemon.json")
+DAEMON_USER_DATA_DIR = os.path.join("browser_data", "cdp_daemon_user_data_dir")
+
+
+def get_process_tree_memory_mb(pid: int) -> Optional[float]:
+    """
+    Resident memory of the browser and all its helper processes (renderers, gpu, ...)
+    Returns:
+        memory in MB, None if it cannot be measured on this system
+    """
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root, *root.children(recursive=True)]
+        except psutil.Error:
+            return None
+        rss = 0
+        for process in processes:
+            try:
+                rss += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return rss / 1024 / 1024
+
+    if not os.path.isdir("/proc"):
+        return None
+    # The browser is launched in its own session, so its process group id is its pid
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    rss_pages, found = 0, False
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if int(fields[2]) == pid:
+            rss_pages += int(fields[21])
+            found = True
+    return rss_pages * page_size / 1024 / 1024 if found else None
+
+
+def _kill_process_tree(pid: int, timeout: float = 5) -> None:
+    if platform.system() == "Windows":
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], capture_output=True, check=False)
+        return
+    try:
+        os.killpg(pid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        return
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return
+        time.sleep(0.2)
+    utils.logger.warning(f"[BrowserDaemon] Browser {pid} did not exit within {timeout}s, sending SIGKILL")
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _get_process_info(pid: int) -> Tuple[Optional[str], Optional[float]]:
+    """Command line and start time (unix timestamp) of a process, (None, None) if it is gone or unreadable"""
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            return " ".join(process.cmdline()), process.create_time()
+        except psutil.Error:
+            return None, None
+
+    if os.path.isdir("/proc"):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                cmdline = f.read().replace(b"\0", b" ").decode("utf-8", "replace")
+            with open(f"/proc/{pid}/stat", encoding="utf-8") as f:
+                start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+            with open("/proc/stat", encoding="utf-8") as f:
+                boot_time = next(int(line.split()[1]) for line in f if line.startswith("btime"))
+        except (OSError, IndexError, ValueError, StopIteration):
+            return None, None
+        return cmdline, boot_time + start_ticks / os.sysconf("SC_CLK_TCK")
+
+    if platform.system() == "Windows":
+        result = subprocess.run(
+            ["powershell", "-NoProfile", "-Command", f"(Get-CimInstance Win32_Process -Filter 'ProcessId={pid}').CommandLine"],
+            capture_output=True, text=True, check=False,
+        )
+        return (result.stdout.strip() or None), None
+    return None, None
+
+
+def _is_daemon_browser(state: Dict[str, Any]) -> bool:
+    """
+    The recorded pid still runs the daemon browser. After a reboot or a browser crash the pid
+    (and on POSIX its process group) may belong to an unrelated process, which must not be killed
+    """
+    cmdline, create_time = _get_process_info(state["pid"])
+    if not cmdline or f"--remote-debugging-port={state['debug_port']}" not in cmdline:
+        return False
+    started_at = state.get("started_at")
+    # The state is written after the browser answered, a process started later reused the pid
+    return create_time is None or started_at is None or create_time <= started_at + 1
+
+
+async def _get_target_id(browser_context: BrowserContext, page: Page) -> Optional[str]:
+    """CDP target id of a page, stable across connections unlike Playwright page objects"""
+    try:
+        session = await browser_context.new_cdp_session(page)
+        try:
+            info = await session.send("Target.getTargetInfo")
+        finally:
+            await session.detach()
+        return info["targetInfo"]["targetId"]
+    except Exception:
+        return None
+
+
+class BrowserDaemon:
+    """
+    Launches, health checks and recycles the shared CDP browser.
+    State: {"pid", "debug_port", "ws_url", "headless", "started_at", "runs", "warm_pages": {platform: target id}}
+    """
+
+    def __init__(self, state_file: str = DAEMON_STATE_FILE):
+        self.state_file = state_file
+        self._process: Optional[subprocess.Popen] = None
+
+    def load_state(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_state(self, state: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    @staticmethod
+    async def _get_ws_url(debug_port: int) -> Optional[str]:
+        try:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(f"http://localhost:{debug_port}/json/version", timeout=3)
+            if response.status_code == 200:
+                return response.json().get("webSocketDebuggerUrl")
+        except (httpx.HTTPError, ValueError):
+            pass
+        return None
+
+    async def is_healthy(self, state: Dict[str, Any]) -> bool:
+        """The debug port answers with the websocket url of the recorded browser (the url contains its browser id)"""
+        return await self._get_ws_url(state["debug_port"]) == state["ws_url"]
+
+    def get_recycle_reason(self, state: Dict[str, Any]) -> Optional[str]:
+        """Why the browser should be restarted before the next run, None if it can keep serving"""
+        if config.CDP_DAEMON_MAX_RUNS and state.get("runs", 0) >= config.CDP_DAEMON_MAX_RUNS:
+            return f"served {state['runs']} runs"
+        if config.CDP_DAEMON_MAX_MEMORY_MB:
+            memory_mb = get_process_tree_memory_mb(state["pid"])
+            if memory_mb is not None and memory_mb >= config.CDP_DAEMON_MAX_MEMORY_MB:
+                return f"uses {memory_mb:.0f} MB memory"
+        return None
+
+    async def _launch(self, browser_path: str, headless: bool) -> Dict[str, Any]:
+        launcher = BrowserLauncher()
+        debug_port = launcher.find_available_port(config.CDP_DEBUG_PORT)
+        user_data_dir = os.path.join(os.getcwd(), DAEMON_USER_DATA_DIR)
+        os.makedirs(user_data_dir, exist_ok=True)
+        # The launcher starts the browser in its own session/process group, so it outlives this run
+        self._process = launcher.launch_browser(browser_path, debug_port, headless=headless, user_data_dir=user_data_dir)
+        launcher.browser_process = None
+
+        deadline = time.monotonic() + config.BROWSER_LAUNCH_TIMEOUT
+        ws_url = None
+        while ws_url is None and time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                break
+            ws_url = await self._get_ws_url(debug_port)
+            if ws_url is None:
+                await asyncio.sleep(0.2)
+        if ws_url is None:
+            _kill_process_tree(self._process.pid)
+            raise RuntimeError(f"Daemon browser failed to start within {config.BROWSER_LAUNCH_TIMEOUT} seconds")
+
+        utils.logger.info(f"[BrowserDaemon] Launched daemon browser pid={self._process.pid} port={debug_port}")
+        return {
+            "pid": self._process.pid,
+            "debug_port": debug_port,
+            "ws_url": ws_url,
+            "headless": headless,
+            "started_at": utils.get_unix_timestamp(),
+            "runs": 0,
+            "warm_pages": {},
+        }
+
+    async def acquire(
+        self,
+        browser_path_factory: Callable[[], Awaitable[str]],
+        headless: bool,
+        count_run: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Get a healthy daemon browser for a new run, launching or recycling it if needed
+        Args:
+            browser_path_factory: returns the browser executable, only called when a browser has to be launched
+            headless: headless mode of a newly launched browser
+            count_run: count this call towards CDP_DAEMON_MAX_RUNS
+
+        Returns:
+            daemon state, connect with state["ws_url"]
+        """
+        state = self.load_state()
+        if state is not None and not await self.is_healthy(state):
+            utils.logger.warning("[BrowserDaemon] Recorded daemon browser is not responding, launching a new one")
+            await self.stop(state)
+            state = None
+        if state is not None:
+            reason = self.get_recycle_reason(state)
+            if reason:
+                utils.logger.info(f"[BrowserDaemon] Recycling daemon browser, it {reason}")
+                await self.stop(state)
+                state = None
+            elif state.get("headless") != headless:
+                utils.logger.info(f"[BrowserDaemon] Reusing daemon browser with headless={state.get('headless')}")
+
+        if state is None:
+            state = await self._launch(await browser_path_factory(), headless)
+        else:
+            utils.logger.info(f"[BrowserDaemon] Attaching to daemon browser pid={state['pid']}, runs={state['runs']}")
+        if count_run:
+            state["runs"] += 1
+        self.save_state(state)
+        return state
+
+    async def release(self, browser_context: BrowserContext, pages_before: List[Page]) -> None:
+        """
+        Hand the browser back after a run. The first page the run opened stays open as the warm page of
+        config.PLATFORM, the other pages it opened and the previous warm page of the platform are closed.
+        Keeping a page per platform also keeps a headed browser alive, which exits when its last window closes
+        """
+        state = self.load_state()
+        new_pages = [page for page in browser_context.pages if page not in pages_before]
+        if state is None or not new_pages:
+            return
+        warm_page, stale_pages = new_pages[0], new_pages[1:]
+        warm_pages: Dict[str, str] = state.setdefault("warm_pages", {})
+        previous_target_id = warm_pages.get(config.PLATFORM)
+        if previous_target_id:
+            for page in pages_before:
+                if await _get_target_id(browser_context, page) == previous_target_id:
+                    stale_pages.append(page)
+        for page in stale_pages:
+            try:
+                await page.close()
+            except Exception as e:
+                utils.logger.debug(f"[BrowserDaemon] Failed to close page: {e}")
+        warm_pages[config.PLATFORM] = await _get_target_id(browser_context, warm_page)
+        self.save_state(state)
+
+    async def stop(self, state: Optional[Dict[str, Any]] = None) -> None:
+        """Terminate the daemon browser and forget it"""
+        state = state or self.load_state()
+        if state is not None:
+            own_process = self._process is not None and self._process.pid == state["pid"]
+            if own_process or await asyncio.to_thread(_is_daemon_browser, state):
+                utils.logger.info(f"[BrowserDaemon] Stopping daemon browser pid={state['pid']}")
+                await asyncio.to_thread(_kill_process_tree, state["pid"])
+            else:
+                utils.logger.warning(
+                    f"[BrowserDaemon] Process {state['pid']} is no longer the daemon browser, forgetting it"
+                )
+            if own_process:
+                await asyncio.to_thread(self._process.wait, 5)
+                self._process = None
+        if os.path.exists(self.state_file):
+            os.remove(self.state_file)
+
+    async def status(self) -> Dict[str, Any]:
+        state = self.load_state()
+        if state is None:
+            return {"running": False}
+        return {
+            **state,
+            "running": await self.is_healthy(state),
+            "memory_mb": get_process_tree_memory_mb(state["pid"]),
+            "recycle_reason": self.get_recycle_reason(state),
+        }
+
+
+async def _run_command(command: str) -> Dict[str, Any]:
+    daemon = BrowserDaemon()
+    if command == "start":
+        from tools.cdp_browser import CDPBrowserManager
+
+        await daemon.acquire(CDPBrowserManager()._get_browser_path, config.CDP_HEADLESS, count_run=False)
+    elif command == "stop":
+        await daemon.stop()
+    return await daemon.status()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the shared CDP browser daemon")
+    parser.add_argument("command", choices=["status", "start", "stop"])
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_run_command(args.command)), ensure_ascii=False, indent=2))
@@ -24,10 +24,11 @@ import socket
 import httpx
 import signal
 import atexit
-from typing import Optional, Dict, Any
-from playwright.async_api import Browser, BrowserContext, Playwright
+from typing import Optional, Dict, Any, List
+from playwright.async_api import Browser, BrowserContext, Page, Playwright
 
 import config
+from tools.browser_daemon import BrowserDaemon
 from tools.browser_launcher import BrowserLauncher
 from tools import utils
 
@@ -43,6 +44,10 @@ class CDPBrowserManager:
         self.browser_context: Optional[BrowserContext] = None
         self.debug_port: Optional[int] = None
         self._cleanup_registered = False
+        # Shared long-lived browser, see tools/browser_daemon.py
+        self.daemon: Optional[BrowserDaemon] = BrowserDaemon() if config.ENABLE_CDP_DAEMON else None
+        # Pages that were already open when attaching to the daemon browser
+        self._pages_before: List[Page] = []
 
     def _register_cleanup_handlers(self):
         """
@@ -104,6 +109,9 @@ class CDPBrowserManager:
         """
         Launch browser and connect via CDP
         """
+        if self.daemon:
+            return await self._attach_to_daemon(playwright, playwright_proxy, user_agent, headless)
+
         try:
             # 1. Detect browser path
             browser_path = await self._get_browser_path()
@@ -133,6 +141,53 @@ class CDPBrowserManager:
             await self.cleanup()
             raise
 
+    async def _attach_to_daemon(
+        self,
+        playwright: Playwright,
+        playwright_proxy: Optional[Dict] = None,
+        user_agent: Optional[str] = None,
+        headless: bool = False,
+    ) -> BrowserContext:
+        """
+        Connect to the shared daemon browser, launching it on first use.
+        No cleanup handlers are registered, the browser process is not owned by this run
+        """
+        try:
+            state = await self.daemon.acquire(self._get_browser_path, headless)
+            self.debug_port = state["debug_port"]
+            self.browser = await playwright.chromium.connect_over_cdp(state["ws_url"])
+            self.browser_context = await self._create_browser_context(playwright_proxy, user_agent)
+            self._pages_before = list(self.browser_context.pages)
+            return self.browser_context
+        except Exception as e:
+            utils.logger.error(f"[CDPBrowserManager] Attaching to daemon browser failed: {e}")
+            await self.cleanup()
+            raise
+
+    async def _detach_from_daemon(self):
+        """
+        Disconnect from the daemon browser, its process and default context stay alive for the next run
+        """
+        try:
+            if self.browser_context:
+                await self.daemon.release(self.browser_context, self._pages_before)
+        except Exception as e:
+            utils.logger.warning(f"[CDPBrowserManager] Failed to release daemon browser pages: {e}")
+        finally:
+            self.browser_context = None
+            self._pages_before = []
+
+        if self.browser:
+            try:
+                if self.browser.is_connected():
+                    # Only disconnects, browsers connected over CDP are not closed by Playwright
+                    await self.browser.close()
+                    utils.logger.info("[CDPBrowserManager] Detached from daemon browser")
+            except Exception as e:
+                utils.logger.debug(f"[CDPBrowserManager] Daemon browser connection already closed: {e}")
+            finally:
+                self.browser = None
+
     async def _get_browser_path(self) -> str:
         """
         Get browser path
@@ -357,6 +412,11 @@ class CDPBrowserManager:
         Args:
             force: Whether to force cleanup browser process (ignoring AUTO_CLOSE_BROWSER config)
         """
+        if self.daemon:
+            # The daemon browser outlives runs, even forced cleanup only detaches from it
+            await self._detach_from_daemon()
+            return
+
         try:
             # Close browser context
             if self.browser_context:
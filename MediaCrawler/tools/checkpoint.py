@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tools/checkpoint.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : Resumable crawl checkpoints. The crawler state (keyword index, next search page, search id, notes whose
+#            comments are done and the comment cursor of each unfinished note) is written to
+#            CRAWL_CHECKPOINT_DIR/{job_id}.json together with the run settings. `python main.py --resume <job_id>`
+#            restores the settings and continues from the checkpoint instead of START_PAGE and empty cursors.
+
+import json
+import os
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+import config
+from tools import utils
+
+CHECKPOINT_VERSION = 1
+
+# Settings saved with the checkpoint, a resumed run crawls with the same settings (missing keys are skipped)
+CHECKPOINT_CONFIG_KEYS = (
+    "PLATFORM",
+    "LOGIN_TYPE",
+    "CRAWLER_TYPE",
+    "KEYWORDS",
+    "START_PAGE",
+    "CRAWLER_MAX_NOTES_COUNT",
+    "SAVE_DATA_OPTION",
+    "ENABLE_GET_COMMENTS",
+    "ENABLE_GET_SUB_COMMENTS",
+    "CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES",
+    "CLIENT_JOB_ID",
+    "SORT_TYPE",
+    "PUBLISH_TIME_TYPE",
+    "BILI_SEARCH_MODE",
+    "START_DAY",
+    "END_DAY",
+    "WEIBO_SEARCH_TYPE",
+    "XHS_SPECIFIED_NOTE_URL_LIST",
+    "XHS_CREATOR_ID_LIST",
+    "DY_SPECIFIED_ID_LIST",
+    "DY_CREATOR_ID_LIST",
+    "KS_SPECIFIED_ID_LIST",
+    "KS_CREATOR_ID_LIST",
+    "BILI_SPECIFIED_ID_LIST",
+    "BILI_CREATOR_ID_LIST",
+    "WEIBO_SPECIFIED_ID_LIST",
+    "WEIBO_CREATOR_ID_LIST",
+    "TIEBA_SPECIFIED_ID_LIST",
+    "TIEBA_NAME_LIST",
+    "TIEBA_CREATOR_URL_LIST",
+    "ZHIHU_SPECIFIED_ID_LIST",
+    "ZHIHU_CREATOR_URL_LIST",
+)
+
+
+def checkpoint_path(job_id: str) -> str:
+    return os.path.join(config.CRAWL_CHECKPOINT_DIR, f"{job_id}.json")
+
+
+def new_job_id() -> str:
+    """CLIENT_JOB_ID when the caller set one, otherwise {platform}_{crawler type}_{start time}"""
+    job_id = (config.CLIENT_JOB_ID or "").strip()
+    if not job_id:
+        job_id = f"{config.PLATFORM}_{config.CRAWLER_TYPE}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    return re.sub(r"[^\w.-]", "_", job_id)
+
+
+def _empty_state() -> Dict[str, Any]:
+    return {
+        "version": CHECKPOINT_VERSION,
+        "status": "running",
+        "config": {},
+        "keyword_index": 0,
+        "keyword": None,
+        "next_page": None,
+        "search_id": "",
+        "completed_comments": [],
+        "comment_cursors": {},
+    }
+
+
+class CrawlCheckpoint:
+    """
+    Crawl state of one job. A disabled checkpoint keeps nothing and never skips anything,
+    so the platform crawlers can call it unconditionally.
+    """
+
+    def __init__(self, job_id: str = "", enabled: bool = False, state: Optional[Dict] = None):
+        self.job_id = job_id
+        self.enabled = enabled
+        self.state: Dict[str, Any] = state or _empty_state()
+        self._completed = set(self.state["completed_comments"])
+        self._last_write = 0.0
+
+    @property
+    def path(self) -> str:
+        return checkpoint_path(self.job_id)
+
+    @classmethod
+    def load(cls, job_id: str) -> "CrawlCheckpoint":
+        path = checkpoint_path(job_id)
+        if not os.path.exists(path):
+            raise ValueError(f"No crawl checkpoint found for job id {job_id!r} ({path})")
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported crawl checkpoint version {state.get('version')!r} in {path}")
+        return cls(job_id, enabled=True, state=state)
+
+    def save(self, force: bool = False) -> None:
+        """Write the state atomically, at most once per CRAWL_CHECKPOINT_INTERVAL unless forced"""
+        if not self.enabled:
+            return
+        if not force and time.time() - self._last_write < config.CRAWL_CHECKPOINT_INTERVAL:
+            return
+        self._last_write = time.time()
+        self.state["completed_comments"] = sorted(self._completed)
+        self.state["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            # A lost checkpoint only costs a longer resume, never fail the crawl because of it
+            utils.logger.warning(f"[CrawlCheckpoint.save] Write checkpoint {self.path} failed: {e}")
+
+    # ---------------------------------------------------------------- search position
+
+    def iter_keywords(self, keywords: Iterable[str]) -> Iterator[str]:
+        """Yield the keywords still to crawl, page and search id are reset when a new keyword starts"""
+        keywords = list(keywords)
+        for index, keyword in enumerate(keywords):
+            if index < self.state["keyword_index"]:
+                utils.logger.info(f"[CrawlCheckpoint.iter_keywords] Skip keyword finished before the resume: {keyword}")
+                continue
+            if self.enabled and (index > self.state["keyword_index"] or self.state["keyword"] != keyword):
+                self._reset_position()
+                self.state["keyword_index"] = index
+                self.state["keyword"] = keyword
+                self.save(force=True)
+            yield keyword
+        if self.enabled:
+            self._reset_position()
+            self.state["keyword_index"] = len(keywords)
+            self.state["keyword"] = None
+            self.save(force=True)
+
+    def resume_page(self, start_page: int) -> int:
+        """First page the search loop of the current keyword has to crawl"""
+        next_page = self.state["next_page"]
+        if next_page is not None and next_page > start_page:
+            utils.logger.info(f"[CrawlCheckpoint.resume_page] Resume keyword {self.state['keyword']} from page {next_page}")
+            return next_page
+        return start_page
+
+    def search_id(self, default: str = "") -> str:
+        """Search id of the current keyword, pages of a resumed search keep the search session"""
+        if not self.state["search_id"]:
+            self.set_search_id(default)
+        return self.state["search_id"] or default
+
+    def set_search_id(self, search_id: str) -> None:
+        if not self.enabled:
+            return
+        self.state["search_id"] = search_id
+        self.save()
+
+    def page_done(self, next_page: int) -> None:
+        """Called by the search loops after a page and the comments of its notes are stored"""
+        if not self.enabled:
+            return
+        self.state["next_page"] = next_page
+        self._completed.clear()
+        self.state["comment_cursors"] = {}
+        self.save(force=True)
+
+    def _reset_position(self) -> None:
+        self.state["next_page"] = None
+        self.state["search_id"] = ""
+        self._completed.clear()
+        self.state["comment_cursors"] = {}
+
+    # ---------------------------------------------------------------- comments
+
+    def comments_completed(self, note_id) -> bool:
+        return str(note_id) in self._completed
+
+    def comments_done(self, note_id) -> None:
+        if not self.enabled:
+            return
+        self._completed.add(str(note_id))
+        self.state["comment_cursors"].pop(str(note_id), None)
+        self.save()
+
+    def comment_cursor(self, note_id, default: Any = "") -> Tuple[Any, int]:
+        """(cursor, comments crawled so far) of a note, (default, 0) when its comments were not started"""
+        saved = self.state["comment_cursors"].get(str(note_id))
+        if not saved:
+            return default, 0
+        utils.logger.info(f"[CrawlCheckpoint.comment_cursor] Resume comments of {note_id} after {saved['count']} comments")
+        return saved["cursor"], saved["count"]
+
+    def save_comment_cursor(self, note_id, cursor: Any, count: int) -> None:
+        """Called by the comment loops of the api clients after a comment page is stored"""
+        if not self.enabled:
+            return
+        self.state["comment_cursors"][str(note_id)] = {"cursor": cursor, "count": count}
+        self.save()
+
+    # ---------------------------------------------------------------- run status
+
+    def mark_finished(self) -> None:
+        self.state["status"] = "finished"
+
+    def finish(self) -> None:
+        if self.state["status"] != "finished":
+            self.state["status"] = "interrupted"
+            if self.enabled:
+                utils.logger.info(
+                    f"[CrawlCheckpoint.finish] Crawl interrupted, continue it with: python main.py --resume {self.job_id}"
+                )
+        self.save(force=True)
+
+
+_checkpoint = CrawlCheckpoint()
+
+
+def get_checkpoint() -> CrawlCheckpoint:
+    return _checkpoint
+
+
+def start_checkpoint(resume_job_id: Optional[str] = None) -> CrawlCheckpoint:
+    """
+    Called by main.py once config is final. With resume_job_id the saved checkpoint is loaded and its
+    settings override the command line, otherwise a new job is started (when ENABLE_CRAWL_CHECKPOINT is on)
+    """
+    global _checkpoint
+    if resume_job_id:
+        _checkpoint = CrawlCheckpoint.load(resume_job_id)
+        for key, value in _checkpoint.state["config"].items():
+            setattr(config, key, value)
+        _checkpoint.state["status"] = "running"
+        utils.logger.info(
+            f"[start_checkpoint] Resume job {resume_job_id}: keyword index {_checkpoint.state['keyword_index']}, "
+            f"next page {_checkpoint.state['next_page']}, {len(_checkpoint.state['completed_comments'])} notes with comments done"
+        )
+    elif config.ENABLE_CRAWL_CHECKPOINT:
+        _checkpoint = CrawlCheckpoint(new_job_id(), enabled=True)
+        _checkpoint.state["config"] = {
+            key: getattr(config, key) for key in CHECKPOINT_CONFIG_KEYS if hasattr(config, key)
+        }
+        utils.logger.info(
+            f"[start_checkpoint] Crawl checkpoint job id: {_checkpoint.job_id}, "
+            f"continue an interrupted run with: python main.py --resume {_checkpoint.job_id}"
+        )
+    else:
+        _checkpoint = CrawlCheckpoint()
+    _checkpoint.save(force=True)
+    return _checkpoint
+
+
+def finish_checkpoint() -> None:
+    _checkpoint.finish()
+
+
+def mark_finished() -> None:
+    _checkpoint.mark_finished()
+
+
+def iter_keywords(keywords: Iterable[str]) -> Iterator[str]:
+    return _checkpoint.iter_keywords(keywords)
+
+
+def resume_page(start_page: int) -> int:
+    return _checkpoint.resume_page(start_page)
+
+
+def search_id(default: str = "") -> str:
+    return _checkpoint.search_id(default)
+
+
+def set_search_id(value: str) -> None:
+    _checkpoint.set_search_id(value)
+
+
+def page_done(next_page: int) -> None:
+    _checkpoint.page_done(next_page)
+
+
+def comments_completed(note_id) -> bool:
+    return _checkpoint.comments_completed(note_id)
+
+
+def comments_done(note_id) -> None:
+    _checkpoint.comments_done(note_id)
+
+
+def comment_cursor(note_id, default: Any = "") -> Tuple[Any, int]:
+    return _checkpoint.comment_cursor(note_id, default)
+
+
+def save_comment_cursor(note_id, cursor: Any, count: int) -> None:
+    _checkpoint.save_comment_cursor(note_id, cursor, count)
@@ -29,11 +29,11 @@ import random
 import re
 import urllib
 import urllib.parse
+from decimal import Decimal
 from io import BytesIO
 from typing import Dict, List, Optional, Tuple, cast
 
 import httpx
-from PIL import Image, ImageDraw, ImageShow
 from playwright.async_api import Cookie, Page
 
 from . import utils
@@ -86,6 +86,9 @@ async def find_qrcode_img_from_canvas(page: Page, canvas_selector: str) -> str:
 
 def show_qrcode(qr_code) -> None:  # type: ignore
     """parse base64 encode qrcode image and show it"""
+    # PIL.ImageShow imports IPython when available, only load it for qrcode login
+    from PIL import Image, ImageDraw, ImageShow
+
     if "," in qr_code:
         qr_code = qr_code.split(",")[1]
     qr_code = base64.b64decode(qr_code)
@@ -174,6 +177,36 @@ def match_interact_info_count(count_str: str) -> int:
         return 0
 
 
+_COUNT_UNITS = {"万": 10_000, "w": 10_000, "亿": 100_000_000, "k": 1_000}
+
+
+def parse_count(value) -> int:
+    """
+    Parse an interaction counter into int, platforms return counts such as 123, "123", "1.2万", "3亿", "10+" or "1,234"
+    Args:
+        value: raw counter value
+
+    Returns:
+        counter as int, 0 if it cannot be parsed
+    """
+    if value is None or isinstance(value, bool):
+        return 0
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+
+    match = re.search(r"(\d+(?:\.\d+)?)\s*(万|亿|w|k)?", str(value).replace(",", "").lower())
+    if not match:
+        return 0
+    # Decimal keeps "1.13亿" exact, float would give 112999999
+    number = Decimal(match.group(1))
+    unit = match.group(2)
+    if unit:
+        number *= _COUNT_UNITS[unit]
+    return int(number)
+
+
 def format_proxy_info(ip_proxy_info) -> Tuple[Optional[Dict], Optional[str]]:
     """format proxy info for playwright and httpx"""
     # fix circular import issue
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tools/parse_pool.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : Optional worker process pool for CPU-bound page parsing (parsel/regex/json over full HTML pages),
+#            so extraction does not stall network I/O of the other crawler tasks on the event loop thread.
+#            Functions and arguments must be picklable: module level functions, or methods of stateless
+#            extractors such as TieBaExtractor. The model/ pydantic types are returned by pickling.
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+import config
+
+T = TypeVar("T")
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _payload_size(args) -> int:
+    return sum(len(arg) for arg in args if isinstance(arg, (str, bytes)))
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Lazily started process pool, spawned so workers do not inherit the browser and event loop state"""
+    global _parse_pool
+    if _parse_pool is None:
+        workers = config.PARSE_PROCESS_POOL_WORKERS or max((os.cpu_count() or 2) - 1, 1)
+        _parse_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _parse_pool
+
+
+async def run_in_parse_pool(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a parsing function in the worker process pool.
+    Runs inline when ENABLE_PARSE_PROCESS_POOL is off, or when the str/bytes arguments are smaller than
+    PARSE_PROCESS_POOL_MIN_SIZE, where pickling the input costs more than parsing it
+    Args:
+        func: picklable parsing function
+        *args: picklable arguments
+
+    Returns:
+        the result of func(*args)
+    """
+    if not config.ENABLE_PARSE_PROCESS_POOL or _payload_size(args) < config.PARSE_PROCESS_POOL_MIN_SIZE:
+        return func(*args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parse_pool(), func, *args)
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the worker processes"""
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
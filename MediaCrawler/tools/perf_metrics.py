@@ -0,0 +1,384 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tools/perf_metrics.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : Hot-path performance metrics of a crawler run: request latency per platform/endpoint, signing latency,
+#            tenacity retries, store write latency, in-flight requests and items stored per second.
+#            Kept dependency free, the crawler process periodically writes a JSON snapshot which the WebUI API
+#            renders in the Prometheus text format, and main.py logs a JSON summary when the run ends.
+
+import asyncio
+import bisect
+import functools
+import inspect
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import config
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Path segments made of ids (note id, BV number, numeric user id...) collapse into one endpoint label
+_ID_SEGMENT_RE = re.compile(r"^(?=.*\d)[\w-]{6,}$")
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._series: Dict[Tuple[str, ...], Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _samples(self) -> List[Dict]:
+        return [
+            {"labels": dict(zip(self.label_names, key)), "value": value}
+            for key, value in self._series.items()
+        ]
+
+    def snapshot(self) -> Dict:
+        return {
+            "type": self.kind,
+            "help": self.documentation,
+            "samples": self._samples(),
+        }
+
+    def reset(self) -> None:
+        self._series.clear()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        self._series[key] = self._series.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        self._series[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        self._series[key] = self._series.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            # Per bucket (not cumulative) counts, the last slot is +Inf
+            series = self._series[key] = {"counts": [0] * (len(self.buckets) + 1), "count": 0, "sum": 0.0, "max": 0.0}
+        series["counts"][bisect.bisect_left(self.buckets, value)] += 1
+        series["count"] += 1
+        series["sum"] += value
+        series["max"] = max(series["max"], value)
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> List[Dict]:
+        return [
+            {"labels": dict(zip(self.label_names, key)), **series, "counts": list(series["counts"])}
+            for key, series in self._series.items()
+        ]
+
+    def snapshot(self) -> Dict:
+        return {**super().snapshot(), "buckets": list(self.buckets)}
+
+
+class MetricsRegistry:
+    """Metrics of the current process, keyed by metric name"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def snapshot(self) -> Dict:
+        return {
+            "started_at": self.started_at,
+            "updated_at": time.time(),
+            "metrics": {name: metric.snapshot() for name, metric in self._metrics.items()},
+        }
+
+    def reset(self) -> None:
+        self.started_at = time.time()
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.histogram(
+    "mediacrawler_request_duration_seconds", "HTTP request latency", ["platform", "endpoint", "status"]
+)
+INFLIGHT_REQUESTS = registry.gauge(
+    "mediacrawler_inflight_requests", "HTTP requests waiting for a response", ["platform"]
+)
+SIGN_DURATION = registry.histogram(
+    "mediacrawler_sign_duration_seconds", "Request signing latency", ["platform", "method"]
+)
+REQUEST_RETRIES = registry.counter(
+    "mediacrawler_retries_total", "Attempts retried by tenacity", ["function"]
+)
+STORE_DURATION = registry.histogram(
+    "mediacrawler_store_duration_seconds", "Store write latency", ["platform", "store", "item"]
+)
+ITEMS_STORED = registry.counter(
+    "mediacrawler_items_stored_total", "Items written to the store", ["platform", "item"]
+)
+PENDING_TASKS = registry.gauge(
+    "mediacrawler_pending_tasks", "Asyncio tasks alive in the crawler process, sampled on each snapshot"
+)
+
+
+def normalize_endpoint(url: str) -> str:
+    """
+    Endpoint label of a request url: host + path without the query string, id-like path segments
+    are replaced by ":id" so the label cardinality does not grow with the crawled items
+    """
+    parts = urlsplit(str(url))
+    segments = [":id" if _ID_SEGMENT_RE.match(segment) else segment for segment in parts.path.split("/")]
+    return parts.netloc + "/".join(segments)
+
+
+def observe_request(url: str, status: Any, duration: float, platform: Optional[str] = None) -> None:
+    REQUEST_DURATION.observe(
+        duration, platform=platform or config.PLATFORM, endpoint=normalize_endpoint(url), status=status
+    )
+
+
+def measure_sign(platform: str, method: str) -> Callable:
+    """Decorator recording the latency of a (sync or async) signing function"""
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with SIGN_DURATION.time(platform=platform, method=method):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with SIGN_DURATION.time(platform=platform, method=method):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def measure_store(func: Callable, store: str, item: str) -> Callable:
+    """Wrap an async store_* method of an AbstractStore implementation, used by AbstractStore.__init_subclass__"""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        with STORE_DURATION.time(platform=config.PLATFORM, store=store, item=item):
+            result = await func(*args, **kwargs)
+        ITEMS_STORED.inc(platform=config.PLATFORM, item=item)
+        return result
+
+    return wrapper
+
+
+def record_retry(retry_state) -> None:
+    """tenacity before_sleep callback counting the retried attempts per decorated function"""
+    fn = getattr(retry_state, "fn", None)
+    REQUEST_RETRIES.inc(function=getattr(fn, "__qualname__", "unknown"))
+
+
+def _series_label(labels: Dict[str, str]) -> str:
+    return ",".join(f"{key}={value}" for key, value in labels.items()) or "total"
+
+
+def _bucket_quantile(buckets: Sequence[float], counts: Sequence[int], count: int, maximum: float, q: float) -> float:
+    """Upper bound of the bucket holding the q quantile, capped by the largest observed value"""
+    rank = q * count
+    cumulative = 0
+    for bound, bucket_count in zip(list(buckets) + [maximum], counts):
+        cumulative += bucket_count
+        if cumulative >= rank:
+            return min(bound, maximum)
+    return maximum
+
+
+def summarize(snapshot: Dict) -> Dict:
+    """
+    Condense a registry snapshot for humans: count/avg/p50/p95/max per histogram series,
+    counter totals and items stored per second over the run
+    """
+    elapsed = max(snapshot["updated_at"] - snapshot["started_at"], 1e-9)
+    summary: Dict[str, Any] = {"elapsed_seconds": round(elapsed, 3)}
+    for name, metric in snapshot["metrics"].items():
+        if not metric["samples"]:
+            continue
+        short_name = name.removeprefix("mediacrawler_")
+        if metric["type"] == "histogram":
+            summary[short_name] = {
+                _series_label(sample["labels"]): {
+                    "count": sample["count"],
+                    "avg": round(sample["sum"] / sample["count"], 4),
+                    "p50": round(_bucket_quantile(metric["buckets"], sample["counts"], sample["count"], sample["max"], 0.5), 4),
+                    "p95": round(_bucket_quantile(metric["buckets"], sample["counts"], sample["count"], sample["max"], 0.95), 4),
+                    "max": round(sample["max"], 4),
+                }
+                for sample in metric["samples"]
+                if sample["count"]
+            }
+        else:
+            summary[short_name] = {_series_label(sample["labels"]): sample["value"] for sample in metric["samples"]}
+    items = snapshot["metrics"].get(ITEMS_STORED.name, {}).get("samples", [])
+    if items:
+        summary["items_per_second"] = {
+            _series_label(sample["labels"]): round(sample["value"] / elapsed, 3) for sample in items
+        }
+    return summary
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(snapshot: Dict) -> str:
+    """Render a registry snapshot in the Prometheus text exposition format (version 0.0.4)"""
+    lines = [
+        "# HELP mediacrawler_run_started_timestamp_seconds Start time of the crawler run",
+        "# TYPE mediacrawler_run_started_timestamp_seconds gauge",
+        f"mediacrawler_run_started_timestamp_seconds {_format_value(snapshot['started_at'])}",
+        "# HELP mediacrawler_metrics_updated_timestamp_seconds Time the metrics snapshot was taken",
+        "# TYPE mediacrawler_metrics_updated_timestamp_seconds gauge",
+        f"mediacrawler_metrics_updated_timestamp_seconds {_format_value(snapshot['updated_at'])}",
+    ]
+    for name, metric in snapshot["metrics"].items():
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        for sample in metric["samples"]:
+            labels = sample["labels"]
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(sample['value'])}")
+                continue
+            cumulative = 0
+            for bound, count in zip(metric["buckets"] + [float("inf")], sample["counts"]):
+                cumulative += count
+                bucket_labels = {**labels, "le": _format_value(float(bound))}
+                lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(float(sample['sum']))}")
+            lines.append(f"{name}_count{_format_labels(labels)} {sample['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def take_snapshot() -> Dict:
+    try:
+        PENDING_TASKS.set(len(asyncio.all_tasks()))
+    except RuntimeError:
+        # No running event loop
+        pass
+    return registry.snapshot()
+
+
+def write_snapshot(path: Optional[str] = None) -> Dict:
+    """Write the current snapshot as JSON (atomically, the API process may read it concurrently)"""
+    path = path or config.PERF_METRICS_FILE
+    snapshot = take_snapshot()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return snapshot
+
+
+def read_snapshot(path: Optional[str] = None) -> Optional[Dict]:
+    path = path or config.PERF_METRICS_FILE
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+async def run_snapshot_writer(interval: Optional[float] = None, path: Optional[str] = None) -> None:
+    """Background task writing the snapshot every interval seconds until cancelled"""
+    interval = interval or config.PERF_METRICS_FLUSH_INTERVAL
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            write_snapshot(path)
+        except OSError:
+            pass
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tools/progress.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : Structured crawl progress events (pages done, contents/comments/creators stored, errors, ETA).
+#            When the MEDIACRAWLER_PROGRESS_FILE environment variable is set (the WebUI CrawlerManager does it),
+#            events are appended to that file as JSON lines, one object per line with an "event" field:
+#            run_started, progress (cumulative counts, throttled to one per PROGRESS_FLUSH_INTERVAL), error,
+#            run_finished. The manager tails the file instead of inferring progress from log lines.
+
+import functools
+import json
+import logging
+import os
+import time
+from typing import Callable, Dict, Optional, TextIO
+
+import config
+
+PROGRESS_FILE_ENV = "MEDIACRAWLER_PROGRESS_FILE"
+# Minimum seconds between two cumulative progress events
+PROGRESS_FLUSH_INTERVAL = 1.0
+# Error messages are cut to this length, stack traces stay in the log
+MAX_ERROR_MESSAGE_LENGTH = 500
+
+# Config list holding the ids of a detail run, per platform
+_SPECIFIED_ID_LISTS = {
+    "xhs": "XHS_SPECIFIED_NOTE_URL_LIST",
+    "dy": "DY_SPECIFIED_ID_LIST",
+    "ks": "KS_SPECIFIED_ID_LIST",
+    "bili": "BILI_SPECIFIED_ID_LIST",
+    "wb": "WEIBO_SPECIFIED_ID_LIST",
+    "tieba": "TIEBA_SPECIFIED_ID_LIST",
+    "zhihu": "ZHIHU_SPECIFIED_ID_LIST",
+}
+
+
+def get_target_contents() -> Optional[int]:
+    """Number of contents the run is expected to store, None when it is not known upfront (creator mode)"""
+    if config.CRAWLER_TYPE == "search":
+        keywords = [keyword for keyword in config.KEYWORDS.split(",") if keyword.strip()]
+        return config.CRAWLER_MAX_NOTES_COUNT * len(keywords)
+    if config.CRAWLER_TYPE == "detail":
+        return len(getattr(config, _SPECIFIED_ID_LISTS.get(config.PLATFORM, ""), []))
+    return None
+
+
+class ProgressReporter:
+    """Cumulative progress counters of the crawler run, written to the progress file as JSON lines"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.counts: Dict[str, int] = {"pages": 0, "contents": 0, "comments": 0, "creators": 0, "errors": 0}
+        self.target_contents: Optional[int] = None
+        self.started_at = time.time()
+        self._last_flush = 0.0
+        self._file: Optional[TextIO] = None
+
+    def start(self, target_contents: Optional[int] = None) -> None:
+        self.started_at = time.time()
+        self.target_contents = target_contents
+        if self.path:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._emit({
+            "event": "run_started",
+            "platform": config.PLATFORM,
+            "crawler_type": config.CRAWLER_TYPE,
+            "target_contents": target_contents,
+        })
+
+    def record(self, kind: str, amount: int = 1) -> None:
+        self.counts[kind] += amount
+        if time.time() - self._last_flush >= PROGRESS_FLUSH_INTERVAL:
+            self.flush()
+
+    def error(self, message: str, source: str = "") -> None:
+        self.counts["errors"] += 1
+        self._emit({"event": "error", "message": message[:MAX_ERROR_MESSAGE_LENGTH], "source": source})
+
+    def eta_seconds(self) -> Optional[float]:
+        """Remaining seconds at the current content rate, None until a content is stored or without a target"""
+        done = self.counts["contents"]
+        if not self.target_contents or not done:
+            return None
+        rate = done / max(time.time() - self.started_at, 1e-6)
+        return round(max(self.target_contents - done, 0) / rate, 1)
+
+    def snapshot(self) -> Dict:
+        return {
+            **self.counts,
+            "target_contents": self.target_contents,
+            "elapsed_seconds": round(time.time() - self.started_at, 1),
+            "eta_seconds": self.eta_seconds(),
+        }
+
+    def flush(self) -> None:
+        self._last_flush = time.time()
+        self._emit({"event": "progress", **self.snapshot()})
+
+    def finish(self) -> None:
+        self._emit({"event": "run_finished", **self.snapshot()})
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _emit(self, event: Dict) -> None:
+        if self._file is None:
+            return
+        try:
+            self._file.write(json.dumps({**event, "ts": time.time()}, ensure_ascii=False) + "\n")
+            self._file.flush()
+        except (OSError, ValueError):
+            # The progress channel is best effort, never fail the crawl because of it
+            pass
+
+
+class ProgressLogHandler(logging.Handler):
+    """Turns ERROR records of the MediaCrawler logger into structured error events"""
+
+    def __init__(self, reporter: ProgressReporter):
+        super().__init__(level=logging.ERROR)
+        self.reporter = reporter
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.reporter.error(record.getMessage(), f"{record.filename}:{record.lineno}")
+
+
+_reporter = ProgressReporter()
+_log_handler: Optional[ProgressLogHandler] = None
+
+
+def get_progress_reporter() -> ProgressReporter:
+    return _reporter
+
+
+def start_progress(path: Optional[str] = None) -> ProgressReporter:
+    """Start reporting to path (default: $MEDIACRAWLER_PROGRESS_FILE), called by main.py once config is final"""
+    global _reporter, _log_handler
+    _reporter = ProgressReporter(path or os.environ.get(PROGRESS_FILE_ENV))
+    _reporter.start(get_target_contents())
+    if _reporter.path:
+        _log_handler = ProgressLogHandler(_reporter)
+        logging.getLogger("MediaCrawler").addHandler(_log_handler)
+    return _reporter
+
+
+def finish_progress() -> None:
+    global _log_handler
+    if _log_handler is not None:
+        logging.getLogger("MediaCrawler").removeHandler(_log_handler)
+        _log_handler = None
+    _reporter.finish()
+
+
+def page_done() -> None:
+    """Called by the platform search loops after a result page is processed"""
+    _reporter.record("pages")
+
+
+def track_store_progress(func: Callable, item: str) -> Callable:
+    """Wrap an async store_* method of an AbstractStore implementation, used by AbstractStore.__init_subclass__"""
+    kind = f"{item}s"
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        result = await func(*args, **kwargs)
+        _reporter.record(kind)
+        return result
+
+    return wrapper
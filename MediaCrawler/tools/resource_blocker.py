@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tools/resource_blocker.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : Request interception profiles for the browser pages, which are only kept for cookies,
+#            localStorage and in-page signing functions (e.g. xhs window.mnsv2) and never need to render media.
+
+from typing import Dict, FrozenSet, Iterable, Optional
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext, Route
+
+import config
+from tools import utils
+
+# Resource types aborted by each profile (Playwright request.resource_type)
+RESOURCE_PROFILES: Dict[str, FrozenSet[str]] = {
+    "off": frozenset(),
+    "light": frozenset({"image", "media", "font"}),
+    "minimal": frozenset({"image", "media", "font", "stylesheet", "texttrack", "manifest"}),
+}
+
+# Analytics and ad hosts, blocked in the minimal profile
+TRACKER_HOST_SUFFIXES = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "hm.baidu.com",
+    "mcs.zijieapi.com",
+    "data.bilibili.com",
+    "cm.bilibili.com",
+)
+
+
+def _host_matches(host: str, suffixes: Iterable[str]) -> bool:
+    return any(host == suffix or host.endswith("." + suffix) for suffix in suffixes)
+
+
+class ResourceBlocker:
+    """Aborts the requests of a profile on a browser context through context.route"""
+
+    def __init__(self, profile: str, script_allowlist: Iterable[str] = ()):
+        if profile not in RESOURCE_PROFILES:
+            raise ValueError(f"[ResourceBlocker] Unknown resource profile: {profile}, supported: {', '.join(RESOURCE_PROFILES)}")
+        self.profile = profile
+        self.blocked_types = RESOURCE_PROFILES[profile]
+        # minimal profile: only scripts of these hosts (and their subdomains) are loaded, empty allows all scripts
+        self.script_allowlist = tuple(script_allowlist) if profile == "minimal" else ()
+        self.blocked_count = 0
+        self.allowed_count = 0
+        self._browser_context: Optional[BrowserContext] = None
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.blocked_types:
+            return True
+        if self.profile != "minimal":
+            return False
+        host = urlsplit(url).hostname or ""
+        if _host_matches(host, TRACKER_HOST_SUFFIXES):
+            return True
+        return resource_type == "script" and bool(self.script_allowlist) and not _host_matches(host, self.script_allowlist)
+
+    async def _handle_route(self, route: Route):
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.blocked_count += 1
+            await route.abort("blockedbyclient")
+        else:
+            self.allowed_count += 1
+            await route.fallback()
+
+    async def attach(self, browser_context: BrowserContext):
+        if self.profile == "off" or self._browser_context is not None:
+            return
+        await browser_context.route("**/*", self._handle_route)
+        self._browser_context = browser_context
+        utils.logger.info(f"[ResourceBlocker] Resource profile '{self.profile}' enabled")
+
+    async def detach(self):
+        """Stop intercepting, e.g. before a login that has to show a qrcode image"""
+        if self._browser_context is None:
+            return
+        await self._browser_context.unroute("**/*", self._handle_route)
+        self._browser_context = None
+        utils.logger.info(f"[ResourceBlocker] Resource profile '{self.profile}' disabled, "
+                          f"blocked {self.blocked_count} of {self.blocked_count + self.allowed_count} requests")
+
+
+async def apply_resource_profile(browser_context: BrowserContext, platform: str) -> Optional[ResourceBlocker]:
+    """
+    Enable BROWSER_RESOURCE_PROFILE on the crawler's browser context, called once login has finished
+    Args:
+        browser_context: crawler browser context
+        platform: platform name, selects the script allowlist of the minimal profile
+
+    Returns:
+        the attached blocker, None if the profile is off
+    """
+    if config.BROWSER_RESOURCE_PROFILE == "off":
+        return None
+    blocker = ResourceBlocker(config.BROWSER_RESOURCE_PROFILE, config.BROWSER_SCRIPT_ALLOWLIST.get(platform, ()))
+    await blocker.attach(browser_context)
+    return blocker
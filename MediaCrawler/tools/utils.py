@@ -22,7 +22,6 @@ import argparse
 import logging
 
 from .crawler_util import *
-from .slider_util import *
 from .time_util import *
 
 
@@ -44,6 +43,14 @@ def init_loging_config():
 
 logger = init_loging_config()
 
+
+def __getattr__(name):
+    # slider_util imports cv2/numpy, only load it when the douyin slider captcha has to be solved
+    if name in ("Slide", "get_tracks", "get_track_simple"):
+        from . import slider_util
+        return getattr(slider_util, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def str2bool(v):
     if isinstance(v, bool):
         return v
@@ -18,21 +18,161 @@
 # 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
 
 
+# -*- coding: utf-8 -*-
+# @Desc    : Comment word frequency and word cloud. Comments are streamed from the JSON/JSONL/CSV store files in
+#            chunks, tokenized by jieba in a process pool and the per-chunk Counters merged as they complete,
+#            so millions of comments neither sit in memory at once nor block the event loop. The PNG is rendered
+#            in a worker process as well.
+
 import asyncio
+import csv
+import itertools
 import json
 import logging
+import multiprocessing
+import os
 from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Set, TextIO
 
 import aiofiles
 import jieba
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
 
 import config
 from tools import utils
 
 plot_lock = asyncio.Lock()
 
+# Comment text field names across platforms
+COMMENT_TEXT_FIELDS = ("content", "comment_text", "text")
+
+# Tokenizer state of the current process, set by init_tokenizer
+_stop_words: Set[str] = set()
+
+
+def load_stop_words(stop_words_file: str) -> Set[str]:
+    with open(stop_words_file, 'r', encoding='utf-8') as f:
+        return set(f.read().strip().split('\n'))
+
+
+def init_tokenizer(stop_words: Set[str], custom_words: Dict[str, str]):
+    """Load the jieba dictionary and custom words of the current process, also the process pool initializer"""
+    global _stop_words
+    logging.getLogger('jieba').setLevel(logging.WARNING)
+    _stop_words = stop_words
+    for word in custom_words:
+        jieba.add_word(word)
+    jieba.initialize()
+
+
+def count_words(texts: List[str]) -> Counter:
+    """Word frequency of one chunk of comments, runs in a worker process"""
+    return Counter(
+        word for word in jieba.lcut(' '.join(texts)) if word not in _stop_words and len(word.strip()) > 0
+    )
+
+
+def render_word_cloud(word_freq: Dict[str, int], save_words_prefix: str, font_path: Optional[str], stop_words: Set[str]):
+    """Render the word cloud PNG, runs in a worker process"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from wordcloud import WordCloud
+
+    top_20_word_freq = {word: freq for word, freq in
+                        sorted(word_freq.items(), key=lambda item: item[1], reverse=True)[:20]}
+    wordcloud = WordCloud(
+        font_path=font_path,
+        width=800,
+        height=400,
+        background_color='white',
+        max_words=200,
+        stopwords=stop_words,
+        colormap='viridis',
+        contour_color='steelblue',
+        contour_width=1
+    ).generate_from_frequencies(top_20_word_freq)
+
+    # Save word cloud image
+    plt.figure(figsize=(10, 5), facecolor='white')
+    plt.imshow(wordcloud, interpolation='bilinear')
+
+    plt.axis('off')
+    plt.tight_layout(pad=0)
+    plt.savefig(f"{save_words_prefix}_word_cloud.png", format='png', dpi=300)
+    plt.close()
+
+
+def iter_json_values(f: TextIO, read_size: int = 1 << 20) -> Iterator:
+    """
+    Stream the items of a JSON array file (as written by the json store) or the values of a JSONL file,
+    reading read_size characters at a time
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof, in_array = "", 0, False, None
+    while True:
+        # Skip whitespace and separators, refilling the buffer as needed
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            chunk = f.read(read_size)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+        if pos >= len(buffer):
+            return
+        if in_array is None:
+            in_array = buffer[pos] == "["
+            if in_array:
+                pos += 1
+                continue
+        if in_array and buffer[pos] == "]":
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # The value continues in the next read
+            chunk = f.read(read_size)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+        yield value
+        pos = end
+        if pos >= read_size:
+            buffer, pos = buffer[pos:], 0
+
+
+def iter_comment_texts(file_path: str) -> Iterator[str]:
+    """Comment texts of a json / jsonl / csv store file, read incrementally"""
+    if file_path.endswith(".csv"):
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            items: Iterable = csv.DictReader(f)
+            yield from _comment_texts(items)
+    else:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            yield from _comment_texts(iter_json_values(f))
+
+
+def _comment_texts(items: Iterable) -> Iterator[str]:
+    for item in items:
+        if isinstance(item, dict):
+            text = next((item[field] for field in COMMENT_TEXT_FIELDS if item.get(field)), "")
+            if text:
+                yield text
+
+
+def _chunks(texts: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk = []
+    for text in texts:
+        chunk.append(text)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
 class AsyncWordCloudGenerator:
     def __init__(self):
         logging.getLogger('jieba').setLevel(logging.WARNING)
@@ -40,17 +180,78 @@ class AsyncWordCloudGenerator:
         self.lock = asyncio.Lock()
         self.stop_words = self.load_stop_words()
         self.custom_words = config.CUSTOM_WORDS
-        for word, group in self.custom_words.items():
-            jieba.add_word(word)
+        self._workers = config.WORDCLOUD_PROCESS_POOL_WORKERS or max((os.cpu_count() or 2) - 1, 1)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._inline_ready = False
 
     def load_stop_words(self):
-        with open(self.stop_words_file, 'r', encoding='utf-8') as f:
-            return set(f.read().strip().split('\n'))
+        return load_stop_words(self.stop_words_file)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Lazily started pool, spawned so workers do not inherit the browser and event loop state"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_tokenizer,
+                initargs=(self.stop_words, self.custom_words),
+            )
+        return self._pool
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _count_chunks(self, texts: Iterable[str]) -> Counter:
+        """
+        Merge the word frequency of all chunks, blocking, run it in a thread.
+        A single chunk is counted in the calling thread, more chunks go to the process pool with a bounded
+        number in flight so reading never runs far ahead of tokenizing
+        """
+        chunks = _chunks(texts, config.WORDCLOUD_CHUNK_SIZE)
+        first = next(chunks, None)
+        if first is None:
+            return Counter()
+        second = next(chunks, None)
+        if second is None:
+            if not self._inline_ready:
+                init_tokenizer(self.stop_words, self.custom_words)
+                self._inline_ready = True
+            return count_words(first)
+
+        pool = self._get_pool()
+        max_in_flight = self._workers * 2
+        word_freq: Counter = Counter()
+        pending: Set[Future] = set()
+        for chunk in itertools.chain((first, second), chunks):
+            pending.add(pool.submit(count_words, chunk))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    word_freq.update(future.result())
+        for future in pending:
+            word_freq.update(future.result())
+        return word_freq
+
+    async def count_word_frequency(self, texts: Iterable[str]) -> Counter:
+        """Word frequency of the texts, which may be a lazy iterator over a store file"""
+        return await asyncio.to_thread(self._count_chunks, texts)
 
     async def generate_word_frequency_and_cloud(self, data, save_words_prefix):
-        all_text = ' '.join(item['content'] for item in data)
-        words = [word for word in jieba.lcut(all_text) if word not in self.stop_words and len(word.strip()) > 0]
-        word_freq = Counter(words)
+        word_freq = await self.count_word_frequency(item['content'] for item in data)
+        await self._save_word_frequency_and_cloud(word_freq, save_words_prefix)
+
+    async def generate_word_frequency_and_cloud_from_file(self, file_path: str, save_words_prefix: str):
+        """Stream the comments of a json / jsonl / csv store file instead of loading it"""
+        word_freq = await self.count_word_frequency(iter_comment_texts(file_path))
+        await self._save_word_frequency_and_cloud(word_freq, save_words_prefix)
+
+    async def _save_word_frequency_and_cloud(self, word_freq: Counter, save_words_prefix: str):
+        if not word_freq:
+            utils.logger.info("No valid comment content found, skipping word frequency and word cloud.")
+            return
 
         # Save word frequency to file
         freq_file = f"{save_words_prefix}_word_freq.json"
@@ -65,28 +266,8 @@ class AsyncWordCloudGenerator:
         await self.generate_word_cloud(word_freq, save_words_prefix)
 
     async def generate_word_cloud(self, word_freq, save_words_prefix):
-        await plot_lock.acquire()
-        top_20_word_freq = {word: freq for word, freq in
-                            sorted(word_freq.items(), key=lambda item: item[1], reverse=True)[:20]}
-        wordcloud = WordCloud(
-            font_path=config.FONT_PATH,
-            width=800,
-            height=400,
-            background_color='white',
-            max_words=200,
-            stopwords=self.stop_words,
-            colormap='viridis',
-            contour_color='steelblue',
-            contour_width=1
-        ).generate_from_frequencies(top_20_word_freq)
-
-        # Save word cloud image
-        plt.figure(figsize=(10, 5), facecolor='white')
-        plt.imshow(wordcloud, interpolation='bilinear')
-
-        plt.axis('off')
-        plt.tight_layout(pad=0)
-        plt.savefig(f"{save_words_prefix}_word_cloud.png", format='png', dpi=300)
-        plt.close()
-
-        plot_lock.release()
+        async with plot_lock:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                self._get_pool(), render_word_cloud, dict(word_freq), save_words_prefix, config.FONT_PATH, self.stop_words
+            )